@@ -1,3 +1,25 @@
+"""
+Django admin for Analytics app
+"""
 from django.contrib import admin
+from .models import AttendanceForecast, DailyFact, ReportJob
 
-# Register your models here.
+
+@admin.register(DailyFact)
+class DailyFactAdmin(admin.ModelAdmin):
+    list_display = ['date', 'metric', 'dimension', 'value']
+    list_filter = ['metric', 'dimension']
+    date_hierarchy = 'date'
+
+
+@admin.register(ReportJob)
+class ReportJobAdmin(admin.ModelAdmin):
+    list_display = ['report_type', 'format', 'status', 'row_count', 'requested_by', 'created_at', 'completed_at']
+    list_filter = ['report_type', 'format', 'status']
+    readonly_fields = ['params_hash', 'created_at', 'started_at', 'completed_at']
+
+
+@admin.register(AttendanceForecast)
+class AttendanceForecastAdmin(admin.ModelAdmin):
+    list_display = ['service', 'weeks', 'season_length', 'last_week', 'residual_std', 'fitted_at']
+    readonly_fields = ['state', 'predictions', 'fitted_at', 'updated_at']
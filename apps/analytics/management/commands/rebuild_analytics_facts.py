@@ -0,0 +1,33 @@
+"""
+Management command to rebuild daily analytics facts from source tables.
+Usage:
+    python manage.py rebuild_analytics_facts                  # All churches, last 5 years
+    python manage.py rebuild_analytics_facts <subdomain> --since 2020-01-01
+"""
+from datetime import date, timedelta
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from django_tenants.utils import get_public_schema_name, schema_context
+from apps.churches.models import Church
+from core.services.analytics_service import AnalyticsService
+
+
+class Command(BaseCommand):
+    help = 'Rebuild daily analytics facts (use after importing or back-dating data)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('subdomain', type=str, nargs='?', help='Church subdomain (default: all churches)')
+        parser.add_argument('--since', type=date.fromisoformat, help='First date to rebuild (YYYY-MM-DD)')
+
+    def handle(self, *args, **options):
+        today = timezone.localdate()
+        since = options['since'] or today - timedelta(days=5 * 365)
+
+        churches = Church.objects.exclude(schema_name=get_public_schema_name())
+        if options['subdomain']:
+            churches = churches.filter(subdomain=options['subdomain'])
+
+        for church in churches:
+            with schema_context(church.schema_name):
+                facts = AnalyticsService.rebuild_facts(since, today)
+            self.stdout.write(self.style.SUCCESS(f'✅ {church.name}: {facts} daily fact(s)'))
@@ -0,0 +1,55 @@
+# Generated by Django 4.2.11 on 2026-10-19 15:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="DailyFact",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("date", models.DateField()),
+                (
+                    "metric",
+                    models.CharField(
+                        choices=[
+                            ("new_members", "New Members"),
+                            ("giving", "Giving"),
+                            ("attendance", "Event Attendance"),
+                            ("volunteer_hours", "Volunteer Hours"),
+                        ],
+                        max_length=30,
+                    ),
+                ),
+                ("dimension", models.CharField(blank=True, default="", max_length=50)),
+                (
+                    "value",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=14),
+                ),
+            ],
+            options={
+                "db_table": "analytics_daily_facts",
+                "ordering": ["date"],
+                "indexes": [
+                    models.Index(
+                        fields=["metric", "date"], name="daily_fact_metric_date_idx"
+                    )
+                ],
+                "unique_together": {("metric", "dimension", "date")},
+            },
+        ),
+    ]
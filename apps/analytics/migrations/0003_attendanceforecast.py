@@ -0,0 +1,41 @@
+# Generated by Django 4.2.11 on 2026-10-19 17:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("analytics", "0002_reportjob"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AttendanceForecast",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("service", models.CharField(max_length=255, unique=True)),
+                ("first_week", models.DateField()),
+                ("last_week", models.DateField()),
+                ("weeks", models.IntegerField(default=0)),
+                ("season_length", models.IntegerField(default=0)),
+                ("state", models.JSONField(blank=True, default=dict)),
+                ("predictions", models.JSONField(blank=True, default=list)),
+                ("residual_std", models.FloatField(default=0)),
+                ("fitted_at", models.DateTimeField()),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "db_table": "attendance_forecasts",
+                "ordering": ["service"],
+            },
+        ),
+    ]
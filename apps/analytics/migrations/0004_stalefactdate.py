@@ -0,0 +1,33 @@
+# Generated by Django 4.2.11 on 2026-10-19 17:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("analytics", "0003_attendanceforecast"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="StaleFactDate",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("date", models.DateField(unique=True)),
+                ("marked_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "db_table": "analytics_stale_fact_dates",
+                "ordering": ["date"],
+            },
+        ),
+    ]
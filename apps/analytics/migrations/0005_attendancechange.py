@@ -0,0 +1,32 @@
+# Generated by Django 4.2.11 on 2026-10-19 18:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("analytics", "0004_stalefactdate"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AttendanceChange",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("marked_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "db_table": "analytics_attendance_changes",
+                "ordering": ["marked_at"],
+            },
+        ),
+    ]
@@ -1,3 +1,171 @@
+"""
+Analytics models.
+Precomputed daily facts behind the time-series analytics, background
+report jobs and attendance forecasts.
+"""
+
 from django.db import models
+from django.conf import settings
+
+
+METRIC_CHOICES = [
+    ('new_members', 'New Members'),
+    ('giving', 'Giving'),
+    ('attendance', 'Event Attendance'),
+    ('volunteer_hours', 'Volunteer Hours'),
+]
+
+
+class DailyFact(models.Model):
+    """
+    One metric's total for one day, optionally broken down by a dimension
+    (payment type, event type). Rebuilt from source tables by AnalyticsService.
+    """
+    
+    date = models.DateField()
+    metric = models.CharField(max_length=30, choices=METRIC_CHOICES)
+    dimension = models.CharField(max_length=50, blank=True, default='')
+    value = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    
+    class Meta:
+        db_table = 'analytics_daily_facts'
+        ordering = ['date']
+        unique_together = ['metric', 'dimension', 'date']
+        indexes = [
+            models.Index(fields=['metric', 'date'], name='daily_fact_metric_date_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.date} - {self.metric} {self.dimension} - {self.value}"
+
+
+class StaleFactDate(models.Model):
+    """
+    A day whose source rows changed since its facts were built.
+    Marked by signals, consumed by AnalyticsService.refresh.
+    """
+    
+    date = models.DateField(unique=True)
+    marked_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        db_table = 'analytics_stale_fact_dates'
+        ordering = ['date']
+    
+    def __str__(self):
+        return f"{self.date}"
+
+
+class ReportJob(models.Model):
+    """
+    Report generated in the background.
+    Jobs with the same params_hash share one artifact until it expires.
+    """
+    
+    report_type = models.CharField(
+        max_length=30,
+        choices=[
+            ('members', 'Members'),
+            ('financial', 'Financial'),
+            ('events', 'Events'),
+        ]
+    )
+    
+    format = models.CharField(
+        max_length=10,
+        choices=[
+            ('csv', 'CSV'),
+            ('xlsx', 'Excel'),
+            ('pdf', 'PDF'),
+        ],
+        default='csv'
+    )
+    
+    params = models.JSONField(default=dict, blank=True)
+    params_hash = models.CharField(max_length=64)
+    
+    status = models.CharField(
+        max_length=20,
+        choices=[
+            ('queued', 'Queued'),
+            ('running', 'Running'),
+            ('completed', 'Completed'),
+            ('failed', 'Failed'),
+        ],
+        default='queued'
+    )
+    
+    # Artifact in default storage
+    file_path = models.CharField(max_length=500, blank=True)
+    file_size = models.BigIntegerField(default=0)
+    row_count = models.IntegerField(default=0)
+    error = models.TextField(blank=True)
+    
+    requested_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name='report_jobs'
+    )
+    
+    # Timestamps
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+    expires_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        db_table = 'report_jobs'
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['params_hash', 'status'], name='report_job_params_idx'),
+            models.Index(fields=['requested_by', '-created_at'], name='report_job_user_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.report_type} ({self.format}) - {self.status}"
+
+
+class AttendanceChange(models.Model):
+    """
+    A change to event registrations since attendance forecasts were last
+    refreshed. Marked by signals, consumed by ForecastService.refresh.
+    """
+    
+    marked_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        db_table = 'analytics_attendance_changes'
+        ordering = ['marked_at']
+    
+    def __str__(self):
+        return f"{self.marked_at}"
+
 
-# Create your models here.
+class AttendanceForecast(models.Model):
+    """
+    Fitted weekly attendance model for one service (events of type
+    'service' grouped by title). ``state`` holds the smoothing state so
+    new weeks can be folded in without refitting the whole history.
+    """
+    
+    service = models.CharField(max_length=255, unique=True)
+    
+    first_week = models.DateField()
+    last_week = models.DateField()
+    weeks = models.IntegerField(default=0)
+    season_length = models.IntegerField(default=0)
+    
+    state = models.JSONField(default=dict, blank=True)
+    predictions = models.JSONField(default=list, blank=True)
+    residual_std = models.FloatField(default=0)
+    
+    fitted_at = models.DateTimeField()
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        db_table = 'attendance_forecasts'
+        ordering = ['service']
+    
+    def __str__(self):
+        return f"{self.service} - {self.last_week}"
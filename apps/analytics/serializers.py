@@ -0,0 +1,33 @@
+"""
+Analytics serializers.
+"""
+
+from rest_framework import serializers
+from .models import ReportJob
+
+
+class ReportJobSerializer(serializers.ModelSerializer):
+    """Report job status serializer."""
+    
+    download_url = serializers.SerializerMethodField()
+    
+    class Meta:
+        model = ReportJob
+        fields = [
+            'id', 'report_type', 'format', 'params', 'status', 'row_count', 'file_size',
+            'error', 'download_url', 'created_at', 'started_at', 'completed_at', 'expires_at'
+        ]
+        read_only_fields = fields
+    
+    def get_download_url(self, obj):
+        if obj.status != 'completed':
+            return None
+        return f'/api/v1/reports/{obj.id}/download/'
+
+
+class ReportRequestSerializer(serializers.Serializer):
+    """Report request serializer."""
+    
+    report_type = serializers.CharField()
+    format = serializers.CharField(default='csv')
+    params = serializers.DictField(required=False, default=dict)
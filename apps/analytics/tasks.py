@@ -0,0 +1,84 @@
+"""
+Background analytics tasks.
+"""
+
+from celery import shared_task
+from django_tenants.utils import schema_context
+import logging
+
+from apps.notifications.tasks import tenant_churches
+from core.services.analytics_service import AnalyticsService
+from core.services.forecast_service import ForecastService
+from core.services.report_service import ReportService
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def refresh_daily_facts(days=None):
+    """
+    Rebuild daily analytics facts in every tenant schema for days marked
+    stale by source writes and for the trailing ANALYTICS_FACT_REFRESH_DAYS.
+    """
+    results = {}
+    
+    for _, schema_name in tenant_churches():
+        with schema_context(schema_name):
+            try:
+                results[schema_name] = AnalyticsService.refresh(days)
+            except Exception as e:
+                logger.error(f'❌ Analytics refresh failed in {schema_name}: {e}')
+    
+    return results
+
+
+@shared_task
+def generate_report(schema_name, job_id):
+    """
+    Generate a queued report in its tenant schema.
+    """
+    from apps.analytics.models import ReportJob
+    
+    with schema_context(schema_name):
+        job = ReportJob.objects.select_related('requested_by').filter(pk=job_id, status='queued').first()
+        if job is None:
+            return None
+        job = ReportService.generate(job)
+        return {'status': job.status, 'rows': job.row_count}
+
+
+@shared_task
+def purge_expired_reports():
+    """
+    Delete expired report artifacts in every tenant schema.
+    """
+    results = {}
+    
+    for _, schema_name in tenant_churches(active_only=False):
+        with schema_context(schema_name):
+            try:
+                results[schema_name] = ReportService.purge_expired()
+            except Exception as e:
+                logger.error(f'❌ Report purge failed in {schema_name}: {e}')
+    
+    return results
+
+
+@shared_task
+def refresh_attendance_forecasts(full=False):
+    """
+    Update attendance forecasts in every tenant schema. Tenants without
+    new attendance or newly completed weeks are skipped; ``full`` refits
+    every series to re-tune the smoothing parameters.
+    """
+    results = {}
+    
+    for _, schema_name in tenant_churches():
+        with schema_context(schema_name):
+            try:
+                if full or ForecastService.needs_refresh():
+                    results[schema_name] = ForecastService.refresh(full=full)
+            except Exception as e:
+                logger.error(f'❌ Attendance forecast failed in {schema_name}: {e}')
+    
+    return results
@@ -3,10 +3,12 @@ Analytics-specific URLs (for /api/v1/analytics/).
 """
 
 from django.urls import path
-from .views import AnalyticsView
+from .views import AnalyticsView, AttendanceForecastView, RetentionView
 
 urlpatterns = [
     path('', AnalyticsView.as_view(), name='analytics'),
+    path('retention/', RetentionView.as_view(), name='analytics-retention'),
+    path('attendance-forecast/', AttendanceForecastView.as_view(), name='analytics-attendance-forecast'),
 ]
 
 
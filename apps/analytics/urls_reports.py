@@ -2,17 +2,13 @@
 Report URLs (for /api/v1/reports/).
 """
 
-from django.urls import path
+from django.urls import path, include
+from rest_framework.routers import DefaultRouter
+from .views import ReportJobViewSet
+
+router = DefaultRouter()
+router.register(r'', ReportJobViewSet, basename='report')
 
 urlpatterns = [
-    # TODO: Add report generation endpoints
-    # path('members/', MemberReportView.as_view()),
-    # path('financial/', FinancialReportView.as_view()),
-    # path('events/', EventReportView.as_view()),
+    path('', include(router.urls)),
 ]
-
-
-
-
-
-
@@ -3,12 +3,22 @@ Analytics and dashboard views.
 """
 
 from rest_framework.views import APIView
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import action, api_view, permission_classes
 from rest_framework.response import Response
-from rest_framework import permissions, status
-from django.db.models import Count, Sum
+from rest_framework import permissions, status, viewsets
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.http import FileResponse
 from django.utils import timezone
-from datetime import timedelta
+from datetime import date, timedelta
+
+from core.services.analytics_service import AnalyticsService, GRANULARITY_STEPS, METRICS
+from core.services.dashboard_service import DashboardService
+from core.services.report_service import CONTENT_TYPES, ReportService
+from core.services.retention_service import RetentionService
+from core.permissions import IsChurchAdmin
+from .models import AttendanceForecast, ReportJob
+from .serializers import ReportJobSerializer, ReportRequestSerializer
 
 
 class DashboardView(APIView):
@@ -23,78 +33,199 @@ class DashboardView(APIView):
         
         GET /api/v1/dashboard/stats/
         """
-        from apps.members.models import Member
-        from apps.events.models import Event
-        from apps.payments.models import Payment
-        from apps.ministries.models import Ministry
-        
-        # Member stats
-        members = Member.objects.all()
-        member_stats = {
-            'total': members.count(),
-            'active': members.filter(status='active').count(),
-            'new_this_month': members.filter(
-                created_at__gte=timezone.now() - timedelta(days=30)
-            ).count()
-        }
-        
-        # Event stats
-        events = Event.objects.all()
-        upcoming_events = events.filter(date__gte=timezone.now())
-        
-        event_stats = {
-            'total': events.count(),
-            'upcoming': upcoming_events.count(),
-            'this_month': events.filter(
-                date__month=timezone.now().month,
-                date__year=timezone.now().year
-            ).count()
-        }
-        
-        # Payment stats
-        payments = Payment.objects.filter(status='completed')
-        this_month_payments = payments.filter(
-            date__month=timezone.now().month,
-            date__year=timezone.now().year
-        )
+        return Response({
+            'success': True,
+            'stats': DashboardService.get_stats()
+        })
+
+
+class AnalyticsView(APIView):
+    """
+    Advanced analytics and reports.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    
+    def get(self, request):
+        """
+        Get time-series analytics.
         
-        payment_stats = {
-            'total_count': payments.count(),
-            'total_amount': payments.aggregate(total=Sum('amount'))['total'] or 0,
-            'this_month_amount': this_month_payments.aggregate(total=Sum('amount'))['total'] or 0,
-            'this_month_count': this_month_payments.count()
-        }
+        Query params: start, end (YYYY-MM-DD), granularity
+        (day/week/month/quarter/year), metrics (comma separated), window
+        (moving average periods).
         
-        # Ministry stats
-        ministry_stats = {
-            'total': Ministry.objects.filter(is_active=True).count()
-        }
+        GET /api/v1/analytics/
+        """
+        today = timezone.localdate()
+        try:
+            end = date.fromisoformat(request.query_params.get('end') or today.isoformat())
+            start = date.fromisoformat(
+                request.query_params.get('start') or (end - timedelta(days=365)).isoformat()
+            )
+            window = int(request.query_params.get('window', 3))
+        except ValueError:
+            return Response({
+                'success': False,
+                'error': 'start and end must be YYYY-MM-DD and window a number'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        granularity = request.query_params.get('granularity', 'month')
+        metrics = [m for m in request.query_params.get('metrics', '').split(',') if m]
+        
+        if granularity not in GRANULARITY_STEPS:
+            return Response({
+                'success': False,
+                'error': f"granularity must be one of: {', '.join(GRANULARITY_STEPS)}"
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        unknown = [m for m in metrics if m not in METRICS]
+        if unknown:
+            return Response({
+                'success': False,
+                'error': f"Unknown metrics: {', '.join(unknown)}"
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        if start > end or (end - start).days > settings.ANALYTICS_MAX_RANGE_DAYS or not 1 <= window <= 52:
+            return Response({
+                'success': False,
+                'error': 'Invalid date range or window'
+            }, status=status.HTTP_400_BAD_REQUEST)
         
         return Response({
             'success': True,
-            'stats': {
-                'members': member_stats,
-                'events': event_stats,
-                'payments': payment_stats,
-                'ministries': ministry_stats
-            }
+            'analytics': AnalyticsService.get_series(start, end, granularity, metrics, window)
         })
 
 
-class AnalyticsView(APIView):
+class RetentionView(APIView):
     """
-    Advanced analytics and reports.
+    Membership cohort retention.
     """
     permission_classes = [permissions.IsAuthenticated]
     
     def get(self, request):
         """
-        Get analytics data.
+        Get monthly cohort retention, churn and reactivation.
         
-        GET /api/v1/analytics/overview/
+        GET /api/v1/analytics/retention/?months=24
         """
-        # TODO: Implement detailed analytics
+        try:
+            months = int(request.query_params.get('months', settings.RETENTION_DEFAULT_MONTHS))
+        except ValueError:
+            months = 0
+        
+        if not 1 <= months <= settings.RETENTION_MAX_MONTHS:
+            return Response({
+                'success': False,
+                'error': f'months must be between 1 and {settings.RETENTION_MAX_MONTHS}'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
         return Response({
             'success': True,
-            'message': 'Analytics not fully implemented yet'
+            'retention': RetentionService.get_retention(months)
         })
+
+
+class AttendanceForecastView(APIView):
+    """
+    Weekly service attendance forecasts.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    
+    def get(self, request):
+        """
+        Get attendance predictions for the next N weeks per service.
+        
+        GET /api/v1/analytics/attendance-forecast/?weeks=8&service=Sunday%20Service
+        """
+        try:
+            weeks = int(request.query_params.get('weeks', 8))
+        except ValueError:
+            weeks = 0
+        
+        if not 1 <= weeks <= settings.ATTENDANCE_FORECAST_MAX_WEEKS:
+            return Response({
+                'success': False,
+                'error': f'weeks must be between 1 and {settings.ATTENDANCE_FORECAST_MAX_WEEKS}'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        forecasts = AttendanceForecast.objects.all()
+        if request.query_params.get('service'):
+            forecasts = forecasts.filter(service=request.query_params['service'])
+        
+        return Response({
+            'success': True,
+            'forecasts': [
+                {
+                    'service': forecast.service,
+                    'history_weeks': forecast.weeks,
+                    'last_week': forecast.last_week,
+                    'seasonal': forecast.season_length > 0,
+                    'residual_std': round(forecast.residual_std, 2),
+                    'fitted_at': forecast.fitted_at,
+                    'predictions': forecast.predictions[:weeks],
+                }
+                for forecast in forecasts
+            ]
+        })
+
+
+class ReportJobViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    Background report jobs.
+    """
+    serializer_class = ReportJobSerializer
+    permission_classes = [permissions.IsAuthenticated, IsChurchAdmin]
+    
+    def get_queryset(self):
+        return ReportJob.objects.all()
+    
+    def create(self, request):
+        """
+        Queue a report. Identical requests reuse a queued, running or
+        unexpired completed job.
+        
+        POST /api/v1/reports/
+        """
+        serializer = ReportRequestSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        
+        try:
+            job, reused = ReportService.request(
+                serializer.validated_data['report_type'],
+                serializer.validated_data['format'],
+                serializer.validated_data['params'],
+                request.user
+            )
+        except ValueError as e:
+            return Response({
+                'success': False,
+                'error': str(e)
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        return Response({
+            'success': True,
+            'reused': reused,
+            'job': ReportJobSerializer(job).data
+        }, status=status.HTTP_200_OK if reused else status.HTTP_202_ACCEPTED)
+    
+    @action(detail=True, methods=['get'])
+    def download(self, request, pk=None):
+        """
+        Download a completed report.
+        
+        GET /api/v1/reports/{id}/download/
+        """
+        job = self.get_object()
+        if job.status != 'completed' or not job.file_path:
+            return Response({
+                'success': False,
+                'error': 'Report is not ready'
+            }, status=status.HTTP_409_CONFLICT)
+        
+        filename = f"{job.report_type}_report_{job.completed_at.strftime('%Y%m%d')}.{job.format}"
+        return FileResponse(
+            default_storage.open(job.file_path, 'rb'),
+            as_attachment=True,
+            filename=filename,
+            content_type=CONTENT_TYPES[job.format]
+        )
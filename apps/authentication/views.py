@@ -23,6 +23,7 @@ from .serializers import (
 )
 from .models import PasswordResetToken
 from apps.churches.models import Church, Domain
+from core.services.email_service import EmailService
 from django.utils import timezone
 from datetime import timedelta
 import secrets
@@ -405,8 +406,8 @@ class ForgotPasswordView(APIView):
                     expires_at=timezone.now() + timedelta(hours=24)
                 )
                 
-                # TODO: Send email with reset link
-                # send_password_reset_email(user, token)
+                # Queued; delivered by the email worker
+                EmailService.send_password_reset(user, token)
                 
                 return Response({
                     'success': True,
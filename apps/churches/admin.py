@@ -4,6 +4,7 @@ Django admin for Churches app
 from django.contrib import admin
 from .models import Church, Domain
 from .models_subscription_payment import SubscriptionPayment
+from .models_usage import ChurchUsage
 
 
 @admin.register(Church)
@@ -65,3 +66,11 @@ class SubscriptionPaymentAdmin(admin.ModelAdmin):
             'classes': ('collapse',)
         }),
     )
+
+
+@admin.register(ChurchUsage)
+class ChurchUsageAdmin(admin.ModelAdmin):
+    list_display = ['church', 'storage_bytes', 'members', 'period', 'api_calls', 'notifications_sent', 'reconciled_at']
+    search_fields = ['church__name', 'church__subdomain']
+    readonly_fields = ['updated_at']
+    raw_id_fields = ['church']
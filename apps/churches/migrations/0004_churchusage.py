@@ -0,0 +1,47 @@
+# Generated by Django 4.2.11 on 2026-10-19 19:10
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("churches", "0003_add_subscription_payment_model"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ChurchUsage",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("storage_bytes", models.BigIntegerField(default=0)),
+                ("members", models.IntegerField(default=0)),
+                ("period", models.DateField()),
+                ("api_calls", models.BigIntegerField(default=0)),
+                ("notifications_sent", models.BigIntegerField(default=0)),
+                ("reconciled_at", models.DateTimeField(blank=True, null=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "church",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="usage",
+                        to="churches.church",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "church_usage",
+                "verbose_name_plural": "Church usage",
+            },
+        ),
+    ]
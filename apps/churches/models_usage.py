@@ -0,0 +1,37 @@
+"""
+Usage metering models.
+Running totals per church for plan quotas.
+"""
+
+from django.db import models
+
+
+class ChurchUsage(models.Model):
+    """
+    Metered usage for one church.
+    
+    storage_bytes and members are running totals updated with each write
+    and periodically reconciled against the tenant tables.
+    api_calls and notifications_sent count the calendar month in ``period``.
+    """
+    
+    church = models.OneToOneField('churches.Church', on_delete=models.CASCADE, related_name='usage')
+    
+    # Running totals
+    storage_bytes = models.BigIntegerField(default=0)
+    members = models.IntegerField(default=0)
+    
+    # Monthly counters
+    period = models.DateField()
+    api_calls = models.BigIntegerField(default=0)
+    notifications_sent = models.BigIntegerField(default=0)
+    
+    reconciled_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        db_table = 'church_usage'
+        verbose_name_plural = 'Church usage'
+    
+    def __str__(self):
+        return f"Usage for church {self.church_id} ({self.period:%Y-%m})"
@@ -0,0 +1,29 @@
+"""
+Background church tasks.
+"""
+
+from celery import shared_task
+from django_tenants.utils import schema_context
+import logging
+
+from apps.notifications.tasks import tenant_churches
+from core.services.usage_service import UsageService
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def reconcile_usage():
+    """
+    Recompute storage and member totals in every tenant schema.
+    """
+    results = {}
+    
+    for _, schema_name in tenant_churches(active_only=False):
+        with schema_context(schema_name):
+            try:
+                results[schema_name] = UsageService.reconcile()['storage_bytes']
+            except Exception as e:
+                logger.error(f'❌ Usage reconcile failed in {schema_name}: {e}')
+    
+    return results
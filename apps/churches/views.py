@@ -5,10 +5,14 @@ Church views with subdomain resolution and feature management.
 from rest_framework import viewsets, permissions, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseNotModified
 from django.shortcuts import get_object_or_404
+from django.utils.http import parse_etags
 from .models import Church, Domain
 from .serializers import ChurchSerializer, ChurchDetailSerializer, DomainSerializer
 from core.permissions import IsSuperAdmin, IsChurchAdmin
+from core.services.church_service import ChurchService
 
 
 class ChurchViewSet(viewsets.ModelViewSet):
@@ -50,19 +54,22 @@ class ChurchViewSet(viewsets.ModelViewSet):
                 'error': 'Subdomain parameter is required'
             }, status=status.HTTP_400_BAD_REQUEST)
         
-        try:
-            church = Church.objects.get(subdomain=subdomain, is_active=True)
-            serializer = ChurchDetailSerializer(church)
-            
-            return Response({
-                'success': True,
-                'church': serializer.data
-            })
-        except Church.DoesNotExist:
+        cached = ChurchService.public_church(subdomain)
+        if cached is None:
             return Response({
                 'success': False,
                 'error': 'Church not found or inactive'
             }, status=status.HTTP_404_NOT_FOUND)
+        
+        # Served as pre-rendered JSON so the ETag matches the exact bytes
+        body, etag = cached
+        if etag in parse_etags(request.headers.get('If-None-Match', '')):
+            response = HttpResponseNotModified()
+        else:
+            response = HttpResponse(body, content_type='application/json')
+        response['ETag'] = etag
+        response['Cache-Control'] = f'public, max-age={settings.PUBLIC_CHURCH_MAX_AGE}'
+        return response
     
     @action(detail=False, methods=['post'], permission_classes=[permissions.AllowAny])
     def validate_subdomain(self, request):
@@ -360,4 +367,26 @@ class ChurchViewSet(viewsets.ModelViewSet):
             'subscription_end_date': church.subscription_end_date,
             'grace_period_days': church.grace_period_days,
             'bypass_subscription_check': church.bypass_subscription_check,
-        })
\ No newline at end of file
+        })
+    
+    @action(detail=True, methods=['get'])
+    def usage(self, request, pk=None):
+        """
+        Get metered usage and the plan's limits.
+        
+        GET /api/v1/churches/:id/usage/
+        """
+        from django_tenants.utils import schema_context
+        from core.services.usage_service import UsageService
+        
+        church = self.get_object()
+        
+        with schema_context(church.schema_name):
+            usage = UsageService.usage()
+        
+        return Response({
+            'success': True,
+            'plan': usage.pop('plan'),
+            'usage': usage,
+            'limits': UsageService.limits(church.plan),
+        })
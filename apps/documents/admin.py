@@ -1,3 +1,27 @@
+"""
+Django admin for Documents app
+"""
 from django.contrib import admin
+from .models import Document, DocumentUpload, DocumentVariant
 
-# Register your models here.
+
+@admin.register(Document)
+class DocumentAdmin(admin.ModelAdmin):
+    list_display = ['file_name', 'category', 'mime_type', 'file_size', 'is_public', 'variant_status', 'created_at']
+    list_filter = ['category', 'is_public', 'variant_status']
+    search_fields = ['file_name', 'content_hash']
+    readonly_fields = ['content_hash', 'created_at']
+
+
+@admin.register(DocumentUpload)
+class DocumentUploadAdmin(admin.ModelAdmin):
+    list_display = ['file_name', 'status', 'received_bytes', 'total_size', 'uploaded_by', 'expires_at']
+    list_filter = ['status']
+    readonly_fields = ['created_at', 'updated_at']
+
+
+@admin.register(DocumentVariant)
+class DocumentVariantAdmin(admin.ModelAdmin):
+    list_display = ['content_hash', 'name', 'width', 'height', 'file_size', 'created_at']
+    list_filter = ['name']
+    search_fields = ['content_hash']
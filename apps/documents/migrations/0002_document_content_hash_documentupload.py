@@ -0,0 +1,115 @@
+# Generated by Django 4.2.11 on 2026-10-19 17:45
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("members", "0002_add_two_stage_approval_to_member_request"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("documents", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="document",
+            name="content_hash",
+            field=models.CharField(blank=True, db_index=True, max_length=64),
+        ),
+        migrations.AlterField(
+            model_name="document",
+            name="file_size",
+            field=models.BigIntegerField(),
+        ),
+        migrations.CreateModel(
+            name="DocumentUpload",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                ("file_name", models.CharField(max_length=255)),
+                ("total_size", models.BigIntegerField()),
+                ("mime_type", models.CharField(blank=True, max_length=100)),
+                (
+                    "category",
+                    models.CharField(
+                        choices=[
+                            ("certificate", "Certificate"),
+                            ("photo", "Photo"),
+                            ("document", "Document"),
+                            ("receipt", "Receipt"),
+                            ("report", "Report"),
+                            ("other", "Other"),
+                        ],
+                        default="document",
+                        max_length=50,
+                    ),
+                ),
+                ("is_public", models.BooleanField(default=False)),
+                ("received_bytes", models.BigIntegerField(default=0)),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("uploading", "Uploading"),
+                            ("completed", "Completed"),
+                            ("aborted", "Aborted"),
+                        ],
+                        default="uploading",
+                        max_length=20,
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("expires_at", models.DateTimeField()),
+                (
+                    "document",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="uploads",
+                        to="documents.document",
+                    ),
+                ),
+                (
+                    "member",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="document_uploads",
+                        to="members.member",
+                    ),
+                ),
+                (
+                    "uploaded_by",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="document_uploads",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "document_uploads",
+                "ordering": ["-created_at"],
+                "indexes": [
+                    models.Index(
+                        fields=["status", "expires_at"],
+                        name="document_upload_expiry_idx",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,59 @@
+# Generated by Django 4.2.11 on 2026-10-19 18:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("documents", "0002_document_content_hash_documentupload"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="document",
+            name="variant_status",
+            field=models.CharField(
+                blank=True,
+                choices=[
+                    ("pending", "Pending"),
+                    ("ready", "Ready"),
+                    ("failed", "Failed"),
+                ],
+                db_index=True,
+                max_length=20,
+            ),
+        ),
+        migrations.CreateModel(
+            name="DocumentVariant",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("content_hash", models.CharField(max_length=64)),
+                ("name", models.CharField(max_length=20)),
+                ("file_path", models.CharField(max_length=500)),
+                ("file_size", models.BigIntegerField()),
+                ("mime_type", models.CharField(max_length=100)),
+                ("width", models.PositiveIntegerField()),
+                ("height", models.PositiveIntegerField()),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "db_table": "document_variants",
+                "ordering": ["width"],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("content_hash", "name"),
+                        name="document_variant_unique",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -2,10 +2,22 @@
 Document models for file management.
 """
 
+import uuid
+
 from django.db import models
 from django.conf import settings
 
 
+CATEGORY_CHOICES = [
+    ('certificate', 'Certificate'),
+    ('photo', 'Photo'),
+    ('document', 'Document'),
+    ('receipt', 'Receipt'),
+    ('report', 'Report'),
+    ('other', 'Other'),
+]
+
+
 class Document(models.Model):
     """
     Document storage for churches and members.
@@ -23,20 +35,29 @@ class Document(models.Model):
     # File Information
     file_name = models.CharField(max_length=255)
     file_path = models.CharField(max_length=500)
-    file_size = models.IntegerField()  # In bytes
+    file_size = models.BigIntegerField()  # In bytes
     mime_type = models.CharField(max_length=100)
     
+    # SHA-256 of the content; the stored blob is shared by every document
+    # in the tenant with the same hash
+    content_hash = models.CharField(max_length=64, blank=True, db_index=True)
+    
+    # Photo derivatives (thumbnail and web sizes)
+    variant_status = models.CharField(
+        max_length=20,
+        choices=[
+            ('pending', 'Pending'),
+            ('ready', 'Ready'),
+            ('failed', 'Failed'),
+        ],
+        blank=True,
+        db_index=True
+    )
+    
     # Category
     category = models.CharField(
         max_length=50,
-        choices=[
-            ('certificate', 'Certificate'),
-            ('photo', 'Photo'),
-            ('document', 'Document'),
-            ('receipt', 'Receipt'),
-            ('report', 'Report'),
-            ('other', 'Other'),
-        ],
+        choices=CATEGORY_CHOICES,
         default='document'
     )
     
@@ -64,3 +85,94 @@ class Document(models.Model):
     
     def __str__(self):
         return f"{self.file_name} ({self.category})"
+
+
+
+class DocumentVariant(models.Model):
+    """
+    Resized rendition of a photo, stored beside the original blob.
+    Keyed by content hash so every document with the same photo shares it.
+    """
+    
+    content_hash = models.CharField(max_length=64)
+    name = models.CharField(max_length=20)  # e.g. 'thumb', 'web'
+    file_path = models.CharField(max_length=500)
+    file_size = models.BigIntegerField()
+    mime_type = models.CharField(max_length=100)
+    width = models.PositiveIntegerField()
+    height = models.PositiveIntegerField()
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        db_table = 'document_variants'
+        ordering = ['width']
+        constraints = [
+            models.UniqueConstraint(fields=['content_hash', 'name'], name='document_variant_unique'),
+        ]
+    
+    def __str__(self):
+        return f"{self.content_hash[:12]} {self.name} ({self.width}x{self.height})"
+
+
+class DocumentUpload(models.Model):
+    """
+    Resumable chunked upload in progress.
+    Chunks are appended to a spool file; ``received_bytes`` is the offset
+    the next chunk must start at.
+    """
+    
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    
+    # Target document
+    file_name = models.CharField(max_length=255)
+    total_size = models.BigIntegerField()
+    mime_type = models.CharField(max_length=100, blank=True)
+    category = models.CharField(max_length=50, choices=CATEGORY_CHOICES, default='document')
+    is_public = models.BooleanField(default=False)
+    member = models.ForeignKey(
+        'members.Member',
+        on_delete=models.CASCADE,
+        related_name='document_uploads',
+        null=True,
+        blank=True
+    )
+    
+    # Progress
+    received_bytes = models.BigIntegerField(default=0)
+    status = models.CharField(
+        max_length=20,
+        choices=[
+            ('uploading', 'Uploading'),
+            ('completed', 'Completed'),
+            ('aborted', 'Aborted'),
+        ],
+        default='uploading'
+    )
+    document = models.ForeignKey(
+        Document,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='uploads'
+    )
+    
+    uploaded_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='document_uploads'
+    )
+    
+    # Timestamps
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    expires_at = models.DateTimeField()
+    
+    class Meta:
+        db_table = 'document_uploads'
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'expires_at'], name='document_upload_expiry_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.file_name} ({self.received_bytes}/{self.total_size})"
@@ -3,7 +3,8 @@ Document serializers.
 """
 
 from rest_framework import serializers
-from .models import Document
+from core.services.document_service import DocumentService
+from .models import Document, DocumentUpload
 
 
 class DocumentSerializer(serializers.ModelSerializer):
@@ -12,22 +13,41 @@ class DocumentSerializer(serializers.ModelSerializer):
     member_name = serializers.CharField(source='member.full_name', read_only=True)
     uploaded_by_name = serializers.CharField(source='uploaded_by.name', read_only=True)
     file_size_mb = serializers.SerializerMethodField()
+    download_url = serializers.SerializerMethodField()
     
     class Meta:
         model = Document
         fields = [
             'id', 'member', 'member_name', 'file_name', 'file_path', 'file_size',
-            'file_size_mb', 'mime_type', 'category', 'is_public', 'uploaded_by',
-            'uploaded_by_name', 'created_at'
+            'file_size_mb', 'mime_type', 'content_hash', 'variant_status', 'category', 'is_public', 'uploaded_by',
+            'uploaded_by_name', 'download_url', 'created_at'
         ]
-        read_only_fields = ['id', 'created_at', 'uploaded_by']
+        read_only_fields = ['id', 'created_at', 'uploaded_by', 'content_hash', 'variant_status']
     
     def get_file_size_mb(self, obj):
         """Get file size in MB."""
         return round(obj.file_size / (1024 * 1024), 2)
+    
+    def get_download_url(self, obj):
+        """Signed, expiring link for the requesting user."""
+        request = self.context.get('request')
+        if not obj.content_hash or request is None or not request.user.is_authenticated:
+            return None
+        token = DocumentService.sign_download(obj, request.user)
+        return f'/api/v1/documents/{obj.id}/download/?token={token}'
 
 
-
-
-
-
+class DocumentUploadSerializer(serializers.ModelSerializer):
+    """Resumable upload session serializer."""
+    
+    class Meta:
+        model = DocumentUpload
+        fields = [
+            'id', 'file_name', 'total_size', 'received_bytes', 'mime_type',
+            'category', 'is_public', 'member', 'status', 'document',
+            'created_at', 'updated_at', 'expires_at'
+        ]
+        read_only_fields = [
+            'id', 'received_bytes', 'status', 'document',
+            'created_at', 'updated_at', 'expires_at'
+        ]
@@ -0,0 +1,53 @@
+"""
+Background document tasks.
+"""
+
+from celery import shared_task
+from django_tenants.utils import schema_context
+import logging
+
+from apps.notifications.tasks import tenant_churches
+from core.services.document_service import DocumentService
+from core.services.photo_variant_service import PhotoVariantService
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def purge_expired_uploads():
+    """
+    Delete abandoned resumable uploads and their spool files in every tenant schema.
+    """
+    results = {}
+    
+    for _, schema_name in tenant_churches(active_only=False):
+        with schema_context(schema_name):
+            try:
+                results[schema_name] = DocumentService.purge_expired()
+            except Exception as e:
+                logger.error(f'❌ Upload purge failed in {schema_name}: {e}')
+    
+    return results
+
+
+@shared_task
+def generate_document_variants(schema_name=None):
+    """
+    Render thumbnails and web variants for pending photos.
+    Without a schema (the periodic run) every tenant with pending photos is drained.
+    """
+    from apps.documents.models import Document
+    
+    schemas = [schema_name] if schema_name else [schema for _, schema in tenant_churches()]
+    results = {}
+    
+    for schema in schemas:
+        with schema_context(schema):
+            if schema_name is None and not Document.objects.filter(variant_status='pending').exists():
+                continue
+            try:
+                results[schema] = PhotoVariantService.drain()
+            except Exception as e:
+                logger.error(f'❌ Photo variants failed in {schema}: {e}')
+    
+    return results
@@ -2,11 +2,25 @@
 Document views.
 """
 
+import os
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core import signing
+from django.db.models import Q
+from django.http import HttpResponse, HttpResponseNotModified, HttpResponseRedirect, StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+from django.utils.http import content_disposition_header, parse_etags
+from django_tenants.utils import schema_context
 from rest_framework import viewsets, permissions, status
 from rest_framework.decorators import action
+from rest_framework.parsers import MultiPartParser
 from rest_framework.response import Response
-from .models import Document
-from .serializers import DocumentSerializer
+from apps.authentication.models import User
+from core.services.document_service import DocumentService, UploadOffsetConflict, document_storage
+from core.services.photo_variant_service import PhotoVariantService
+from .models import Document, DocumentUpload
+from .serializers import DocumentSerializer, DocumentUploadSerializer
 
 
 class DocumentViewSet(viewsets.ModelViewSet):
@@ -19,38 +33,318 @@ class DocumentViewSet(viewsets.ModelViewSet):
     search_fields = ['file_name']
     ordering_fields = ['created_at', 'file_name']
     
-    def get_queryset(self):
-        """Filter documents."""
-        user = self.request.user
-        
-        # Admins see all
+    @staticmethod
+    def visible_documents(user):
+        """
+        Documents a user may see: admins see all, members their own and
+        public documents, everyone else public documents only.
+        """
         if user.is_church_admin or user.is_superadmin:
             return Document.objects.all()
         
-        # Members see:
-        # 1. Their own documents
-        # 2. Public documents
         if hasattr(user, 'member_profile'):
-            from django.db.models import Q
             return Document.objects.filter(
                 Q(member=user.member_profile) | Q(is_public=True)
             )
         
         return Document.objects.filter(is_public=True)
     
+    def get_queryset(self):
+        """Filter documents."""
+        return self.visible_documents(self.request.user)
+    
     def perform_create(self, serializer):
         """Set uploaded_by to current user."""
         serializer.save(uploaded_by=self.request.user)
     
-    @action(detail=False, methods=['post'])
+    def get_upload(self, upload_id):
+        """Upload session owned by the current user."""
+        return get_object_or_404(DocumentUpload, pk=upload_id, uploaded_by=self.request.user)
+    
+    def upload_response(self, upload, status_code=status.HTTP_200_OK):
+        response = Response({
+            'success': True,
+            'upload': DocumentUploadSerializer(upload).data
+        }, status=status_code)
+        response['Upload-Offset'] = str(upload.received_bytes)
+        return response
+    
+    @action(detail=False, methods=['post'], parser_classes=[MultiPartParser])
     def upload(self, request):
         """
-        Upload a document.
+        Upload a small document in one multipart request (field ``file``).
+        Larger files should use resumable uploads.
         
         POST /api/v1/documents/upload/
         """
-        # TODO: Implement file upload with S3/local storage
+        file = request.FILES.get('file')
+        if file is None:
+            return Response({
+                'success': False,
+                'error': 'file is required'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        serializer = DocumentUploadSerializer(data={
+            'file_name': file.name,
+            'total_size': file.size,
+            **{field: request.data[field] for field in ['category', 'is_public', 'member', 'mime_type'] if field in request.data}
+        })
+        serializer.is_valid(raise_exception=True)
+        fields = serializer.validated_data
+        
+        try:
+            document = DocumentService.store(
+                file,
+                file_name=file.name,
+                uploaded_by=request.user,
+                sha256=request.data.get('sha256'),
+                mime_type=fields.get('mime_type') or file.content_type or '',
+                member=fields.get('member'),
+                category=fields.get('category', 'document'),
+                is_public=fields.get('is_public', False),
+            )
+        except ValueError as e:
+            return Response({
+                'success': False,
+                'error': str(e)
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
         return Response({
-            'success': False,
-            'error': 'File upload not implemented yet'
-        }, status=status.HTTP_501_NOT_IMPLEMENTED)
+            'success': True,
+            'document': DocumentSerializer(document, context={'request': request}).data
+        }, status=status.HTTP_201_CREATED)
+    
+    @action(detail=False, methods=['post'])
+    def uploads(self, request):
+        """
+        Start a resumable upload.
+        Send chunks with PATCH to the returned upload, then complete it.
+        
+        POST /api/v1/documents/uploads/
+        """
+        serializer = DocumentUploadSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        fields = dict(serializer.validated_data)
+        
+        try:
+            upload = DocumentService.start(
+                request.user,
+                fields.pop('file_name'),
+                fields.pop('total_size'),
+                **fields
+            )
+        except ValueError as e:
+            return Response({
+                'success': False,
+                'error': str(e)
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        response = self.upload_response(upload, status.HTTP_201_CREATED)
+        response['Upload-Chunk-Size'] = str(settings.DOCUMENT_UPLOAD_CHUNK_SIZE)
+        return response
+    
+    @action(
+        detail=False,
+        methods=['get', 'put', 'patch', 'delete'],
+        url_path=r'uploads/(?P<upload_id>[0-9a-f-]+)'
+    )
+    def upload_chunk(self, request, upload_id=None):
+        """
+        Get upload progress, send the chunk starting at the ``Upload-Offset``
+        header as the raw request body, or abort the upload.
+        
+        GET/PATCH/DELETE /api/v1/documents/uploads/{id}/
+        """
+        upload = self.get_upload(upload_id)
+        
+        if request.method == 'GET':
+            return self.upload_response(upload)
+        
+        if request.method == 'DELETE':
+            DocumentService.abort(upload)
+            return Response({'success': True}, status=status.HTTP_200_OK)
+        
+        try:
+            offset = int(request.headers.get('Upload-Offset', ''))
+        except ValueError:
+            return Response({
+                'success': False,
+                'error': 'Upload-Offset header is required'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        try:
+            # Read the body straight from the request stream; request.data
+            # would buffer the whole chunk first
+            upload = DocumentService.append(upload, request.stream, offset)
+        except UploadOffsetConflict as e:
+            response = Response({
+                'success': False,
+                'error': str(e),
+                'offset': e.offset
+            }, status=status.HTTP_409_CONFLICT)
+            response['Upload-Offset'] = str(e.offset)
+            return response
+        except ValueError as e:
+            return Response({
+                'success': False,
+                'error': str(e)
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        return self.upload_response(upload)
+    
+    @action(detail=False, methods=['post'], url_path=r'uploads/(?P<upload_id>[0-9a-f-]+)/complete')
+    def complete_upload(self, request, upload_id=None):
+        """
+        Finish a resumable upload once every byte is received.
+        An optional ``sha256`` is checked against the content.
+        
+        POST /api/v1/documents/uploads/{id}/complete/
+        """
+        upload = self.get_upload(upload_id)
+        
+        try:
+            document = DocumentService.complete(upload, sha256=request.data.get('sha256'))
+        except ValueError as e:
+            return Response({
+                'success': False,
+                'error': str(e)
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        return Response({
+            'success': True,
+            'document': DocumentSerializer(document, context={'request': request}).data
+        }, status=status.HTTP_201_CREATED)
+    
+    @action(
+        detail=True,
+        methods=['get'],
+        permission_classes=[permissions.AllowAny],
+        authentication_classes=[]
+    )
+    def download(self, request, pk=None):
+        """
+        Download a document through a signed link (``download_url``).
+        Visibility is checked again for the user the link was issued to.
+        Photos accept ``width`` to get the smallest rendition that fits.
+        
+        GET /api/v1/documents/{id}/download/?token=...&width=...
+        """
+        try:
+            schema_name, document_id, user_id = DocumentService.read_download_token(
+                request.query_params.get('token', '')
+            )
+        except signing.BadSignature:
+            return Response({
+                'success': False,
+                'error': 'Download link is invalid or has expired'
+            }, status=status.HTTP_403_FORBIDDEN)
+        
+        user = User.objects.filter(pk=user_id, is_active=True).first()
+        if user is None or str(document_id) != str(pk):
+            return Response({
+                'success': False,
+                'error': 'Download link is invalid or has expired'
+            }, status=status.HTTP_403_FORBIDDEN)
+        
+        with schema_context(schema_name):
+            document = self.visible_documents(user).filter(pk=document_id).first()
+            if document is None:
+                return Response({
+                    'success': False,
+                    'error': 'Document not found'
+                }, status=status.HTTP_404_NOT_FOUND)
+            
+            # Photos: the smallest rendition at least ?width= pixels wide
+            variant = None
+            if 'width' in request.query_params:
+                try:
+                    width = int(request.query_params['width'])
+                except ValueError:
+                    return Response({
+                        'success': False,
+                        'error': 'width must be an integer'
+                    }, status=status.HTTP_400_BAD_REQUEST)
+                variant = PhotoVariantService.best_variant(document, width)
+            
+            if variant is not None:
+                name = os.path.splitext(document.file_name)[0]
+                return self.deliver(
+                    request,
+                    file_name=f'{name}-{variant.name}.webp',
+                    file_path=variant.file_path,
+                    file_size=variant.file_size,
+                    mime_type=variant.mime_type,
+                    etag=f'"{variant.content_hash}-{variant.name}"'
+                )
+            return self.deliver(
+                request,
+                file_name=document.file_name,
+                file_path=document.file_path,
+                file_size=document.file_size,
+                mime_type=document.mime_type,
+                etag=DocumentService.etag(document)
+            )
+    
+    def deliver(self, request, file_name, file_path, file_size, mime_type, etag=None):
+        """
+        Response for an authorized download.
+        
+        - If-None-Match against the ETag answers 304
+        - DOCUMENT_DELIVERY_MODE 'x-accel-redirect' or 'x-sendfile' hands the
+          file to the reverse proxy, 'redirect' sends the client to the
+          storage's own (presigned) URL
+        - Otherwise Django streams the file, honouring a single Range
+        """
+        headers = {
+            'Cache-Control': f'private, max-age={settings.DOCUMENT_LINK_TTL_SECONDS}',
+            'Accept-Ranges': 'bytes',
+        }
+        if etag:
+            headers['ETag'] = etag
+            if_none_match = parse_etags(request.headers.get('If-None-Match', ''))
+            if etag in if_none_match or '*' in if_none_match:
+                response = HttpResponseNotModified()
+                for header, value in headers.items():
+                    response[header] = value
+                return response
+        
+        storage = document_storage()
+        headers['Content-Disposition'] = content_disposition_header(
+            'inline' not in request.query_params,
+            file_name
+        )
+        mode = settings.DOCUMENT_DELIVERY_MODE
+        
+        if mode == 'redirect':
+            return HttpResponseRedirect(storage.url(file_path))
+        
+        if mode == 'x-accel-redirect':
+            response = HttpResponse(content_type=mime_type)
+            response['X-Accel-Redirect'] = settings.DOCUMENT_ACCEL_REDIRECT_PREFIX + quote(file_path)
+        elif mode == 'x-sendfile':
+            response = HttpResponse(content_type=mime_type)
+            response['X-Sendfile'] = storage.path(file_path)
+        else:
+            # If-Range: only honour the range while the client's copy is current
+            if_range = request.headers.get('If-Range')
+            range_header = request.headers.get('Range') if not if_range or if_range == etag else None
+            try:
+                byte_range = DocumentService.parse_range(range_header, file_size)
+            except ValueError:
+                response = HttpResponse(status=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE)
+                response['Content-Range'] = f'bytes */{file_size}'
+                return response
+            
+            start, end = byte_range or (0, file_size - 1)
+            response = StreamingHttpResponse(
+                DocumentService.iter_range(storage.open(file_path, 'rb'), start, end - start + 1),
+                status=status.HTTP_206_PARTIAL_CONTENT if byte_range else status.HTTP_200_OK,
+                content_type=mime_type
+            )
+            response['Content-Length'] = str(end - start + 1)
+            if byte_range:
+                response['Content-Range'] = f'bytes {start}-{end}/{file_size}'
+        
+        for header, value in headers.items():
+            response[header] = value
+        return response
@@ -0,0 +1,14 @@
+"""
+Django admin for Emails app
+"""
+from django.contrib import admin
+from .models import EmailDelivery
+
+
+@admin.register(EmailDelivery)
+class EmailDeliveryAdmin(admin.ModelAdmin):
+    list_display = ['template', 'to_email', 'church', 'status', 'attempts', 'sent_at', 'created_at']
+    list_filter = ['status', 'template', 'created_at']
+    search_fields = ['to_email', 'church__name']
+    readonly_fields = ['created_at', 'updated_at']
+    raw_id_fields = ['church']
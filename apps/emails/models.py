@@ -0,0 +1,60 @@
+"""
+Email models.
+Outbound email queue and delivery status.
+"""
+
+from django.db import models
+
+
+class EmailDelivery(models.Model):
+    """
+    One queued outbound email.
+    
+    Rows live in the public schema so a single worker can drain every
+    church's queue. The message is rendered from ``template`` and
+    ``context`` when it is sent, using the church's template overrides.
+    """
+    
+    church = models.ForeignKey(
+        'churches.Church',
+        on_delete=models.CASCADE,
+        related_name='email_deliveries',
+        null=True,
+        blank=True
+    )
+    
+    # Message
+    template = models.CharField(max_length=100)
+    context = models.JSONField(default=dict, blank=True)
+    to_email = models.EmailField()
+    
+    # Delivery status
+    status = models.CharField(
+        max_length=20,
+        choices=[
+            ('queued', 'Queued'),
+            ('sending', 'Sending'),
+            ('sent', 'Sent'),
+            ('failed', 'Failed'),
+        ],
+        default='queued'
+    )
+    attempts = models.IntegerField(default=0)
+    next_attempt_at = models.DateTimeField()
+    last_error = models.TextField(blank=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+    
+    # Timestamps
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        db_table = 'email_deliveries'
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at'], name='email_delivery_queue_idx'),
+            models.Index(fields=['church', 'created_at'], name='email_delivery_church_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.template} to {self.to_email} ({self.status})"
@@ -0,0 +1,22 @@
+"""
+Background email tasks.
+"""
+
+from celery import shared_task
+import logging
+
+from core.services.email_service import EmailService
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def send_queued_emails():
+    """
+    Send due emails from the queue.
+    Triggered after each enqueue and periodically to pick up retries.
+    """
+    result = EmailService.process_queue()
+    if result['sent'] or result['failed']:
+        logger.info(f'Email queue: {result}')
+    return result
@@ -39,9 +39,16 @@ class EventViewSet(viewsets.ModelViewSet):
         """Filter events by current tenant."""
         return Event.objects.all().order_by('date')
     
+    def create(self, request, *args, **kwargs):
+        """Create and return the broadcast notification ID."""
+        response = super().create(request, *args, **kwargs)
+        response.data['notification_broadcast_id'] = getattr(self, 'notification_broadcast_id', None)
+        return response
+    
     def perform_create(self, serializer):
         """Set created_by to current user."""
-        serializer.save(created_by=self.request.user)
+        instance = serializer.save(created_by=self.request.user)
+        self.notification_broadcast_id = getattr(instance, 'notification_broadcast_id', None)
     
     @action(detail=False, methods=['get'])
     def upcoming(self, request):
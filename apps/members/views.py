@@ -12,7 +12,7 @@ from .serializers import (
     MemberDetailSerializer,
     MemberWorkflowSerializer
 )
-from core.services import ExportService
+from core.services import ExportService, UsageService
 from core.permissions import IsChurchAdmin, IsAdminOrReadOnly
 
 
@@ -39,6 +39,11 @@ class MemberViewSet(viewsets.ModelViewSet):
         # Members are tenant-specific (in tenant schema)
         return Member.objects.all()
     
+    def perform_create(self, serializer):
+        """Enforce the plan's member limit."""
+        UsageService.check('members')
+        serializer.save()
+    
     @action(detail=False, methods=['get'])
     def export_csv(self, request):
         """
@@ -8,9 +8,11 @@ from rest_framework.decorators import action, api_view, permission_classes
 from rest_framework.response import Response
 from django.utils import timezone
 from django.db import transaction
+from datetime import timedelta
+import secrets
 from django.db import connection
 from apps.churches.models import Church
-from apps.authentication.models import User
+from apps.authentication.models import User, PasswordResetToken
 from .models import MemberRequest, Member
 from .serializers import (
     MemberRequestSerializer,
@@ -18,6 +20,7 @@ from .serializers import (
     MemberRequestPublicSerializer
 )
 from core.permissions import IsChurchAdmin
+from core.services.email_service import EmailService
 
 
 class MemberRequestViewSet(viewsets.ModelViewSet):
@@ -147,6 +150,15 @@ class MemberRequestViewSet(viewsets.ModelViewSet):
                 member_request.created_user = user
                 member_request.save()
                 
+                # Email a link for the new member to set their password
+                token = PasswordResetToken.objects.create(
+                    user=user,
+                    token=f"welcome_{int(timezone.now().timestamp())}_{secrets.token_urlsafe(16)}",
+                    email=user.email,
+                    expires_at=timezone.now() + timedelta(hours=72)
+                )
+                EmailService.send_member_confirmed(user, tenant, token.token, expires_hours=72)
+                
                 return Response({
                     'success': True,
                     'message': 'Member account created successfully. User can now log in.',
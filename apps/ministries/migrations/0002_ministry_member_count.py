@@ -0,0 +1,34 @@
+# Generated by Django 4.2.11 on 2026-10-19 12:30
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def backfill_member_counts(apps, schema_editor):
+    Ministry = apps.get_model("ministries", "Ministry")
+    MinistryMembership = apps.get_model("ministries", "MinistryMembership")
+
+    active = (
+        MinistryMembership.objects.filter(ministry=OuterRef("pk"), status="active")
+        .values("ministry")
+        .annotate(count=Count("id"))
+        .values("count")
+    )
+    Ministry.objects.update(member_count=Coalesce(Subquery(active), Value(0)))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("ministries", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="ministry",
+            name="member_count",
+            field=models.IntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_member_counts, migrations.RunPython.noop),
+    ]
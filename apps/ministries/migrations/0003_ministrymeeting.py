@@ -0,0 +1,80 @@
+# Generated by Django 4.2.11 on 2026-10-19 13:10
+
+from django.conf import settings
+import django.contrib.postgres.fields
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("ministries", "0002_ministry_member_count"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="MinistryMeeting",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("date", models.DateField()),
+                (
+                    "attendee_ids",
+                    django.contrib.postgres.fields.ArrayField(
+                        base_field=models.IntegerField(),
+                        blank=True,
+                        default=list,
+                        size=None,
+                    ),
+                ),
+                ("roster_size", models.IntegerField(default=0)),
+                ("guest_count", models.IntegerField(default=0)),
+                ("notes", models.TextField(blank=True)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "ministry",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="meetings",
+                        to="ministries.ministry",
+                    ),
+                ),
+                (
+                    "recorded_by",
+                    models.ForeignKey(
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="recorded_ministry_meetings",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "ministry_meetings",
+                "ordering": ["-date"],
+                "indexes": [
+                    models.Index(fields=["date"], name="ministry_meeting_date_idx"),
+                    django.contrib.postgres.indexes.GinIndex(
+                        fields=["attendee_ids"], name="ministry_meeting_attendee_idx"
+                    ),
+                ],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="ministrymeeting",
+            constraint=models.UniqueConstraint(
+                fields=("ministry", "date"), name="ministry_meeting_unique"
+            ),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.11 on 2026-10-19 18:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("ministries", "0003_ministrymeeting"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="ministrymembership",
+            name="left_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
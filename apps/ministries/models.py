@@ -3,8 +3,11 @@ Ministry models.
 Small groups and ministry management.
 """
 
+from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex
 from django.db import models
 from django.conf import settings
+from django.utils import timezone
 
 
 class Ministry(models.Model):
@@ -52,6 +55,9 @@ class Ministry(models.Model):
     # Capacity
     max_capacity = models.IntegerField(null=True, blank=True)
     
+    # Active memberships, kept in step with MinistryMembership writes
+    member_count = models.IntegerField(default=0)
+    
     # Status
     is_active = models.BooleanField(default=True)
     
@@ -74,6 +80,15 @@ class Ministry(models.Model):
     
     def __str__(self):
         return self.name
+    
+    def save(self, *args, **kwargs):
+        """Never write back a stale member_count; it is only changed with F() updates."""
+        if not self._state.adding and kwargs.get('update_fields') is None and not kwargs.get('force_insert'):
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name != 'member_count'
+            ]
+        super().save(*args, **kwargs)
 
 
 class MinistryMembership(models.Model):
@@ -104,6 +119,8 @@ class MinistryMembership(models.Model):
     )
     
     joined_at = models.DateTimeField(auto_now_add=True)
+    # When the membership was last deactivated; cleared while it is active
+    left_at = models.DateTimeField(null=True, blank=True)
     notes = models.TextField(blank=True)
     
     class Meta:
@@ -113,3 +130,55 @@ class MinistryMembership(models.Model):
     
     def __str__(self):
         return f"{self.member.full_name} - {self.ministry.name} ({self.role})"
+    
+    def save(self, *args, **kwargs):
+        """Stamp left_at when the membership is deactivated and clear it when reactivated."""
+        left_at = None if self.status == 'active' else (self.left_at or timezone.now())
+        if left_at != self.left_at:
+            self.left_at = left_at
+            if kwargs.get('update_fields') is not None:
+                kwargs['update_fields'] = [*kwargs['update_fields'], 'left_at']
+        super().save(*args, **kwargs)
+
+
+class MinistryMeeting(models.Model):
+    """
+    One small-group meeting and who attended it.
+    Attendance is a sorted array of member ids rather than a row per
+    attendee; roster_size is the roster on the meeting date.
+    """
+    
+    ministry = models.ForeignKey(Ministry, on_delete=models.CASCADE, related_name='meetings')
+    date = models.DateField()
+    
+    # Attendance
+    attendee_ids = ArrayField(models.IntegerField(), default=list, blank=True)
+    roster_size = models.IntegerField(default=0)
+    guest_count = models.IntegerField(default=0)
+    
+    notes = models.TextField(blank=True)
+    
+    recorded_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name='recorded_ministry_meetings'
+    )
+    
+    # Timestamps
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        db_table = 'ministry_meetings'
+        ordering = ['-date']
+        constraints = [
+            models.UniqueConstraint(fields=['ministry', 'date'], name='ministry_meeting_unique'),
+        ]
+        indexes = [
+            models.Index(fields=['date'], name='ministry_meeting_date_idx'),
+            GinIndex(fields=['attendee_ids'], name='ministry_meeting_attendee_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.ministry.name} - {self.date} ({len(self.attendee_ids)}/{self.roster_size})"
@@ -3,7 +3,7 @@ Ministry serializers.
 """
 
 from rest_framework import serializers
-from .models import Ministry, MinistryMembership
+from .models import Ministry, MinistryMeeting, MinistryMembership
 
 
 class MinistryMembershipSerializer(serializers.ModelSerializer):
@@ -13,15 +13,14 @@ class MinistryMembershipSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = MinistryMembership
-        fields = ['id', 'ministry', 'member', 'member_name', 'role', 'status', 'joined_at', 'notes']
-        read_only_fields = ['id', 'joined_at']
+        fields = ['id', 'ministry', 'member', 'member_name', 'role', 'status', 'joined_at', 'left_at', 'notes']
+        read_only_fields = ['id', 'joined_at', 'left_at']
 
 
 class MinistrySerializer(serializers.ModelSerializer):
     """Ministry serializer."""
     
     leader_name = serializers.CharField(source='leader.full_name', read_only=True)
-    member_count = serializers.SerializerMethodField()
     
     class Meta:
         model = Ministry
@@ -30,11 +29,7 @@ class MinistrySerializer(serializers.ModelSerializer):
             'meeting_schedule', 'location', 'max_capacity', 'is_active',
             'member_count', 'created_by', 'created_at', 'updated_at'
         ]
-        read_only_fields = ['id', 'created_at', 'updated_at', 'created_by']
-    
-    def get_member_count(self, obj):
-        """Get count of active members."""
-        return obj.members.filter(ministrymembership__status='active').count()
+        read_only_fields = ['id', 'member_count', 'created_at', 'updated_at', 'created_by']
 
 
 class MinistryDetailSerializer(MinistrySerializer):
@@ -46,7 +41,18 @@ class MinistryDetailSerializer(MinistrySerializer):
         fields = MinistrySerializer.Meta.fields + ['memberships']
 
 
-
-
-
-
+class MinistryMeetingSerializer(serializers.ModelSerializer):
+    """Ministry meeting attendance serializer."""
+    
+    present_count = serializers.SerializerMethodField()
+    
+    class Meta:
+        model = MinistryMeeting
+        fields = [
+            'id', 'ministry', 'date', 'attendee_ids', 'present_count', 'roster_size',
+            'guest_count', 'notes', 'recorded_by', 'created_at', 'updated_at'
+        ]
+        read_only_fields = fields
+    
+    def get_present_count(self, obj):
+        return len(obj.attendee_ids)
@@ -0,0 +1,29 @@
+"""
+Background ministry tasks.
+"""
+
+from celery import shared_task
+from django_tenants.utils import schema_context
+import logging
+
+from apps.notifications.tasks import tenant_churches
+from core.services.ministry_service import MinistryService
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def reconcile_ministry_counts():
+    """
+    Correct member_count from active memberships in every tenant schema.
+    """
+    results = {}
+    
+    for _, schema_name in tenant_churches():
+        with schema_context(schema_name):
+            try:
+                results[schema_name] = MinistryService.reconcile()
+            except Exception as e:
+                logger.error(f'❌ Ministry count reconcile failed in {schema_name}: {e}')
+    
+    return results
@@ -2,6 +2,10 @@
 Ministry views.
 """
 
+from datetime import date
+
+from django.conf import settings
+from django.utils import timezone
 from rest_framework import viewsets, permissions, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
@@ -9,9 +13,12 @@ from .models import Ministry, MinistryMembership
 from .serializers import (
     MinistrySerializer,
     MinistryDetailSerializer,
-    MinistryMembershipSerializer
+    MinistryMembershipSerializer,
+    MinistryMeetingSerializer
 )
 from core.permissions import IsAdminOrReadOnly
+from core.services.group_attendance_service import GroupAttendanceService
+from core.services.ministry_service import MinistryService
 
 
 class MinistryViewSet(viewsets.ModelViewSet):
@@ -32,7 +39,10 @@ class MinistryViewSet(viewsets.ModelViewSet):
     
     def get_queryset(self):
         """Filter ministries by current tenant."""
-        return Ministry.objects.filter(is_active=True).order_by('name')
+        queryset = Ministry.objects.filter(is_active=True).select_related('leader').order_by('name')
+        if self.action == 'retrieve':
+            queryset = queryset.prefetch_related('ministrymembership_set__member')
+        return queryset
     
     def perform_create(self, serializer):
         """Set created_by to current user."""
@@ -55,26 +65,12 @@ class MinistryViewSet(viewsets.ModelViewSet):
                 'error': 'member_id is required'
             }, status=status.HTTP_400_BAD_REQUEST)
         
-        # Check capacity
-        if ministry.max_capacity:
-            current_members = ministry.members.filter(ministrymembership__status='active').count()
-            if current_members >= ministry.max_capacity:
-                return Response({
-                    'success': False,
-                    'error': 'Ministry is at capacity'
-                }, status=status.HTTP_400_BAD_REQUEST)
-        
-        # Create membership
-        membership, created = MinistryMembership.objects.get_or_create(
-            ministry=ministry,
-            member_id=member_id,
-            defaults={'status': 'active', 'role': 'member'}
-        )
-        
-        if not created:
+        try:
+            membership = MinistryService.join(ministry, member_id)
+        except ValueError as e:
             return Response({
                 'success': False,
-                'error': 'Already a member of this ministry'
+                'error': str(e)
             }, status=status.HTTP_400_BAD_REQUEST)
         
         return Response({
@@ -132,10 +128,124 @@ class MinistryViewSet(viewsets.ModelViewSet):
         )
         
         ministry_ids = memberships.values_list('ministry_id', flat=True)
-        ministries = Ministry.objects.filter(id__in=ministry_ids)
+        ministries = Ministry.objects.filter(id__in=ministry_ids).select_related('leader')
         
         serializer = MinistrySerializer(ministries, many=True)
         return Response({
             'success': True,
             'data': serializer.data
         })
+    
+    def can_take_attendance(self, user, ministry):
+        """Admins, the ministry's leader and its leaders/assistants."""
+        if user.is_church_admin or user.is_superadmin:
+            return True
+        member = getattr(user, 'member_profile', None)
+        if member is None:
+            return False
+        return ministry.leader_id == member.id or MinistryMembership.objects.filter(
+            ministry=ministry,
+            member=member,
+            status='active',
+            role__in=['leader', 'assistant']
+        ).exists()
+    
+    @action(detail=True, methods=['get', 'post'], permission_classes=[permissions.IsAuthenticated])
+    def attendance(self, request, pk=None):
+        """
+        Record a meeting's attendance, or get the group's attendance report
+        (?weeks=12).
+        
+        GET /api/v1/ministries/:id/attendance/
+        POST /api/v1/ministries/:id/attendance/
+        Body: { "date": "YYYY-MM-DD", "present": [1, 2, 3], "guest_count": 0, "notes": "..." }
+        """
+        ministry = self.get_object()
+        
+        if not self.can_take_attendance(request.user, ministry):
+            return Response({
+                'success': False,
+                'error': 'Only ministry leaders can manage attendance'
+            }, status=status.HTTP_403_FORBIDDEN)
+        
+        if request.method == 'GET':
+            try:
+                weeks = int(request.query_params.get('weeks', settings.GROUP_ATTENDANCE_WEEKS))
+            except ValueError:
+                weeks = settings.GROUP_ATTENDANCE_WEEKS
+            return Response({
+                'success': True,
+                'attendance': GroupAttendanceService.group_report(ministry, min(max(weeks, 1), 104))
+            })
+        
+        try:
+            meeting_date = date.fromisoformat(request.data.get('date') or timezone.localdate().isoformat())
+            present = [int(member_id) for member_id in request.data.get('present') or []]
+            guest_count = int(request.data.get('guest_count') or 0)
+        except (TypeError, ValueError):
+            return Response({
+                'success': False,
+                'error': 'date must be YYYY-MM-DD and present a list of member ids'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        try:
+            meeting = GroupAttendanceService.record(
+                ministry,
+                meeting_date,
+                present,
+                request.user,
+                guest_count=guest_count,
+                notes=request.data.get('notes', '')
+            )
+        except ValueError as e:
+            return Response({
+                'success': False,
+                'error': str(e)
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        return Response({
+            'success': True,
+            'message': 'Attendance recorded',
+            'meeting': MinistryMeetingSerializer(meeting).data
+        })
+    
+    @action(detail=False, methods=['get'])
+    def attendance_rates(self, request):
+        """
+        Attendance rate of every group over the trailing weeks (?weeks=12).
+        
+        GET /api/v1/ministries/attendance_rates/
+        """
+        if not (request.user.is_church_admin or request.user.is_superadmin):
+            return Response({
+                'success': False,
+                'error': 'Only church admins can view attendance rates'
+            }, status=status.HTTP_403_FORBIDDEN)
+        
+        try:
+            weeks = int(request.query_params.get('weeks', settings.GROUP_ATTENDANCE_WEEKS))
+        except ValueError:
+            weeks = settings.GROUP_ATTENDANCE_WEEKS
+        
+        return Response({
+            'success': True,
+            'data': GroupAttendanceService.group_rates(min(max(weeks, 1), 104))
+        })
+    
+    @action(detail=False, methods=['get'])
+    def my_attendance(self, request):
+        """
+        Current user's attendance in each of their groups.
+        
+        GET /api/v1/ministries/my_attendance/
+        """
+        if not hasattr(request.user, 'member_profile'):
+            return Response({
+                'success': True,
+                'attendance': {'rate': None, 'groups': []}
+            })
+        
+        return Response({
+            'success': True,
+            'attendance': GroupAttendanceService.member_rates(request.user.member_profile)
+        })
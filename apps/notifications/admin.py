@@ -2,7 +2,7 @@
 Django admin for Notifications app
 """
 from django.contrib import admin
-from .models import Notification
+from .models import Notification, BroadcastNotification
 
 
 @admin.register(Notification)
@@ -12,3 +12,12 @@ class NotificationAdmin(admin.ModelAdmin):
     search_fields = ['user__name', 'user__email', 'title', 'message']
     readonly_fields = ['created_at']
     raw_id_fields = ['user']
+
+
+@admin.register(BroadcastNotification)
+class BroadcastNotificationAdmin(admin.ModelAdmin):
+    list_display = ['title', 'type', 'audience', 'priority', 'created_at']
+    list_filter = ['type', 'audience', 'created_at']
+    search_fields = ['title', 'message']
+    readonly_fields = ['created_at']
+    raw_id_fields = ['created_by']
@@ -0,0 +1,63 @@
+"""
+Notification WebSocket consumers.
+"""
+
+from channels.db import database_sync_to_async
+from channels.generic.websocket import AsyncJsonWebsocketConsumer
+from django_tenants.utils import schema_context
+
+from core.services import NotificationService, PushService, UnreadCounterService
+
+
+class NotificationConsumer(AsyncJsonWebsocketConsumer):
+    """
+    Pushes new notifications to the connected user.
+    
+    Joins the user's personal group and one group per broadcast audience
+    the user belongs to, all scoped to the tenant schema. Sends the current
+    unread count on connect so clients can stop polling.
+    
+    WS /ws/notifications/?tenant=<subdomain>
+    """
+    
+    async def connect(self):
+        user = self.scope.get('user')
+        tenant = self.scope.get('tenant')
+        
+        if user is None or not user.is_authenticated or tenant is None:
+            await self.close(code=4401)
+            return
+        
+        schema_name = tenant.schema_name
+        self.groups = [PushService.user_group(user.id, schema_name)] + [
+            PushService.audience_group(audience, schema_name)
+            for audience in NotificationService.audiences_for(user)
+        ]
+        for group in self.groups:
+            await self.channel_layer.group_add(group, self.channel_name)
+        
+        await self.accept()
+        await self.send_json({
+            'event': 'unread_count',
+            'count': await self.get_unread_count(schema_name, user),
+        })
+    
+    async def disconnect(self, code):
+        for group in getattr(self, 'groups', []):
+            await self.channel_layer.group_discard(group, self.channel_name)
+    
+    async def receive_json(self, content, **kwargs):
+        if content.get('action') == 'ping':
+            await self.send_json({'event': 'pong'})
+    
+    async def notification_created(self, event):
+        """Handler for 'notification.created' group messages."""
+        await self.send_json({
+            'event': 'notification',
+            'data': event['notification'],
+        })
+    
+    @database_sync_to_async
+    def get_unread_count(self, schema_name, user):
+        with schema_context(schema_name):
+            return UnreadCounterService.get(user.id, lambda: user)
@@ -0,0 +1,97 @@
+# Generated by Django 4.2.11 on 2026-10-19 11:40
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+# Rebuild the notifications table as a range-partitioned table on
+# created_at with one partition per month. PostgreSQL requires the
+# partition key in the primary key, so the database key becomes
+# (id, created_at); Django keeps treating id as the primary key.
+PARTITION_NOTIFICATIONS = """
+ALTER TABLE notifications RENAME TO notifications_unpartitioned;
+
+CREATE TABLE notifications (
+    LIKE notifications_unpartitioned INCLUDING DEFAULTS INCLUDING IDENTITY
+) PARTITION BY RANGE (created_at);
+
+DO $$
+DECLARE
+    month_start date := date_trunc(
+        'month', COALESCE((SELECT MIN(created_at) FROM notifications_unpartitioned), now())
+    )::date;
+    last_month date := (date_trunc('month', now()) + interval '3 months')::date;
+BEGIN
+    WHILE month_start <= last_month LOOP
+        EXECUTE format(
+            'CREATE TABLE %I PARTITION OF notifications FOR VALUES FROM (%L) TO (%L)',
+            'notifications_p' || to_char(month_start, 'YYYYMM'),
+            month_start::timestamp AT TIME ZONE 'UTC',
+            (month_start + interval '1 month')::timestamp AT TIME ZONE 'UTC'
+        );
+        month_start := (month_start + interval '1 month')::date;
+    END LOOP;
+END $$;
+
+CREATE TABLE notifications_default PARTITION OF notifications DEFAULT;
+
+INSERT INTO notifications SELECT * FROM notifications_unpartitioned;
+DROP TABLE notifications_unpartitioned;
+
+ALTER TABLE notifications ADD PRIMARY KEY (id, created_at);
+ALTER TABLE notifications ADD CONSTRAINT notifications_user_id_fk_users_id
+    FOREIGN KEY (user_id) REFERENCES users (id) DEFERRABLE INITIALLY DEFERRED;
+CREATE INDEX notifications_user_id_idx ON notifications (user_id);
+CREATE INDEX notificatio_user_id_a4dd5c_idx ON notifications (user_id, is_read);
+CREATE INDEX notificatio_type_8a8a78_idx ON notifications (type);
+CREATE INDEX notificatio_created_e4c995_idx ON notifications (created_at);
+
+SELECT setval(
+    pg_get_serial_sequence('notifications', 'id'),
+    COALESCE((SELECT MAX(id) FROM notifications), 0) + 1,
+    false
+);
+"""
+
+UNPARTITION_NOTIFICATIONS = """
+ALTER TABLE notifications RENAME TO notifications_partitioned;
+
+CREATE TABLE notifications (
+    LIKE notifications_partitioned INCLUDING DEFAULTS INCLUDING IDENTITY
+);
+
+INSERT INTO notifications SELECT * FROM notifications_partitioned;
+DROP TABLE notifications_partitioned;
+
+ALTER TABLE notifications ADD PRIMARY KEY (id);
+ALTER TABLE notifications ADD CONSTRAINT notifications_user_id_fk_users_id
+    FOREIGN KEY (user_id) REFERENCES users (id) DEFERRABLE INITIALLY DEFERRED;
+CREATE INDEX notifications_user_id_idx ON notifications (user_id);
+CREATE INDEX notificatio_user_id_a4dd5c_idx ON notifications (user_id, is_read);
+CREATE INDEX notificatio_type_8a8a78_idx ON notifications (type);
+CREATE INDEX notificatio_created_e4c995_idx ON notifications (created_at);
+
+SELECT setval(
+    pg_get_serial_sequence('notifications', 'id'),
+    COALESCE((SELECT MAX(id) FROM notifications), 0) + 1,
+    false
+);
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("notifications", "0002_broadcastnotification_broadcastreceipt"),
+    ]
+
+    operations = [
+        migrations.RunSQL(PARTITION_NOTIFICATIONS, UNPARTITION_NOTIFICATIONS),
+        migrations.AddIndex(
+            model_name="notification",
+            index=models.Index(
+                fields=["user", "-created_at"], name="notification_user_recent_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,71 @@
+# Generated by Django 4.2.11 on 2026-10-19 13:05
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("notifications", "0003_partition_notifications"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="NotificationDigest",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "frequency",
+                    models.CharField(
+                        choices=[
+                            ("immediate", "Immediate"),
+                            ("daily", "Daily"),
+                            ("weekly", "Weekly"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                ("period_start", models.DateTimeField()),
+                ("period_end", models.DateTimeField()),
+                ("notification_count", models.IntegerField(default=0)),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[("sent", "Sent"), ("failed", "Failed")],
+                        default="sent",
+                        max_length=20,
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="notification_digests",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "notification_digests",
+                "ordering": ["-period_end"],
+                "indexes": [
+                    models.Index(
+                        fields=["user", "frequency", "period_end"],
+                        name="digest_user_period_idx",
+                    ),
+                ],
+            },
+        ),
+    ]
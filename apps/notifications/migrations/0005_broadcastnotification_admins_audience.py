@@ -0,0 +1,27 @@
+# Generated by Django 4.2.11 on 2026-10-19 16:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("notifications", "0004_notificationdigest"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="broadcastnotification",
+            name="audience",
+            field=models.CharField(
+                choices=[
+                    ("all", "All Members"),
+                    ("members", "Members Only"),
+                    ("leaders", "Leaders"),
+                    ("admins", "Admins"),
+                ],
+                default="all",
+                max_length=20,
+            ),
+        ),
+    ]
@@ -7,9 +7,37 @@ from django.db import models
 from django.conf import settings
 
 
+NOTIFICATION_TYPE_CHOICES = [
+    ('system', 'System'),
+    ('event', 'Event'),
+    ('payment', 'Payment'),
+    ('request', 'Request'),
+    ('ministry', 'Ministry'),
+    ('announcement', 'Announcement'),
+    ('volunteer', 'Volunteer'),
+    ('prayer', 'Prayer'),
+    ('altar_call', 'Altar Call'),
+    ('member_request', 'Member Request'),
+    ('admin_message', 'Admin Message'),
+    ('event_reminder', 'Event Reminder'),
+    ('other', 'Other'),
+]
+
+PRIORITY_CHOICES = [
+    ('low', 'Low'),
+    ('normal', 'Normal'),
+    ('high', 'High'),
+    ('urgent', 'Urgent'),
+]
+
+
 class Notification(models.Model):
     """
     User notifications.
+    
+    The table is range-partitioned by month on created_at (see migration
+    0003). Old partitions and expired/dismissed rows are purged by
+    NotificationRetentionService.
     """
     
     user = models.ForeignKey(
@@ -19,39 +47,13 @@ class Notification(models.Model):
     )
     
     # Notification Content
-    type = models.CharField(
-        max_length=50,
-        choices=[
-            ('system', 'System'),
-            ('event', 'Event'),
-            ('payment', 'Payment'),
-            ('request', 'Request'),
-            ('ministry', 'Ministry'),
-            ('announcement', 'Announcement'),
-            ('volunteer', 'Volunteer'),
-            ('prayer', 'Prayer'),
-            ('altar_call', 'Altar Call'),
-            ('member_request', 'Member Request'),
-            ('admin_message', 'Admin Message'),
-            ('event_reminder', 'Event Reminder'),
-            ('other', 'Other'),
-        ]
-    )
+    type = models.CharField(max_length=50, choices=NOTIFICATION_TYPE_CHOICES)
     
     title = models.CharField(max_length=255)
     message = models.TextField()
     
     # Priority
-    priority = models.CharField(
-        max_length=20,
-        choices=[
-            ('low', 'Low'),
-            ('normal', 'Normal'),
-            ('high', 'High'),
-            ('urgent', 'Urgent'),
-        ],
-        default='normal'
-    )
+    priority = models.CharField(max_length=20, choices=PRIORITY_CHOICES, default='normal')
     
     # Category
     category = models.CharField(max_length=50, blank=True)
@@ -92,12 +94,98 @@ class Notification(models.Model):
             models.Index(fields=['user', 'is_read']),
             models.Index(fields=['type']),
             models.Index(fields=['created_at']),
+            models.Index(fields=['user', '-created_at'], name='notification_user_recent_idx'),
         ]
     
     def __str__(self):
         return f"{self.user.name} - {self.title}"
 
 
+class BroadcastNotification(models.Model):
+    """
+    Notification stored once and shown to every user in an audience.
+    Per-user read/dismiss state lives in BroadcastReceipt.
+    """
+    
+    type = models.CharField(max_length=50, choices=NOTIFICATION_TYPE_CHOICES)
+    
+    title = models.CharField(max_length=255)
+    message = models.TextField()
+    
+    priority = models.CharField(max_length=20, choices=PRIORITY_CHOICES, default='normal')
+    
+    # Audience (matches Announcement.target_audience)
+    audience = models.CharField(
+        max_length=20,
+        choices=[
+            ('all', 'All Members'),
+            ('members', 'Members Only'),
+            ('leaders', 'Leaders'),
+            ('admins', 'Admins'),
+        ],
+        default='all'
+    )
+    
+    action_url = models.CharField(max_length=500, blank=True)
+    
+    # Metadata
+    metadata = models.JSONField(default=dict, blank=True)
+    
+    # Expiry
+    expires_at = models.DateTimeField(null=True, blank=True)
+    
+    # Creator
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='created_broadcasts'
+    )
+    
+    # Timestamps
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        db_table = 'broadcast_notifications'
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['audience', 'created_at'], name='broadcast_audience_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.audience} - {self.title}"
+
+
+class BroadcastReceipt(models.Model):
+    """
+    Sparse per-user state for a broadcast notification.
+    A row only exists once the user has read or dismissed the broadcast.
+    """
+    
+    broadcast = models.ForeignKey(
+        BroadcastNotification,
+        on_delete=models.CASCADE,
+        related_name='receipts'
+    )
+    
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='broadcast_receipts'
+    )
+    
+    read_at = models.DateTimeField(null=True, blank=True)
+    dismissed_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        db_table = 'broadcast_receipts'
+        unique_together = ['broadcast', 'user']
+    
+    def __str__(self):
+        return f"{self.user_id} - {self.broadcast_id}"
+
+
 class NotificationPreference(models.Model):
     """
     User notification preferences.
@@ -145,3 +233,51 @@ class NotificationPreference(models.Model):
     
     def __str__(self):
         return f"{self.user.name} - {self.channel} - {self.category}"
+
+
+class NotificationDigest(models.Model):
+    """
+    Log of digest emails sent to a user.
+    The latest period_end per user and frequency is the point from which
+    the next digest collects notifications.
+    """
+    
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='notification_digests'
+    )
+    
+    frequency = models.CharField(
+        max_length=20,
+        choices=[
+            ('immediate', 'Immediate'),
+            ('daily', 'Daily'),
+            ('weekly', 'Weekly'),
+        ]
+    )
+    
+    period_start = models.DateTimeField()
+    period_end = models.DateTimeField()
+    notification_count = models.IntegerField(default=0)
+    
+    status = models.CharField(
+        max_length=20,
+        choices=[
+            ('sent', 'Sent'),
+            ('failed', 'Failed'),
+        ],
+        default='sent'
+    )
+    
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        db_table = 'notification_digests'
+        ordering = ['-period_end']
+        indexes = [
+            models.Index(fields=['user', 'frequency', 'period_end'], name='digest_user_period_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.user_id} - {self.frequency} - {self.period_end}"
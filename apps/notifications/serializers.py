@@ -29,6 +29,19 @@ class NotificationListSerializer(serializers.ModelSerializer):
         ]
 
 
+class NotificationFeedSerializer(serializers.Serializer):
+    """Merged feed item (personal notification or broadcast)."""
+    
+    id = serializers.IntegerField(source='item_id')
+    source = serializers.CharField(source='item_source')
+    type = serializers.CharField(source='item_type')
+    title = serializers.CharField(source='item_title')
+    message = serializers.CharField(source='item_message')
+    priority = serializers.CharField(source='item_priority')
+    is_read = serializers.BooleanField(source='item_is_read')
+    created_at = serializers.DateTimeField(source='item_created_at')
+
+
 class NotificationPreferenceSerializer(serializers.ModelSerializer):
     """Notification preference serializer."""
     
@@ -0,0 +1,79 @@
+"""
+Background notification tasks.
+"""
+
+from celery import shared_task
+from django_tenants.utils import get_public_schema_name, schema_context
+import logging
+
+from core.services.digest_service import DigestService
+from core.services.notification_retention_service import NotificationRetentionService
+from core.services.unread_counter_service import UnreadCounterService
+
+logger = logging.getLogger(__name__)
+
+
+def tenant_churches(active_only=True):
+    """(id, schema_name) pairs for every tenant church."""
+    from apps.churches.models import Church
+    
+    churches = Church.objects.exclude(schema_name=get_public_schema_name())
+    if active_only:
+        churches = churches.filter(is_active=True)
+    return list(churches.values_list('id', 'schema_name'))
+
+
+@shared_task
+def reconcile_unread_counters():
+    """
+    Periodically rewrite cached unread counters from the database in every
+    tenant schema, correcting any drift from missed increments.
+    """
+    churches = tenant_churches()
+    
+    for church_id, schema_name in churches:
+        with schema_context(schema_name):
+            UnreadCounterService.reconcile(church_id, schema_name)
+    
+    return {'churches': len(churches)}
+
+
+@shared_task
+def enforce_notification_retention():
+    """
+    Nightly partition maintenance and purge of expired notifications in
+    every tenant schema. Counters are reconciled afterwards because purged
+    rows may have been unread.
+    """
+    results = {}
+    
+    for church_id, schema_name in tenant_churches(active_only=False):
+        with schema_context(schema_name):
+            try:
+                results[schema_name] = NotificationRetentionService.run()
+                UnreadCounterService.reconcile(church_id, schema_name)
+            except Exception as e:
+                logger.error(f'❌ Notification retention failed in {schema_name}: {e}')
+    
+    return results
+
+
+@shared_task
+def send_notification_digests():
+    """
+    Send due notification digest emails in every tenant schema.
+    Runs on every scheduler tick; each user's preferences decide whether
+    their digest is due.
+    """
+    from apps.churches.models import Church
+    
+    results = {}
+    
+    for church_id, schema_name in tenant_churches():
+        with schema_context(schema_name):
+            try:
+                results[schema_name] = DigestService.send_digests(Church.objects.get(pk=church_id))
+            except Exception as e:
+                logger.error(f'❌ Notification digests failed in {schema_name}: {e}')
+    
+    return results
@@ -5,13 +5,18 @@ Notification views.
 from rest_framework import viewsets, permissions, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from rest_framework.exceptions import AuthenticationFailed, NotFound
 from django.utils import timezone
 from .models import Notification, NotificationPreference
 from .serializers import (
     NotificationSerializer,
     NotificationListSerializer,
+    NotificationFeedSerializer,
     NotificationPreferenceSerializer
 )
+from apps.authentication.models import User
+from core.authentication import CookieJWTStatelessAuthentication
+from core.services import NotificationService, UnreadCounterService
 
 
 class NotificationViewSet(viewsets.ModelViewSet):
@@ -33,6 +38,37 @@ class NotificationViewSet(viewsets.ModelViewSet):
         """Filter notifications for current user."""
         return Notification.objects.filter(user=self.request.user).order_by('-created_at')
     
+    def get_feed(self, request, **filters):
+        """Personal notifications merged with broadcasts for the current user."""
+        params = request.query_params
+        is_read = params.get('is_read')
+        if is_read is not None:
+            is_read = is_read.lower() in ['true', '1']
+        
+        options = {
+            'notification_type': params.get('type'),
+            'priority': params.get('priority'),
+            'is_read': is_read,
+        }
+        options.update(filters)
+        return NotificationService.feed(request.user, **options)
+    
+    def list(self, request, *args, **kwargs):
+        """
+        List personal notifications and broadcasts, newest first.
+        
+        GET /api/v1/notifications/
+        """
+        feed = self.get_feed(request)
+        
+        page = self.paginate_queryset(feed)
+        if page is not None:
+            serializer = NotificationFeedSerializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+        
+        serializer = NotificationFeedSerializer(feed, many=True)
+        return Response(serializer.data)
+    
     @action(detail=False, methods=['get'])
     def unread(self, request):
         """
@@ -40,22 +76,33 @@ class NotificationViewSet(viewsets.ModelViewSet):
         
         GET /api/v1/notifications/unread/
         """
-        unread = self.get_queryset().filter(is_read=False)
-        serializer = NotificationListSerializer(unread, many=True)
+        unread = self.get_feed(request, is_read=False)
+        serializer = NotificationFeedSerializer(unread, many=True)
         
         return Response({
             'success': True,
             'data': serializer.data
         })
     
-    @action(detail=False, methods=['get'])
+    @action(detail=False, methods=['get'], authentication_classes=[CookieJWTStatelessAuthentication])
     def unread_count(self, request):
         """
         Get count of unread notifications.
+        Served from the cached counter; the user row is only loaded on a miss.
+        Deactivating or deleting a user drops their counters, so their next
+        request reaches the loader and is rejected.
         
         GET /api/v1/notifications/unread/count/
         """
-        count = self.get_queryset().filter(is_read=False).count()
+        user_id = request.user.id
+        
+        def load_user():
+            user = User.objects.filter(pk=user_id, is_active=True).first()
+            if user is None:
+                raise AuthenticationFailed('User not found or inactive', code='user_inactive')
+            return user
+        
+        count = UnreadCounterService.get(user_id, load_user)
         
         return Response({
             'success': True,
@@ -70,9 +117,16 @@ class NotificationViewSet(viewsets.ModelViewSet):
         PUT /api/v1/notifications/:id/mark-read/
         """
         notification = self.get_object()
-        notification.is_read = True
-        notification.read_at = timezone.now()
-        notification.save()
+        updated = self.get_queryset().filter(
+            pk=notification.pk,
+            created_at=notification.created_at,  # lets Postgres prune to one partition
+            is_read=False
+        ).update(
+            is_read=True,
+            read_at=timezone.now()
+        )
+        if notification.dismissed_at is None:
+            UnreadCounterService.decrement(request.user.id, updated)
         
         return Response({
             'success': True,
@@ -90,6 +144,8 @@ class NotificationViewSet(viewsets.ModelViewSet):
             is_read=True,
             read_at=timezone.now()
         )
+        NotificationService.mark_broadcasts_read(request.user)
+        UnreadCounterService.reset(request.user.id)
         
         return Response({
             'success': True,
@@ -104,8 +160,52 @@ class NotificationViewSet(viewsets.ModelViewSet):
         DELETE /api/v1/notifications/:id/dismiss/
         """
         notification = self.get_object()
+        counted = not notification.is_read and notification.dismissed_at is None
         notification.dismissed_at = timezone.now()
         notification.save()
+        if counted:
+            UnreadCounterService.decrement(request.user.id)
+        
+        return Response({
+            'success': True,
+            'message': 'Notification dismissed'
+        })
+
+
+    def get_broadcast_or_404(self, broadcast_id):
+        """Broadcast visible to the current user, or raise 404."""
+        broadcast = NotificationService.visible_broadcasts(self.request.user).filter(pk=broadcast_id).first()
+        if broadcast is None:
+            raise NotFound('Broadcast notification not found')
+        return broadcast
+    
+    @action(detail=False, methods=['put', 'patch'], url_path=r'broadcasts/(?P<broadcast_id>[0-9]+)/mark-read')
+    def mark_broadcast_read(self, request, broadcast_id=None):
+        """
+        Mark broadcast notification as read.
+        
+        PUT /api/v1/notifications/broadcasts/:id/mark-read/
+        """
+        broadcast = self.get_broadcast_or_404(broadcast_id)
+        marked = NotificationService.mark_broadcasts_read(request.user, [broadcast.id])
+        UnreadCounterService.decrement_broadcasts(request.user.id, marked)
+        
+        return Response({
+            'success': True,
+            'message': 'Marked as read'
+        })
+    
+    @action(detail=False, methods=['delete'], url_path=r'broadcasts/(?P<broadcast_id>[0-9]+)/dismiss')
+    def dismiss_broadcast(self, request, broadcast_id=None):
+        """
+        Dismiss broadcast notification.
+        
+        DELETE /api/v1/notifications/broadcasts/:id/dismiss/
+        """
+        broadcast = self.get_broadcast_or_404(broadcast_id)
+        NotificationService.dismiss_broadcast(request.user, broadcast.id)
+        if not broadcast.is_read:
+            UnreadCounterService.decrement_broadcasts(request.user.id)
         
         return Response({
             'success': True,
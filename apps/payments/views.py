@@ -6,6 +6,8 @@ from rest_framework import viewsets, permissions, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from django.db.models import Sum
+from django.utils import timezone
+from django.utils.dateparse import parse_date
 from decimal import Decimal
 from .models import Payment, Pledge, TaxReceipt
 from .serializers import (
@@ -15,7 +17,7 @@ from .serializers import (
     TaxReceiptSerializer
 )
 from core.permissions import IsAdminOrReadOnly
-from core.services import ExportService
+from core.services import ExportService, PledgeService
 
 
 class PaymentViewSet(viewsets.ModelViewSet):
@@ -113,6 +115,47 @@ class PledgeViewSet(viewsets.ModelViewSet):
     def get_queryset(self):
         """Filter pledges by current tenant."""
         return Pledge.objects.all().order_by('-created_at')
+    
+    @action(detail=False, methods=['get'])
+    def projection(self, request):
+        """
+        Expected-to-date vs. paid-to-date for all active pledges.
+        
+        GET /api/v1/payments/pledges/projection/?as_of=2025-06-30&months=12
+        """
+        as_of = request.query_params.get('as_of')
+        as_of = parse_date(as_of) if as_of else timezone.now().date()
+        if as_of is None:
+            return Response({
+                'success': False,
+                'error': 'as_of must be a date in YYYY-MM-DD format'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        try:
+            months = min(max(int(request.query_params.get('months', 0)), 0), 120)
+        except ValueError:
+            months = 0
+        
+        pledges = self.filter_queryset(self.get_queryset()).filter(status='active')
+        
+        return Response({
+            'success': True,
+            'projection': PledgeService.projection_summary(pledges, as_of, months)
+        })
+    
+    @action(detail=False, methods=['post'])
+    def recalculate(self, request):
+        """
+        Rebuild amount_paid for all pledges from linked payments.
+        
+        POST /api/v1/payments/pledges/recalculate/
+        """
+        updated = PledgeService.recalculate(self.get_queryset())
+        
+        return Response({
+            'success': True,
+            'message': f'{updated} pledge(s) updated'
+        })
 
 
 class TaxReceiptViewSet(viewsets.ModelViewSet):
@@ -0,0 +1,12 @@
+"""
+Django admin for Reminders app
+"""
+from django.contrib import admin
+from .models import EventReminder
+
+
+@admin.register(EventReminder)
+class EventReminderAdmin(admin.ModelAdmin):
+    list_display = ['schema_name', 'event_id', 'occurrence', 'lead_minutes', 'due_at', 'status', 'recipients']
+    list_filter = ['status', 'schema_name']
+    readonly_fields = ['created_at', 'sent_at']
@@ -0,0 +1,32 @@
+"""
+Management command to rebuild pending event reminders from existing events.
+Usage:
+    python manage.py sync_event_reminders            # All churches
+    python manage.py sync_event_reminders <subdomain>
+"""
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from django_tenants.utils import get_public_schema_name, schema_context
+from apps.churches.models import Church
+from core.services.reminder_service import ReminderService
+
+
+class Command(BaseCommand):
+    help = 'Rebuild pending event reminders for upcoming and recurring events'
+
+    def add_arguments(self, parser):
+        parser.add_argument('subdomain', type=str, nargs='?', help='Church subdomain (default: all churches)')
+
+    def handle(self, *args, **options):
+        from apps.events.models import Event
+        from django.db.models import Q
+
+        churches = Church.objects.exclude(schema_name=get_public_schema_name())
+        if options['subdomain']:
+            churches = churches.filter(subdomain=options['subdomain'])
+
+        for church in churches:
+            with schema_context(church.schema_name):
+                events = Event.objects.filter(Q(date__gte=timezone.now()) | Q(is_recurring=True))
+                scheduled = sum(ReminderService.sync_event(event, church.schema_name) for event in events)
+            self.stdout.write(self.style.SUCCESS(f'✅ {church.name}: {scheduled} reminder(s) scheduled'))
@@ -0,0 +1,61 @@
+# Generated by Django 4.2.11 on 2026-10-19 15:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="EventReminder",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("schema_name", models.CharField(max_length=63)),
+                ("event_id", models.BigIntegerField()),
+                ("occurrence", models.DateTimeField()),
+                ("lead_minutes", models.IntegerField()),
+                ("due_at", models.DateTimeField()),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("pending", "Pending"),
+                            ("sent", "Sent"),
+                            ("expired", "Expired"),
+                        ],
+                        default="pending",
+                        max_length=20,
+                    ),
+                ),
+                ("recipients", models.IntegerField(default=0)),
+                ("sent_at", models.DateTimeField(blank=True, null=True)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "db_table": "event_reminders",
+                "ordering": ["due_at"],
+                "unique_together": {
+                    ("schema_name", "event_id", "occurrence", "lead_minutes")
+                },
+                "indexes": [
+                    models.Index(
+                        condition=models.Q(("status", "pending")),
+                        fields=["due_at"],
+                        name="event_reminder_due_idx",
+                    ),
+                ],
+            },
+        ),
+    ]
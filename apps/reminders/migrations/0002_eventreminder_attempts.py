@@ -0,0 +1,37 @@
+# Generated by Django 4.2.11 on 2026-10-19 16:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("reminders", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="eventreminder",
+            name="attempts",
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="eventreminder",
+            name="last_error",
+            field=models.TextField(blank=True),
+        ),
+        migrations.AlterField(
+            model_name="eventreminder",
+            name="status",
+            field=models.CharField(
+                choices=[
+                    ("pending", "Pending"),
+                    ("sent", "Sent"),
+                    ("expired", "Expired"),
+                    ("failed", "Failed"),
+                ],
+                default="pending",
+                max_length=20,
+            ),
+        ),
+    ]
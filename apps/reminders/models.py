@@ -0,0 +1,56 @@
+"""
+Reminder models.
+Due-time index for event reminders across all tenants.
+"""
+
+from django.db import models
+
+
+class EventReminder(models.Model):
+    """
+    One reminder due for one occurrence of an event.
+    
+    Rows live in the public schema so the scheduler can find due reminders
+    for every church with a single indexed query. ``event_id`` refers to an
+    Event in the tenant schema named by ``schema_name``.
+    """
+    
+    schema_name = models.CharField(max_length=63)
+    event_id = models.BigIntegerField()
+    occurrence = models.DateTimeField()  # Start of the event occurrence
+    lead_minutes = models.IntegerField()  # How long before the occurrence to remind
+    due_at = models.DateTimeField()
+    
+    status = models.CharField(
+        max_length=20,
+        choices=[
+            ('pending', 'Pending'),
+            ('sent', 'Sent'),
+            ('expired', 'Expired'),
+            ('failed', 'Failed'),
+        ],
+        default='pending'
+    )
+    recipients = models.IntegerField(default=0)
+    sent_at = models.DateTimeField(null=True, blank=True)
+    
+    # Failed sends are retried with backoff by moving due_at forward
+    attempts = models.IntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        db_table = 'event_reminders'
+        ordering = ['due_at']
+        unique_together = ['schema_name', 'event_id', 'occurrence', 'lead_minutes']
+        indexes = [
+            models.Index(
+                fields=['due_at'],
+                condition=models.Q(status='pending'),
+                name='event_reminder_due_idx'
+            ),
+        ]
+    
+    def __str__(self):
+        return f"{self.schema_name}:{self.event_id} @ {self.due_at}"
@@ -0,0 +1,28 @@
+"""
+Background reminder tasks.
+"""
+
+from celery import shared_task
+import logging
+
+from core.services.reminder_service import ReminderService
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def send_due_event_reminders():
+    """
+    Scheduler tick: send every event reminder that has fallen due.
+    Work is proportional to the number of due reminders, not events.
+    """
+    processed = 0
+    while True:
+        claimed = ReminderService.send_due()
+        processed += claimed
+        if claimed < ReminderService.batch_size():
+            break
+    
+    if processed:
+        logger.info(f'Processed {processed} event reminder(s)')
+    return {'processed': processed}
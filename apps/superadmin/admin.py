@@ -1,3 +1,13 @@
+"""
+Django admin for Super Admin app
+"""
 from django.contrib import admin
+from .models import TenantMetricSnapshot
 
-# Register your models here.
+
+@admin.register(TenantMetricSnapshot)
+class TenantMetricSnapshotAdmin(admin.ModelAdmin):
+    list_display = ['church', 'members_total', 'members_active', 'giving_30d', 'events_upcoming', 'captured_at']
+    list_filter = ['captured_at']
+    search_fields = ['church__name', 'church__subdomain']
+    raw_id_fields = ['church']
@@ -0,0 +1,63 @@
+# Generated by Django 4.2.11 on 2026-10-19 16:40
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ("churches", "0003_add_subscription_payment_model"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TenantMetricSnapshot",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("members_total", models.IntegerField(default=0)),
+                ("members_active", models.IntegerField(default=0)),
+                ("members_new_30d", models.IntegerField(default=0)),
+                (
+                    "giving_total",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=14),
+                ),
+                (
+                    "giving_30d",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=14),
+                ),
+                ("payments_30d", models.IntegerField(default=0)),
+                ("events_upcoming", models.IntegerField(default=0)),
+                ("users_active", models.IntegerField(default=0)),
+                ("captured_at", models.DateTimeField(db_index=True)),
+                (
+                    "church",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="metric_snapshots",
+                        to="churches.church",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "tenant_metric_snapshots",
+                "ordering": ["-captured_at"],
+                "indexes": [
+                    models.Index(
+                        fields=["church", "-captured_at"],
+                        name="metric_snapshot_church_idx",
+                    )
+                ],
+            },
+        ),
+    ]
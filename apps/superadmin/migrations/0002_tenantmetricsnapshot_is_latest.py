@@ -0,0 +1,38 @@
+# Generated by Django 4.2.11 on 2026-10-19 17:35
+
+from django.db import migrations, models
+
+
+def flag_latest_snapshots(apps, schema_editor):
+    TenantMetricSnapshot = apps.get_model("superadmin", "TenantMetricSnapshot")
+
+    latest = (
+        TenantMetricSnapshot.objects.order_by("church_id", "-captured_at")
+        .distinct("church_id")
+        .values_list("id", flat=True)
+    )
+    TenantMetricSnapshot.objects.filter(id__in=list(latest)).update(is_latest=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("superadmin", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="tenantmetricsnapshot",
+            name="is_latest",
+            field=models.BooleanField(default=False),
+        ),
+        migrations.RunPython(flag_latest_snapshots, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="tenantmetricsnapshot",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("is_latest", True)),
+                fields=("church",),
+                name="metric_snapshot_latest_uniq",
+            ),
+        ),
+    ]
@@ -1,3 +1,58 @@
+"""
+Super admin models.
+Platform-wide metrics collected from every tenant schema.
+"""
+
 from django.db import models
 
-# Create your models here.
+
+class TenantMetricSnapshot(models.Model):
+    """
+    Point-in-time metrics for one church.
+    
+    Rows live in the public schema and are written on a schedule by
+    PlatformMetricsService, so platform dashboards read this table
+    instead of querying every tenant schema.
+    """
+    
+    church = models.ForeignKey(
+        'churches.Church',
+        on_delete=models.CASCADE,
+        related_name='metric_snapshots'
+    )
+    
+    # Members
+    members_total = models.IntegerField(default=0)
+    members_active = models.IntegerField(default=0)
+    members_new_30d = models.IntegerField(default=0)
+    
+    # Giving (completed payments)
+    giving_total = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    giving_30d = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    payments_30d = models.IntegerField(default=0)
+    
+    # Activity
+    events_upcoming = models.IntegerField(default=0)
+    users_active = models.IntegerField(default=0)
+    
+    captured_at = models.DateTimeField(db_index=True)
+    
+    # Newest snapshot for the church; dashboards read only these rows
+    is_latest = models.BooleanField(default=False)
+    
+    class Meta:
+        db_table = 'tenant_metric_snapshots'
+        ordering = ['-captured_at']
+        indexes = [
+            models.Index(fields=['church', '-captured_at'], name='metric_snapshot_church_idx'),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['church'],
+                condition=models.Q(is_latest=True),
+                name='metric_snapshot_latest_uniq'
+            ),
+        ]
+    
+    def __str__(self):
+        return f"{self.church_id} - {self.captured_at}"
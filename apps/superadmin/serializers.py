@@ -0,0 +1,24 @@
+"""
+Super admin serializers.
+"""
+
+from rest_framework import serializers
+from .models import TenantMetricSnapshot
+
+
+class TenantMetricSnapshotSerializer(serializers.ModelSerializer):
+    """Tenant metric snapshot serializer."""
+    
+    church_name = serializers.CharField(source='church.name', read_only=True)
+    subdomain = serializers.CharField(source='church.subdomain', read_only=True)
+    plan = serializers.CharField(source='church.plan', read_only=True)
+    
+    class Meta:
+        model = TenantMetricSnapshot
+        fields = [
+            'church', 'church_name', 'subdomain', 'plan',
+            'members_total', 'members_active', 'members_new_30d',
+            'giving_total', 'giving_30d', 'payments_30d',
+            'events_upcoming', 'users_active', 'captured_at'
+        ]
+        read_only_fields = fields
@@ -0,0 +1,20 @@
+"""
+Background super admin tasks.
+"""
+
+from celery import shared_task
+import logging
+
+from core.services.platform_metrics_service import PlatformMetricsService
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def snapshot_platform_metrics():
+    """
+    Store a metrics snapshot for every church in the public schema.
+    """
+    stored = PlatformMetricsService.snapshot()
+    logger.info(f'Stored platform metrics for {stored} church(es)')
+    return {'churches': stored}
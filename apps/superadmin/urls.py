@@ -3,17 +3,9 @@ Super admin URLs.
 """
 
 from django.urls import path
+from .views import ChurchMetricsHistoryView, PlatformMetricsView
 
 urlpatterns = [
-    # TODO: Add super admin endpoints
-    # - Church management
-    # - User management across all churches
-    # - System monitoring
-    # - Analytics
+    path('metrics/', PlatformMetricsView.as_view(), name='platform-metrics'),
+    path('metrics/<int:church_id>/history/', ChurchMetricsHistoryView.as_view(), name='church-metrics-history'),
 ]
-
-
-
-
-
-
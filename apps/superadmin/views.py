@@ -1,3 +1,69 @@
-from django.shortcuts import render
+"""
+Super admin views.
+"""
 
-# Create your views here.
+from datetime import timedelta
+
+from django.utils import timezone
+from rest_framework import permissions, status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from core.permissions import IsSuperAdmin
+from core.services.platform_metrics_service import PlatformMetricsService
+from .models import TenantMetricSnapshot
+from .serializers import TenantMetricSnapshotSerializer
+
+
+class PlatformMetricsView(APIView):
+    """
+    Platform-wide metrics from the latest snapshot of every church.
+    """
+    permission_classes = [permissions.IsAuthenticated, IsSuperAdmin]
+    
+    def get(self, request):
+        """
+        Get platform totals and per-church metrics.
+        
+        GET /api/v1/superadmin/metrics/
+        """
+        snapshots = list(PlatformMetricsService.latest())
+        snapshots.sort(key=lambda snapshot: snapshot.members_total, reverse=True)
+        
+        return Response({
+            'success': True,
+            'totals': PlatformMetricsService.totals(snapshots),
+            'captured_at': max((s.captured_at for s in snapshots), default=None),
+            'churches': TenantMetricSnapshotSerializer(snapshots, many=True).data
+        })
+
+
+class ChurchMetricsHistoryView(APIView):
+    """
+    Metric snapshots for one church over time.
+    """
+    permission_classes = [permissions.IsAuthenticated, IsSuperAdmin]
+    
+    def get(self, request, church_id):
+        """
+        Get a church's metric history.
+        
+        GET /api/v1/superadmin/metrics/{church_id}/history/?days=30
+        """
+        try:
+            days = int(request.query_params.get('days', 30))
+        except ValueError:
+            return Response({
+                'success': False,
+                'error': 'days must be a number'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        snapshots = TenantMetricSnapshot.objects.filter(
+            church_id=church_id,
+            captured_at__gte=timezone.now() - timedelta(days=days)
+        ).select_related('church').order_by('captured_at')
+        
+        return Response({
+            'success': True,
+            'history': TenantMetricSnapshotSerializer(snapshots, many=True).data
+        })
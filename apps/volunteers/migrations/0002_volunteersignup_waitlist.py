@@ -0,0 +1,41 @@
+# Generated by Django 4.2.11 on 2026-10-19 10:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("volunteers", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="volunteersignup",
+            name="status",
+            field=models.CharField(
+                choices=[
+                    ("pending", "Pending"),
+                    ("approved", "Approved"),
+                    ("rejected", "Rejected"),
+                    ("completed", "Completed"),
+                    ("cancelled", "Cancelled"),
+                    ("waitlisted", "Waitlisted"),
+                ],
+                default="pending",
+                max_length=20,
+            ),
+        ),
+        migrations.AddField(
+            model_name="volunteersignup",
+            name="waitlisted_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name="volunteersignup",
+            index=models.Index(
+                fields=["opportunity", "status", "waitlisted_at"],
+                name="volunteer_signup_waitlist_idx",
+            ),
+        ),
+    ]
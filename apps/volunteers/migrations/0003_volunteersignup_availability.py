@@ -0,0 +1,18 @@
+# Generated by Django 4.2.11 on 2026-10-19 11:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("volunteers", "0002_volunteersignup_waitlist"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="volunteersignup",
+            name="availability",
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
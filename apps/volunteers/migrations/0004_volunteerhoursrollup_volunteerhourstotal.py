@@ -0,0 +1,151 @@
+# Generated by Django 4.2.11 on 2026-10-19 11:48
+
+from decimal import Decimal
+from django.db import migrations, models
+from django.db.models import Count, Q, Sum
+import django.db.models.deletion
+
+
+def backfill_rollups(apps, schema_editor):
+    VolunteerHours = apps.get_model("volunteers", "VolunteerHours")
+    VolunteerHoursRollup = apps.get_model("volunteers", "VolunteerHoursRollup")
+    VolunteerHoursTotal = apps.get_model("volunteers", "VolunteerHoursTotal")
+
+    rollups = []
+    totals = {}
+    rows = (
+        VolunteerHours.objects.values("member_id", "opportunity_id")
+        .annotate(
+            total=Sum("hours"),
+            verified=Sum("hours", filter=Q(verified_by__isnull=False)),
+            count=Count("id"),
+        )
+        .order_by()
+    )
+    for row in rows:
+        verified = row["verified"] or Decimal("0.00")
+        rollups.append(
+            VolunteerHoursRollup(
+                member_id=row["member_id"],
+                opportunity_id=row["opportunity_id"],
+                hours=row["total"],
+                verified_hours=verified,
+                entries=row["count"],
+            )
+        )
+        total = totals.setdefault(
+            row["member_id"], VolunteerHoursTotal(member_id=row["member_id"])
+        )
+        total.hours += row["total"]
+        total.verified_hours += verified
+        total.opportunities += 1
+
+    VolunteerHoursRollup.objects.bulk_create(rollups, batch_size=500)
+    VolunteerHoursTotal.objects.bulk_create(totals.values(), batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("members", "0001_initial"),
+        ("volunteers", "0003_volunteersignup_availability"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="VolunteerHoursTotal",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "hours",
+                    models.DecimalField(
+                        decimal_places=2, default=Decimal("0.00"), max_digits=10
+                    ),
+                ),
+                (
+                    "verified_hours",
+                    models.DecimalField(
+                        decimal_places=2, default=Decimal("0.00"), max_digits=10
+                    ),
+                ),
+                ("opportunities", models.IntegerField(default=0)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "member",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="volunteer_hours_total",
+                        to="members.member",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "volunteer_hours_totals",
+                "indexes": [
+                    models.Index(fields=["-hours"], name="volunteer_total_rank_idx")
+                ],
+            },
+        ),
+        migrations.CreateModel(
+            name="VolunteerHoursRollup",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "hours",
+                    models.DecimalField(
+                        decimal_places=2, default=Decimal("0.00"), max_digits=10
+                    ),
+                ),
+                (
+                    "verified_hours",
+                    models.DecimalField(
+                        decimal_places=2, default=Decimal("0.00"), max_digits=10
+                    ),
+                ),
+                ("entries", models.IntegerField(default=0)),
+                (
+                    "member",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="volunteer_hours_rollups",
+                        to="members.member",
+                    ),
+                ),
+                (
+                    "opportunity",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="hours_rollups",
+                        to="volunteers.volunteeropportunity",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "volunteer_hours_rollups",
+                "indexes": [
+                    models.Index(
+                        fields=["opportunity", "-hours"],
+                        name="volunteer_rollup_rank_idx",
+                    )
+                ],
+                "unique_together": {("member", "opportunity")},
+            },
+        ),
+        migrations.RunPython(backfill_rollups, migrations.RunPython.noop),
+    ]
@@ -141,10 +141,14 @@ class VolunteerSignup(models.Model):
             ('rejected', 'Rejected'),
             ('completed', 'Completed'),
             ('cancelled', 'Cancelled'),
+            ('waitlisted', 'Waitlisted'),
         ],
         default='pending'
     )
     
+    # Waitlist position (oldest first); set while status is waitlisted
+    waitlisted_at = models.DateTimeField(null=True, blank=True)
+    
     # Approval
     approved_by = models.ForeignKey(
         settings.AUTH_USER_MODEL,
@@ -155,6 +159,9 @@ class VolunteerSignup(models.Model):
     )
     approved_at = models.DateTimeField(null=True, blank=True)
     
+    # Rostering: {"weekdays": [0-6, Monday = 0], "blackout_dates": ["YYYY-MM-DD"]}
+    availability = models.JSONField(default=dict, blank=True)
+    
     # Notes
     notes = models.TextField(blank=True)
     admin_notes = models.TextField(blank=True)
@@ -171,6 +178,12 @@ class VolunteerSignup(models.Model):
         db_table = 'volunteer_signups'
         unique_together = ['opportunity', 'member']
         ordering = ['-signup_date']
+        indexes = [
+            models.Index(
+                fields=['opportunity', 'status', 'waitlisted_at'],
+                name='volunteer_signup_waitlist_idx'
+            ),
+        ]
     
     def __str__(self):
         return f"{self.member.full_name} - {self.opportunity.title}"
@@ -226,3 +239,64 @@ class VolunteerHours(models.Model):
     
     def __str__(self):
         return f"{self.member.full_name} - {self.hours} hours on {self.date}"
+
+
+class VolunteerHoursRollup(models.Model):
+    """
+    Hours a member has logged for one opportunity, kept in step with
+    VolunteerHours writes.
+    """
+    
+    member = models.ForeignKey(
+        'members.Member',
+        on_delete=models.CASCADE,
+        related_name='volunteer_hours_rollups'
+    )
+    
+    opportunity = models.ForeignKey(
+        VolunteerOpportunity,
+        on_delete=models.CASCADE,
+        related_name='hours_rollups'
+    )
+    
+    hours = models.DecimalField(max_digits=10, decimal_places=2, default=Decimal('0.00'))
+    verified_hours = models.DecimalField(max_digits=10, decimal_places=2, default=Decimal('0.00'))
+    entries = models.IntegerField(default=0)
+    
+    class Meta:
+        db_table = 'volunteer_hours_rollups'
+        unique_together = ['member', 'opportunity']
+        indexes = [
+            models.Index(fields=['opportunity', '-hours'], name='volunteer_rollup_rank_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.member.full_name} - {self.hours} hours for {self.opportunity.title}"
+
+
+class VolunteerHoursTotal(models.Model):
+    """
+    A member's volunteer hours across all opportunities, used for
+    summaries and the leaderboard.
+    """
+    
+    member = models.OneToOneField(
+        'members.Member',
+        on_delete=models.CASCADE,
+        related_name='volunteer_hours_total'
+    )
+    
+    hours = models.DecimalField(max_digits=10, decimal_places=2, default=Decimal('0.00'))
+    verified_hours = models.DecimalField(max_digits=10, decimal_places=2, default=Decimal('0.00'))
+    opportunities = models.IntegerField(default=0)
+    
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        db_table = 'volunteer_hours_totals'
+        indexes = [
+            models.Index(fields=['-hours'], name='volunteer_total_rank_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.member.full_name} - {self.hours} hours"
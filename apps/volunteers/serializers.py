@@ -2,6 +2,8 @@
 Volunteer serializers.
 """
 
+from datetime import date
+
 from rest_framework import serializers
 from .models import VolunteerOpportunity, VolunteerSignup, VolunteerHours
 
@@ -36,10 +38,24 @@ class VolunteerSignupSerializer(serializers.ModelSerializer):
         model = VolunteerSignup
         fields = [
             'id', 'opportunity', 'opportunity_title', 'member', 'member_name', 'user',
-            'status', 'approved_by', 'approved_at', 'notes', 'admin_notes',
+            'status', 'waitlisted_at', 'availability', 'approved_by', 'approved_at', 'notes', 'admin_notes',
             'hours_completed', 'completed_date', 'feedback', 'signup_date'
         ]
-        read_only_fields = ['id', 'signup_date', 'approved_at']
+        read_only_fields = ['id', 'signup_date', 'approved_at', 'waitlisted_at']
+    
+    def validate_availability(self, value):
+        """Weekdays are 0 (Monday) to 6; blackout dates are YYYY-MM-DD."""
+        if not isinstance(value, dict):
+            raise serializers.ValidationError('Availability must be an object')
+        weekdays = value.get('weekdays', [])
+        if not isinstance(weekdays, list) or any(day not in range(7) for day in weekdays):
+            raise serializers.ValidationError('weekdays must be a list of 0 (Monday) to 6')
+        try:
+            for day in value.get('blackout_dates', []):
+                date.fromisoformat(day)
+        except (TypeError, ValueError):
+            raise serializers.ValidationError('blackout_dates must be YYYY-MM-DD dates')
+        return value
 
 
 class VolunteerHoursSerializer(serializers.ModelSerializer):
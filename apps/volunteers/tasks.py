@@ -0,0 +1,30 @@
+"""
+Background volunteer tasks.
+"""
+
+from celery import shared_task
+from django_tenants.utils import schema_context
+import logging
+
+from apps.notifications.tasks import tenant_churches
+from core.services.volunteer_service import VolunteerService
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def reconcile_volunteer_spots():
+    """
+    Correct spots_filled from signups and fill freed spots from waitlists
+    in every tenant schema.
+    """
+    results = {}
+    
+    for _, schema_name in tenant_churches():
+        with schema_context(schema_name):
+            try:
+                results[schema_name] = VolunteerService.reconcile()
+            except Exception as e:
+                logger.error(f'❌ Volunteer spot reconcile failed in {schema_name}: {e}')
+    
+    return results
@@ -2,10 +2,15 @@
 Volunteer views.
 """
 
+from datetime import date, timedelta
+
 from rest_framework import viewsets, permissions, status
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
-from django.db.models import Sum
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
 from .models import VolunteerOpportunity, VolunteerSignup, VolunteerHours
 from .serializers import (
     VolunteerOpportunitySerializer,
@@ -13,6 +18,10 @@ from .serializers import (
     VolunteerHoursSerializer
 )
 from core.permissions import IsAdminOrReadOnly
+from apps.members.models import Member
+from core.services.roster_service import RosterService
+from core.services.volunteer_hours_service import VolunteerHoursService
+from core.services.volunteer_service import HOLDING_STATUSES, VolunteerService
 
 
 class VolunteerOpportunityViewSet(viewsets.ModelViewSet):
@@ -33,6 +42,55 @@ class VolunteerOpportunityViewSet(viewsets.ModelViewSet):
         """Set created_by to current user."""
         serializer.save(created_by=self.request.user)
     
+    @action(detail=False, methods=['post'])
+    def roster(self, request):
+        """
+        Draft a roster for recurring opportunities. Nothing is saved.
+        
+        POST /api/v1/volunteer-opportunities/roster/
+        Body: { "start": "YYYY-MM-DD", "end": "YYYY-MM-DD", "opportunities": [1, 2],
+                "volunteers_per_slot": 1, "max_shifts_per_month": 4, "min_gap_days": 6 }
+        """
+        today = timezone.localdate()
+        try:
+            start = date.fromisoformat(request.data.get('start') or today.isoformat())
+            end = date.fromisoformat(request.data.get('end') or (start + timedelta(days=90)).isoformat())
+            per_slot = int(request.data.get('volunteers_per_slot', 1))
+            max_per_month = request.data.get('max_shifts_per_month')
+            max_per_month = int(max_per_month) if max_per_month is not None else None
+            min_gap_days = request.data.get('min_gap_days')
+            min_gap_days = int(min_gap_days) if min_gap_days is not None else None
+            opportunity_ids = [int(pk) for pk in request.data.get('opportunities') or []]
+        except (TypeError, ValueError):
+            return Response({
+                'success': False,
+                'error': 'start and end must be YYYY-MM-DD and limits numbers'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        if start > end or (end - start).days > settings.VOLUNTEER_ROSTER_MAX_DAYS:
+            return Response({
+                'success': False,
+                'error': f'Rosters cover at most {settings.VOLUNTEER_ROSTER_MAX_DAYS} days'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        if per_slot < 1 or (max_per_month is not None and max_per_month < 1) or (min_gap_days is not None and min_gap_days < 0):
+            return Response({
+                'success': False,
+                'error': 'Invalid roster limits'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        return Response({
+            'success': True,
+            'roster': RosterService.draft(
+                start,
+                end,
+                opportunity_ids=opportunity_ids,
+                per_slot=per_slot,
+                max_per_month=max_per_month,
+                min_gap_days=min_gap_days
+            )
+        })
+    
     @action(detail=True, methods=['post'])
     def signup(self, request, pk=None):
         """
@@ -42,37 +100,35 @@ class VolunteerOpportunityViewSet(viewsets.ModelViewSet):
         Body: { "member_id": "xxx", "notes": "..." }
         """
         opportunity = self.get_object()
+        member_id = request.data.get('member_id')
+        notes = request.data.get('notes', '')
         
-        # Check if full
-        if opportunity.is_full:
+        if not member_id:
             return Response({
                 'success': False,
-                'error': 'Opportunity is full'
+                'error': 'member_id is required'
             }, status=status.HTTP_400_BAD_REQUEST)
         
-        member_id = request.data.get('member_id')
-        notes = request.data.get('notes', '')
-        
-        # Create signup
-        signup, created = VolunteerSignup.objects.get_or_create(
-            opportunity=opportunity,
-            member_id=member_id,
-            defaults={
-                'user': request.user,
-                'notes': notes,
-                'status': 'pending'
-            }
-        )
-        
-        if not created:
+        # Full opportunities put the volunteer on the waitlist
+        try:
+            signup = VolunteerService.signup(opportunity, member_id, request.user, notes)
+        except ValueError as e:
             return Response({
                 'success': False,
-                'error': 'Already signed up for this opportunity'
+                'error': str(e)
             }, status=status.HTTP_400_BAD_REQUEST)
         
-        # Update spots filled
-        opportunity.spots_filled += 1
-        opportunity.save()
+        if signup.status == 'waitlisted':
+            return Response({
+                'success': True,
+                'message': 'Opportunity is full; added to the waitlist',
+                'waitlist_position': VolunteerSignup.objects.filter(
+                    opportunity=opportunity,
+                    status='waitlisted',
+                    waitlisted_at__lte=signup.waitlisted_at
+                ).count(),
+                'signup': VolunteerSignupSerializer(signup).data
+            })
         
         return Response({
             'success': True,
@@ -92,27 +148,18 @@ class VolunteerOpportunityViewSet(viewsets.ModelViewSet):
         member_id = request.data.get('member_id')
         
         try:
-            signup = VolunteerSignup.objects.get(
-                opportunity=opportunity,
-                member_id=member_id
-            )
-            signup.status = 'cancelled'
-            signup.save()
-            
-            # Update spots filled
-            if opportunity.spots_filled > 0:
-                opportunity.spots_filled -= 1
-                opportunity.save()
-            
-            return Response({
-                'success': True,
-                'message': 'Withdrawn successfully'
-            })
-        except VolunteerSignup.DoesNotExist:
+            promoted = VolunteerService.withdraw(opportunity, member_id)
+        except ValueError as e:
             return Response({
                 'success': False,
-                'error': 'Not signed up for this opportunity'
+                'error': str(e)
             }, status=status.HTTP_404_NOT_FOUND)
+        
+        return Response({
+            'success': True,
+            'message': 'Withdrawn successfully',
+            'promoted': [signup.id for signup in promoted]
+        })
 
 
 class VolunteerSignupViewSet(viewsets.ModelViewSet):
@@ -131,6 +178,37 @@ class VolunteerSignupViewSet(viewsets.ModelViewSet):
             return VolunteerSignup.objects.all()
         # Members see only their signups
         return VolunteerSignup.objects.filter(user=user)
+    
+    def perform_create(self, serializer):
+        """Claim a spot for the new signup, or waitlist it when full."""
+        requested = serializer.validated_data.get('status', 'pending')
+        opportunity = serializer.validated_data['opportunity']
+        with transaction.atomic():
+            if requested in HOLDING_STATUSES and not VolunteerService.claim_spot(opportunity.pk):
+                requested = 'waitlisted'
+            if requested == 'waitlisted':
+                serializer.save(status='waitlisted', waitlisted_at=timezone.now())
+            else:
+                serializer.save()
+    
+    def perform_update(self, serializer):
+        """Keep the opportunity's spots_filled in step with status changes."""
+        with transaction.atomic():
+            signup = VolunteerSignup.objects.select_for_update().get(pk=serializer.instance.pk)
+            previous_status = signup.status
+            signup = serializer.save()
+            try:
+                VolunteerService.status_changed(signup, previous_status)
+            except ValueError as e:
+                raise ValidationError({'status': str(e)})
+    
+    def perform_destroy(self, instance):
+        """Free the signup's spot for the waitlist."""
+        with transaction.atomic():
+            previous_status = instance.status
+            instance.delete()
+            instance.status = 'cancelled'
+            VolunteerService.status_changed(instance, previous_status)
 
 
 class VolunteerHoursViewSet(viewsets.ModelViewSet):
@@ -165,17 +243,60 @@ class VolunteerHoursViewSet(viewsets.ModelViewSet):
                 'summary': {'total_hours': 0, 'opportunities_count': 0}
             })
         
-        hours = VolunteerHours.objects.filter(member=request.user.member_profile)
-        
-        summary = {
-            'total_hours': hours.aggregate(total=Sum('hours'))['total'] or 0,
-            'opportunities_count': hours.values('opportunity').distinct().count(),
-            'verified_hours': hours.filter(verified_by__isnull=False).aggregate(
-                total=Sum('hours')
-            )['total'] or 0,
-        }
+        summary = VolunteerHoursService.summary(request.user.member_profile)
         
         return Response({
             'success': True,
             'summary': summary
         })
+    
+    @action(detail=False, methods=['get'])
+    def leaderboard(self, request):
+        """
+        Volunteers ranked by hours, church-wide or for one opportunity, with
+        the current user's (or, for admins, ?member=) rank and percentile.
+        
+        GET /api/v1/volunteer-hours/leaderboard/?limit=10&opportunity=1
+        """
+        user = request.user
+        try:
+            limit = min(max(int(request.query_params.get('limit', 10)), 1), 100)
+            opportunity = request.query_params.get('opportunity')
+            opportunity = int(opportunity) if opportunity else None
+            member = request.query_params.get('member')
+            member = int(member) if member else None
+        except ValueError:
+            return Response({
+                'success': False,
+                'error': 'limit, opportunity and member must be numbers'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        if member is not None and (user.is_church_admin or user.is_superadmin):
+            member = Member.objects.filter(pk=member).first()
+        else:
+            member = getattr(user, 'member_profile', None)
+        
+        return Response({
+            'success': True,
+            'leaderboard': VolunteerHoursService.leaderboard(limit, opportunity, member)
+        })
+    
+    @action(detail=False, methods=['post'])
+    def recalculate(self, request):
+        """
+        Rebuild hour rollups from all logged hours.
+        
+        POST /api/v1/volunteer-hours/recalculate/
+        """
+        if not (request.user.is_church_admin or request.user.is_superadmin):
+            return Response({
+                'success': False,
+                'error': 'Only church admins can recalculate hours'
+            }, status=status.HTTP_403_FORBIDDEN)
+        
+        updated = VolunteerHoursService.recalculate()
+        
+        return Response({
+            'success': True,
+            'message': f'Hours recalculated for {updated} member(s)'
+        })
@@ -0,0 +1,21 @@
+"""
+Celery configuration for background jobs.
+
+Tasks that touch tenant data receive the tenant's schema_name and run
+inside django_tenants' schema_context, so work is always scoped to the
+church that queued it.
+"""
+
+import os
+
+from celery import Celery
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+
+app = Celery('config')
+
+# Read CELERY_* settings from Django settings
+app.config_from_object('django.conf:settings', namespace='CELERY')
+
+# Discover tasks.py modules in all installed apps
+app.autodiscover_tasks()
@@ -6,6 +6,7 @@ Multi-tenant church management system.
 import os
 from pathlib import Path
 from datetime import timedelta
+from celery.schedules import crontab
 from dotenv import load_dotenv
 
 try:
@@ -34,6 +35,7 @@ TENANT_DOMAIN_MODEL = "churches.Domain"
 # Shared Apps (available to all tenants)
 SHARED_APPS = [
     'django_tenants',  # Must be first
+    'daphne',  # Must precede staticfiles so runserver serves ASGI
     'django.contrib.contenttypes',
     'django.contrib.auth',
     'django.contrib.sessions',
@@ -47,12 +49,16 @@ SHARED_APPS = [
     'corsheaders',
     'drf_spectacular',
     'django_filters',
+    'channels',
     # Note: sslserver removed - not needed in production, incompatible with Python 3.13
     # For local HTTPS dev, use a reverse proxy or plain localhost (no HTTPS needed)
     
     # Shared apps (multi-tenant)
     'apps.churches',
     'apps.authentication',
+    'apps.emails',
+    'apps.reminders',
+    'apps.superadmin',
 ]
 
 # Tenant Apps (isolated per tenant/church)
@@ -74,6 +80,7 @@ TENANT_APPS = [
     'apps.roles',
     'apps.themes',
     'apps.documents',
+    'apps.analytics',
 ]
 
 INSTALLED_APPS = list(SHARED_APPS) + [app for app in TENANT_APPS if app not in SHARED_APPS]
@@ -95,6 +102,7 @@ MIDDLEWARE = [
     'core.middleware.SecurityHeadersMiddleware',
     'core.middleware.TenantIsolationMiddleware',
     'core.middleware.subscription.SubscriptionMiddleware',  # Check subscription/trial status
+    'core.middleware.UsageMeteringMiddleware',  # Count API calls per church
 ]
 
 ROOT_URLCONF = 'config.urls_tenants'  # Use tenant-aware URLs
@@ -117,6 +125,7 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'config.wsgi.application'
+ASGI_APPLICATION = 'config.asgi.application'
 
 # Database (Multi-tenant with PostgreSQL)
 # Using Neon PostgreSQL via DATABASE_URL
@@ -319,6 +328,14 @@ EMAIL_USE_TLS = os.getenv('EMAIL_USE_TLS', 'True') == 'True'
 EMAIL_HOST_USER = os.getenv('EMAIL_HOST_USER', '')
 EMAIL_HOST_PASSWORD = os.getenv('EMAIL_HOST_PASSWORD', '')
 DEFAULT_FROM_EMAIL = os.getenv('DEFAULT_FROM_EMAIL', 'noreply@faithflows.com')
+# Outbound email queue (apps.emails)
+EMAIL_BATCH_SIZE = int(os.getenv('EMAIL_BATCH_SIZE', 50))
+EMAIL_RATE_LIMIT_PER_MINUTE = int(os.getenv('EMAIL_RATE_LIMIT_PER_MINUTE', 120))  # Per church, 0 = unlimited
+EMAIL_MAX_ATTEMPTS = int(os.getenv('EMAIL_MAX_ATTEMPTS', 5))
+EMAIL_RETRY_BACKOFF_SECONDS = int(os.getenv('EMAIL_RETRY_BACKOFF_SECONDS', 60))
+EMAIL_RETRY_BACKOFF_MAX_SECONDS = int(os.getenv('EMAIL_RETRY_BACKOFF_MAX_SECONDS', 3600))
+EMAIL_SENDING_TIMEOUT = int(os.getenv('EMAIL_SENDING_TIMEOUT', 600))  # Reclaim messages stuck in 'sending'
+EMAIL_QUEUE_TIME_LIMIT = int(os.getenv('EMAIL_QUEUE_TIME_LIMIT', 50))  # Seconds per worker run
 
 # Celery Configuration (for async tasks)
 CELERY_BROKER_URL = os.getenv('CELERY_BROKER_URL', 'redis://localhost:6379/1')
@@ -327,32 +344,225 @@ CELERY_ACCEPT_CONTENT = ['json']
 CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TIMEZONE = TIME_ZONE
+# Run tasks inline when no broker is available (local development/tests)
+CELERY_TASK_ALWAYS_EAGER = os.getenv('CELERY_TASK_ALWAYS_EAGER', str(DEBUG)) == 'True'
+CELERY_TASK_EAGER_PROPAGATES = True
+CELERY_TASK_TRACK_STARTED = True
+CELERY_BEAT_SCHEDULE = {
+    'reconcile-unread-counters': {
+        'task': 'apps.notifications.tasks.reconcile_unread_counters',
+        'schedule': int(os.getenv('NOTIFICATION_COUNTER_RECONCILE_SECONDS', 900)),
+    },
+    'send-notification-digests': {
+        'task': 'apps.notifications.tasks.send_notification_digests',
+        'schedule': int(os.getenv('NOTIFICATION_DIGEST_INTERVAL_SECONDS', 900)),
+    },
+    'send-queued-emails': {
+        'task': 'apps.emails.tasks.send_queued_emails',
+        'schedule': int(os.getenv('EMAIL_QUEUE_INTERVAL_SECONDS', 60)),
+    },
+    'refresh-analytics-facts': {
+        'task': 'apps.analytics.tasks.refresh_daily_facts',
+        'schedule': int(os.getenv('ANALYTICS_REFRESH_INTERVAL_SECONDS', 900)),
+    },
+    'refresh-attendance-forecasts': {
+        'task': 'apps.analytics.tasks.refresh_attendance_forecasts',
+        'schedule': crontab(minute=30),
+    },
+    'refit-attendance-forecasts': {
+        'task': 'apps.analytics.tasks.refresh_attendance_forecasts',
+        'schedule': crontab(hour=2, minute=0, day_of_week=1),
+        'kwargs': {'full': True},
+    },
+    'purge-expired-uploads': {
+        'task': 'apps.documents.tasks.purge_expired_uploads',
+        'schedule': crontab(minute=45),
+    },
+    'generate-document-variants': {
+        'task': 'apps.documents.tasks.generate_document_variants',
+        'schedule': int(os.getenv('DOCUMENT_VARIANT_INTERVAL_SECONDS', 300)),
+    },
+    'reconcile-church-usage': {
+        'task': 'apps.churches.tasks.reconcile_usage',
+        'schedule': crontab(hour=1, minute=30),
+    },
+    'reconcile-volunteer-spots': {
+        'task': 'apps.volunteers.tasks.reconcile_volunteer_spots',
+        'schedule': crontab(minute=20),
+    },
+    'reconcile-ministry-counts': {
+        'task': 'apps.ministries.tasks.reconcile_ministry_counts',
+        'schedule': crontab(minute=25),
+    },
+    'purge-expired-reports': {
+        'task': 'apps.analytics.tasks.purge_expired_reports',
+        'schedule': crontab(hour=4, minute=0),
+    },
+    'snapshot-platform-metrics': {
+        'task': 'apps.superadmin.tasks.snapshot_platform_metrics',
+        'schedule': crontab(minute=15),
+    },
+    'send-due-event-reminders': {
+        'task': 'apps.reminders.tasks.send_due_event_reminders',
+        'schedule': int(os.getenv('EVENT_REMINDER_INTERVAL_SECONDS', 60)),
+    },
+    'enforce-notification-retention': {
+        'task': 'apps.notifications.tasks.enforce_notification_retention',
+        'schedule': crontab(hour=3, minute=0),
+    },
+}
 
-# Caching (Redis)
-CACHES = {
-    'default': {
-        # Use local memory cache for development (no Redis needed)
-        # Switch to Redis in production
-        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
-        'LOCATION': 'faithflows-cache',
-        'OPTIONS': {
-            'MAX_ENTRIES': 1000
-        },
-        'TIMEOUT': 300,  # 5 minutes default
+# Cached unread counters are rebuilt from the database when they expire
+NOTIFICATION_COUNTER_TIMEOUT = int(os.getenv('NOTIFICATION_COUNTER_TIMEOUT', 86400))
+# Retention for the monthly-partitioned notifications table
+NOTIFICATION_RETENTION_MONTHS = int(os.getenv('NOTIFICATION_RETENTION_MONTHS', 12))
+NOTIFICATION_ARCHIVE_EXPIRED_PARTITIONS = os.getenv('NOTIFICATION_ARCHIVE_EXPIRED_PARTITIONS', 'False') == 'True'
+NOTIFICATION_PARTITION_MONTHS_AHEAD = int(os.getenv('NOTIFICATION_PARTITION_MONTHS_AHEAD', 3))
+NOTIFICATION_DISMISSED_RETENTION_DAYS = int(os.getenv('NOTIFICATION_DISMISSED_RETENTION_DAYS', 30))
+NOTIFICATION_PURGE_BATCH_SIZE = int(os.getenv('NOTIFICATION_PURGE_BATCH_SIZE', 5000))
+# Dashboard stats cache (also invalidated by writes)
+DASHBOARD_CACHE_TIMEOUT = int(os.getenv('DASHBOARD_CACHE_TIMEOUT', 300))
+DASHBOARD_RECOMPUTE_LOCK_TIMEOUT = int(os.getenv('DASHBOARD_RECOMPUTE_LOCK_TIMEOUT', 30))
+DASHBOARD_RECOMPUTE_WAIT = float(os.getenv('DASHBOARD_RECOMPUTE_WAIT', 2))
+# Time-series analytics (daily facts for recent days are rebuilt periodically)
+ANALYTICS_FACT_REFRESH_DAYS = int(os.getenv('ANALYTICS_FACT_REFRESH_DAYS', 7))
+ANALYTICS_CACHE_TIMEOUT = int(os.getenv('ANALYTICS_CACHE_TIMEOUT', 3600))
+ANALYTICS_MAX_RANGE_DAYS = int(os.getenv('ANALYTICS_MAX_RANGE_DAYS', 3660))
+# Membership cohort retention (members unseen for MEMBER_CHURN_DAYS have churned)
+MEMBER_CHURN_DAYS = int(os.getenv('MEMBER_CHURN_DAYS', 90))
+RETENTION_DEFAULT_MONTHS = int(os.getenv('RETENTION_DEFAULT_MONTHS', 24))
+RETENTION_MAX_MONTHS = int(os.getenv('RETENTION_MAX_MONTHS', 120))
+RETENTION_CACHE_TIMEOUT = int(os.getenv('RETENTION_CACHE_TIMEOUT', 3600))
+# Weekly service attendance forecasts
+ATTENDANCE_SEASON_WEEKS = int(os.getenv('ATTENDANCE_SEASON_WEEKS', 52))
+ATTENDANCE_FORECAST_MIN_WEEKS = int(os.getenv('ATTENDANCE_FORECAST_MIN_WEEKS', 8))
+ATTENDANCE_FORECAST_MAX_WEEKS = int(os.getenv('ATTENDANCE_FORECAST_MAX_WEEKS', 26))
+# Background reports (identical requests reuse an artifact until it expires)
+REPORT_ARTIFACT_TTL_HOURS = int(os.getenv('REPORT_ARTIFACT_TTL_HOURS', 24))
+REPORT_CHUNK_SIZE = int(os.getenv('REPORT_CHUNK_SIZE', 2000))
+REPORT_JOB_TIMEOUT = int(os.getenv('REPORT_JOB_TIMEOUT', 3600))
+# Document uploads (chunks stay below DATA_UPLOAD_MAX_MEMORY_SIZE; the spool
+# directory must be shared by every web node)
+DOCUMENT_MAX_SIZE = int(os.getenv('DOCUMENT_MAX_SIZE', 524288000))  # 500MB
+DOCUMENT_UPLOAD_CHUNK_SIZE = int(os.getenv('DOCUMENT_UPLOAD_CHUNK_SIZE', 4194304))  # 4MB
+DOCUMENT_UPLOAD_EXPIRY_HOURS = int(os.getenv('DOCUMENT_UPLOAD_EXPIRY_HOURS', 24))
+DOCUMENT_UPLOAD_SPOOL_DIR = os.getenv('DOCUMENT_UPLOAD_SPOOL_DIR', str(BASE_DIR / 'media' / 'uploads'))
+# Document downloads: signed links expire after DOCUMENT_LINK_TTL_SECONDS.
+# DOCUMENT_DELIVERY_MODE '' streams through Django; 'x-accel-redirect' (nginx
+# internal location at DOCUMENT_ACCEL_REDIRECT_PREFIX), 'x-sendfile' (local
+# storage only) or 'redirect' (presigned storage URL) offload the bytes
+DOCUMENT_LINK_TTL_SECONDS = int(os.getenv('DOCUMENT_LINK_TTL_SECONDS', 900))
+DOCUMENT_DELIVERY_MODE = os.getenv('DOCUMENT_DELIVERY_MODE', '')
+DOCUMENT_ACCEL_REDIRECT_PREFIX = os.getenv('DOCUMENT_ACCEL_REDIRECT_PREFIX', '/protected-documents/')
+# Content-addressed document storage (S3 when a bucket is configured)
+if os.getenv('AWS_STORAGE_BUCKET_NAME'):
+    DOCUMENT_STORAGE_BACKEND = 'storages.backends.s3.S3Storage'
+    DOCUMENT_STORAGE_OPTIONS = {
+        'bucket_name': os.getenv('AWS_STORAGE_BUCKET_NAME'),
+        'location': os.getenv('DOCUMENT_STORAGE_LOCATION', 'documents'),
+        'default_acl': 'private',
+        'file_overwrite': False,
     }
+else:
+    DOCUMENT_STORAGE_BACKEND = 'django.core.files.storage.FileSystemStorage'
+    DOCUMENT_STORAGE_OPTIONS = {'location': str(MEDIA_ROOT / 'documents')}
+# Photo variants ("name:longest edge in pixels"), rendered one original at a
+# time; batches are capped by count and by bytes of originals read
+DOCUMENT_IMAGE_VARIANTS = [
+    (variant.split(':')[0], int(variant.split(':')[1]))
+    for variant in os.getenv('DOCUMENT_IMAGE_VARIANTS', 'thumb:320,web:1600').split(',')
+]
+DOCUMENT_IMAGE_QUALITY = int(os.getenv('DOCUMENT_IMAGE_QUALITY', 80))
+DOCUMENT_VARIANT_BATCH_SIZE = int(os.getenv('DOCUMENT_VARIANT_BATCH_SIZE', 20))
+DOCUMENT_VARIANT_BATCH_BYTES = int(os.getenv('DOCUMENT_VARIANT_BATCH_BYTES', 104857600))  # 100MB
+# Larger originals are served as-is without being read or decoded
+DOCUMENT_VARIANT_MAX_SOURCE_BYTES = int(os.getenv('DOCUMENT_VARIANT_MAX_SOURCE_BYTES', 52428800))  # 50MB
+DOCUMENT_VARIANT_MAX_PIXELS = int(os.getenv('DOCUMENT_VARIANT_MAX_PIXELS', 60000000))
+DOCUMENT_VARIANT_LOCK_TIMEOUT = int(os.getenv('DOCUMENT_VARIANT_LOCK_TIMEOUT', 600))
+# Usage metering (in-process counters are written every USAGE_FLUSH_SECONDS)
+USAGE_FLUSH_SECONDS = int(os.getenv('USAGE_FLUSH_SECONDS', 30))
+USAGE_CACHE_TIMEOUT = int(os.getenv('USAGE_CACHE_TIMEOUT', 60))
+# Plan quotas (None = unlimited); api_calls and notifications_sent are per month
+GB = 1024 ** 3
+PLAN_LIMITS = {
+    'trial': {'storage_bytes': 1 * GB, 'members': 100, 'api_calls': 100000, 'notifications_sent': 5000},
+    'basic': {'storage_bytes': 5 * GB, 'members': 250, 'api_calls': 500000, 'notifications_sent': 20000},
+    'standard': {'storage_bytes': 25 * GB, 'members': 1000, 'api_calls': 2000000, 'notifications_sent': 100000},
+    'premium': {'storage_bytes': 100 * GB, 'members': 5000, 'api_calls': 10000000, 'notifications_sent': 500000},
+    'enterprise': {'storage_bytes': None, 'members': None, 'api_calls': None, 'notifications_sent': None},
 }
+# Volunteer roster drafts: fairness limits and the longest range drafted at once
+VOLUNTEER_ROSTER_MAX_SHIFTS_PER_MONTH = int(os.getenv('VOLUNTEER_ROSTER_MAX_SHIFTS_PER_MONTH', 4))
+VOLUNTEER_ROSTER_MIN_GAP_DAYS = int(os.getenv('VOLUNTEER_ROSTER_MIN_GAP_DAYS', 6))
+VOLUNTEER_ROSTER_MAX_DAYS = int(os.getenv('VOLUNTEER_ROSTER_MAX_DAYS', 186))
+# Small-group attendance rates cover the trailing GROUP_ATTENDANCE_WEEKS
+GROUP_ATTENDANCE_WEEKS = int(os.getenv('GROUP_ATTENDANCE_WEEKS', 12))
+# Public church lookups by subdomain: server-side entry lifetime and client max-age.
+# Saves invalidate entries through the shared cache; the lifetime bounds how
+# long a write that skips model signals (queryset.update, raw SQL) is served
+PUBLIC_CHURCH_CACHE_TIMEOUT = int(os.getenv('PUBLIC_CHURCH_CACHE_TIMEOUT', 300))
+PUBLIC_CHURCH_MAX_AGE = int(os.getenv('PUBLIC_CHURCH_MAX_AGE', 60))
+# Cross-tenant platform metrics snapshots
+PLATFORM_METRICS_SCHEMAS_PER_QUERY = int(os.getenv('PLATFORM_METRICS_SCHEMAS_PER_QUERY', 50))
+PLATFORM_METRICS_RETENTION_DAYS = int(os.getenv('PLATFORM_METRICS_RETENTION_DAYS', 400))
+# Event reminders (minutes before each occurrence)
+EVENT_REMINDER_LEAD_MINUTES = [
+    int(minutes) for minutes in os.getenv('EVENT_REMINDER_LEAD_MINUTES', '1440,60').split(',')
+]
+EVENT_REMINDER_HORIZON_DAYS = int(os.getenv('EVENT_REMINDER_HORIZON_DAYS', 35))
+EVENT_REMINDER_BATCH_SIZE = int(os.getenv('EVENT_REMINDER_BATCH_SIZE', 200))
+EVENT_REMINDER_MAX_ATTEMPTS = int(os.getenv('EVENT_REMINDER_MAX_ATTEMPTS', 5))
+EVENT_REMINDER_RETRY_BACKOFF_SECONDS = int(os.getenv('EVENT_REMINDER_RETRY_BACKOFF_SECONDS', 60))
+EVENT_REMINDER_RETRY_BACKOFF_MAX_SECONDS = int(os.getenv('EVENT_REMINDER_RETRY_BACKOFF_MAX_SECONDS', 3600))
+# Email digests (frequency used when a user has no email preference for a category)
+NOTIFICATION_DIGEST_DEFAULT_FREQUENCY = os.getenv('NOTIFICATION_DIGEST_DEFAULT_FREQUENCY', 'daily')
+NOTIFICATION_DIGEST_BATCH_SIZE = int(os.getenv('NOTIFICATION_DIGEST_BATCH_SIZE', 100))
+NOTIFICATION_DIGEST_MAX_ITEMS = int(os.getenv('NOTIFICATION_DIGEST_MAX_ITEMS', 20))
+
+# Channels (WebSocket push)
+# In-memory layer for local development/tests; set CHANNEL_REDIS_URL in production
+CHANNEL_REDIS_URL = os.getenv('CHANNEL_REDIS_URL')
+if CHANNEL_REDIS_URL:
+    CHANNEL_LAYERS = {
+        'default': {
+            'BACKEND': 'channels_redis.core.RedisChannelLayer',
+            'CONFIG': {'hosts': [CHANNEL_REDIS_URL]},
+        },
+    }
+else:
+    CHANNEL_LAYERS = {
+        'default': {
+            'BACKEND': 'channels.layers.InMemoryChannelLayer',
+        },
+    }
 
-# For production with Redis, use:
-# CACHES = {
-#     'default': {
-#         'BACKEND': 'django_redis.cache.RedisCache',
-#         'LOCATION': os.getenv('REDIS_URL', 'redis://localhost:6379/0'),
-#         'OPTIONS': {
-#             'CLIENT_CLASS': 'django_redis.client.DefaultClient',
-#         },
-#         'KEY_PREFIX': 'faithflows',
-#     }
-# }
+# Caching (Redis)
+# Counters, version keys and locks must be shared by the web and Celery
+# processes, so production uses Redis; local memory is for development/tests
+CACHE_REDIS_URL = os.getenv('REDIS_URL')
+if CACHE_REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django_redis.cache.RedisCache',
+            'LOCATION': CACHE_REDIS_URL,
+            'OPTIONS': {
+                'CLIENT_CLASS': 'django_redis.client.DefaultClient',
+            },
+            'KEY_PREFIX': 'faithflows',
+            'TIMEOUT': 300,  # 5 minutes default
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'faithflows-cache',
+            'OPTIONS': {
+                'MAX_ENTRIES': 1000
+            },
+            'TIMEOUT': 300,  # 5 minutes default
+        }
+    }
 
 # Session Configuration
 SESSION_ENGINE = 'django.contrib.sessions.backends.cache'
@@ -75,5 +75,8 @@ urlpatterns = [
     path('api/v1/dashboard/', include('apps.analytics.urls')),
     path('api/v1/analytics/', include('apps.analytics.urls_analytics')),
     path('api/v1/reports/', include('apps.analytics.urls_reports')),
+    
+    # Super admin (ROOT_URLCONF serves every request; each view requires IsSuperAdmin)
+    path('api/v1/superadmin/', include('apps.superadmin.urls')),
 ]
 
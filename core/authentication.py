@@ -1,5 +1,5 @@
 from django.conf import settings
-from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.authentication import JWTAuthentication, JWTStatelessUserAuthentication
 
 
 class CookieJWTAuthentication(JWTAuthentication):
@@ -26,3 +26,10 @@ class CookieJWTAuthentication(JWTAuthentication):
         validated_token = self.get_validated_token(raw_token)
         return self.get_user(validated_token), validated_token
 
+
+class CookieJWTStatelessAuthentication(CookieJWTAuthentication, JWTStatelessUserAuthentication):
+    """
+    Cookie/header JWT auth that trusts the token's claims instead of loading
+    the user row. request.user is a TokenUser carrying only the user ID, for
+    hot read-only endpoints that can be answered without the database.
+    """
@@ -2,6 +2,7 @@
 Custom exception handlers for FaithFlow Studio API.
 """
 
+from rest_framework.exceptions import APIException
 from rest_framework.views import exception_handler
 from rest_framework.response import Response
 from rest_framework import status
@@ -64,7 +65,10 @@ class InvalidSubdomain(Exception):
     pass
 
 
-
-
-
-
+class QuotaExceeded(APIException):
+    """
+    Exception raised when an action would exceed the church's plan limits.
+    """
+    status_code = status.HTTP_403_FORBIDDEN
+    default_detail = 'Plan limit reached.'
+    default_code = 'quota_exceeded'
@@ -6,12 +6,14 @@ from .security import SecurityHeadersMiddleware
 from .tenant import TenantIsolationMiddleware
 from .subscription import SubscriptionMiddleware
 from .csrf import DynamicCSRFMiddleware
+from .usage import UsageMeteringMiddleware
 
 __all__ = [
     'SecurityHeadersMiddleware',
     'TenantIsolationMiddleware',
     'SubscriptionMiddleware',
     'DynamicCSRFMiddleware',
+    'UsageMeteringMiddleware',
 ]
 
 
@@ -0,0 +1,29 @@
+"""
+Usage metering middleware for FaithFlow Studio.
+Counts API calls per church.
+"""
+
+from django.db import connection
+from django_tenants.utils import get_public_schema_name
+
+
+class UsageMeteringMiddleware:
+    """
+    Count every tenant API request towards the church's monthly usage.
+    Counting is in-process; see UsageService for how counts are flushed.
+    """
+    
+    def __init__(self, get_response):
+        self.get_response = get_response
+    
+    def __call__(self, request):
+        # Capture the tenant before the view can switch schemas
+        schema_name = connection.schema_name
+        response = self.get_response(request)
+        
+        if request.path.startswith('/api/') and schema_name != get_public_schema_name():
+            from core.services.usage_service import UsageService
+            
+            UsageService.record('api_calls', 1, schema_name)
+        
+        return response
@@ -0,0 +1,105 @@
+"""
+WebSocket authentication and tenant middleware.
+Mirrors CookieJWTAuthentication and TenantHeaderMiddleware for ASGI connections.
+"""
+
+import re
+from http.cookies import SimpleCookie
+from urllib.parse import parse_qs
+
+from channels.db import database_sync_to_async
+from channels.middleware import BaseMiddleware
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+import logging
+
+from core.authentication import CookieJWTAuthentication
+
+logger = logging.getLogger(__name__)
+
+
+class WebSocketJWTAuthMiddleware(BaseMiddleware):
+    """
+    Authenticate WebSocket connections and select the tenant.
+
+    - Token comes from the access token cookie, or an Authorization header
+      for non-browser clients (same sources as CookieJWTAuthentication)
+    - Tenant comes from the ``tenant`` query parameter or the
+      X-Tenant-Subdomain header; browsers cannot set headers on WebSockets
+    - Browser origins must be allowed by the CORS settings, since cookies
+      are sent on cross-site WebSocket handshakes
+    - Users may only connect to their own church
+
+    Sets scope['user'] (AnonymousUser on failure) and scope['tenant'].
+    """
+
+    async def __call__(self, scope, receive, send):
+        headers = {
+            name.decode('latin1').lower(): value.decode('latin1')
+            for name, value in scope.get('headers', [])
+        }
+        query = parse_qs(scope.get('query_string', b'').decode())
+
+        scope = dict(scope)
+        scope['user'] = AnonymousUser()
+        scope['tenant'] = None
+
+        origin = headers.get('origin')
+        if origin and not self.origin_allowed(origin):
+            logger.warning(f'🚫 WebSocket origin rejected: {origin}')
+            return await super().__call__(scope, receive, send)
+
+        raw_token = self.get_raw_token(headers)
+        subdomain = (query.get('tenant', [''])[0] or headers.get('x-tenant-subdomain', '')).strip()
+
+        if raw_token and subdomain:
+            user, church = await self.authenticate(raw_token, subdomain)
+            if user is not None:
+                scope['user'] = user
+                scope['tenant'] = church
+
+        return await super().__call__(scope, receive, send)
+
+    @staticmethod
+    def origin_allowed(origin):
+        """Same allow-list the HTTP API uses for CORS."""
+        if origin in settings.CORS_ALLOWED_ORIGINS:
+            return True
+        return any(re.match(pattern, origin) for pattern in settings.CORS_ALLOWED_ORIGIN_REGEXES)
+
+    @staticmethod
+    def get_raw_token(headers):
+        authorization = headers.get('authorization', '')
+        if authorization.lower().startswith('bearer '):
+            return authorization[7:].strip()
+
+        cookie = SimpleCookie()
+        cookie.load(headers.get('cookie', ''))
+        morsel = cookie.get(settings.ACCESS_TOKEN_COOKIE_NAME)
+        return morsel.value if morsel else None
+
+    @database_sync_to_async
+    def authenticate(self, raw_token, subdomain):
+        """Return (user, church), or (None, None) if either is invalid."""
+        from apps.churches.models import Church
+
+        backend = CookieJWTAuthentication()
+        try:
+            user = backend.get_user(backend.get_validated_token(raw_token))
+        except (InvalidToken, TokenError, AuthenticationFailed):
+            return None, None
+
+        church = Church.objects.filter(subdomain=subdomain, is_active=True).first()
+        if church is None:
+            return None, None
+
+        if not user.is_superadmin and user.church_id != church.id:
+            logger.warning(
+                f'🚫 Security: User {user.id} attempted WebSocket access to tenant {church.id} '
+                f'but belongs to church {user.church_id}'
+            )
+            return None, None
+
+        return user, church
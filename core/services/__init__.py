@@ -2,14 +2,58 @@
 Business logic services.
 """
 
+from .analytics_service import AnalyticsService
+from .church_service import ChurchService
 from .export_service import ExportService
+from .forecast_service import ForecastService
 from .denomination_service import DenominationService
+from .dashboard_service import DashboardService
+from .digest_service import DigestService
+from .document_service import DocumentService
+from .email_service import EmailService
+from .group_attendance_service import GroupAttendanceService
+from .ministry_service import MinistryService
 from .notification_service import NotificationService
+from .notification_retention_service import NotificationRetentionService
+from .photo_variant_service import PhotoVariantService
+from .platform_metrics_service import PlatformMetricsService
+from .pledge_service import PledgeService
+from .push_service import PushService
+from .reminder_service import ReminderService
+from .report_service import ReportService
+from .retention_service import RetentionService
+from .roster_service import RosterService
+from .unread_counter_service import UnreadCounterService
+from .usage_service import UsageService
+from .volunteer_hours_service import VolunteerHoursService
+from .volunteer_service import VolunteerService
 
 __all__ = [
+    'AnalyticsService',
+    'ChurchService',
     'ExportService',
+    'ForecastService',
     'DenominationService',
+    'DashboardService',
+    'DigestService',
+    'DocumentService',
+    'EmailService',
+    'GroupAttendanceService',
+    'MinistryService',
     'NotificationService',
+    'NotificationRetentionService',
+    'PhotoVariantService',
+    'PlatformMetricsService',
+    'PledgeService',
+    'PushService',
+    'ReminderService',
+    'ReportService',
+    'RetentionService',
+    'RosterService',
+    'UnreadCounterService',
+    'UsageService',
+    'VolunteerHoursService',
+    'VolunteerService',
 ]
 
 
@@ -0,0 +1,354 @@
+"""
+Analytics service for time-series charts over precomputed daily facts.
+"""
+
+import hashlib
+import json
+import time
+from datetime import datetime, time as dt_time, timedelta
+
+import numpy as np
+from dateutil.relativedelta import relativedelta
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.db.models import Count, DateField, F, Sum, Value
+from django.db.models.functions import Coalesce, Trunc, TruncDate
+from django.utils import timezone
+import logging
+
+from apps.analytics.models import DailyFact, METRIC_CHOICES, StaleFactDate
+
+logger = logging.getLogger(__name__)
+
+
+METRICS = [metric for metric, _ in METRIC_CHOICES]
+
+# Fields that place a source row on a fact date, first non-empty wins
+FACT_DATE_FIELDS = {
+    'members.Member': ('membership_date', 'created_at'),
+    'payments.Payment': ('date',),
+    'events.Event': ('date',),
+    'events.EventRegistration': ('event__date',),
+    'volunteers.VolunteerHours': ('date',),
+}
+
+GRANULARITY_STEPS = {
+    'day': relativedelta(days=1),
+    'week': relativedelta(weeks=1),
+    'month': relativedelta(months=1),
+    'quarter': relativedelta(months=3),
+    'year': relativedelta(years=1),
+}
+
+
+class AnalyticsService:
+    """
+    Time series for membership growth, giving, event attendance and
+    volunteer hours.
+
+    - Source tables are rolled up into DailyFact rows (one per metric,
+      dimension and day). Source writes mark their days stale (see
+      core.signals) and a periodic task rebuilds those days plus a short
+      trailing window that catches writes made without signals
+    - Charts group the facts with date_trunc, so a multi-year range reads
+      at most a few thousand small rows
+    - Moving averages and year-over-year deltas are computed with NumPy
+    - Results are cached per tenant, range, granularity and window under a
+      generation that every fact rebuild bumps
+    """
+
+    @staticmethod
+    def generation_key(schema_name=None):
+        schema_name = schema_name or connection.schema_name
+        return f'analytics:facts_gen:{schema_name}'
+
+    @staticmethod
+    def generation(schema_name=None):
+        return cache.get_or_set(
+            AnalyticsService.generation_key(schema_name),
+            time.time_ns,
+            timeout=None
+        )
+
+    @staticmethod
+    def day_bounds(start, end):
+        """Aware datetimes covering the local dates [start, end]."""
+        return (
+            timezone.make_aware(datetime.combine(start, dt_time.min)),
+            timezone.make_aware(datetime.combine(end + timedelta(days=1), dt_time.min)),
+        )
+
+    @staticmethod
+    def collect_facts(start, end):
+        """Daily totals from the source tables for the dates [start, end]."""
+        from apps.members.models import Member
+        from apps.events.models import EventRegistration
+        from apps.payments.models import Payment
+        from apps.volunteers.models import VolunteerHours
+
+        range_start, range_end = AnalyticsService.day_bounds(start, end)
+
+        sources = {
+            'new_members': Member.objects.annotate(
+                day=Coalesce('membership_date', TruncDate('created_at'), output_field=DateField())
+            ).filter(day__gte=start, day__lte=end).values('day').annotate(
+                dimension=Value(''),
+                value=Count('id')
+            ),
+            'giving': Payment.objects.filter(
+                status='completed',
+                date__gte=range_start,
+                date__lt=range_end
+            ).values(day=TruncDate('date'), dimension=F('type')).annotate(
+                value=Sum('amount')
+            ),
+            'attendance': EventRegistration.objects.filter(
+                status='attended',
+                event__date__gte=range_start,
+                event__date__lt=range_end
+            ).values(day=TruncDate('event__date'), dimension=F('event__type')).annotate(
+                value=Count('id')
+            ),
+            'volunteer_hours': VolunteerHours.objects.filter(
+                date__gte=start,
+                date__lte=end
+            ).values(day=F('date')).annotate(
+                dimension=Value(''),
+                value=Sum('hours')
+            ),
+        }
+
+        return [
+            DailyFact(
+                date=row['day'],
+                metric=metric,
+                dimension=row['dimension'] or '',
+                value=row['value'] or 0
+            )
+            for metric, rows in sources.items()
+            for row in rows.order_by()
+        ]
+
+    @staticmethod
+    def rebuild_facts(start, end):
+        """
+        Replace the daily facts for the dates [start, end] in the current
+        tenant and invalidate cached series. Returns the number of facts.
+        """
+        facts = AnalyticsService.collect_facts(start, end)
+
+        with transaction.atomic():
+            DailyFact.objects.filter(date__gte=start, date__lte=end).delete()
+            DailyFact.objects.bulk_create(facts, batch_size=1000)
+
+        key = AnalyticsService.generation_key()
+        transaction.on_commit(lambda: cache.set(key, time.time_ns(), None))
+        return len(facts)
+
+    @staticmethod
+    def fact_date(values):
+        """The first non-empty value as a local date."""
+        for value in values:
+            if isinstance(value, datetime):
+                return timezone.localtime(value).date()
+            if value is not None:
+                return value
+        return None
+
+    @staticmethod
+    def previous_fact_date(sender, pk):
+        """Fact date of a source row as currently stored, or None."""
+        row = sender.objects.filter(pk=pk).values_list(*FACT_DATE_FIELDS[sender._meta.label]).first()
+        return AnalyticsService.fact_date(row) if row else None
+
+    @staticmethod
+    def current_fact_date(instance):
+        """Fact date of an in-memory source instance, or None."""
+        values = []
+        for field in FACT_DATE_FIELDS[instance._meta.label]:
+            value = instance
+            for part in field.split('__'):
+                # Missing related rows (e.g. mid-cascade) read as None
+                value = getattr(value, part, None) if value is not None else None
+            values.append(value)
+        return AnalyticsService.fact_date(values)
+
+    @staticmethod
+    def mark_stale(*dates):
+        """Queue days for a fact rebuild. Marking a day twice is a no-op."""
+        dates = {day for day in dates if day is not None}
+        if dates:
+            StaleFactDate.objects.bulk_create(
+                [StaleFactDate(date=day) for day in dates],
+                ignore_conflicts=True
+            )
+
+    @staticmethod
+    def date_runs(dates):
+        """Sorted dates grouped into (first, last) runs of consecutive days."""
+        runs = []
+        for day in sorted(dates):
+            if runs and day - runs[-1][1] == timedelta(days=1):
+                runs[-1][1] = day
+            else:
+                runs.append([day, day])
+        return [tuple(run) for run in runs]
+
+    @staticmethod
+    def refresh(days=None):
+        """
+        Rebuild facts for every day marked stale and for the trailing
+        ``days`` days, including today. Stale marks are claimed with
+        SKIP LOCKED and removed in the same transaction as the rebuild,
+        so a failed rebuild leaves them for the next run. Returns the
+        number of facts written.
+        """
+        days = days or settings.ANALYTICS_FACT_REFRESH_DAYS
+        today = timezone.localdate()
+        recent = {today - timedelta(days=offset) for offset in range(days)}
+
+        facts = 0
+        with transaction.atomic():
+            claimed = list(
+                StaleFactDate.objects.select_for_update(skip_locked=True).values_list('id', 'date')
+            )
+            for start, end in AnalyticsService.date_runs(recent | {day for _, day in claimed}):
+                facts += AnalyticsService.rebuild_facts(start, end)
+            StaleFactDate.objects.filter(id__in=[pk for pk, _ in claimed]).delete()
+        return facts
+
+    @staticmethod
+    def truncate(day, granularity):
+        """Python equivalent of date_trunc for a date."""
+        if granularity == 'week':
+            return day - timedelta(days=day.weekday())
+        if granularity == 'month':
+            return day.replace(day=1)
+        if granularity == 'quarter':
+            return day.replace(month=(day.month - 1) // 3 * 3 + 1, day=1)
+        if granularity == 'year':
+            return day.replace(month=1, day=1)
+        return day
+
+    @staticmethod
+    def periods(start, end, granularity):
+        """Every period start from the one containing ``start`` to ``end``."""
+        step = GRANULARITY_STEPS[granularity]
+        first = AnalyticsService.truncate(start, granularity)
+        found = []
+        n = 0
+        period = first
+        while period <= end:
+            found.append(period)
+            n += 1
+            period = first + step * n
+        return found
+
+    @staticmethod
+    def moving_average(values, window):
+        """Trailing mean over ``window`` periods (shorter at the start)."""
+        if window <= 1:
+            return values.copy()
+        sums = np.convolve(values, np.ones(window), mode='full')[:len(values)]
+        counts = np.minimum(np.arange(1, len(values) + 1), window)
+        return sums / counts
+
+    @staticmethod
+    def as_list(values):
+        """Rounded floats with NaN as None."""
+        rounded = np.round(values.astype(float), 2)
+        return [None if np.isnan(v) else v for v in rounded.tolist()]
+
+    @staticmethod
+    def series(start, end, granularity='month', metrics=None, window=3):
+        """
+        Time series for the current tenant between the dates ``start`` and
+        ``end``. Year-over-year values need the previous year, so facts are
+        read from a year before ``start``.
+        """
+        metrics = metrics or METRICS
+        history_start = AnalyticsService.truncate(start - relativedelta(years=1), granularity)
+        periods = AnalyticsService.periods(history_start, end, granularity)
+        index = {period: i for i, period in enumerate(periods)}
+        first_shown = index[AnalyticsService.truncate(start, granularity)]
+
+        # Position of the same period one year earlier, or -1
+        prior = np.array([
+            index.get(AnalyticsService.truncate(period - relativedelta(years=1), granularity), -1)
+            for period in periods
+        ])
+        has_prior = prior >= 0
+
+        rows = DailyFact.objects.filter(
+            metric__in=metrics,
+            date__gte=history_start,
+            date__lte=end
+        ).annotate(
+            period=Trunc('date', granularity, output_field=DateField())
+        ).values('metric', 'dimension', 'period').annotate(value=Sum('value')).order_by()
+
+        totals = {metric: np.zeros(len(periods)) for metric in metrics}
+        by_dimension = {metric: {} for metric in metrics}
+        for row in rows:
+            i = index.get(row['period'])
+            if i is None:
+                continue
+            value = float(row['value'])
+            totals[row['metric']][i] += value
+            if row['dimension']:
+                dimension = by_dimension[row['metric']].setdefault(row['dimension'], np.zeros(len(periods)))
+                dimension[i] += value
+
+        result = {}
+        for metric in metrics:
+            values = totals[metric]
+            previous = np.where(has_prior, values[np.maximum(prior, 0)], np.nan)
+            change = values - previous
+            with np.errstate(divide='ignore', invalid='ignore'):
+                percent = np.where(previous > 0, change / previous * 100, np.nan)
+
+            shown = slice(first_shown, None)
+            data = {
+                'values': AnalyticsService.as_list(values[shown]),
+                'moving_average': AnalyticsService.as_list(
+                    AnalyticsService.moving_average(values, window)[shown]
+                ),
+                'yoy_change': AnalyticsService.as_list(change[shown]),
+                'yoy_percent': AnalyticsService.as_list(percent[shown]),
+            }
+            if by_dimension[metric]:
+                data['by'] = {
+                    dimension: AnalyticsService.as_list(dimension_values[shown])
+                    for dimension, dimension_values in sorted(by_dimension[metric].items())
+                }
+            if metric == 'new_members':
+                baseline = DailyFact.objects.filter(
+                    metric='new_members',
+                    date__lt=history_start
+                ).aggregate(total=Sum('value'))['total'] or 0
+                data['total'] = AnalyticsService.as_list((float(baseline) + np.cumsum(values))[shown])
+            result[metric] = data
+
+        return {
+            'start': start.isoformat(),
+            'end': end.isoformat(),
+            'granularity': granularity,
+            'window': window,
+            'periods': [period.isoformat() for period in periods[first_shown:]],
+            'series': result,
+        }
+
+    @staticmethod
+    def get_series(start, end, granularity='month', metrics=None, window=3):
+        """Cached ``series`` for the current tenant."""
+        metrics = sorted(metrics or METRICS)
+        params = json.dumps([start.isoformat(), end.isoformat(), granularity, metrics, window])
+        digest = hashlib.md5(params.encode()).hexdigest()
+        key = f'analytics:series:{connection.schema_name}:{AnalyticsService.generation()}:{digest}'
+
+        data = cache.get(key)
+        if data is None:
+            data = AnalyticsService.series(start, end, granularity, metrics, window)
+            cache.set(key, data, settings.ANALYTICS_CACHE_TIMEOUT)
+        return data
@@ -0,0 +1,86 @@
+"""
+Church service for cached public subdomain resolution.
+"""
+
+import hashlib
+import re
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+
+from apps.churches.models import Church
+from apps.churches.serializers import ChurchDetailSerializer
+
+
+# Anything else cannot be a subdomain and is never looked up or cached
+SUBDOMAIN_PATTERN = re.compile(r'^[A-Za-z0-9-]{1,63}$')
+
+
+class ChurchService:
+    """
+    Public church lookups by subdomain.
+
+    - The rendered JSON body is cached under a per-subdomain version that
+      Church and Domain writes bump after commit (see core.signals), so a
+      save never races an invalidation and stale entries simply age out.
+      Versions live in the shared cache (Redis, see CACHES), so a save in
+      a Celery worker invalidates the entry for every web process; writes
+      that skip signals are served for at most PUBLIC_CHURCH_CACHE_TIMEOUT
+    - The ETag is a hash of those exact bytes, so clients and CDNs can
+      revalidate with If-None-Match and get a 304 without a body
+    - Unknown subdomains are cached too, as None, until a church claims it
+    """
+
+    @staticmethod
+    def version_key(subdomain):
+        return f'churches:public_version:{subdomain}'
+
+    @staticmethod
+    def entry_key(subdomain, version):
+        return f'churches:public:{subdomain}:{version}'
+
+    @staticmethod
+    def version(subdomain):
+        return cache.get_or_set(ChurchService.version_key(subdomain), time.time_ns, timeout=None)
+
+    @staticmethod
+    def invalidate(*subdomains):
+        """Start a new version for each subdomain once the transaction commits."""
+        keys = [ChurchService.version_key(subdomain) for subdomain in set(subdomains) if subdomain]
+
+        def bump():
+            version = time.time_ns()
+            cache.set_many({key: version for key in keys}, None)
+
+        if keys:
+            transaction.on_commit(bump)
+
+    @staticmethod
+    def render(subdomain):
+        """(body, etag) for an active church, or None."""
+        church = Church.objects.filter(subdomain=subdomain, is_active=True).prefetch_related('domains').first()
+        if church is None:
+            return None
+        body = JSONRenderer().render({
+            'success': True,
+            'church': ChurchDetailSerializer(church).data,
+        })
+        return body, f'"{hashlib.sha256(body).hexdigest()}"'
+
+    @staticmethod
+    def public_church(subdomain):
+        """Cached (body, etag) for ``subdomain``, or None when there is no active church."""
+        if not SUBDOMAIN_PATTERN.match(subdomain):
+            return None
+        key = ChurchService.entry_key(subdomain, ChurchService.version(subdomain))
+        entry = cache.get(key)
+        if entry is None:
+            rendered = ChurchService.render(subdomain)
+            entry = {'body': rendered[0], 'etag': rendered[1]} if rendered else {'body': None}
+            cache.set(key, entry, settings.PUBLIC_CHURCH_CACHE_TIMEOUT)
+        if entry['body'] is None:
+            return None
+        return entry['body'], entry['etag']
@@ -0,0 +1,135 @@
+"""
+Dashboard service for cached tenant overview statistics.
+"""
+
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.db.models import Count, Q, Sum
+from django.utils import timezone
+
+
+class DashboardService:
+    """
+    Tenant dashboard statistics.
+
+    - One conditional-aggregation query per table, over plain date ranges
+      so the date indexes are used
+    - Results are cached per tenant under a generation number that writes
+      bump (see core.signals), so a stats write never races an invalidation
+    - Only one request recomputes a missing entry; the others wait briefly
+      for it instead of all hitting the database at once
+    """
+
+    @staticmethod
+    def generation_key(schema_name=None):
+        schema_name = schema_name or connection.schema_name
+        return f'dashboard:stats_gen:{schema_name}'
+
+    @staticmethod
+    def stats_key(generation, schema_name=None):
+        schema_name = schema_name or connection.schema_name
+        return f'dashboard:stats:{schema_name}:{generation}'
+
+    @staticmethod
+    def generation(schema_name=None):
+        return cache.get_or_set(
+            DashboardService.generation_key(schema_name),
+            time.time_ns,
+            timeout=None
+        )
+
+    @staticmethod
+    def invalidate(schema_name=None):
+        """Start a new generation once the current transaction commits."""
+        key = DashboardService.generation_key(schema_name)
+        transaction.on_commit(lambda: cache.set(key, time.time_ns(), None))
+
+    @staticmethod
+    def month_bounds(now):
+        """Start of the current local month and of the next one."""
+        start = timezone.localtime(now).replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+        if start.month == 12:
+            end = start.replace(year=start.year + 1, month=1)
+        else:
+            end = start.replace(month=start.month + 1)
+        return start, end
+
+    @staticmethod
+    def compute(now=None):
+        """Dashboard stats for the current tenant straight from the database."""
+        from apps.members.models import Member
+        from apps.events.models import Event
+        from apps.payments.models import Payment
+        from apps.ministries.models import Ministry
+
+        now = now or timezone.now()
+        month_start, month_end = DashboardService.month_bounds(now)
+        this_month = Q(date__gte=month_start, date__lt=month_end)
+
+        member_stats = Member.objects.aggregate(
+            total=Count('id'),
+            active=Count('id', filter=Q(status='active')),
+            new_this_month=Count('id', filter=Q(created_at__gte=now - timedelta(days=30)))
+        )
+
+        event_stats = Event.objects.aggregate(
+            total=Count('id'),
+            upcoming=Count('id', filter=Q(date__gte=now)),
+            this_month=Count('id', filter=this_month)
+        )
+
+        payments = Payment.objects.filter(status='completed').aggregate(
+            total_count=Count('id'),
+            total_amount=Sum('amount'),
+            this_month_amount=Sum('amount', filter=this_month),
+            this_month_count=Count('id', filter=this_month)
+        )
+        payment_stats = {
+            'total_count': payments['total_count'],
+            'total_amount': payments['total_amount'] or 0,
+            'this_month_amount': payments['this_month_amount'] or 0,
+            'this_month_count': payments['this_month_count']
+        }
+
+        ministry_stats = {
+            'total': Ministry.objects.filter(is_active=True).count()
+        }
+
+        return {
+            'members': member_stats,
+            'events': event_stats,
+            'payments': payment_stats,
+            'ministries': ministry_stats
+        }
+
+    @staticmethod
+    def get_stats():
+        """Cached dashboard stats for the current tenant."""
+        key = DashboardService.stats_key(DashboardService.generation())
+        stats = cache.get(key)
+        if stats is not None:
+            return stats
+
+        lock_key = f'{key}:lock'
+        lock_timeout = settings.DASHBOARD_RECOMPUTE_LOCK_TIMEOUT
+        locked = cache.add(lock_key, 1, lock_timeout)
+        if not locked:
+            # Another request is recomputing; wait for its result
+            deadline = time.monotonic() + settings.DASHBOARD_RECOMPUTE_WAIT
+            while time.monotonic() < deadline:
+                time.sleep(0.05)
+                stats = cache.get(key)
+                if stats is not None:
+                    return stats
+
+        try:
+            stats = DashboardService.compute()
+            cache.set(key, stats, settings.DASHBOARD_CACHE_TIMEOUT)
+        finally:
+            if locked:
+                cache.delete(lock_key)
+        return stats
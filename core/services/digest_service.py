@@ -0,0 +1,272 @@
+"""
+Digest service for batching notification emails per user.
+"""
+
+from datetime import timedelta
+from zoneinfo import ZoneInfo
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db import connection
+from django.db.models import Max, Q
+from django.template.loader import render_to_string
+from django.utils import timezone
+import logging
+
+from apps.authentication.models import User
+from apps.notifications.models import (
+    BroadcastNotification,
+    BroadcastReceipt,
+    NotificationDigest,
+    NotificationPreference,
+)
+from core.services.notification_service import AUDIENCE_ROLES, NotificationService
+
+logger = logging.getLogger(__name__)
+
+
+# How often each digest frequency is sent. Immediate digests go out on
+# every scheduler tick.
+FREQUENCY_PERIODS = {
+    'immediate': timedelta(0),
+    'daily': timedelta(days=1),
+    'weekly': timedelta(days=7),
+}
+
+# Tolerance so a daily digest is not pushed back a whole tick by jitter
+SCHEDULE_SLACK = timedelta(minutes=5)
+
+
+class DigestService:
+    """
+    Sends one email per user summarising pending notifications, honouring
+    each user's email NotificationPreference (category, frequency, quiet hours).
+
+    - Preferences are read once per tenant per run into a lookup, so
+      changes apply from the next run
+    - Pending notifications for every user are read in one query, and the
+      last digest per user/frequency in one grouped query
+    - All digests go out over a single mail connection in batches
+    """
+
+    @staticmethod
+    def compile_preferences():
+        """
+        Email preferences as {user_id: {category: rule}}, where rule is
+        (frequency, quiet_hours_start, quiet_hours_end) or None if disabled.
+        """
+        compiled = {}
+        preferences = NotificationPreference.objects.filter(channel='email').values(
+            'user_id', 'category', 'enabled', 'frequency', 'quiet_hours_start', 'quiet_hours_end'
+        )
+        for pref in preferences:
+            rule = None
+            if pref['enabled']:
+                rule = (pref['frequency'], pref['quiet_hours_start'], pref['quiet_hours_end'])
+            compiled.setdefault(pref['user_id'], {})[pref['category']] = rule
+        return compiled
+
+    @staticmethod
+    def resolve(rules, category):
+        """Rule for a category: exact match, then 'all', then the default frequency."""
+        if category in rules:
+            return rules[category]
+        if 'all' in rules:
+            return rules['all']
+        return (settings.NOTIFICATION_DIGEST_DEFAULT_FREQUENCY, None, None)
+
+    @staticmethod
+    def in_quiet_hours(local_time, start, end):
+        """Whether a local time falls in [start, end), which may wrap midnight."""
+        if start is None or end is None or start == end:
+            return False
+        if start < end:
+            return start <= local_time < end
+        return local_time >= start or local_time < end
+
+    @staticmethod
+    def local_time(church, now):
+        tz_name = (church.communication_settings or {}).get('timezone') or settings.TIME_ZONE
+        try:
+            return now.astimezone(ZoneInfo(tz_name)).time()
+        except (KeyError, ValueError):
+            return now.astimezone(ZoneInfo(settings.TIME_ZONE)).time()
+
+    @staticmethod
+    def windows(now):
+        """
+        Start of the collection window per (user_id, frequency) for digests
+        that are due now, based on the last sent digest.
+        Returns (windows, default_starts) where default_starts apply to users
+        who have never received a digest of that frequency.
+        """
+        lookback = max(FREQUENCY_PERIODS.values()) + SCHEDULE_SLACK
+        last_sent = NotificationDigest.objects.filter(
+            status='sent',
+            period_end__gte=now - lookback
+        ).values('user_id', 'frequency').annotate(last=Max('period_end'))
+
+        windows = {}
+        for row in last_sent:
+            period = FREQUENCY_PERIODS[row['frequency']]
+            if now - row['last'] >= period - SCHEDULE_SLACK:
+                windows[(row['user_id'], row['frequency'])] = row['last']
+            else:
+                windows[(row['user_id'], row['frequency'])] = None  # not due yet
+
+        default_starts = {
+            frequency: now - max(period, timedelta(days=1))
+            for frequency, period in FREQUENCY_PERIODS.items()
+        }
+        return windows, default_starts
+
+    @staticmethod
+    def collect(church, now):
+        """
+        Pending digest items per user as {user_id: {'user': row, 'items': [...],
+        'frequencies': {frequency: (period_start, count)}}}.
+        Users whose due items fall in quiet hours are left out so their
+        window is not advanced.
+        """
+        rules_by_user = DigestService.compile_preferences()
+        windows, default_starts = DigestService.windows(now)
+        earliest = min(default_starts.values())
+        local_time = DigestService.local_time(church, now)
+
+        users = {
+            row['id']: row for row in User.objects.filter(
+                church_id=church.id, is_active=True
+            ).exclude(email='').values('id', 'email', 'name', 'role', 'created_at')
+        }
+
+        digests = {}
+        quiet_users = set()
+
+        def add(user_id, category, item):
+            user = users.get(user_id)
+            if user is None or item['created_at'] < user['created_at']:
+                return
+            rule = DigestService.resolve(rules_by_user.get(user_id, {}), category)
+            if rule is None:
+                return
+            frequency, quiet_start, quiet_end = rule
+
+            key = (user_id, frequency)
+            start = windows[key] if key in windows else default_starts[frequency]
+            if start is None or item['created_at'] < start:
+                return
+            if DigestService.in_quiet_hours(local_time, quiet_start, quiet_end):
+                quiet_users.add(user_id)
+
+            digest = digests.setdefault(user_id, {'user': user, 'items': [], 'frequencies': {}})
+            digest['items'].append(item)
+            _, count = digest['frequencies'].get(frequency, (start, 0))
+            digest['frequencies'][frequency] = (start, count + 1)
+
+        # Personal notifications for every user in one query
+        personal = NotificationService.active_notifications().filter(
+            is_read=False,
+            created_at__gte=earliest,
+            created_at__lt=now,
+        ).order_by('user_id', '-created_at').values(
+            'user_id', 'type', 'category', 'title', 'message', 'priority', 'created_at'
+        )
+        for row in personal.iterator(chunk_size=2000):
+            add(row['user_id'], row['category'] or row['type'], row)
+
+        # Broadcasts, minus ones each user has already read or dismissed
+        broadcasts = list(BroadcastNotification.objects.filter(
+            created_at__gte=earliest,
+            created_at__lt=now,
+        ).filter(
+            Q(expires_at__isnull=True) | Q(expires_at__gt=now)
+        ).order_by('-created_at').values(
+            'id', 'audience', 'type', 'title', 'message', 'priority', 'created_at'
+        ))
+        seen = set(BroadcastReceipt.objects.filter(
+            broadcast_id__in=[b['id'] for b in broadcasts]
+        ).values_list('broadcast_id', 'user_id'))
+
+        for broadcast in broadcasts:
+            roles = AUDIENCE_ROLES[broadcast['audience']]
+            for user_id, user in users.items():
+                if roles is not None and user['role'] not in roles:
+                    continue
+                if (broadcast['id'], user_id) in seen:
+                    continue
+                add(user_id, broadcast['type'], broadcast)
+
+        for user_id in quiet_users:
+            digests.pop(user_id, None)
+
+        return digests
+
+    @staticmethod
+    def render(church, digest):
+        """Build the digest email for one user."""
+        user = digest['user']
+        items = sorted(digest['items'], key=lambda item: item['created_at'], reverse=True)
+        max_items = settings.NOTIFICATION_DIGEST_MAX_ITEMS
+        context = {
+            'church': church,
+            'user': user,
+            'items': items[:max_items],
+            'total': len(items),
+            'remaining': max(len(items) - max_items, 0),
+        }
+
+        message = EmailMultiAlternatives(
+            subject=f"{church.name}: {len(items)} new notification{'s' if len(items) != 1 else ''}",
+            body=render_to_string('notifications/digest_email.txt', context),
+            from_email=settings.DEFAULT_FROM_EMAIL,
+            to=[user['email']],
+        )
+        message.attach_alternative(render_to_string('notifications/digest_email.html', context), 'text/html')
+        return message
+
+    @staticmethod
+    def send_digests(church, now=None):
+        """
+        Collect, render and send every due digest for the current tenant.
+        Returns counts of sent and failed digests.
+        """
+        now = now or timezone.now()
+        digests = list(DigestService.collect(church, now).values())
+        batch_size = settings.NOTIFICATION_DIGEST_BATCH_SIZE
+        sent = failed = 0
+
+        if not digests:
+            return {'sent': 0, 'failed': 0}
+
+        mail_connection = get_connection()
+        mail_connection.open()
+        try:
+            for start in range(0, len(digests), batch_size):
+                batch = digests[start:start + batch_size]
+                messages = [DigestService.render(church, digest) for digest in batch]
+
+                status = 'sent'
+                try:
+                    mail_connection.send_messages(messages)
+                    sent += len(batch)
+                except Exception as e:
+                    logger.error(f'❌ Error sending notification digests in {connection.schema_name}: {e}')
+                    status = 'failed'
+                    failed += len(batch)
+
+                NotificationDigest.objects.bulk_create([
+                    NotificationDigest(
+                        user_id=digest['user']['id'],
+                        frequency=frequency,
+                        period_start=period_start,
+                        period_end=now,
+                        notification_count=count,
+                        status=status,
+                    )
+                    for digest in batch
+                    for frequency, (period_start, count) in digest['frequencies'].items()
+                ])
+        finally:
+            mail_connection.close()
+
+        return {'sent': sent, 'failed': failed}
@@ -0,0 +1,324 @@
+"""
+Document service for chunked uploads and content-addressed storage.
+"""
+
+import hashlib
+import mimetypes
+import os
+import re
+from datetime import timedelta
+from functools import lru_cache
+
+from django.conf import settings
+from django.core import signing
+from django.core.files import File
+from django.db import connection, transaction
+from django.utils import timezone
+from django.utils.module_loading import import_string
+import logging
+
+from apps.documents.models import Document, DocumentUpload
+from core.services.usage_service import UsageService
+
+logger = logging.getLogger(__name__)
+
+
+# Bytes read from request streams and files at a time
+READ_SIZE = 64 * 1024
+
+# Leading bytes of common document formats
+MAGIC_NUMBERS = [
+    (b'%PDF-', 'application/pdf'),
+    (b'\x89PNG\r\n\x1a\n', 'image/png'),
+    (b'\xff\xd8\xff', 'image/jpeg'),
+    (b'GIF87a', 'image/gif'),
+    (b'GIF89a', 'image/gif'),
+    (b'RIFF', 'image/webp'),
+    (b'\xd0\xcf\x11\xe0', 'application/msword'),
+]
+
+# Single byte range: bytes=start-end, bytes=start- or bytes=-suffix
+RANGE_PATTERN = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+DOWNLOAD_SALT = 'documents.download'
+
+
+class UploadOffsetConflict(ValueError):
+    """A chunk did not start at the upload's current offset."""
+
+    def __init__(self, offset):
+        super().__init__(f'Chunk must start at offset {offset}')
+        self.offset = offset
+
+
+@lru_cache(maxsize=None)
+def document_storage():
+    """Storage for document blobs (DOCUMENT_STORAGE_BACKEND)."""
+    return import_string(settings.DOCUMENT_STORAGE_BACKEND)(**settings.DOCUMENT_STORAGE_OPTIONS)
+
+
+class DocumentService:
+    """
+    Document uploads.
+
+    - Large files are sent in chunks of at most DOCUMENT_UPLOAD_CHUNK_SIZE
+      bytes; each chunk names its offset, is streamed straight to a spool
+      file and a broken upload resumes from ``received_bytes``
+    - Finished files are hashed with SHA-256 and stored once per tenant
+      under ``{schema}/sha256/{hash}``; a second upload of the same content
+      only adds a Document row pointing at the existing blob
+    - Blobs are deleted along with the last Document referencing them
+    - Downloads use signed links that expire after DOCUMENT_LINK_TTL_SECONDS
+      and name the tenant, document and user they were issued to
+    """
+
+    @staticmethod
+    def spool_path(upload):
+        return os.path.join(settings.DOCUMENT_UPLOAD_SPOOL_DIR, f'{connection.schema_name}_{upload.pk}.part')
+
+    @staticmethod
+    def blob_path(content_hash):
+        return f'{connection.schema_name}/sha256/{content_hash[:2]}/{content_hash[2:4]}/{content_hash}'
+
+    @staticmethod
+    def expiry():
+        return timezone.now() + timedelta(hours=settings.DOCUMENT_UPLOAD_EXPIRY_HOURS)
+
+    @staticmethod
+    def start(user, file_name, total_size, **fields):
+        """Create an upload session and its empty spool file."""
+        if total_size <= 0:
+            raise ValueError('total_size must be positive')
+        if total_size > settings.DOCUMENT_MAX_SIZE:
+            raise ValueError(f'Documents are limited to {settings.DOCUMENT_MAX_SIZE} bytes')
+        UsageService.check('storage_bytes', total_size)
+
+        upload = DocumentUpload.objects.create(
+            file_name=file_name,
+            total_size=total_size,
+            uploaded_by=user,
+            expires_at=DocumentService.expiry(),
+            **fields
+        )
+        os.makedirs(settings.DOCUMENT_UPLOAD_SPOOL_DIR, exist_ok=True)
+        open(DocumentService.spool_path(upload), 'wb').close()
+        return upload
+
+    @staticmethod
+    def append(upload, stream, offset):
+        """
+        Append a chunk read from ``stream`` at ``offset``.
+        The row is locked so concurrent chunks for one upload are serialized.
+        """
+        with transaction.atomic():
+            upload = DocumentUpload.objects.select_for_update().get(pk=upload.pk)
+            if upload.status != 'uploading':
+                raise ValueError(f'Upload is {upload.status}')
+            if offset != upload.received_bytes:
+                raise UploadOffsetConflict(upload.received_bytes)
+
+            limit = min(settings.DOCUMENT_UPLOAD_CHUNK_SIZE, upload.total_size - offset)
+            written = 0
+            with open(DocumentService.spool_path(upload), 'r+b') as spool:
+                # Drop bytes past the offset left by an interrupted chunk
+                spool.seek(offset)
+                spool.truncate()
+                while stream is not None:
+                    data = stream.read(READ_SIZE)
+                    if not data:
+                        break
+                    written += len(data)
+                    if written > limit:
+                        spool.truncate(offset)
+                        raise ValueError(f'Chunk exceeds {limit} bytes')
+                    spool.write(data)
+
+            upload.received_bytes = offset + written
+            upload.expires_at = DocumentService.expiry()
+            upload.save(update_fields=['received_bytes', 'expires_at', 'updated_at'])
+        return upload
+
+    @staticmethod
+    def complete(upload, sha256=None):
+        """Store a fully received upload; returns the Document."""
+        with transaction.atomic():
+            upload = DocumentUpload.objects.select_for_update().get(pk=upload.pk)
+            if upload.status == 'completed':
+                return upload.document
+            if upload.status != 'uploading':
+                raise ValueError(f'Upload is {upload.status}')
+            if upload.received_bytes != upload.total_size:
+                raise ValueError(f'Received {upload.received_bytes} of {upload.total_size} bytes')
+
+            path = DocumentService.spool_path(upload)
+            with open(path, 'rb') as spool:
+                document = DocumentService.store(
+                    spool,
+                    file_name=upload.file_name,
+                    uploaded_by=upload.uploaded_by,
+                    member=upload.member,
+                    category=upload.category,
+                    is_public=upload.is_public,
+                    mime_type=upload.mime_type,
+                    sha256=sha256,
+                )
+
+            upload.status = 'completed'
+            upload.document = document
+            upload.save(update_fields=['status', 'document', 'updated_at'])
+
+        DocumentService.remove_spool(path)
+        return document
+
+    @staticmethod
+    def abort(upload):
+        if upload.status != 'uploading':
+            return
+        upload.status = 'aborted'
+        upload.save(update_fields=['status', 'updated_at'])
+        DocumentService.remove_spool(DocumentService.spool_path(upload))
+
+    @staticmethod
+    def remove_spool(path):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+    @staticmethod
+    def hash_file(file):
+        """SHA-256 hex digest and size of a file, read in pieces."""
+        digest = hashlib.sha256()
+        size = 0
+        file.seek(0)
+        for data in iter(lambda: file.read(READ_SIZE), b''):
+            digest.update(data)
+            size += len(data)
+        file.seek(0)
+        return digest.hexdigest(), size
+
+    @staticmethod
+    def sniff_mime_type(file, file_name, declared=''):
+        """MIME type from the leading bytes, else the declared type or file name."""
+        head = file.read(16)
+        file.seek(0)
+        for magic, mime_type in MAGIC_NUMBERS:
+            if head.startswith(magic):
+                if mime_type == 'image/webp' and head[8:12] != b'WEBP':
+                    continue
+                return mime_type
+        return declared or mimetypes.guess_type(file_name)[0] or 'application/octet-stream'
+
+    @staticmethod
+    def store(file, file_name, uploaded_by, sha256=None, mime_type='', **fields):
+        """
+        Save ``file`` under its content hash unless the tenant already has it
+        and create a Document. ``sha256``, when given, must match the content.
+        """
+        content_hash, size = DocumentService.hash_file(file)
+        if size > settings.DOCUMENT_MAX_SIZE:
+            raise ValueError(f'Documents are limited to {settings.DOCUMENT_MAX_SIZE} bytes')
+        UsageService.check('storage_bytes', size)
+        if sha256 and sha256.lower() != content_hash:
+            raise ValueError('Content does not match the sha256 checksum')
+
+        storage = document_storage()
+        path = DocumentService.blob_path(content_hash)
+        if not storage.exists(path):
+            path = storage.save(path, File(file, name=file_name))
+
+        return Document.objects.create(
+            file_name=file_name,
+            file_path=path,
+            file_size=size,
+            content_hash=content_hash,
+            mime_type=DocumentService.sniff_mime_type(file, file_name, mime_type),
+            uploaded_by=uploaded_by,
+            **fields
+        )
+
+    @staticmethod
+    def release(document):
+        """
+        Delete a document's blob once no other document references it.
+        Returns whether the blob is gone.
+        """
+        if not document.content_hash:
+            return False
+        if Document.objects.filter(file_path=document.file_path).exclude(pk=document.pk).exists():
+            return False
+        try:
+            document_storage().delete(document.file_path)
+        except Exception as e:
+            logger.warning(f'⚠️ Could not delete document blob {document.file_path}: {e}')
+        return True
+
+    @staticmethod
+    def purge_expired():
+        """Delete expired upload sessions and their spool files. Returns the count."""
+        expired = list(DocumentUpload.objects.filter(expires_at__lt=timezone.now()))
+        for upload in expired:
+            DocumentService.remove_spool(DocumentService.spool_path(upload))
+        DocumentUpload.objects.filter(pk__in=[upload.pk for upload in expired]).delete()
+        return len(expired)
+
+    @staticmethod
+    def sign_download(document, user):
+        """Token for a download link issued to ``user``."""
+        return signing.dumps(
+            {'schema': connection.schema_name, 'document': document.pk, 'user': user.pk},
+            salt=DOWNLOAD_SALT
+        )
+
+    @staticmethod
+    def read_download_token(token):
+        """
+        (schema_name, document_id, user_id) from a download token. Links are
+        opened without the tenant header, so the token names the schema.
+        Raises signing.BadSignature (or SignatureExpired) when invalid.
+        """
+        data = signing.loads(token, salt=DOWNLOAD_SALT, max_age=settings.DOCUMENT_LINK_TTL_SECONDS)
+        return data['schema'], data['document'], data['user']
+
+    @staticmethod
+    def etag(document):
+        """Strong ETag; content-addressed blobs never change under a hash."""
+        return f'"{document.content_hash}"' if document.content_hash else None
+
+    @staticmethod
+    def parse_range(header, size):
+        """
+        (start, end) inclusive for a single-range Range header, None to send
+        the whole file (no header, multiple ranges or unknown units).
+        Raises ValueError when the range cannot be satisfied.
+        """
+        match = RANGE_PATTERN.match(header.strip()) if header else None
+        if not match:
+            return None
+        first, last = match.groups()
+        if not first and not last:
+            return None
+        if not first:
+            suffix = int(last)
+            if suffix == 0:
+                raise ValueError('Empty suffix range')
+            return max(size - suffix, 0), size - 1
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+        if start >= size or end < start:
+            raise ValueError('Range not satisfiable')
+        return start, end
+
+    @staticmethod
+    def iter_range(file, start, length):
+        """Yield ``length`` bytes of ``file`` from ``start``, then close it."""
+        try:
+            file.seek(start)
+            while length > 0:
+                data = file.read(min(READ_SIZE, length))
+                if not data:
+                    break
+                length -= len(data)
+                yield data
+        finally:
+            file.close()
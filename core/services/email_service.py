@@ -0,0 +1,267 @@
+"""
+Email service for queued, batched outbound delivery.
+"""
+
+import random
+import time
+from datetime import timedelta
+from email.utils import formataddr
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db import transaction
+from django.db.models import Q
+from django.template import TemplateDoesNotExist
+from django.template.loader import select_template
+from django.utils import timezone
+import logging
+
+from apps.emails.models import EmailDelivery
+
+logger = logging.getLogger(__name__)
+
+
+class EmailService:
+    """
+    Outbound email goes through the EmailDelivery queue:
+
+    - Request threads only insert a row; a Celery worker sends it
+    - Templates are rendered at send time, preferring a church's own
+      ``emails/<subdomain>/<name>`` override over the default
+    - Workers claim batches with SKIP LOCKED and send them over one reused
+      mail connection
+    - Each church is limited to EMAIL_RATE_LIMIT_PER_MINUTE messages;
+      over-limit messages are deferred, not failed
+    - Failures are retried with exponential backoff up to EMAIL_MAX_ATTEMPTS
+    """
+
+    @staticmethod
+    def enqueue(template, to_email, context=None, church=None):
+        """
+        Queue an email and wake a worker after the transaction commits.
+        ``context`` must be JSON serialisable.
+        """
+        delivery = EmailDelivery.objects.create(
+            church=church,
+            template=template,
+            context=context or {},
+            to_email=to_email,
+            next_attempt_at=timezone.now()
+        )
+        transaction.on_commit(EmailService.wake_worker)
+        return delivery
+
+    @staticmethod
+    def wake_worker():
+        from apps.emails.tasks import send_queued_emails
+
+        try:
+            send_queued_emails.delay()
+        except Exception as e:
+            # The periodic task will pick the message up
+            logger.error(f'❌ Could not dispatch email worker: {e}')
+
+    @staticmethod
+    def template_names(church, template, suffix):
+        names = []
+        if church is not None:
+            names.append(f'emails/{church.subdomain}/{template}.{suffix}')
+        names.append(f'emails/{template}.{suffix}')
+        return names
+
+    @staticmethod
+    def render(delivery):
+        """Build the message for a delivery using the church's templates."""
+        church = delivery.church
+        context = {
+            **delivery.context,
+            'church': church,
+            'branding': church.branding_settings if church else {},
+            'frontend_url': settings.FRONTEND_URL,
+        }
+
+        def render_part(suffix):
+            names = EmailService.template_names(church, delivery.template, suffix)
+            return select_template(names).render(context)
+
+        subject = ' '.join(render_part('subject.txt').split())
+        message = EmailMultiAlternatives(
+            subject=subject,
+            body=render_part('txt'),
+            from_email=formataddr((church.name, settings.DEFAULT_FROM_EMAIL)) if church else settings.DEFAULT_FROM_EMAIL,
+            to=[delivery.to_email],
+        )
+        try:
+            message.attach_alternative(render_part('html'), 'text/html')
+        except TemplateDoesNotExist:
+            pass
+        return message
+
+    @staticmethod
+    def claim(limit):
+        """
+        Lock and mark a batch of due deliveries as sending.
+        Deliveries stuck in 'sending' (crashed worker) are reclaimed.
+        """
+        now = timezone.now()
+        stale = now - timedelta(seconds=settings.EMAIL_SENDING_TIMEOUT)
+
+        with transaction.atomic():
+            batch = list(
+                EmailDelivery.objects.select_for_update(skip_locked=True, of=('self',))
+                .filter(
+                    Q(status='queued', next_attempt_at__lte=now) |
+                    Q(status='sending', updated_at__lt=stale)
+                )
+                .select_related('church')
+                .order_by('next_attempt_at')[:limit]
+            )
+            EmailDelivery.objects.filter(pk__in=[d.pk for d in batch]).update(
+                status='sending',
+                updated_at=now
+            )
+        return batch
+
+    @staticmethod
+    def take_rate_slot(church_id):
+        """Count one message against the church's per-minute limit."""
+        limit = settings.EMAIL_RATE_LIMIT_PER_MINUTE
+        if not limit or church_id is None:
+            return True
+
+        key = f'emails:rate:{church_id}:{int(time.time() // 60)}'
+        cache.add(key, 0, 120)
+        try:
+            count = cache.incr(key)
+        except ValueError:
+            cache.set(key, 1, 120)
+            count = 1
+        return count <= limit
+
+    @staticmethod
+    def backoff(attempts):
+        """Delay before the next attempt: exponential with jitter, capped."""
+        delay = min(
+            settings.EMAIL_RETRY_BACKOFF_SECONDS * 2 ** (attempts - 1),
+            settings.EMAIL_RETRY_BACKOFF_MAX_SECONDS
+        )
+        return timedelta(seconds=delay * random.uniform(1.0, 1.1))
+
+    @staticmethod
+    def send_batch(batch, mail_connection):
+        """Send claimed deliveries over an open connection; returns per-status counts."""
+        now = timezone.now()
+        next_minute = now.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        counts = {'sent': 0, 'retrying': 0, 'failed': 0, 'deferred': 0}
+
+        for delivery in batch:
+            if not EmailService.take_rate_slot(delivery.church_id):
+                delivery.status = 'queued'
+                delivery.next_attempt_at = next_minute
+                counts['deferred'] += 1
+                continue
+
+            try:
+                mail_connection.send_messages([EmailService.render(delivery)])
+                delivery.status = 'sent'
+                delivery.sent_at = timezone.now()
+                delivery.attempts += 1
+                delivery.last_error = ''
+                counts['sent'] += 1
+            except Exception as e:
+                delivery.attempts += 1
+                delivery.last_error = str(e)[:1000]
+                if delivery.attempts >= settings.EMAIL_MAX_ATTEMPTS:
+                    delivery.status = 'failed'
+                    counts['failed'] += 1
+                else:
+                    delivery.status = 'queued'
+                    delivery.next_attempt_at = timezone.now() + EmailService.backoff(delivery.attempts)
+                    counts['retrying'] += 1
+                logger.warning(f'⚠️ Email {delivery.id} to {delivery.to_email} failed: {e}')
+
+                # The connection may be broken; start a fresh one for the rest
+                try:
+                    mail_connection.close()
+                    mail_connection.open()
+                except Exception:
+                    pass
+
+        for delivery in batch:
+            delivery.updated_at = timezone.now()
+        EmailDelivery.objects.bulk_update(
+            batch,
+            ['status', 'attempts', 'next_attempt_at', 'last_error', 'sent_at', 'updated_at']
+        )
+        return counts
+
+    @staticmethod
+    def process_queue(time_limit=None):
+        """
+        Drain due deliveries in batches over one mail connection.
+        The connection is only opened once a first batch has been claimed,
+        so an empty queue costs one query and no SMTP session.
+        Returns counts plus elapsed time and throughput.
+        """
+        if time_limit is None:
+            time_limit = settings.EMAIL_QUEUE_TIME_LIMIT
+        batch_size = settings.EMAIL_BATCH_SIZE
+
+        started = time.monotonic()
+        totals = {'sent': 0, 'retrying': 0, 'failed': 0, 'deferred': 0}
+
+        batch = EmailService.claim(batch_size)
+        if batch:
+            mail_connection = get_connection()
+            try:
+                mail_connection.open()
+            except Exception:
+                # Hand the batch straight back rather than waiting for the sending timeout
+                EmailDelivery.objects.filter(pk__in=[d.pk for d in batch]).update(
+                    status='queued',
+                    updated_at=timezone.now()
+                )
+                raise
+            try:
+                while batch:
+                    counts = EmailService.send_batch(batch, mail_connection)
+                    for key, value in counts.items():
+                        totals[key] += value
+                    if time.monotonic() - started >= time_limit:
+                        break
+                    batch = EmailService.claim(batch_size)
+            finally:
+                mail_connection.close()
+
+        elapsed = time.monotonic() - started
+        totals['seconds'] = round(elapsed, 3)
+        totals['per_second'] = round(totals['sent'] / elapsed, 2) if elapsed else 0.0
+        return totals
+
+    @staticmethod
+    def send_password_reset(user, token, expires_hours=24):
+        return EmailService.enqueue(
+            'password_reset',
+            user.email,
+            {
+                'name': user.name,
+                'reset_url': f'{settings.FRONTEND_URL}/reset-password?token={token}',
+                'expires_hours': expires_hours,
+            },
+            church=user.church
+        )
+
+    @staticmethod
+    def send_member_confirmed(user, church, token, expires_hours):
+        return EmailService.enqueue(
+            'member_confirmed',
+            user.email,
+            {
+                'name': user.name,
+                'login_email': user.email,
+                'set_password_url': f'{settings.FRONTEND_URL}/reset-password?token={token}',
+                'expires_hours': expires_hours,
+            },
+            church=church
+        )
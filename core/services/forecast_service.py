@@ -0,0 +1,281 @@
+"""
+Forecast service for weekly service attendance.
+"""
+
+import itertools
+from datetime import datetime, time, timedelta
+
+import numpy as np
+from django.conf import settings
+from django.db.models import Count
+from django.db.models.functions import TruncWeek
+from django.utils import timezone
+import logging
+
+from apps.analytics.models import AttendanceChange, AttendanceForecast
+
+logger = logging.getLogger(__name__)
+
+
+# Smoothing parameters tried when fitting (level, trend, season)
+ALPHAS = [0.1, 0.2, 0.3, 0.5, 0.7]
+BETAS = [0.0, 0.05, 0.1, 0.2]
+GAMMAS = [0.05, 0.1, 0.3]
+
+# Two-sided 80% and 95% normal quantiles
+INTERVAL_Z = {80: 1.2816, 95: 1.96}
+
+
+class ForecastService:
+    """
+    Weekly attendance forecasts per service.
+
+    Attendance is the number of 'attended' registrations for events of
+    type 'service', grouped by event title and week. Each series is fitted
+    with additive Holt-Winters smoothing. A season of
+    ATTENDANCE_SEASON_WEEKS is used once two full seasons exist, otherwise
+    level and trend only. Every parameter combination is run at once as
+    a NumPy array, so a fit costs one pass over the weeks.
+
+    The fitted state is stored. When new weeks complete, only those weeks
+    are run through the recursion. History that changed triggers a refit.
+    """
+
+    @staticmethod
+    def mark_dirty():
+        """
+        Flag the tenant's forecasts for a refresh. The mark is a row written
+        in the caller's transaction, so it is visible to the Celery refresh
+        exactly when the change is.
+        """
+        AttendanceChange.objects.create()
+
+    @staticmethod
+    def current_week():
+        today = timezone.localdate()
+        return today - timedelta(days=today.weekday())
+
+    @staticmethod
+    def weekly_series():
+        """{service: (first_week, counts)} over complete weeks only."""
+        from apps.events.models import EventRegistration
+
+        current_week = ForecastService.current_week()
+        rows = EventRegistration.objects.filter(
+            status='attended',
+            event__type='service',
+            event__date__lt=timezone.make_aware(datetime.combine(current_week, time.min))
+        ).annotate(
+            week=TruncWeek('event__date')
+        ).values('event__title', 'week').annotate(count=Count('id')).order_by()
+
+        weeks_by_service = {}
+        for row in rows:
+            week = row['week'].date() if hasattr(row['week'], 'date') else row['week']
+            weeks_by_service.setdefault(row['event__title'], {})[week] = row['count']
+
+        series = {}
+        for service, counts in weeks_by_service.items():
+            first = min(counts)
+            length = (current_week - first).days // 7
+            values = np.zeros(length)
+            for week, count in counts.items():
+                values[(week - first).days // 7] = count
+            series[service] = (first, values)
+        return series
+
+    @staticmethod
+    def season_length(weeks):
+        season = settings.ATTENDANCE_SEASON_WEEKS
+        return season if weeks >= 2 * season else 0
+
+    @staticmethod
+    def initial_state(values, season):
+        """Level, trend and seasonal offsets from the start of the series."""
+        if season:
+            first, second = values[:season], values[season:2 * season]
+            level = first.mean()
+            trend = (second.mean() - first.mean()) / season
+            seasonal = first - level
+        else:
+            level = values[:min(len(values), 4)].mean()
+            trend = 0.0
+            seasonal = np.zeros(1)
+        return level, trend, seasonal
+
+    @staticmethod
+    def run(values, start, level, trend, seasonal, alpha, beta, gamma, season, warmup=0):
+        """
+        Holt-Winters recursion over ``values`` for P parameter sets at once.
+        level/trend/alpha/beta/gamma have shape (P,), seasonal (P, season).
+        ``start`` is the series index of values[0]. Returns the final state
+        and the sum of squared one-step errors after ``warmup`` steps.
+        """
+        sse = np.zeros_like(level)
+        count = 0
+        for offset, y in enumerate(values):
+            t = start + offset
+            index = t % season if season else 0
+            season_now = seasonal[:, index]
+            error = y - (level + trend + season_now)
+            if offset >= warmup:
+                sse += error ** 2
+                count += 1
+            new_level = alpha * (y - season_now) + (1 - alpha) * (level + trend)
+            trend = beta * (new_level - level) + (1 - beta) * trend
+            if season:
+                seasonal[:, index] = gamma * (y - new_level) + (1 - gamma) * season_now
+            level = new_level
+        return level, trend, seasonal, sse, count
+
+    @staticmethod
+    def fit(values):
+        """Fit the best parameters for a series; returns a state dict."""
+        season = ForecastService.season_length(len(values))
+        grid = np.array(list(itertools.product(ALPHAS, BETAS, GAMMAS if season else [0.0])))
+        alpha, beta, gamma = grid[:, 0], grid[:, 1], grid[:, 2]
+
+        level, trend, seasonal = ForecastService.initial_state(values, season)
+        params = len(grid)
+        level = np.full(params, level)
+        trend = np.full(params, trend)
+        seasonal = np.tile(seasonal, (params, 1))
+
+        level, trend, seasonal, sse, count = ForecastService.run(
+            values, 0, level, trend, seasonal, alpha, beta, gamma, season,
+            warmup=season or min(len(values) - 1, 2)
+        )
+        best = int(np.argmin(sse))
+        return {
+            'alpha': float(alpha[best]),
+            'beta': float(beta[best]),
+            'gamma': float(gamma[best]),
+            'level': float(level[best]),
+            'trend': float(trend[best]),
+            'seasonal': seasonal[best].tolist(),
+            'sse': float(sse[best]),
+            'errors': count,
+            'history': values.tolist(),
+        }
+
+    @staticmethod
+    def update(state, new_values):
+        """Fold newly completed weeks into a fitted state."""
+        season = len(state['seasonal']) if len(state['seasonal']) > 1 else 0
+        level, trend, seasonal, sse, count = ForecastService.run(
+            new_values,
+            len(state['history']),
+            np.array([state['level']]),
+            np.array([state['trend']]),
+            np.array([state['seasonal']], dtype=float),
+            np.array([state['alpha']]),
+            np.array([state['beta']]),
+            np.array([state['gamma']]),
+            season,
+        )
+        return {
+            **state,
+            'level': float(level[0]),
+            'trend': float(trend[0]),
+            'seasonal': seasonal[0].tolist(),
+            'sse': state['sse'] + float(sse[0]),
+            'errors': state['errors'] + count,
+            'history': state['history'] + new_values.tolist(),
+        }
+
+    @staticmethod
+    def predict(state, first_week, horizon):
+        """Point forecasts with 80% and 95% intervals for the next ``horizon`` weeks."""
+        weeks = len(state['history'])
+        season = len(state['seasonal']) if len(state['seasonal']) > 1 else 0
+        steps = np.arange(1, horizon + 1)
+        seasonal = np.array(state['seasonal'])
+        offsets = seasonal[(weeks + steps - 1) % season] if season else np.zeros(horizon)
+        point = np.maximum(state['level'] + steps * state['trend'] + offsets, 0)
+
+        sigma = np.sqrt(state['sse'] / max(state['errors'], 1))
+        # Forecast variance grows with the horizon as level errors accumulate
+        spread = sigma * np.sqrt(1 + (steps - 1) * state['alpha'] ** 2 * (1 + steps * state['beta']))
+
+        predictions = []
+        for i, step in enumerate(steps):
+            prediction = {
+                'week': (first_week + timedelta(weeks=int(weeks + step - 1))).isoformat(),
+                'attendance': round(float(point[i]), 1),
+            }
+            for level, z in INTERVAL_Z.items():
+                prediction[f'lower_{level}'] = round(float(max(point[i] - z * spread[i], 0)), 1)
+                prediction[f'upper_{level}'] = round(float(point[i] + z * spread[i]), 1)
+            predictions.append(prediction)
+        return predictions, float(sigma)
+
+    @staticmethod
+    def refresh(full=False):
+        """
+        Bring every service's forecast up to the last complete week.
+        Returns counts of services refitted and incrementally updated.
+        """
+        horizon = settings.ATTENDANCE_FORECAST_MAX_WEEKS
+        existing = {forecast.service: forecast for forecast in AttendanceForecast.objects.all()}
+        refitted = updated = 0
+        now = timezone.now()
+
+        # Cleared before the series is read; changes not yet committed keep their marks
+        AttendanceChange.objects.all().delete()
+        try:
+            series = ForecastService.weekly_series()
+        except Exception:
+            ForecastService.mark_dirty()
+            raise
+
+        for service, (first_week, values) in series.items():
+            if len(values) < settings.ATTENDANCE_FORECAST_MIN_WEEKS:
+                continue
+
+            forecast = existing.pop(service, None)
+            state = forecast.state if forecast else None
+            known = len(state['history']) if state else 0
+
+            if (
+                full or state is None or forecast.first_week != first_week
+                or known > len(values)
+                or not np.array_equal(np.array(state['history']), values[:known])
+                or ForecastService.season_length(len(values)) != forecast.season_length
+            ):
+                state = ForecastService.fit(values)
+                refitted += 1
+            elif known < len(values):
+                state = ForecastService.update(state, values[known:])
+                updated += 1
+            else:
+                continue
+
+            predictions, sigma = ForecastService.predict(state, first_week, horizon)
+            AttendanceForecast.objects.update_or_create(
+                service=service,
+                defaults={
+                    'first_week': first_week,
+                    'last_week': first_week + timedelta(weeks=len(values) - 1),
+                    'weeks': len(values),
+                    'season_length': ForecastService.season_length(len(values)),
+                    'state': state,
+                    'predictions': predictions,
+                    'residual_std': sigma,
+                    'fitted_at': now,
+                }
+            )
+
+        # Services with no recent attendance data left
+        if existing:
+            AttendanceForecast.objects.filter(service__in=existing).delete()
+
+        return {'refitted': refitted, 'updated': updated}
+
+    @staticmethod
+    def needs_refresh():
+        """Whether attendance changed or a week completed since the last run."""
+        if AttendanceChange.objects.exists():
+            return True
+        last_complete = ForecastService.current_week() - timedelta(weeks=1)
+        latest = AttendanceForecast.objects.order_by('-last_week').values_list('last_week', flat=True).first()
+        return latest is None or latest < last_complete
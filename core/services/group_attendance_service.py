@@ -0,0 +1,190 @@
+"""
+Group attendance service for recording and summarising small-group meetings.
+"""
+
+from bisect import bisect_left
+from collections import Counter
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import BooleanField, Count, ExpressionWrapper, Func, IntegerField, Q, Sum
+from django.utils import timezone
+
+from apps.ministries.models import MinistryMeeting, MinistryMembership
+
+
+class Cardinality(Func):
+    function = 'cardinality'
+    output_field = IntegerField()
+
+
+class GroupAttendanceService:
+    """
+    Small-group attendance.
+
+    - A meeting stores its attendees as one sorted array of member ids
+      and the size of the roster on the meeting date, so a church with
+      hundreds of groups writes one row per meeting, not per attendee
+    - Group rates are SUM(cardinality(attendee_ids)) / SUM(roster_size)
+      over the trailing GROUP_ATTENDANCE_WEEKS, in one grouped query
+    - Member rates only count meetings held since the member joined
+    """
+
+    @staticmethod
+    def window_start(weeks=None):
+        weeks = weeks or settings.GROUP_ATTENDANCE_WEEKS
+        return timezone.localdate() - timedelta(weeks=weeks)
+
+    @staticmethod
+    def rate(present, possible):
+        """Percentage to one decimal place, or None when nothing was possible."""
+        return round(100 * present / possible, 1) if possible else None
+
+    @staticmethod
+    def roster(ministry, date=None):
+        """
+        {member_id: (joined date, name)} for the ministry's active members,
+        or for the members whose membership covered ``date`` when given.
+        """
+        memberships = MinistryMembership.objects.filter(ministry=ministry).select_related('member')
+        if date is None:
+            memberships = memberships.filter(status='active')
+        else:
+            memberships = memberships.filter(
+                Q(status='active') | Q(left_at__date__gte=date),
+                joined_at__date__lte=date
+            )
+        return {
+            membership.member_id: (timezone.localtime(membership.joined_at).date(), membership.member.full_name)
+            for membership in memberships
+        }
+
+    @staticmethod
+    def record(ministry, date, present, user, guest_count=0, notes=''):
+        """
+        Record (or replace) who attended a meeting. ``present`` must only
+        name members on the roster on ``date``; raises ValueError otherwise.
+        """
+        roster = GroupAttendanceService.roster(ministry, date)
+        present = sorted(set(present))
+        unknown = [member_id for member_id in present if member_id not in roster]
+        if unknown:
+            raise ValueError(f"Not on the ministry roster: {', '.join(str(member_id) for member_id in unknown)}")
+
+        meeting, _ = MinistryMeeting.objects.update_or_create(
+            ministry=ministry,
+            date=date,
+            defaults={
+                'attendee_ids': present,
+                'roster_size': len(roster),
+                'guest_count': guest_count,
+                'notes': notes,
+                'recorded_by': user,
+            }
+        )
+        return meeting
+
+    @staticmethod
+    def group_report(ministry, weeks=None):
+        """Meeting history, group rate and per-member rates for one ministry."""
+        meetings = list(
+            MinistryMeeting.objects.filter(
+                ministry=ministry,
+                date__gte=GroupAttendanceService.window_start(weeks)
+            ).order_by('date').values('date', 'attendee_ids', 'roster_size', 'guest_count')
+        )
+        dates = [meeting['date'] for meeting in meetings]
+        present_sets = [set(meeting['attendee_ids']) for meeting in meetings]
+
+        members = []
+        for member_id, (joined, name) in GroupAttendanceService.roster(ministry).items():
+            since_joined = present_sets[bisect_left(dates, joined):]
+            attended = sum(member_id in present for present in since_joined)
+            members.append({
+                'member': member_id,
+                'member_name': name,
+                'attended': attended,
+                'meetings': len(since_joined),
+                'rate': GroupAttendanceService.rate(attended, len(since_joined)),
+            })
+        members.sort(key=lambda row: (-(row['rate'] or 0), row['member_name']))
+
+        present = sum(len(meeting['attendee_ids']) for meeting in meetings)
+        return {
+            'weeks': weeks or settings.GROUP_ATTENDANCE_WEEKS,
+            'meetings': len(meetings),
+            'rate': GroupAttendanceService.rate(present, sum(meeting['roster_size'] for meeting in meetings)),
+            'average_attendance': round(present / len(meetings), 1) if meetings else None,
+            'members': members,
+            'history': [
+                {
+                    'date': meeting['date'],
+                    'present': len(meeting['attendee_ids']),
+                    'roster_size': meeting['roster_size'],
+                    'guests': meeting['guest_count'],
+                }
+                for meeting in reversed(meetings)
+            ],
+        }
+
+    @staticmethod
+    def group_rates(weeks=None):
+        """Attendance rate of every group that met in the window."""
+        rows = MinistryMeeting.objects.filter(
+            date__gte=GroupAttendanceService.window_start(weeks)
+        ).values('ministry', 'ministry__name').annotate(
+            meetings=Count('id'),
+            present=Sum(Cardinality('attendee_ids')),
+            possible=Sum('roster_size')
+        ).order_by('ministry__name')
+
+        return [
+            {
+                'ministry': row['ministry'],
+                'ministry_name': row['ministry__name'],
+                'meetings': row['meetings'],
+                'average_attendance': round(row['present'] / row['meetings'], 1),
+                'rate': GroupAttendanceService.rate(row['present'], row['possible']),
+            }
+            for row in rows
+        ]
+
+    @staticmethod
+    def member_rates(member, weeks=None):
+        """A member's attendance in each group they belong to."""
+        joined = {
+            membership.ministry_id: (timezone.localtime(membership.joined_at).date(), membership.ministry.name)
+            for membership in MinistryMembership.objects.filter(
+                member=member,
+                status='active'
+            ).select_related('ministry')
+        }
+        meetings = MinistryMeeting.objects.filter(
+            ministry_id__in=joined,
+            date__gte=GroupAttendanceService.window_start(weeks)
+        ).annotate(
+            attended=ExpressionWrapper(Q(attendee_ids__contains=[member.id]), output_field=BooleanField())
+        ).values('ministry_id', 'date', 'attended')
+
+        held = Counter()
+        attended = Counter()
+        for meeting in meetings:
+            if meeting['date'] >= joined[meeting['ministry_id']][0]:
+                held[meeting['ministry_id']] += 1
+                attended[meeting['ministry_id']] += meeting['attended']
+
+        groups = [
+            {
+                'ministry': ministry_id,
+                'ministry_name': name,
+                'attended': attended[ministry_id],
+                'meetings': held[ministry_id],
+                'rate': GroupAttendanceService.rate(attended[ministry_id], held[ministry_id]),
+            }
+            for ministry_id, (_, name) in joined.items()
+        ]
+        return {
+            'weeks': weeks or settings.GROUP_ATTENDANCE_WEEKS,
+            'rate': GroupAttendanceService.rate(sum(attended.values()), sum(held.values())),
+            'groups': sorted(groups, key=lambda row: row['ministry_name']),
+        }
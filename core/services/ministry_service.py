@@ -0,0 +1,100 @@
+"""
+Ministry service for membership counts and capacity.
+"""
+
+from django.db import transaction
+from django.db.models import Count, F
+from django.utils import timezone
+import logging
+
+from apps.ministries.models import Ministry, MinistryMembership
+
+logger = logging.getLogger(__name__)
+
+
+class MinistryService:
+    """
+    Service for ministry memberships.
+    Keeps Ministry.member_count equal to the number of active memberships,
+    so ministry lists read a column instead of counting per row, and
+    checks capacity under a lock on the ministry row. The counts are
+    periodically reconciled, correcting changes made outside these paths.
+    """
+
+    @staticmethod
+    def apply_membership_change(previous, membership):
+        """
+        Apply a membership's change to member counts. ``previous`` is a
+        dict with ministry_id/status captured before save (None for new
+        memberships); ``membership`` is None when it was deleted.
+        """
+        old = previous['ministry_id'] if previous and previous['status'] == 'active' else None
+        new = membership.ministry_id if membership is not None and membership.status == 'active' else None
+        if old == new:
+            return
+
+        if old is not None:
+            Ministry.objects.filter(pk=old, member_count__gt=0).update(member_count=F('member_count') - 1)
+        if new is not None:
+            Ministry.objects.filter(pk=new).update(member_count=F('member_count') + 1)
+
+    @staticmethod
+    def join(ministry, member_id, role='member'):
+        """
+        Add (or reactivate) an active membership. Raises ValueError when the
+        ministry is at capacity or the member already belongs to it.
+        """
+        with transaction.atomic():
+            # Concurrent joins wait here, so the capacity check sees every earlier join
+            ministry = Ministry.objects.select_for_update().get(pk=ministry.pk)
+            membership = MinistryMembership.objects.select_for_update().filter(
+                ministry=ministry,
+                member_id=member_id
+            ).first()
+            if membership is not None and membership.status == 'active':
+                raise ValueError('Already a member of this ministry')
+            if ministry.max_capacity and ministry.member_count >= ministry.max_capacity:
+                raise ValueError('Ministry is at capacity')
+
+            if membership is None:
+                return MinistryMembership.objects.create(
+                    ministry=ministry,
+                    member_id=member_id,
+                    status='active',
+                    role=role
+                )
+            # A rejoin starts a new membership period
+            membership.status = 'active'
+            membership.joined_at = timezone.now()
+            membership.save(update_fields=['status', 'joined_at'])
+            return membership
+
+    @staticmethod
+    def reconcile():
+        """
+        Reset member_count to the number of active memberships wherever
+        they differ. Returns the number of ministries corrected.
+        """
+        active = dict(
+            MinistryMembership.objects.filter(status='active')
+            .values('ministry').annotate(count=Count('id')).order_by()
+            .values_list('ministry', 'count')
+        )
+        drifted = [
+            ministry_id
+            for ministry_id, member_count in Ministry.objects.values_list('id', 'member_count')
+            if member_count != active.get(ministry_id, 0)
+        ]
+
+        for ministry_id in drifted:
+            with transaction.atomic():
+                # Count again under the row lock so in-flight joins are included
+                ministry = Ministry.objects.select_for_update().get(pk=ministry_id)
+                actual = MinistryMembership.objects.filter(ministry_id=ministry_id, status='active').count()
+                if ministry.member_count != actual:
+                    logger.warning(
+                        f'⚠️ Ministry {ministry_id} had member_count {ministry.member_count}, expected {actual}'
+                    )
+                    Ministry.objects.filter(pk=ministry_id).update(member_count=actual)
+
+        return len(drifted)
@@ -0,0 +1,158 @@
+"""
+Retention for the partitioned notifications table.
+"""
+
+from datetime import date, timedelta
+
+from django.conf import settings
+from django.db import connection
+from django.utils import timezone
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+PARTITION_PREFIX = 'notifications_p'
+ARCHIVE_PREFIX = 'notifications_archive_'
+
+
+class NotificationRetentionService:
+    """
+    Maintains the monthly partitions of the notifications table in the
+    current tenant schema.
+
+    - Creates partitions ahead of time so inserts never land in the
+      default partition
+    - Drops (or detaches and keeps as archive tables) whole partitions
+      older than the retention window, which is far cheaper than DELETE
+    - Deletes expired and long-dismissed rows in small batches
+    """
+
+    @staticmethod
+    def add_months(month, months):
+        index = month.year * 12 + month.month - 1 + months
+        return date(index // 12, index % 12 + 1, 1)
+
+    @staticmethod
+    def partition_name(month):
+        return f'{PARTITION_PREFIX}{month:%Y%m}'
+
+    @staticmethod
+    def partitions():
+        """Monthly partitions of notifications in the current schema, as {month: name}."""
+        with connection.cursor() as cursor:
+            cursor.execute("""
+                SELECT child.relname
+                FROM pg_inherits
+                JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+                JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+                JOIN pg_namespace ns ON ns.oid = parent.relnamespace
+                WHERE parent.relname = 'notifications' AND ns.nspname = current_schema()
+            """)
+            names = [row[0] for row in cursor.fetchall()]
+
+        partitions = {}
+        for name in names:
+            suffix = name[len(PARTITION_PREFIX):]
+            if name.startswith(PARTITION_PREFIX) and suffix.isdigit() and len(suffix) == 6:
+                partitions[date(int(suffix[:4]), int(suffix[4:]), 1)] = name
+        return partitions
+
+    @staticmethod
+    def ensure_partitions(months_ahead=None):
+        """Create partitions from the current month up to ``months_ahead`` months out."""
+        if months_ahead is None:
+            months_ahead = settings.NOTIFICATION_PARTITION_MONTHS_AHEAD
+
+        existing = NotificationRetentionService.partitions()
+        current = timezone.now().date().replace(day=1)
+        created = []
+
+        with connection.cursor() as cursor:
+            for offset in range(months_ahead + 1):
+                month = NotificationRetentionService.add_months(current, offset)
+                if month in existing:
+                    continue
+                name = NotificationRetentionService.partition_name(month)
+                upper = NotificationRetentionService.add_months(month, 1)
+                cursor.execute(
+                    f'CREATE TABLE IF NOT EXISTS {connection.ops.quote_name(name)} '
+                    f"PARTITION OF notifications FOR VALUES FROM ('{month.isoformat()} 00:00:00+00') "
+                    f"TO ('{upper.isoformat()} 00:00:00+00')"
+                )
+                created.append(name)
+
+        return created
+
+    @staticmethod
+    def expire_partitions(retention_months=None, archive=None):
+        """
+        Remove partitions whose whole month is older than the retention window.
+        With ``archive`` the partition is detached and renamed instead of dropped.
+        """
+        if retention_months is None:
+            retention_months = settings.NOTIFICATION_RETENTION_MONTHS
+        if archive is None:
+            archive = settings.NOTIFICATION_ARCHIVE_EXPIRED_PARTITIONS
+
+        current = timezone.now().date().replace(day=1)
+        cutoff = NotificationRetentionService.add_months(current, -retention_months)
+        removed = []
+
+        with connection.cursor() as cursor:
+            for month, name in sorted(NotificationRetentionService.partitions().items()):
+                if month >= cutoff:
+                    continue
+                quoted = connection.ops.quote_name(name)
+                if archive:
+                    archive_name = connection.ops.quote_name(f'{ARCHIVE_PREFIX}{month:%Y%m}')
+                    cursor.execute(f'ALTER TABLE notifications DETACH PARTITION {quoted}')
+                    cursor.execute(f'ALTER TABLE {quoted} RENAME TO {archive_name}')
+                else:
+                    cursor.execute(f'DROP TABLE {quoted}')
+                removed.append(name)
+
+        return removed
+
+    @staticmethod
+    def purge_expired_rows(batch_size=None, dismissed_days=None):
+        """
+        Delete expired notifications and ones dismissed more than
+        ``dismissed_days`` ago, ``batch_size`` rows per statement so locks
+        and WAL stay small. Returns the number of rows deleted.
+        """
+        if batch_size is None:
+            batch_size = settings.NOTIFICATION_PURGE_BATCH_SIZE
+        if dismissed_days is None:
+            dismissed_days = settings.NOTIFICATION_DISMISSED_RETENTION_DAYS
+
+        now = timezone.now()
+        dismissed_before = now - timedelta(days=dismissed_days)
+        deleted = 0
+
+        with connection.cursor() as cursor:
+            while True:
+                cursor.execute("""
+                    DELETE FROM notifications
+                    WHERE (id, created_at) IN (
+                        SELECT id, created_at FROM notifications
+                        WHERE expires_at < %s OR dismissed_at < %s
+                        LIMIT %s
+                    )
+                """, [now, dismissed_before, batch_size])
+                deleted += cursor.rowcount
+                if cursor.rowcount < batch_size:
+                    break
+
+        return deleted
+
+    @staticmethod
+    def run():
+        """Full retention pass for the current tenant schema."""
+        result = {
+            'created_partitions': NotificationRetentionService.ensure_partitions(),
+            'removed_partitions': NotificationRetentionService.expire_partitions(),
+            'deleted_rows': NotificationRetentionService.purge_expired_rows(),
+        }
+        logger.info(f'Notification retention in {connection.schema_name}: {result}')
+        return result
@@ -2,8 +2,33 @@
 Notification service for creating and managing notifications.
 """
 
-from apps.notifications.models import Notification
-from apps.authentication.models import User
+from django.db import connection, transaction
+from django.db.models import CharField, Exists, F, OuterRef, Q, Value
+from django.utils import timezone
+
+from apps.notifications.models import Notification, BroadcastNotification, BroadcastReceipt
+from core.services.push_service import PushService
+from core.services.unread_counter_service import UnreadCounterService
+from core.services.usage_service import UsageService
+
+
+# Roles that make up each notification audience (None means every role).
+# Audience names match Announcement.target_audience.
+AUDIENCE_ROLES = {
+    'all': None,
+    'members': ['member'],
+    'leaders': ['admin', 'leader'],
+    'admins': ['admin'],
+}
+
+# Audiences a BroadcastNotification can target
+BROADCAST_AUDIENCES = ['all', 'members', 'leaders', 'admins']
+
+# Columns shared by personal and broadcast rows in the merged feed
+FEED_FIELDS = [
+    'item_id', 'item_source', 'item_type', 'item_title', 'item_message',
+    'item_priority', 'item_is_read', 'item_created_at',
+]
 
 
 class NotificationService:
@@ -27,88 +52,226 @@ class NotificationService:
         )
     
     @staticmethod
-    def notify_church(church, title, message, notification_type='system', priority='normal', metadata=None):
+    def record_created(notifications, schema_name=None):
         """
-        Send notification to all members of a church.
+        Bookkeeping for newly inserted personal notifications:
+        bump cached unread counters and push to connected clients.
+        """
+        UnreadCounterService.record_created(notifications, schema_name)
+        PushService.notifications_created(notifications, schema_name)
+        UsageService.record('notifications_sent', len(notifications), schema_name)
+        return notifications
+    
+    @staticmethod
+    def broadcast(audience, title, message, notification_type='system', priority='normal',
+                  metadata=None, created_by=None, expires_at=None):
+        """
+        Store a notification once for a whole audience.
+        Recipients see it through the merged feed; nothing is copied per user.
         """
-        users = User.objects.filter(
-            church=church,
-            role='member',
-            is_active=True
+        if audience not in BROADCAST_AUDIENCES:
+            audience = 'members'
+        
+        broadcast = BroadcastNotification.objects.create(
+            audience=audience,
+            type=notification_type,
+            title=title,
+            message=message,
+            priority=priority,
+            metadata=metadata or {},
+            created_by=created_by,
+            expires_at=expires_at
         )
         
-        notifications = []
-        for user in users:
-            notifications.append(
-                Notification(
-                    user=user,
-                    type=notification_type,
-                    title=title,
-                    message=message,
-                    priority=priority,
-                    metadata=metadata or {}
-                )
-            )
+        # Recount only once the broadcast is visible to other connections
+        schema_name = connection.schema_name
+        transaction.on_commit(lambda: UnreadCounterService.broadcast_published(schema_name))
+        PushService.broadcast_created(broadcast, schema_name)
+        UsageService.record('notifications_sent', 1, schema_name)
         
-        return Notification.objects.bulk_create(notifications)
+        return broadcast
+    
+    @staticmethod
+    def notify_church(church, title, message, notification_type='system', priority='normal', metadata=None):
+        """
+        Send notification to all members of a church.
+        """
+        return NotificationService.broadcast(
+            'members', title, message,
+            notification_type=notification_type,
+            priority=priority,
+            metadata=metadata
+        )
     
     @staticmethod
     def notify_admins(church, title, message, notification_type='system', priority='high', metadata=None):
         """
         Send notification to all admins of a church.
         """
-        admins = User.objects.filter(
-            church=church,
-            role='admin',
-            is_active=True
+        return NotificationService.broadcast(
+            'admins', title, message,
+            notification_type=notification_type,
+            priority=priority,
+            metadata=metadata
         )
-        
-        notifications = []
-        for admin in admins:
-            notifications.append(
-                Notification(
-                    user=admin,
-                    type=notification_type,
-                    title=title,
-                    message=message,
-                    priority=priority,
-                    metadata=metadata or {}
-                )
-            )
-        
-        return Notification.objects.bulk_create(notifications)
     
     @staticmethod
     def notify_event_created(event):
         """Notify members about new event."""
-        users = User.objects.filter(
-            church=event.church,
-            role='member',
-            is_active=True
-        )
-        
-        from django.utils import timezone
         hours_until = (event.date - timezone.now()).total_seconds() / 3600
         priority = 'urgent' if hours_until < 48 else 'normal'
         
-        notifications = []
-        for user in users:
-            notifications.append(
-                Notification(
-                    user=user,
-                    type='event',
-                    title=f"New Event: {event.title}",
-                    message=f"{event.title} - {event.date.strftime('%B %d, %Y at %I:%M %p')} at {event.location}",
-                    priority=priority,
-                    metadata={
-                        'event_id': str(event.id),
-                        'event_title': event.title,
-                        'event_date': event.date.isoformat(),
-                    }
-                )
+        return NotificationService.broadcast(
+            'members',
+            title=f"New Event: {event.title}",
+            message=f"{event.title} has been scheduled for {event.date.strftime('%B %d, %Y at %I:%M %p')} at {event.location}",
+            notification_type='event',
+            priority=priority,
+            metadata={
+                'event_id': str(event.id),
+                'event_title': event.title,
+                'event_date': event.date.isoformat(),
+            },
+            created_by=event.created_by
+        )
+    
+    @staticmethod
+    def notify_announcement_created(announcement):
+        """Notify the announcement's target audience."""
+        content = announcement.content
+        return NotificationService.broadcast(
+            announcement.target_audience,
+            title=f"New Announcement: {announcement.title}",
+            message=content[:200] + '...' if len(content) > 200 else content,
+            notification_type='announcement',
+            priority=announcement.priority,
+            metadata={
+                'announcement_id': str(announcement.id),
+                'announcement_title': announcement.title,
+            },
+            created_by=announcement.created_by,
+            expires_at=announcement.expires_at
+        )
+    
+    @staticmethod
+    def audiences_for(user):
+        """Broadcast audiences that include the given user."""
+        return [
+            audience for audience in BROADCAST_AUDIENCES
+            if AUDIENCE_ROLES[audience] is None or user.role in AUDIENCE_ROLES[audience]
+        ]
+    
+    @staticmethod
+    def visible_broadcasts(user):
+        """
+        Broadcasts a user should see, annotated with is_read.
+        Dismissed and expired broadcasts, and ones sent before the user
+        joined, are excluded.
+        """
+        receipts = BroadcastReceipt.objects.filter(broadcast=OuterRef('pk'), user=user)
+        
+        return BroadcastNotification.objects.filter(
+            audience__in=NotificationService.audiences_for(user),
+            created_at__gte=user.created_at,
+        ).filter(
+            Q(expires_at__isnull=True) | Q(expires_at__gt=timezone.now())
+        ).exclude(
+            Exists(receipts.filter(dismissed_at__isnull=False))
+        ).annotate(
+            is_read=Exists(receipts.filter(read_at__isnull=False))
+        )
+    
+    @staticmethod
+    def active_notifications():
+        """Personal notifications that are neither dismissed nor expired."""
+        return Notification.objects.filter(dismissed_at__isnull=True).filter(
+            Q(expires_at__isnull=True) | Q(expires_at__gt=timezone.now())
+        )
+    
+    @staticmethod
+    def visible_notifications(user):
+        """Active personal notifications for one user (or user ID)."""
+        return NotificationService.active_notifications().filter(user=user)
+    
+    @staticmethod
+    def feed(user, notification_type=None, priority=None, is_read=None):
+        """
+        Personal notifications and visible broadcasts as one queryset.
+        
+        Both sides are filtered before a UNION ALL so each can use its own
+        index; the result is ordered newest first and can be paginated.
+        """
+        personal = NotificationService.visible_notifications(user)
+        broadcasts = NotificationService.visible_broadcasts(user)
+        
+        if notification_type:
+            personal = personal.filter(type=notification_type)
+            broadcasts = broadcasts.filter(type=notification_type)
+        if priority:
+            personal = personal.filter(priority=priority)
+            broadcasts = broadcasts.filter(priority=priority)
+        if is_read is not None:
+            personal = personal.filter(is_read=is_read)
+            broadcasts = broadcasts.filter(is_read=is_read)
+        
+        def feed_columns(queryset, source):
+            return queryset.order_by().annotate(
+                item_id=F('id'),
+                item_source=Value(source, output_field=CharField()),
+                item_type=F('type'),
+                item_title=F('title'),
+                item_message=F('message'),
+                item_priority=F('priority'),
+                item_is_read=F('is_read'),
+                item_created_at=F('created_at'),
+            ).values(*FEED_FIELDS)
+        
+        return feed_columns(personal, 'personal').union(
+            feed_columns(broadcasts, 'broadcast'),
+            all=True
+        ).order_by('-item_created_at')
+    
+    @staticmethod
+    def unread_count(user):
+        """Count unread personal notifications and broadcasts."""
+        personal = NotificationService.visible_notifications(user).filter(is_read=False).count()
+        broadcasts = NotificationService.visible_broadcasts(user).filter(is_read=False).count()
+        return personal + broadcasts
+    
+    @staticmethod
+    def mark_broadcasts_read(user, broadcast_ids=None):
+        """
+        Record read receipts for unread broadcasts (all, or the given IDs).
+        Returns the number of broadcasts marked read.
+        """
+        now = timezone.now()
+        unread = NotificationService.visible_broadcasts(user).filter(is_read=False)
+        if broadcast_ids is not None:
+            unread = unread.filter(id__in=broadcast_ids)
+        unread_ids = list(unread.values_list('id', flat=True))
+        
+        if unread_ids:
+            BroadcastReceipt.objects.filter(
+                user=user,
+                broadcast_id__in=unread_ids,
+                read_at__isnull=True
+            ).update(read_at=now)
+            BroadcastReceipt.objects.bulk_create(
+                [BroadcastReceipt(broadcast_id=pk, user=user, read_at=now) for pk in unread_ids],
+                ignore_conflicts=True
             )
         
-        return Notification.objects.bulk_create(notifications)
+        return len(unread_ids)
+    
+    @staticmethod
+    def dismiss_broadcast(user, broadcast_id):
+        """Hide a broadcast for one user."""
+        now = timezone.now()
+        receipt, _ = BroadcastReceipt.objects.get_or_create(broadcast_id=broadcast_id, user=user)
+        receipt.read_at = receipt.read_at or now
+        receipt.dismissed_at = now
+        receipt.save()
+        return receipt
     
     @staticmethod
     def notify_payment_received(payment):
@@ -131,29 +294,22 @@ class NotificationService:
                 )
             )
         
-        # Notify admins
-        admins = User.objects.filter(
-            church=payment.member.church,
-            role='admin',
-            is_active=True
+        # Broadcast once to admins
+        NotificationService.notify_admins(
+            payment.member.church,
+            title='Payment Received',
+            message=f"{payment.member.full_name} - {payment.type} {payment.currency} {payment.amount}",
+            notification_type='payment',
+            priority='low',
+            metadata={
+                'payment_id': str(payment.id),
+                'member_id': str(payment.member.id),
+            }
         )
         
-        for admin in admins:
-            notifications.append(
-                Notification(
-                    user=admin,
-                    type='payment',
-                    title='Payment Received',
-                    message=f"{payment.member.full_name} - {payment.type} {payment.currency} {payment.amount}",
-                    priority='low',
-                    metadata={
-                        'payment_id': str(payment.id),
-                        'member_id': str(payment.member.id),
-                    }
-                )
-            )
-        
-        return Notification.objects.bulk_create(notifications)
+        created = Notification.objects.bulk_create(notifications)
+        NotificationService.record_created(created)
+        return created
 
 
 
@@ -0,0 +1,245 @@
+"""
+Photo variant service for thumbnails and web-sized renditions.
+"""
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.db import connection, transaction
+import io
+import logging
+
+from apps.documents.models import Document, DocumentVariant
+from core.services.document_service import DocumentService, document_storage
+
+logger = logging.getLogger(__name__)
+
+
+# Formats Pillow can read that are worth resizing
+RESIZABLE_TYPES = {'image/jpeg', 'image/png', 'image/gif', 'image/webp'}
+
+
+def render_variants(source, sizes, quality, max_pixels):
+    """
+    Resize an image file to each {name: longest_edge} that is smaller than
+    the original. Images over ``max_pixels`` are refused from their header,
+    before any pixel data is decoded.
+    Returns [(name, webp_bytes, width, height)].
+    """
+    from PIL import Image, ImageOps
+
+    rendered = []
+    with Image.open(source) as image:
+        width, height = image.size
+        if width * height > max_pixels:
+            raise ValueError(f'{width}x{height} exceeds {max_pixels} pixels')
+
+        # Let the JPEG decoder downscale while decoding
+        image.draft('RGB', (max(sizes.values()),) * 2)
+        image = ImageOps.exif_transpose(image)
+        if image.mode not in ('RGB', 'RGBA'):
+            has_alpha = image.mode in ('LA', 'PA') or 'transparency' in image.info
+            image = image.convert('RGBA' if has_alpha else 'RGB')
+
+        # Largest first so each rendition shrinks the previous one
+        for name, edge in sorted(sizes.items(), key=lambda item: -item[1]):
+            if max(image.size) <= edge:
+                continue
+            image = image.copy()
+            image.thumbnail((edge, edge), Image.LANCZOS)
+            output = io.BytesIO()
+            image.save(output, 'WEBP', quality=quality, method=4)
+            rendered.append((name, output.getvalue(), image.width, image.height))
+    return rendered
+
+
+class PhotoVariantService:
+    """
+    Derivatives for photo documents.
+
+    - Storing a photo marks it ``variant_status='pending'``; the database
+      is the work queue, so a bulk import queues rows rather than tasks
+    - At most one drain task per tenant is queued or running. It claims
+      up to DOCUMENT_VARIANT_BATCH_SIZE distinct content hashes and
+      DOCUMENT_VARIANT_BATCH_BYTES of originals at a time, and renders
+      them one by one straight from storage, so a worker holds at most
+      one original and its renditions in memory
+    - Originals over DOCUMENT_VARIANT_MAX_SOURCE_BYTES or
+      DOCUMENT_VARIANT_MAX_PIXELS are marked failed without being decoded
+      and keep being served as-is
+    - Renditions are keyed by content hash and skipped when they already
+      exist, so re-running a batch is harmless
+    """
+
+    @staticmethod
+    def queued_key(schema_name=None):
+        schema_name = schema_name or connection.schema_name
+        return f'documents:variants_queued:{schema_name}'
+
+    @staticmethod
+    def lock_key(schema_name=None):
+        schema_name = schema_name or connection.schema_name
+        return f'documents:variants_lock:{schema_name}'
+
+    @staticmethod
+    def wants_variants(document):
+        return document.category == 'photo' and document.mime_type in RESIZABLE_TYPES
+
+    @staticmethod
+    def enqueue(document):
+        """Mark a stored photo pending and make sure a drain is queued."""
+        if not PhotoVariantService.wants_variants(document):
+            return
+        if DocumentVariant.objects.filter(content_hash=document.content_hash).exists():
+            document.variant_status = 'ready'
+        else:
+            document.variant_status = 'pending'
+        document.save(update_fields=['variant_status'])
+
+        if document.variant_status == 'pending':
+            schema_name = connection.schema_name
+            transaction.on_commit(lambda: PhotoVariantService.dispatch(schema_name))
+
+    @staticmethod
+    def dispatch(schema_name):
+        """Queue a drain for the tenant unless one is already queued."""
+        from apps.documents.tasks import generate_document_variants
+
+        key = PhotoVariantService.queued_key(schema_name)
+        if not cache.add(key, True, settings.DOCUMENT_VARIANT_LOCK_TIMEOUT):
+            return
+        try:
+            generate_document_variants.delay(schema_name)
+        except Exception as e:
+            cache.delete(key)
+            logger.error(f'❌ Could not dispatch photo variants for {schema_name}: {e}')
+
+    @staticmethod
+    def sizes():
+        return dict(settings.DOCUMENT_IMAGE_VARIANTS)
+
+    @staticmethod
+    def variant_path(content_hash, name):
+        return f'{DocumentService.blob_path(content_hash)}.{name}.webp'
+
+    @staticmethod
+    def claim_batch():
+        """
+        Next pending (content_hash, file_path, file_size) rows, bounded by
+        count and by DOCUMENT_VARIANT_BATCH_BYTES of originals to read.
+        The first row is always taken so one large photo cannot stall the queue.
+        """
+        pending = (
+            Document.objects.filter(variant_status='pending')
+            .order_by('content_hash')
+            .values_list('content_hash', 'file_path', 'file_size')
+            .distinct()[:settings.DOCUMENT_VARIANT_BATCH_SIZE]
+        )
+        batch = []
+        budget = settings.DOCUMENT_VARIANT_BATCH_BYTES
+        for content_hash, file_path, file_size in pending:
+            readable = file_size <= settings.DOCUMENT_VARIANT_MAX_SOURCE_BYTES
+            if batch and readable and file_size > budget:
+                break
+            batch.append((content_hash, file_path, file_size))
+            if readable:
+                budget -= file_size
+        return batch
+
+    @staticmethod
+    def store_variants(storage, content_hash, rendered, existing):
+        for name, data, width, height in rendered:
+            if (content_hash, name) in existing:
+                continue
+            path = PhotoVariantService.variant_path(content_hash, name)
+            if not storage.exists(path):
+                path = storage.save(path, ContentFile(data))
+            DocumentVariant.objects.get_or_create(
+                content_hash=content_hash,
+                name=name,
+                defaults={
+                    'file_path': path,
+                    'file_size': len(data),
+                    'mime_type': 'image/webp',
+                    'width': width,
+                    'height': height,
+                }
+            )
+
+    @staticmethod
+    def process_batch():
+        """Render variants for the next batch of pending hashes. Returns the number of hashes."""
+        batch = PhotoVariantService.claim_batch()
+        if not batch:
+            return 0
+
+        storage = document_storage()
+        sizes = PhotoVariantService.sizes()
+        existing = set(DocumentVariant.objects.filter(
+            content_hash__in=[content_hash for content_hash, _, _ in batch]
+        ).values_list('content_hash', 'name'))
+
+        failed = set()
+        for content_hash, file_path, file_size in batch:
+            if all((content_hash, name) in existing for name in sizes):
+                continue
+            if file_size > settings.DOCUMENT_VARIANT_MAX_SOURCE_BYTES:
+                logger.warning(f'⚠️ Skipping variants for {file_path}: {file_size} bytes is over the limit')
+                failed.add(content_hash)
+                continue
+            try:
+                with storage.open(file_path, 'rb') as original:
+                    rendered = render_variants(
+                        original, sizes, settings.DOCUMENT_IMAGE_QUALITY, settings.DOCUMENT_VARIANT_MAX_PIXELS
+                    )
+                PhotoVariantService.store_variants(storage, content_hash, rendered, existing)
+            except Exception as e:
+                logger.warning(f'⚠️ Could not render variants for {file_path}: {e}')
+                failed.add(content_hash)
+
+        hashes = [content_hash for content_hash, _, _ in batch]
+        Document.objects.filter(content_hash__in=failed, variant_status='pending').update(variant_status='failed')
+        Document.objects.filter(content_hash__in=hashes, variant_status='pending').update(variant_status='ready')
+        return len(batch)
+
+    @staticmethod
+    def drain():
+        """Process pending photos batch by batch. Returns the number of hashes processed."""
+        lock_key = PhotoVariantService.lock_key()
+        if not cache.add(lock_key, True, settings.DOCUMENT_VARIANT_LOCK_TIMEOUT):
+            return 0
+
+        # Photos stored from now on need a new drain queued
+        cache.delete(PhotoVariantService.queued_key())
+        processed = 0
+        try:
+            # Every claimed hash leaves 'pending', so this ends when the queue is empty
+            while True:
+                count = PhotoVariantService.process_batch()
+                if not count:
+                    break
+                processed += count
+        finally:
+            cache.delete(lock_key)
+        return processed
+
+    @staticmethod
+    def best_variant(document, width):
+        """Smallest variant at least ``width`` pixels wide, or None for the original."""
+        if document.variant_status != 'ready':
+            return None
+        return DocumentVariant.objects.filter(
+            content_hash=document.content_hash,
+            width__gte=width
+        ).order_by('width').first()
+
+    @staticmethod
+    def release(content_hash):
+        """Delete a photo's variants along with its blob."""
+        storage = document_storage()
+        for variant in DocumentVariant.objects.filter(content_hash=content_hash):
+            try:
+                storage.delete(variant.file_path)
+            except Exception as e:
+                logger.warning(f'⚠️ Could not delete variant {variant.file_path}: {e}')
+            variant.delete()
@@ -0,0 +1,154 @@
+"""
+Platform metrics service for cross-tenant superadmin reporting.
+"""
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Count
+from django.utils import timezone
+from django_tenants.utils import get_public_schema_name
+import logging
+
+from apps.authentication.models import User
+from apps.churches.models import Church
+from apps.superadmin.models import TenantMetricSnapshot
+
+logger = logging.getLogger(__name__)
+
+
+# Tenant tables every metrics query reads
+METRIC_TABLES = ['members', 'payments', 'events']
+
+METRIC_FIELDS = [
+    'members_total', 'members_active', 'members_new_30d',
+    'giving_total', 'giving_30d', 'payments_30d', 'events_upcoming',
+]
+
+SCHEMA_METRICS_SQL = """
+    SELECT {church_id} AS church_id, m.total, m.active, m.new_30d, p.total, p.recent, p.recent_count, e.upcoming
+    FROM (
+        SELECT count(*) AS total,
+               count(*) FILTER (WHERE status = 'active') AS active,
+               count(*) FILTER (WHERE created_at >= %(since)s) AS new_30d
+        FROM {schema}.members
+    ) m, (
+        SELECT coalesce(sum(amount), 0) AS total,
+               coalesce(sum(amount) FILTER (WHERE date >= %(since)s), 0) AS recent,
+               count(*) FILTER (WHERE date >= %(since)s) AS recent_count
+        FROM {schema}.payments
+        WHERE status = 'completed'
+    ) p, (
+        SELECT count(*) AS upcoming FROM {schema}.events WHERE date >= %(now)s
+    ) e
+"""
+
+
+class PlatformMetricsService:
+    """
+    Metrics across every church.
+
+    - Tenant schemas are read with one generated UNION ALL query per batch
+      of PLATFORM_METRICS_SCHEMAS_PER_QUERY schemas instead of switching
+      search_path schema by schema
+    - A batch that fails (e.g. a half-migrated schema) is retried one
+      schema at a time so one bad tenant does not hide the rest
+    - Results are stored as TenantMetricSnapshot rows in the public schema;
+      each church's newest row is flagged is_latest, so superadmin views
+      read one row per church however much history is kept
+    """
+
+    @staticmethod
+    def ready_schemas():
+        """{schema_name: church_id} for tenants that have every metric table."""
+        with connection.cursor() as cursor:
+            cursor.execute("""
+                SELECT table_schema FROM information_schema.tables
+                WHERE table_name = ANY(%s)
+                GROUP BY table_schema
+                HAVING count(DISTINCT table_name) = %s
+            """, [METRIC_TABLES, len(METRIC_TABLES)])
+            ready = {row[0] for row in cursor.fetchall()}
+
+        churches = Church.objects.exclude(
+            schema_name=get_public_schema_name()
+        ).values_list('schema_name', 'id')
+        return {schema_name: church_id for schema_name, church_id in churches if schema_name in ready}
+
+    @staticmethod
+    def query(schemas, params):
+        """Run the metrics UNION ALL for {schema_name: church_id}; returns {church_id: metrics}."""
+        sql = '\nUNION ALL\n'.join(
+            SCHEMA_METRICS_SQL.format(church_id=int(church_id), schema=connection.ops.quote_name(schema_name))
+            for schema_name, church_id in schemas.items()
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            rows = cursor.fetchall()
+        return {row[0]: dict(zip(METRIC_FIELDS, row[1:])) for row in rows}
+
+    @staticmethod
+    def collect(now=None):
+        """Current metrics for every ready tenant as {church_id: metrics}."""
+        now = now or timezone.now()
+        params = {'now': now, 'since': now - timedelta(days=30)}
+        schemas = list(PlatformMetricsService.ready_schemas().items())
+        batch_size = settings.PLATFORM_METRICS_SCHEMAS_PER_QUERY
+        metrics = {}
+
+        for start in range(0, len(schemas), batch_size):
+            batch = dict(schemas[start:start + batch_size])
+            try:
+                metrics.update(PlatformMetricsService.query(batch, params))
+            except Exception as e:
+                logger.warning(f'⚠️ Platform metrics batch failed, retrying per schema: {e}')
+                for schema_name, church_id in batch.items():
+                    try:
+                        metrics.update(PlatformMetricsService.query({schema_name: church_id}, params))
+                    except Exception as e:
+                        logger.error(f'❌ Platform metrics failed for {schema_name}: {e}')
+
+        users = User.objects.filter(
+            church_id__in=metrics.keys(),
+            is_active=True
+        ).values('church_id').annotate(count=Count('id')).order_by()
+        for row in users:
+            metrics[row['church_id']]['users_active'] = row['count']
+
+        return metrics
+
+    @staticmethod
+    def snapshot():
+        """Store a snapshot for every tenant. Returns the number stored."""
+        captured_at = timezone.now()
+        metrics = PlatformMetricsService.collect(captured_at)
+
+        # Churches missing from this run keep their previous latest snapshot
+        with transaction.atomic():
+            TenantMetricSnapshot.objects.filter(
+                church_id__in=metrics.keys(),
+                is_latest=True
+            ).update(is_latest=False)
+            TenantMetricSnapshot.objects.bulk_create([
+                TenantMetricSnapshot(church_id=church_id, captured_at=captured_at, is_latest=True, **values)
+                for church_id, values in metrics.items()
+            ], batch_size=500)
+
+        TenantMetricSnapshot.objects.filter(
+            captured_at__lt=captured_at - timedelta(days=settings.PLATFORM_METRICS_RETENTION_DAYS)
+        ).delete()
+        return len(metrics)
+
+    @staticmethod
+    def latest():
+        """Latest snapshot per church, with the church loaded."""
+        return TenantMetricSnapshot.objects.filter(is_latest=True).select_related('church').order_by('church_id')
+
+    @staticmethod
+    def totals(snapshots):
+        """Platform totals over a set of snapshots."""
+        totals = {'churches': len(snapshots)}
+        for field in METRIC_FIELDS + ['users_active']:
+            totals[field] = sum(getattr(snapshot, field) for snapshot in snapshots)
+        return totals
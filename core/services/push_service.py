@@ -0,0 +1,79 @@
+"""
+Push service for delivering notifications to connected WebSocket clients.
+"""
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.db import connection, transaction
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class PushService:
+    """
+    Sends new notifications to the channel layer groups that
+    NotificationConsumer joins. Groups are scoped by tenant schema:
+    one per user for personal notifications and one per broadcast audience.
+
+    Pushing is best effort and happens after commit; a missing or failing
+    channel layer never affects the write that produced the notification.
+    """
+
+    @staticmethod
+    def user_group(user_id, schema_name=None):
+        schema_name = schema_name or connection.schema_name
+        return f'notifications.{schema_name}.user.{user_id}'
+
+    @staticmethod
+    def audience_group(audience, schema_name=None):
+        schema_name = schema_name or connection.schema_name
+        return f'notifications.{schema_name}.audience.{audience}'
+
+    @staticmethod
+    def payload(item, source):
+        """Same shape as NotificationFeedSerializer."""
+        return {
+            'id': item.id,
+            'source': source,
+            'type': item.type,
+            'title': item.title,
+            'message': item.message,
+            'priority': item.priority,
+            'is_read': getattr(item, 'is_read', False),
+            'created_at': item.created_at.isoformat() if item.created_at else None,
+        }
+
+    @staticmethod
+    def send(messages):
+        """Send (group, payload) pairs once the current transaction commits."""
+        channel_layer = get_channel_layer()
+        if channel_layer is None or not messages:
+            return
+
+        def deliver():
+            try:
+                for group, data in messages:
+                    async_to_sync(channel_layer.group_send)(group, {
+                        'type': 'notification.created',
+                        'notification': data,
+                    })
+            except Exception as e:
+                logger.error(f'❌ Error pushing notifications: {e}')
+
+        transaction.on_commit(deliver)
+
+    @staticmethod
+    def notifications_created(notifications, schema_name=None):
+        """Push personal notifications to their recipients."""
+        PushService.send([
+            (PushService.user_group(n.user_id, schema_name), PushService.payload(n, 'personal'))
+            for n in notifications
+        ])
+
+    @staticmethod
+    def broadcast_created(broadcast, schema_name=None):
+        """Push a broadcast to everyone in its audience."""
+        PushService.send([
+            (PushService.audience_group(broadcast.audience, schema_name), PushService.payload(broadcast, 'broadcast'))
+        ])
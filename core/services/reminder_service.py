@@ -0,0 +1,210 @@
+"""
+Reminder service for scheduling and sending event reminders.
+"""
+
+from datetime import datetime, time, timedelta
+
+from dateutil.relativedelta import relativedelta
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+from django_tenants.utils import schema_context
+import logging
+
+from apps.reminders.models import EventReminder
+
+logger = logging.getLogger(__name__)
+
+
+RECURRENCE_STEPS = {
+    'daily': relativedelta(days=1),
+    'weekly': relativedelta(weeks=1),
+    'monthly': relativedelta(months=1),
+    'yearly': relativedelta(years=1),
+}
+
+
+class ReminderService:
+    """
+    Keeps the public event_reminders table in step with events and sends
+    reminders as they fall due.
+
+    Saving an event rewrites its pending rows for occurrences inside
+    EVENT_REMINDER_HORIZON_DAYS. Recurring events are topped up each time one
+    of their reminders is sent, so the scheduler never scans events.
+    """
+
+    @staticmethod
+    def occurrences(event, start, end):
+        """Occurrence start times of an event within [start, end)."""
+        if not event.is_recurring or event.recurrence_pattern not in RECURRENCE_STEPS:
+            return [event.date] if start <= event.date < end else []
+
+        step = RECURRENCE_STEPS[event.recurrence_pattern]
+        last = end
+        if event.recurrence_end_date:
+            last = min(end, timezone.make_aware(
+                datetime.combine(event.recurrence_end_date + timedelta(days=1), time.min)
+            ))
+
+        # Skip straight to the window for fixed-length steps
+        n = 0
+        step_days = {'daily': 1, 'weekly': 7}.get(event.recurrence_pattern)
+        if step_days and start > event.date:
+            n = max((start - event.date).days // step_days - 1, 0)
+
+        found = []
+        occurrence = event.date + step * n
+        while occurrence < last:
+            if occurrence >= start:
+                found.append(occurrence)
+            n += 1
+            # Step from the original date so month ends do not drift
+            occurrence = event.date + step * n
+        return found
+
+    @staticmethod
+    def sync_event(event, schema_name=None):
+        """Replace an event's pending reminders with ones for upcoming occurrences."""
+        schema_name = schema_name or connection.schema_name
+        now = timezone.now()
+        horizon = now + timedelta(days=settings.EVENT_REMINDER_HORIZON_DAYS)
+        max_lead = max(settings.EVENT_REMINDER_LEAD_MINUTES)
+
+        reminders = [
+            EventReminder(
+                schema_name=schema_name,
+                event_id=event.id,
+                occurrence=occurrence,
+                lead_minutes=lead,
+                due_at=occurrence - timedelta(minutes=lead),
+            )
+            for occurrence in ReminderService.occurrences(event, now, horizon + timedelta(minutes=max_lead))
+            for lead in settings.EVENT_REMINDER_LEAD_MINUTES
+            if occurrence - timedelta(minutes=lead) > now
+        ]
+
+        with transaction.atomic():
+            ReminderService.clear_event(event.id, schema_name)
+            # Reminders already sent for an occurrence are never recreated
+            EventReminder.objects.bulk_create(reminders, ignore_conflicts=True)
+
+        return len(reminders)
+
+    @staticmethod
+    def clear_event(event_id, schema_name=None):
+        schema_name = schema_name or connection.schema_name
+        EventReminder.objects.filter(
+            schema_name=schema_name,
+            event_id=event_id,
+            status='pending'
+        ).delete()
+
+    @staticmethod
+    def notify_registrants(reminder):
+        """
+        Create event_reminder notifications for everyone registered for the
+        event. Must run inside the event's tenant schema.
+        """
+        from apps.events.models import Event, EventRegistration
+        from apps.notifications.models import Notification
+        from core.services.notification_service import NotificationService
+
+        event = Event.objects.filter(pk=reminder.event_id).first()
+        if event is None:
+            return None, 0
+
+        user_ids = EventRegistration.objects.filter(
+            event_id=event.id,
+            status='registered',
+            member__user__isnull=False,
+        ).values_list('member__user_id', flat=True)
+
+        local = timezone.localtime(reminder.occurrence)
+        notifications = [
+            Notification(
+                user_id=user_id,
+                type='event_reminder',
+                title=f"Reminder: {event.title}",
+                message=f"{event.title} starts {local.strftime('%B %d, %Y at %I:%M %p')} at {event.location}",
+                priority='high' if reminder.lead_minutes <= 60 else 'normal',
+                action_type='reminder',
+                metadata={
+                    'event_id': str(event.id),
+                    'occurrence': reminder.occurrence.isoformat(),
+                },
+            )
+            for user_id in user_ids
+        ]
+        NotificationService.record_created(Notification.objects.bulk_create(notifications))
+
+        return event, len(notifications)
+
+    @staticmethod
+    def batch_size():
+        return settings.EVENT_REMINDER_BATCH_SIZE
+
+    @staticmethod
+    def backoff(attempts):
+        """Delay before retrying a failed reminder: exponential, capped."""
+        return timedelta(seconds=min(
+            settings.EVENT_REMINDER_RETRY_BACKOFF_SECONDS * 2 ** (attempts - 1),
+            settings.EVENT_REMINDER_RETRY_BACKOFF_MAX_SECONDS
+        ))
+
+    @staticmethod
+    def send_due(batch_size=None):
+        """
+        Claim due reminders across all tenants with FOR UPDATE SKIP LOCKED and
+        fan them out. Concurrent ticks never claim the same row. A reminder
+        that fails is pushed back by ``backoff`` and marked failed after
+        EVENT_REMINDER_MAX_ATTEMPTS, so it is never reclaimed in the same
+        tick. Returns the number of reminders processed.
+        """
+        batch_size = batch_size or ReminderService.batch_size()
+        now = timezone.now()
+
+        with transaction.atomic():
+            due = list(
+                EventReminder.objects.select_for_update(skip_locked=True)
+                .filter(status='pending', due_at__lte=now)
+                .order_by('due_at')[:batch_size]
+            )
+
+            resync = {}
+            for reminder in due:
+                if reminder.occurrence <= now:
+                    reminder.status = 'expired'
+                    reminder.sent_at = now
+                    continue
+                try:
+                    with transaction.atomic(), schema_context(reminder.schema_name):
+                        event, reminder.recipients = ReminderService.notify_registrants(reminder)
+                    reminder.status = 'sent'
+                    reminder.sent_at = now
+                    if event is not None and event.is_recurring:
+                        resync[(reminder.schema_name, event.id)] = event
+                except Exception as e:
+                    reminder.attempts += 1
+                    reminder.last_error = str(e)[:1000]
+                    if reminder.attempts >= settings.EVENT_REMINDER_MAX_ATTEMPTS:
+                        reminder.status = 'failed'
+                    else:
+                        reminder.due_at = now + ReminderService.backoff(reminder.attempts)
+                    logger.error(f'❌ Event reminder {reminder.id} failed in {reminder.schema_name}: {e}')
+
+            EventReminder.objects.bulk_update(
+                due,
+                ['status', 'recipients', 'sent_at', 'due_at', 'attempts', 'last_error']
+            )
+
+        # Keep recurring events scheduled past the horizon
+        for (schema_name, _), event in resync.items():
+            ReminderService.sync_event(event, schema_name)
+
+        return len(due)
+
+    @staticmethod
+    def clear_schema(schema_name):
+        """Drop every reminder for a tenant schema, e.g. when its church is deleted."""
+        return EventReminder.objects.filter(schema_name=schema_name).delete()[0]
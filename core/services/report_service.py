@@ -0,0 +1,393 @@
+"""
+Report service for background CSV/Excel/PDF report generation.
+"""
+
+import csv
+import hashlib
+import json
+import os
+import tempfile
+from datetime import date, datetime, timedelta
+
+from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.db import connection, transaction
+from django.db.models import Count, Q
+from django.utils import timezone
+from openpyxl import Workbook
+from openpyxl.styles import Font
+import logging
+
+from apps.analytics.models import ReportJob
+
+logger = logging.getLogger(__name__)
+
+
+REPORT_FORMATS = ['csv', 'xlsx', 'pdf']
+
+CONTENT_TYPES = {
+    'csv': 'text/csv',
+    'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+    'pdf': 'application/pdf',
+}
+
+
+def members_report(params):
+    from apps.members.models import Member
+
+    queryset = Member.objects.order_by('last_name', 'first_name')
+    if params.get('status'):
+        queryset = queryset.filter(status=params['status'])
+    return (
+        ['Member ID', 'First Name', 'Last Name', 'Email', 'Phone', 'Gender',
+         'Date of Birth', 'Membership Date', 'Status', 'Address'],
+        queryset.values_list(
+            'member_id', 'first_name', 'last_name', 'email', 'phone', 'gender',
+            'date_of_birth', 'membership_date', 'status', 'address'
+        )
+    )
+
+
+def financial_report(params):
+    from apps.payments.models import Payment
+
+    queryset = Payment.objects.filter(status=params.get('status') or 'completed').order_by('date')
+    if params.get('start'):
+        queryset = queryset.filter(date__date__gte=params['start'])
+    if params.get('end'):
+        queryset = queryset.filter(date__date__lte=params['end'])
+    if params.get('type'):
+        queryset = queryset.filter(type=params['type'])
+    return (
+        ['Date', 'Member ID', 'First Name', 'Last Name', 'Type', 'Amount',
+         'Currency', 'Method', 'Reference', 'Status', 'Receipt Number'],
+        queryset.values_list(
+            'date', 'member__member_id', 'member__first_name', 'member__last_name',
+            'type', 'amount', 'currency', 'method', 'reference', 'status', 'receipt_number'
+        )
+    )
+
+
+def events_report(params):
+    from apps.events.models import Event
+
+    queryset = Event.objects.order_by('date')
+    if params.get('start'):
+        queryset = queryset.filter(date__date__gte=params['start'])
+    if params.get('end'):
+        queryset = queryset.filter(date__date__lte=params['end'])
+    if params.get('type'):
+        queryset = queryset.filter(type=params['type'])
+    return (
+        ['Title', 'Date', 'End Date', 'Location', 'Type', 'Capacity',
+         'Registered', 'Attended', 'Recurring'],
+        queryset.annotate(
+            registered=Count('registrations'),
+            attended=Count('registrations', filter=Q(registrations__status='attended'))
+        ).values_list(
+            'title', 'date', 'end_date', 'location', 'type', 'capacity',
+            'registered', 'attended', 'is_recurring'
+        )
+    )
+
+
+# report_type: (builder, allowed params)
+REPORTS = {
+    'members': (members_report, ['status']),
+    'financial': (financial_report, ['start', 'end', 'type', 'status']),
+    'events': (events_report, ['start', 'end', 'type']),
+}
+
+DATE_PARAMS = {'start', 'end'}
+
+
+def cell(value):
+    """Plain value for a report cell."""
+    if value is None:
+        return ''
+    if isinstance(value, bool):
+        return 'Yes' if value else 'No'
+    if isinstance(value, datetime):
+        return timezone.localtime(value).strftime('%Y-%m-%d %H:%M')
+    if isinstance(value, date):
+        return value.isoformat()
+    return value
+
+
+class CsvReportWriter:
+    def __init__(self, path, headers, title):
+        self.file = open(path, 'w', newline='', encoding='utf-8')
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(headers)
+
+    def writerow(self, row):
+        self.writer.writerow(row)
+
+    def close(self):
+        self.file.close()
+
+
+class XlsxReportWriter:
+    """Write-only workbook so rows are streamed rather than held as cells."""
+
+    def __init__(self, path, headers, title):
+        from openpyxl.cell import WriteOnlyCell
+
+        self.path = path
+        self.workbook = Workbook(write_only=True)
+        self.sheet = self.workbook.create_sheet(title=title[:31])
+        header_cells = []
+        for header in headers:
+            header_cell = WriteOnlyCell(self.sheet, value=header)
+            header_cell.font = Font(bold=True)
+            header_cells.append(header_cell)
+        self.sheet.append(header_cells)
+
+    def writerow(self, row):
+        self.sheet.append(row)
+
+    def close(self):
+        self.workbook.save(self.path)
+
+
+class PdfReportWriter:
+    """
+    Minimal landscape PDF of fixed-width text rows. Pages are written as
+    they fill, so memory use does not grow with the report.
+    """
+
+    PAGE_WIDTH = 842
+    PAGE_HEIGHT = 595
+    FONT_SIZE = 7
+    LINE_HEIGHT = 9
+    LINE_CHARS = 190
+
+    def __init__(self, path, headers, title):
+        self.file = open(path, 'wb')
+        self.offsets = {}
+        self.page_ids = []
+        self.next_id = 4  # 1 catalog, 2 page tree, 3 font
+        self.width = max(self.LINE_CHARS // len(headers), 6)
+        self.header_lines = [title, '', self.format_row(headers), '-' * self.LINE_CHARS]
+        self.lines_per_page = (self.PAGE_HEIGHT - 60) // self.LINE_HEIGHT
+        self.lines = []
+
+        self.file.write(b'%PDF-1.4\n')
+        self.write_object(3, b'<< /Type /Font /Subtype /Type1 /BaseFont /Courier >>')
+
+    def format_row(self, row):
+        return ''.join(str(value)[:self.width - 1].ljust(self.width) for value in row).rstrip()
+
+    def write_object(self, object_id, body):
+        self.offsets[object_id] = self.file.tell()
+        self.file.write(f'{object_id} 0 obj\n'.encode() + body + b'\nendobj\n')
+
+    def flush_page(self):
+        text = ['BT', f'/F1 {self.FONT_SIZE} Tf', f'{self.LINE_HEIGHT} TL', f'30 {self.PAGE_HEIGHT - 30} Td']
+        for line in self.header_lines + self.lines:
+            escaped = line.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+            text.append(f'({escaped}) Tj T*')
+        text.append('ET')
+        stream = '\n'.join(text).encode('latin-1', 'replace')
+
+        page_id, content_id = self.next_id, self.next_id + 1
+        self.next_id += 2
+        self.write_object(content_id, f'<< /Length {len(stream)} >>\nstream\n'.encode() + stream + b'\nendstream')
+        self.write_object(page_id, (
+            f'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {self.PAGE_WIDTH} {self.PAGE_HEIGHT}] '
+            f'/Resources << /Font << /F1 3 0 R >> >> /Contents {content_id} 0 R >>'
+        ).encode())
+        self.page_ids.append(page_id)
+        self.lines = []
+
+    def writerow(self, row):
+        self.lines.append(self.format_row(row))
+        if len(self.lines) + len(self.header_lines) >= self.lines_per_page:
+            self.flush_page()
+
+    def close(self):
+        if self.lines or not self.page_ids:
+            self.flush_page()
+
+        kids = ' '.join(f'{page_id} 0 R' for page_id in self.page_ids)
+        self.write_object(2, f'<< /Type /Pages /Kids [{kids}] /Count {len(self.page_ids)} >>'.encode())
+        self.write_object(1, b'<< /Type /Catalog /Pages 2 0 R >>')
+
+        xref_offset = self.file.tell()
+        size = self.next_id
+        self.file.write(f'xref\n0 {size}\n0000000000 65535 f \n'.encode())
+        for object_id in range(1, size):
+            self.file.write(f'{self.offsets[object_id]:010d} 00000 n \n'.encode())
+        self.file.write(f'trailer\n<< /Size {size} /Root 1 0 R >>\nstartxref\n{xref_offset}\n%%EOF\n'.encode())
+        self.file.close()
+
+
+WRITERS = {
+    'csv': CsvReportWriter,
+    'xlsx': XlsxReportWriter,
+    'pdf': PdfReportWriter,
+}
+
+
+class ReportService:
+    """
+    Background report jobs.
+
+    - Requests only validate parameters and queue a ReportJob
+    - A Celery worker streams the queryset with a server-side cursor into a
+      temporary file and saves it to default storage
+    - The requester is notified when the report is ready; clients can also
+      poll the job
+    - A completed job's artifact is reused by any request with the same
+      parameters until REPORT_ARTIFACT_TTL_HOURS passes
+    """
+
+    @staticmethod
+    def normalize_params(report_type, params):
+        """Validated params for a report type. Raises ValueError."""
+        if report_type not in REPORTS:
+            raise ValueError(f"report_type must be one of: {', '.join(REPORTS)}")
+        if not isinstance(params, dict):
+            raise ValueError('params must be an object')
+
+        _, allowed = REPORTS[report_type]
+        unknown = set(params) - set(allowed)
+        if unknown:
+            raise ValueError(f"Unknown params: {', '.join(sorted(unknown))}")
+
+        normalized = {}
+        for key in allowed:
+            value = params.get(key)
+            if value in (None, ''):
+                continue
+            if key in DATE_PARAMS:
+                value = date.fromisoformat(str(value)).isoformat()
+            normalized[key] = str(value)
+        return normalized
+
+    @staticmethod
+    def params_hash(report_type, report_format, params):
+        payload = json.dumps([report_type, report_format, params], sort_keys=True)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    @staticmethod
+    def request(report_type, report_format, params, user):
+        """
+        Queue a report, or return an identical job that is already queued,
+        running, or completed and unexpired. Returns (job, reused).
+        """
+        if report_format not in REPORT_FORMATS:
+            raise ValueError(f"format must be one of: {', '.join(REPORT_FORMATS)}")
+        params = ReportService.normalize_params(report_type, params)
+        params_hash = ReportService.params_hash(report_type, report_format, params)
+
+        now = timezone.now()
+        stale = now - timedelta(seconds=settings.REPORT_JOB_TIMEOUT)
+        existing = ReportJob.objects.filter(params_hash=params_hash).filter(
+            Q(status__in=['queued', 'running'], created_at__gte=stale) |
+            Q(status='completed', expires_at__gt=now)
+        ).order_by('-created_at').first()
+        if existing is not None:
+            return existing, True
+
+        job = ReportJob.objects.create(
+            report_type=report_type,
+            format=report_format,
+            params=params,
+            params_hash=params_hash,
+            requested_by=user
+        )
+        schema_name = connection.schema_name
+        transaction.on_commit(lambda: ReportService.dispatch(schema_name, job.id))
+        return job, False
+
+    @staticmethod
+    def dispatch(schema_name, job_id):
+        from apps.analytics.tasks import generate_report
+
+        try:
+            generate_report.delay(schema_name, job_id)
+        except Exception as e:
+            logger.error(f'❌ Could not dispatch report job {job_id}: {e}')
+
+    @staticmethod
+    def storage_path(job):
+        return f'reports/{connection.schema_name}/{job.params_hash}.{job.format}'
+
+    @staticmethod
+    def generate(job):
+        """Build the job's artifact and store it. Runs in the tenant schema."""
+        job.status = 'running'
+        job.started_at = timezone.now()
+        job.save(update_fields=['status', 'started_at'])
+
+        temp_path = None
+        try:
+            # Bad params and database errors must fail the job, not leave it running
+            builder, _ = REPORTS[job.report_type]
+            headers, rows = builder(job.params)
+            title = f'{job.report_type.title()} report'
+
+            fd, temp_path = tempfile.mkstemp(suffix=f'.{job.format}')
+            os.close(fd)
+            writer = WRITERS[job.format](temp_path, headers, title)
+            row_count = 0
+            for row in rows.iterator(chunk_size=settings.REPORT_CHUNK_SIZE):
+                writer.writerow([cell(value) for value in row])
+                row_count += 1
+            writer.close()
+
+            path = ReportService.storage_path(job)
+            if default_storage.exists(path):
+                default_storage.delete(path)
+            with open(temp_path, 'rb') as artifact:
+                job.file_path = default_storage.save(path, File(artifact))
+            job.file_size = default_storage.size(job.file_path)
+            job.row_count = row_count
+            job.status = 'completed'
+            job.completed_at = timezone.now()
+            job.expires_at = job.completed_at + timedelta(hours=settings.REPORT_ARTIFACT_TTL_HOURS)
+        except Exception as e:
+            logger.error(f'❌ Report job {job.id} failed in {connection.schema_name}: {e}')
+            job.status = 'failed'
+            job.error = str(e)[:1000]
+        finally:
+            if temp_path:
+                os.remove(temp_path)
+
+        job.save(update_fields=[
+            'status', 'file_path', 'file_size', 'row_count', 'error', 'completed_at', 'expires_at'
+        ])
+        ReportService.notify(job)
+        return job
+
+    @staticmethod
+    def notify(job):
+        from core.services.notification_service import NotificationService
+
+        if job.requested_by is None:
+            return
+        if job.status == 'completed':
+            title = 'Report Ready'
+            message = f'Your {job.report_type} report ({job.format.upper()}, {job.row_count} rows) is ready to download'
+        else:
+            title = 'Report Failed'
+            message = f'Your {job.report_type} report could not be generated'
+        NotificationService.notify_user(
+            job.requested_by,
+            title,
+            message,
+            notification_type='system',
+            metadata={'report_job_id': str(job.id), 'status': job.status}
+        )
+
+    @staticmethod
+    def purge_expired():
+        """Delete expired artifacts and their jobs in the current tenant."""
+        expired = ReportJob.objects.filter(expires_at__lt=timezone.now())
+        for path in expired.exclude(file_path='').values_list('file_path', flat=True).distinct():
+            if not ReportJob.objects.filter(file_path=path, expires_at__gte=timezone.now()).exists():
+                default_storage.delete(path)
+        deleted, _ = expired.delete()
+        return deleted
@@ -0,0 +1,167 @@
+"""
+Retention service for membership cohort analytics.
+"""
+
+import time
+from datetime import timedelta
+
+import numpy as np
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.db.models import Case, DateField, IntegerField, Q, Value, When
+from django.db.models.functions import Coalesce, ExtractMonth, ExtractYear, TruncDate
+from django.utils import timezone
+
+
+def month_index(expression):
+    """SQL months since year 0 for a date expression."""
+    return ExtractYear(expression) * 12 + ExtractMonth(expression) - 1
+
+
+def month_label(index):
+    return f'{index // 12:04d}-{index % 12 + 1:02d}'
+
+
+class RetentionService:
+    """
+    Monthly membership cohorts.
+
+    A member joins in the month of membership_date (or created_at) and
+    counts as retained up to the month of their last activity. Members
+    who are active and were seen within MEMBER_CHURN_DAYS (or have no
+    recorded activity at all) are retained up to the current month.
+    Everyone else has churned in the month after their last activity.
+
+    Reactivated members are marked inactive or suspended but have been
+    active within MEMBER_CHURN_DAYS, so their status lags their behaviour.
+
+    One query loads four integers per member. The cohort grid, churn and
+    reactivation are then computed with NumPy histograms.
+    """
+
+    @staticmethod
+    def generation_key(schema_name=None):
+        schema_name = schema_name or connection.schema_name
+        return f'analytics:retention_gen:{schema_name}'
+
+    @staticmethod
+    def invalidate():
+        key = RetentionService.generation_key()
+        transaction.on_commit(lambda: cache.set(key, time.time_ns(), None))
+
+    @staticmethod
+    def member_arrays(now):
+        """(join_month, last_month, recent, lapsed_status) as int arrays, one entry per member."""
+        from apps.members.models import Member
+
+        cutoff = now - timedelta(days=settings.MEMBER_CHURN_DAYS)
+        joined = Coalesce('membership_date', TruncDate('created_at'), output_field=DateField())
+        rows = Member.objects.annotate(
+            join_month=month_index(joined),
+            last_month=Coalesce(month_index('last_activity_date'), Value(-1)),
+            recent=Case(
+                When(last_activity_date__gte=cutoff, then=Value(1)),
+                When(last_activity_date__isnull=True, status='active', then=Value(1)),
+                default=Value(0),
+                output_field=IntegerField()
+            ),
+            lapsed_status=Case(
+                When(~Q(status='active'), then=Value(1)),
+                default=Value(0),
+                output_field=IntegerField()
+            ),
+        ).order_by().values_list('join_month', 'last_month', 'recent', 'lapsed_status')
+
+        data = np.array(list(rows), dtype=np.int64).reshape(-1, 4)
+        return data[:, 0], data[:, 1], data[:, 2].astype(bool), data[:, 3].astype(bool)
+
+    @staticmethod
+    def compute(months=None, now=None):
+        """Cohort grid, churn and reactivation for the last ``months`` cohorts."""
+        months = months or settings.RETENTION_DEFAULT_MONTHS
+        now = now or timezone.now()
+        local = timezone.localtime(now)
+        current = local.year * 12 + local.month - 1
+        first = current - months + 1
+
+        join, last, recent, lapsed_status = RetentionService.member_arrays(now)
+        join = np.minimum(join, current)
+
+        # Last retained month: now for retained members, else last activity
+        retained_now = recent & ~lapsed_status
+        last = np.where(last < 0, join, np.maximum(last, join))
+        last = np.where(retained_now, current, np.minimum(last, current))
+        churned = ~retained_now
+
+        # Cohort grid: H[c, L] = members of cohort c retained exactly L months
+        in_range = join >= first
+        cohort = join[in_range] - first
+        length = last[in_range] - join[in_range]
+        grid = np.zeros((months, months), dtype=np.int64)
+        np.add.at(grid, (cohort, length), 1)
+        retained = np.cumsum(grid[:, ::-1], axis=1)[:, ::-1]
+        sizes = retained[:, 0]
+
+        ages = np.arange(months)
+        observable = (np.arange(months)[:, None] + ages[None, :]) < months
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rates = np.where(observable & (sizes[:, None] > 0), retained / sizes[:, None] * 100, np.nan)
+
+        # Monthly churn: members lost in month m / members at the start of m
+        churn_month = np.where(churned, last + 1, current + 1)
+        joins_by_month = np.bincount(np.clip(join - first + 1, 0, months), minlength=months + 1)
+        churn_by_month = np.bincount(np.clip(churn_month - first + 1, 0, months + 1), minlength=months + 2)[:months + 1]
+        # Index 0 holds everything before the window
+        members_at_start = np.cumsum(joins_by_month - churn_by_month)[:-1]
+        churn_counts = churn_by_month[1:]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            churn_rates = np.where(members_at_start > 0, churn_counts / members_at_start * 100, np.nan)
+
+        # Reactivated: marked lapsed but recently active, by last activity month
+        reactivated = recent & lapsed_status
+        reactivated_by_month = np.bincount(np.clip(last[reactivated] - first, 0, months - 1), minlength=months)
+
+        def as_list(values):
+            return [None if np.isnan(v) else round(v, 2) for v in values.astype(float).tolist()]
+
+        labels = [month_label(first + i) for i in range(months)]
+        return {
+            'months': months,
+            'cohorts': [
+                {
+                    'month': labels[i],
+                    'size': int(sizes[i]),
+                    'retention': as_list(rates[i, :months - i]),
+                }
+                for i in range(months)
+            ],
+            'churn': {
+                'months': labels,
+                'churned': churn_counts.tolist(),
+                'members_at_start': members_at_start.tolist(),
+                'rate': as_list(churn_rates),
+            },
+            'reactivation': {
+                'total': int(reactivated.sum()),
+                'by_month': reactivated_by_month.tolist(),
+            },
+            'members': {
+                'total': int(len(join)),
+                'retained': int(retained_now.sum()),
+                'churned': int(churned.sum()),
+            },
+        }
+
+    @staticmethod
+    def get_retention(months=None):
+        """Cached ``compute`` for the current tenant."""
+        months = months or settings.RETENTION_DEFAULT_MONTHS
+        generation = cache.get_or_set(RetentionService.generation_key(), time.time_ns, timeout=None)
+        key = f'analytics:retention:{connection.schema_name}:{generation}:{months}'
+
+        data = cache.get(key)
+        if data is None:
+            data = RetentionService.compute(months)
+            cache.set(key, data, settings.RETENTION_CACHE_TIMEOUT)
+        return data
@@ -0,0 +1,276 @@
+"""
+Roster service for drafting volunteer rosters on recurring opportunities.
+"""
+
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+from apps.volunteers.models import VolunteerOpportunity, VolunteerSignup
+from core.services.reminder_service import RECURRENCE_STEPS
+
+
+# Signups that can be rostered
+ROSTER_STATUSES = ['pending', 'approved']
+
+
+class Roster:
+    """
+    Greedy assignment with a repair pass over plain data.
+
+    ``slots`` are dicts with ``start`` (aware datetime), ``needed`` and
+    ``candidates`` (member ids available for that slot); an ``assigned``
+    list is filled in. A member works at most ``max_per_month`` slots per
+    calendar month, with at least ``min_gap_days`` between any two.
+    """
+
+    def __init__(self, slots, max_per_month, min_gap_days):
+        self.slots = sorted(slots, key=lambda slot: slot['start'])
+        self.max_per_month = max_per_month
+        self.min_gap_days = min_gap_days
+        self.shifts = {}
+        # Counter of assignment changes, and its value at each member's last change
+        self.changes = 0
+        self.changed = {}
+        # Members free to cover each slot, valid until the next change
+        self.covers = {}
+        self.covers_at = 0
+        for slot in self.slots:
+            slot['candidates'] = set(slot['candidates'])
+            slot['assigned'] = []
+            slot['day'] = timezone.localtime(slot['start']).date()
+            slot['ordinal'] = slot['day'].toordinal()
+            slot['month'] = (slot['day'].year, slot['day'].month)
+
+    def eligible(self, member, index):
+        """Whether ``member`` can take slot ``index``."""
+        slot = self.slots[index]
+        if member in slot['assigned'] or member not in slot['candidates']:
+            return False
+        in_month = 0
+        for other in self.shifts.get(member, ()):
+            shift = self.slots[other]
+            if abs(shift['ordinal'] - slot['ordinal']) < self.min_gap_days or shift['start'] == slot['start']:
+                return False
+            if shift['month'] == slot['month']:
+                in_month += 1
+        return in_month < self.max_per_month
+
+    def clashes(self, member, index):
+        """``member``'s shifts too close to slot ``index``, and their shifts in its month."""
+        slot = self.slots[index]
+        close, in_month = [], []
+        for other in self.shifts.get(member, ()):
+            shift = self.slots[other]
+            if abs(shift['ordinal'] - slot['ordinal']) < self.min_gap_days or shift['start'] == slot['start']:
+                close.append(other)
+            if shift['month'] == slot['month']:
+                in_month.append(other)
+        return close, in_month
+
+    def assign(self, member, index):
+        self.slots[index]['assigned'].append(member)
+        self.shifts.setdefault(member, []).append(index)
+        self.changes += 1
+        self.changed[member] = self.changes
+
+    def unassign(self, member, index):
+        self.slots[index]['assigned'].remove(member)
+        self.shifts[member].remove(index)
+        self.changes += 1
+        self.changed[member] = self.changes
+
+    def cost(self, member):
+        """Fewest shifts first, then longest since their last one."""
+        shifts = self.shifts.get(member, ())
+        last = max((self.slots[index]['start'] for index in shifts), default=None)
+        return (len(shifts), last is not None, last or 0, member)
+
+    def solve(self):
+        for index, slot in enumerate(self.slots):
+            # Taking this slot changes no other volunteer's eligibility or cost for it
+            eligible = [member for member in slot['candidates'] if self.eligible(member, index)]
+            for member in sorted(eligible, key=self.cost)[:slot['needed'] - len(slot['assigned'])]:
+                self.assign(member, index)
+
+        # Repair: move a blocked member here when someone else can cover their other slot.
+        # A failed slot is retried only once a volunteer its outcome depends on has
+        # changed shifts; each repair fills one more place, so the passes end.
+        blocked = {}
+        progress = True
+        while progress:
+            progress = False
+            for index, slot in enumerate(self.slots):
+                if len(slot['assigned']) >= slot['needed']:
+                    continue
+                if index in blocked:
+                    since, considered = blocked[index]
+                    if all(self.changed.get(member, 0) <= since for member in considered):
+                        continue
+                considered = set()
+                if self.repair(index, considered):
+                    blocked.pop(index, None)
+                    progress = True
+                else:
+                    blocked[index] = (self.changes, considered)
+        return self.slots
+
+    def repair(self, index, considered):
+        """
+        Fill one place in slot ``index``. Adds every member whose shifts
+        the outcome depends on to ``considered``.
+        """
+        slot = self.slots[index]
+        considered.update(slot['candidates'])
+        if self.covers_at != self.changes:
+            self.covers, self.covers_at = {}, self.changes
+        covers = self.covers
+        for member in slot['candidates']:
+            if member in slot['assigned']:
+                continue
+            close, in_month = self.clashes(member, index)
+            for other in self.shifts.get(member, ()):
+                # Leaving ``other`` must clear every clash with this slot
+                if close and close != [other]:
+                    continue
+                if len(in_month) - (other in in_month) >= self.max_per_month:
+                    continue
+                considered.update(self.slots[other]['candidates'])
+                if other not in covers:
+                    covers[other] = [
+                        candidate for candidate in self.slots[other]['candidates']
+                        if self.eligible(candidate, other)
+                    ]
+                if not covers[other]:
+                    continue
+                self.unassign(member, other)
+                self.assign(min(covers[other], key=self.cost), other)
+                self.assign(member, index)
+                return True
+        return False
+
+
+class RosterService:
+    """
+    Draft rosters for recurring volunteer opportunities.
+
+    - Each opportunity is expanded into dated slots from ``start_date`` by
+      its ``recurrence_pattern`` (weekly when blank) up to ``end_date``
+    - Volunteers are the opportunity's pending and approved signups, less
+      any weekdays or dates excluded by their ``availability``
+    - Slots are filled in date order by whoever has the fewest shifts so
+      far, then repaired by moving a volunteer blocked by the monthly cap
+      or spacing rule when another volunteer can cover the slot they vacate
+    - Nothing is saved; coordinators review the draft
+    """
+
+    @staticmethod
+    def occurrences(opportunity, start, end):
+        """Slot start times of a recurring opportunity within [start, end)."""
+        if opportunity.start_date is None:
+            return []
+        step = RECURRENCE_STEPS.get(opportunity.recurrence_pattern or 'weekly')
+        if step is None:
+            return []
+        last = min(end, opportunity.end_date) if opportunity.end_date else end
+
+        # Skip straight to the window for fixed-length steps
+        n = 0
+        step_days = {'daily': 1, 'weekly': 7}.get(opportunity.recurrence_pattern or 'weekly')
+        if step_days and start > opportunity.start_date:
+            n = max((start - opportunity.start_date).days // step_days - 1, 0)
+
+        found = []
+        occurrence = opportunity.start_date + step * n
+        while occurrence < last:
+            if occurrence >= start:
+                found.append(occurrence)
+            n += 1
+            occurrence = opportunity.start_date + step * n
+        return found
+
+    @staticmethod
+    def available(availability, start):
+        """Whether a signup's availability allows a slot starting at ``start``."""
+        if not availability:
+            return True
+        day = timezone.localtime(start).date()
+        weekdays = availability.get('weekdays')
+        if weekdays and day.weekday() not in weekdays:
+            return False
+        return day.isoformat() not in availability.get('blackout_dates', [])
+
+    @staticmethod
+    def draft(start, end, opportunity_ids=None, per_slot=1, max_per_month=None, min_gap_days=None):
+        """
+        Draft roster for recurring opportunities between the dates
+        ``start`` and ``end`` (inclusive).
+        """
+        if max_per_month is None:
+            max_per_month = settings.VOLUNTEER_ROSTER_MAX_SHIFTS_PER_MONTH
+        if min_gap_days is None:
+            min_gap_days = settings.VOLUNTEER_ROSTER_MIN_GAP_DAYS
+
+        window_start = timezone.make_aware(datetime.combine(start, time.min))
+        window_end = timezone.make_aware(datetime.combine(end + timedelta(days=1), time.min))
+
+        opportunities = VolunteerOpportunity.objects.filter(schedule='recurring', is_active=True)
+        if opportunity_ids:
+            opportunities = opportunities.filter(id__in=opportunity_ids)
+        opportunities = {opportunity.id: opportunity for opportunity in opportunities}
+
+        signups = {}
+        members = {}
+        for signup in VolunteerSignup.objects.filter(
+            opportunity_id__in=opportunities,
+            status__in=ROSTER_STATUSES
+        ).select_related('member'):
+            signups.setdefault(signup.opportunity_id, []).append(signup)
+            members[signup.member_id] = signup.member.full_name
+
+        slots = [
+            {
+                'opportunity': opportunity.id,
+                'start': occurrence,
+                'needed': per_slot,
+                'candidates': [
+                    signup.member_id for signup in signups.get(opportunity.id, [])
+                    if RosterService.available(signup.availability, occurrence)
+                ],
+            }
+            for opportunity in opportunities.values()
+            for occurrence in RosterService.occurrences(opportunity, window_start, window_end)
+        ]
+        slots = Roster(slots, max_per_month, min_gap_days).solve()
+
+        shifts = {member: 0 for member in members}
+        for slot in slots:
+            for member in slot['assigned']:
+                shifts[member] += 1
+
+        return {
+            'start': start.isoformat(),
+            'end': end.isoformat(),
+            'max_shifts_per_month': max_per_month,
+            'min_gap_days': min_gap_days,
+            'slots': [
+                {
+                    'opportunity': slot['opportunity'],
+                    'opportunity_title': opportunities[slot['opportunity']].title,
+                    'start': slot['start'].isoformat(),
+                    'needed': slot['needed'],
+                    'assigned': [
+                        {'member': member, 'member_name': members[member]}
+                        for member in slot['assigned']
+                    ],
+                    'unfilled': slot['needed'] - len(slot['assigned']),
+                }
+                for slot in slots
+            ],
+            'volunteers': [
+                {'member': member, 'member_name': members[member], 'shifts': count}
+                for member, count in sorted(shifts.items(), key=lambda item: (-item[1], item[0]))
+            ],
+            'unfilled': sum(slot['needed'] - len(slot['assigned']) for slot in slots),
+        }
@@ -0,0 +1,180 @@
+"""
+Cached unread notification counters.
+"""
+
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+
+
+class UnreadCounterService:
+    """
+    Per-user unread notification counters kept in the cache.
+    
+    Personal notifications use a plain counter per user that is adjusted
+    as rows are created and read. Broadcast unread counts are cached under
+    a per-tenant generation number that is bumped whenever a broadcast is
+    published, so a new broadcast never has to touch every user's counter.
+    Missing keys are rebuilt from the database on the next read.
+    """
+    
+    @staticmethod
+    def _schema():
+        return connection.schema_name
+    
+    @staticmethod
+    def personal_key(user_id, schema_name=None):
+        schema_name = schema_name or UnreadCounterService._schema()
+        return f'notifications:unread:{schema_name}:{user_id}'
+    
+    @staticmethod
+    def generation_key(schema_name=None):
+        schema_name = schema_name or UnreadCounterService._schema()
+        return f'notifications:broadcast_gen:{schema_name}'
+    
+    @staticmethod
+    def broadcast_key(user_id, generation, schema_name=None):
+        schema_name = schema_name or UnreadCounterService._schema()
+        return f'notifications:unread_broadcasts:{schema_name}:{generation}:{user_id}'
+    
+    @staticmethod
+    def generation(schema_name=None):
+        """Current broadcast generation for the tenant."""
+        return cache.get_or_set(
+            UnreadCounterService.generation_key(schema_name),
+            time.time_ns,
+            timeout=None
+        )
+    
+    @staticmethod
+    def get(user_id, load_user):
+        """
+        Unread count for a user, normally answered from the cache alone.
+        ``load_user`` is only called when a counter must be rebuilt.
+        """
+        from core.services.notification_service import NotificationService
+        
+        timeout = settings.NOTIFICATION_COUNTER_TIMEOUT
+        personal_key = UnreadCounterService.personal_key(user_id)
+        broadcast_key = UnreadCounterService.broadcast_key(user_id, UnreadCounterService.generation())
+        
+        cached = cache.get_many([personal_key, broadcast_key])
+        personal = cached.get(personal_key)
+        broadcasts = cached.get(broadcast_key)
+        
+        if personal is None:
+            personal = NotificationService.visible_notifications(user_id).filter(is_read=False).count()
+            cache.set(personal_key, personal, timeout)
+        
+        if broadcasts is None:
+            user = load_user()
+            broadcasts = NotificationService.visible_broadcasts(user).filter(is_read=False).count()
+            cache.set(broadcast_key, broadcasts, timeout)
+        
+        return personal + broadcasts
+    
+    @staticmethod
+    def _adjust(key, delta):
+        """Apply ``delta`` to an existing counter; missing keys are rebuilt lazily."""
+        try:
+            value = cache.incr(key, delta)
+        except ValueError:
+            return
+        if value < 0:
+            cache.delete(key)
+    
+    @staticmethod
+    def increment(user_ids, schema_name=None):
+        """
+        Add one unread notification per occurrence of each user ID.
+        Applied after commit so a rolled back insert is never counted.
+        """
+        keys = {
+            UnreadCounterService.personal_key(user_id, schema_name): count
+            for user_id, count in Counter(user_ids).items()
+        }
+        
+        def apply():
+            for key, count in keys.items():
+                UnreadCounterService._adjust(key, count)
+        
+        transaction.on_commit(apply)
+    
+    @staticmethod
+    def record_created(notifications, schema_name=None):
+        """Increment counters for freshly created Notification objects."""
+        UnreadCounterService.increment(
+            [n.user_id for n in notifications if not n.is_read],
+            schema_name
+        )
+    
+    @staticmethod
+    def decrement(user_id, count=1):
+        """Remove ``count`` personal unread notifications."""
+        if count:
+            UnreadCounterService._adjust(UnreadCounterService.personal_key(user_id), -count)
+    
+    @staticmethod
+    def decrement_broadcasts(user_id, count=1):
+        """Remove ``count`` unread broadcasts from the user's counter."""
+        if count:
+            key = UnreadCounterService.broadcast_key(user_id, UnreadCounterService.generation())
+            UnreadCounterService._adjust(key, -count)
+    
+    @staticmethod
+    def reset(user_id):
+        """Everything is read: set both counters to zero."""
+        timeout = settings.NOTIFICATION_COUNTER_TIMEOUT
+        cache.set_many({
+            UnreadCounterService.personal_key(user_id): 0,
+            UnreadCounterService.broadcast_key(user_id, UnreadCounterService.generation()): 0,
+        }, timeout)
+    
+    @staticmethod
+    def forget(user_id, schema_name=None):
+        """Drop a user's counters so the next read has to load the user."""
+        generation = UnreadCounterService.generation(schema_name)
+        cache.delete_many([
+            UnreadCounterService.personal_key(user_id, schema_name),
+            UnreadCounterService.broadcast_key(user_id, generation, schema_name),
+        ])
+    
+    @staticmethod
+    def broadcast_published(schema_name=None):
+        """Invalidate every broadcast counter in the tenant by moving to a new generation."""
+        key = UnreadCounterService.generation_key(schema_name)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, time.time_ns(), timeout=None)
+    
+    @staticmethod
+    def reconcile(church_id, schema_name=None):
+        """
+        Rewrite personal counters for every user of a church from one
+        grouped query, and start a new broadcast generation.
+        Must run inside the tenant's schema.
+        """
+        from django.db.models import Count
+        from apps.authentication.models import User
+        from core.services.notification_service import NotificationService
+        
+        counts = dict(
+            NotificationService.active_notifications().filter(is_read=False)
+            .order_by()
+            .values('user_id')
+            .annotate(unread=Count('id'))
+            .values_list('user_id', 'unread')
+        )
+        user_ids = User.objects.filter(church_id=church_id, is_active=True).values_list('id', flat=True)
+        
+        cache.set_many({
+            UnreadCounterService.personal_key(user_id, schema_name): counts.get(user_id, 0)
+            for user_id in user_ids
+        }, settings.NOTIFICATION_COUNTER_TIMEOUT)
+        UnreadCounterService.broadcast_published(schema_name)
+        
+        return len(counts)
@@ -0,0 +1,209 @@
+"""
+Usage service for per-church metering and plan quotas.
+"""
+
+import atexit
+import threading
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.db.models import Case, F, Sum, Value, When
+from django.utils import timezone
+from django_tenants.utils import get_public_schema_name
+import logging
+
+from apps.churches.models import Church
+from apps.churches.models_usage import ChurchUsage
+from core.exceptions import QuotaExceeded
+
+logger = logging.getLogger(__name__)
+
+
+# Running totals and monthly counters
+GAUGES = ['storage_bytes', 'members']
+MONTHLY = ['api_calls', 'notifications_sent']
+METRICS = GAUGES + MONTHLY
+
+# Unflushed monthly counts in this process: {(schema_name, metric): amount}
+_pending = defaultdict(int)
+_lock = threading.Lock()
+_last_flush = time.monotonic()
+
+
+class UsageService:
+    """
+    Usage metering.
+
+    - Running totals (storage, members) change with one F() UPDATE of the
+      church's row in the writer's transaction, so they roll back with it
+    - Monthly counters (API calls, notifications) only add to an
+      in-process counter; those are written with one UPDATE per church at
+      most every USAGE_FLUSH_SECONDS (and when the process exits)
+    - ``usage`` reads the church's row from the shared cache, so a quota
+      check costs a cache hit instead of a SUM over the tenant's tables
+    - Running totals are reconciled with the source tables daily under
+      the row lock, so each change is counted exactly once
+    - Quotas come from PLAN_LIMITS by Church.plan; None means unlimited.
+      Monthly counts not yet flushed by other processes are not seen, so
+      those limits can be overshot by up to one flush interval of activity
+    """
+
+    @staticmethod
+    def cache_key(schema_name=None):
+        schema_name = schema_name or connection.schema_name
+        return f'usage:{schema_name}'
+
+    @staticmethod
+    def current_period():
+        return timezone.localdate().replace(day=1)
+
+    @staticmethod
+    def record(metric, amount=1, schema_name=None):
+        """Count usage for the current (or given) tenant."""
+        schema_name = schema_name or connection.schema_name
+        if not amount or schema_name == get_public_schema_name():
+            return
+
+        if metric in GAUGES:
+            # A missing row is created by the first reconcile, which counts this change
+            ChurchUsage.objects.filter(church__schema_name=schema_name).update(**{metric: F(metric) + amount})
+            key = UsageService.cache_key(schema_name)
+            transaction.on_commit(lambda: cache.delete(key))
+            return
+
+        with _lock:
+            _pending[(schema_name, metric)] += amount
+            due = time.monotonic() - _last_flush >= settings.USAGE_FLUSH_SECONDS
+
+        if due:
+            # Never write usage from inside a transaction that may roll back
+            transaction.on_commit(UsageService.flush)
+
+    @staticmethod
+    def pending(schema_name):
+        with _lock:
+            return {metric: _pending.get((schema_name, metric), 0) for metric in MONTHLY}
+
+    @staticmethod
+    def flush():
+        """Write this process's monthly counters. Returns the number of churches updated."""
+        global _pending, _last_flush
+
+        with _lock:
+            pending, _pending = _pending, defaultdict(int)
+            _last_flush = time.monotonic()
+        if not pending:
+            return 0
+
+        deltas = defaultdict(dict)
+        for (schema_name, metric), amount in pending.items():
+            deltas[schema_name][metric] = amount
+
+        churches = dict(Church.objects.filter(schema_name__in=deltas).values_list('schema_name', 'id'))
+        period = UsageService.current_period()
+        updated = 0
+
+        for schema_name, metrics in deltas.items():
+            church_id = churches.get(schema_name)
+            if church_id is None:
+                continue
+            # Counters restart when the stored period is an earlier month
+            changes = {
+                metric: Case(
+                    When(period=period, then=F(metric) + metrics.get(metric, 0)),
+                    default=Value(metrics.get(metric, 0))
+                )
+                for metric in MONTHLY
+            }
+            try:
+                ChurchUsage.objects.get_or_create(church_id=church_id, defaults={'period': period})
+                ChurchUsage.objects.filter(church_id=church_id).update(period=period, **changes)
+                updated += 1
+            except Exception as e:
+                logger.error(f'❌ Usage flush failed for {schema_name}: {e}')
+                with _lock:
+                    for metric, amount in metrics.items():
+                        _pending[(schema_name, metric)] += amount
+                continue
+            cache.delete(UsageService.cache_key(schema_name))
+
+        return updated
+
+    @staticmethod
+    def reconcile():
+        """Recompute the current tenant's running totals from its tables."""
+        from apps.documents.models import Document
+        from apps.members.models import Member
+
+        church = Church.objects.get(schema_name=connection.schema_name)
+        with transaction.atomic():
+            ChurchUsage.objects.get_or_create(church=church, defaults={'period': UsageService.current_period()})
+            # Writers update the row in their own transaction: one that commits before
+            # the lock is granted is in the counts, one that commits after applies its delta
+            usage = ChurchUsage.objects.select_for_update().get(church=church)
+            totals = {
+                'storage_bytes': Document.objects.aggregate(total=Sum('file_size'))['total'] or 0,
+                'members': Member.objects.count(),
+                'reconciled_at': timezone.now(),
+            }
+            ChurchUsage.objects.filter(pk=usage.pk).update(**totals)
+        cache.delete(UsageService.cache_key())
+        return totals
+
+    @staticmethod
+    def usage():
+        """Current usage and plan for the current tenant, including unflushed local counts."""
+        schema_name = connection.schema_name
+        key = UsageService.cache_key(schema_name)
+
+        data = cache.get(key)
+        if data is None:
+            usage = ChurchUsage.objects.select_related('church').filter(
+                church__schema_name=schema_name
+            ).first()
+            if usage is None or usage.reconciled_at is None:
+                UsageService.reconcile()
+                usage = ChurchUsage.objects.select_related('church').get(church__schema_name=schema_name)
+
+            current = usage.period == UsageService.current_period()
+            data = {
+                'plan': usage.church.plan,
+                'storage_bytes': usage.storage_bytes,
+                'members': usage.members,
+                'api_calls': usage.api_calls if current else 0,
+                'notifications_sent': usage.notifications_sent if current else 0,
+            }
+            cache.set(key, data, settings.USAGE_CACHE_TIMEOUT)
+
+        pending = UsageService.pending(schema_name)
+        return {
+            'plan': data['plan'],
+            **{metric: data[metric] + pending.get(metric, 0) for metric in METRICS},
+        }
+
+    @staticmethod
+    def limits(plan):
+        return {metric: settings.PLAN_LIMITS.get(plan, {}).get(metric) for metric in METRICS}
+
+    @staticmethod
+    def check(metric, amount=1):
+        """Raise QuotaExceeded if adding ``amount`` would pass the plan's limit."""
+        usage = UsageService.usage()
+        limit = UsageService.limits(usage['plan'])[metric]
+        if limit is not None and usage[metric] + amount > limit:
+            raise QuotaExceeded(
+                f"The {usage['plan']} plan limit for {metric.replace('_', ' ')} ({limit}) has been reached"
+            )
+
+
+def _flush_at_exit():
+    try:
+        UsageService.flush()
+    except Exception as e:
+        logger.warning(f'⚠️ Usage flush at exit failed: {e}')
+
+
+atexit.register(_flush_at_exit)
@@ -0,0 +1,179 @@
+"""
+Volunteer hours service for rollups, summaries and the leaderboard.
+"""
+
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Q, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+
+from apps.volunteers.models import VolunteerHours, VolunteerHoursRollup, VolunteerHoursTotal
+
+ZERO = Decimal('0.00')
+
+
+class VolunteerHoursService:
+    """
+    Service for volunteer hour rollups.
+    Keeps a (member, opportunity) rollup and a per-member total in step
+    with VolunteerHours writes, so summaries and rankings read a handful
+    of rows instead of aggregating the hours table.
+    """
+
+    @staticmethod
+    def contribution(state):
+        """(member_id, opportunity_id), hours, verified hours for a VolunteerHours state dict."""
+        if not state:
+            return None, ZERO, ZERO
+        hours = Decimal(state['hours'] or 0)
+        verified = hours if state.get('verified_by_id') else ZERO
+        return (state['member_id'], state['opportunity_id']), hours, verified
+
+    @staticmethod
+    def state(entry):
+        return {
+            'member_id': entry.member_id,
+            'opportunity_id': entry.opportunity_id,
+            'hours': entry.hours,
+            'verified_by_id': entry.verified_by_id,
+        }
+
+    @staticmethod
+    def apply_delta(key, hours, verified, entries):
+        """
+        Adjust one member's rollup for one opportunity and their total.
+        The rollup row is locked so concurrent writes for the same member
+        and opportunity are serialized.
+        """
+        if key is None or not (hours or verified or entries):
+            return
+        member_id, opportunity_id = key
+
+        with transaction.atomic():
+            if entries > 0:
+                VolunteerHoursRollup.objects.get_or_create(member_id=member_id, opportunity_id=opportunity_id)
+            rollup = VolunteerHoursRollup.objects.select_for_update().filter(
+                member_id=member_id,
+                opportunity_id=opportunity_id
+            ).first()
+            if rollup is not None:
+                rollup.hours += hours
+                rollup.verified_hours += verified
+                rollup.entries += entries
+                if rollup.entries <= 0:
+                    rollup.delete()
+                else:
+                    rollup.save(update_fields=['hours', 'verified_hours', 'entries'])
+
+            # Rows may already be gone when a member is deleted with their hours
+            if entries > 0:
+                VolunteerHoursTotal.objects.get_or_create(member_id=member_id)
+            VolunteerHoursTotal.objects.filter(member_id=member_id).update(
+                hours=F('hours') + hours,
+                verified_hours=F('verified_hours') + verified,
+                opportunities=Coalesce(Subquery(
+                    VolunteerHoursRollup.objects.filter(member_id=OuterRef('member_id'))
+                    .values('member_id').annotate(count=Count('id')).values('count')
+                ), Value(0))
+            )
+
+    @staticmethod
+    def apply_change(previous, entry):
+        """
+        Apply the difference between a VolunteerHours row's previous and
+        current state. ``previous`` is None for new rows; ``entry`` is None
+        when the row was deleted.
+        """
+        old_key, old_hours, old_verified = VolunteerHoursService.contribution(previous)
+        new_key, new_hours, new_verified = VolunteerHoursService.contribution(
+            VolunteerHoursService.state(entry) if entry is not None else None
+        )
+
+        if old_key == new_key:
+            VolunteerHoursService.apply_delta(new_key, new_hours - old_hours, new_verified - old_verified, 0)
+            return
+
+        VolunteerHoursService.apply_delta(old_key, -old_hours, -old_verified, -1)
+        VolunteerHoursService.apply_delta(new_key, new_hours, new_verified, 1)
+
+    @staticmethod
+    def recalculate():
+        """Rebuild the rollups and totals from the hours table. Returns the number of members."""
+        rows = VolunteerHours.objects.values('member_id', 'opportunity_id').annotate(
+            total=Sum('hours'),
+            verified=Coalesce(Sum('hours', filter=Q(verified_by__isnull=False)), Value(ZERO)),
+            count=Count('id')
+        ).order_by()
+
+        rollups = []
+        totals = {}
+        for row in rows:
+            rollups.append(VolunteerHoursRollup(
+                member_id=row['member_id'],
+                opportunity_id=row['opportunity_id'],
+                hours=row['total'],
+                verified_hours=row['verified'],
+                entries=row['count']
+            ))
+            total = totals.setdefault(row['member_id'], VolunteerHoursTotal(member_id=row['member_id']))
+            total.hours += row['total']
+            total.verified_hours += row['verified']
+            total.opportunities += 1
+
+        with transaction.atomic():
+            VolunteerHoursRollup.objects.all().delete()
+            VolunteerHoursTotal.objects.all().delete()
+            VolunteerHoursRollup.objects.bulk_create(rollups, batch_size=500)
+            VolunteerHoursTotal.objects.bulk_create(totals.values(), batch_size=500)
+        return len(totals)
+
+    @staticmethod
+    def summary(member):
+        total = VolunteerHoursTotal.objects.filter(member=member).first()
+        return {
+            'total_hours': total.hours if total else 0,
+            'opportunities_count': total.opportunities if total else 0,
+            'verified_hours': total.verified_hours if total else 0,
+        }
+
+    @staticmethod
+    def leaderboard(limit=10, opportunity=None, member=None):
+        """
+        Top ``limit`` volunteers by hours (church-wide, or for one
+        opportunity), with ``member``'s rank and percentile. Ties share a
+        rank; the percentile is the share of volunteers with no more hours
+        than the member.
+        """
+        if opportunity is not None:
+            ranked = VolunteerHoursRollup.objects.filter(opportunity=opportunity, hours__gt=0)
+        else:
+            ranked = VolunteerHoursTotal.objects.filter(hours__gt=0)
+
+        leaders = []
+        for row in ranked.select_related('member').order_by('-hours', 'member_id')[:limit]:
+            if leaders and leaders[-1]['hours'] == row.hours:
+                rank = leaders[-1]['rank']
+            else:
+                rank = len(leaders) + 1
+            leaders.append({
+                'rank': rank,
+                'member': row.member_id,
+                'member_name': row.member.full_name,
+                'hours': row.hours,
+                'verified_hours': row.verified_hours,
+            })
+
+        result = {'volunteers': ranked.count(), 'leaders': leaders}
+        if member is not None:
+            hours = ranked.filter(member=member).values_list('hours', flat=True).first()
+            position = {'member': member.id, 'hours': hours or ZERO, 'rank': None, 'percentile': 0}
+            if hours and result['volunteers']:
+                counts = ranked.aggregate(
+                    above=Count('id', filter=Q(hours__gt=hours)),
+                    at_or_below=Count('id', filter=Q(hours__lte=hours))
+                )
+                position['rank'] = counts['above'] + 1
+                position['percentile'] = round(100 * counts['at_or_below'] / result['volunteers'], 1)
+            result['position'] = position
+        return result
@@ -0,0 +1,214 @@
+"""
+Volunteer service for signup capacity and waitlists.
+"""
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Q
+from django.utils import timezone
+import logging
+
+from apps.volunteers.models import VolunteerOpportunity, VolunteerSignup
+
+logger = logging.getLogger(__name__)
+
+
+# Signup statuses that occupy a spot
+HOLDING_STATUSES = ['pending', 'approved', 'completed']
+
+
+class VolunteerService:
+    """
+    Volunteer signups.
+
+    - A spot is claimed with one conditional UPDATE
+      (spots_filled + 1 WHERE spots_filled < spots_available), so
+      concurrent signups can never overfill an opportunity
+    - Signups that find it full join a first-come waitlist; each spot
+      released is handed to the oldest waitlisted volunteer in the same
+      transaction
+    - spots_filled is periodically reconciled with the signups that hold
+      a spot, correcting changes made outside these paths
+    """
+
+    @staticmethod
+    def claim_spot(opportunity_id):
+        """Take a spot if one is free (or capacity is unlimited). Returns whether it was taken."""
+        return VolunteerOpportunity.objects.filter(pk=opportunity_id).filter(
+            Q(spots_available__isnull=True)
+            | Q(spots_available=0)
+            | Q(spots_filled__lt=F('spots_available'))
+        ).update(spots_filled=F('spots_filled') + 1) == 1
+
+    @staticmethod
+    def release_spot(opportunity_id):
+        VolunteerOpportunity.objects.filter(
+            pk=opportunity_id,
+            spots_filled__gt=0
+        ).update(spots_filled=F('spots_filled') - 1)
+
+    @staticmethod
+    def signup(opportunity, member_id, user, notes='', waitlist=True):
+        """
+        Sign a member up, or waitlist them when the opportunity is full.
+        Raises ValueError if they are already signed up or waitlisting is off.
+        """
+        try:
+            with transaction.atomic():
+                signup = VolunteerSignup.objects.select_for_update().filter(
+                    opportunity=opportunity,
+                    member_id=member_id
+                ).first()
+                if signup is not None and signup.status in HOLDING_STATUSES + ['waitlisted']:
+                    raise ValueError('Already signed up for this opportunity')
+
+                if VolunteerService.claim_spot(opportunity.pk):
+                    status, waitlisted_at = 'pending', None
+                elif waitlist:
+                    status, waitlisted_at = 'waitlisted', timezone.now()
+                else:
+                    raise ValueError('Opportunity is full')
+
+                if signup is None:
+                    signup = VolunteerSignup.objects.create(
+                        opportunity=opportunity,
+                        member_id=member_id,
+                        user=user,
+                        notes=notes,
+                        status=status,
+                        waitlisted_at=waitlisted_at
+                    )
+                else:
+                    # Signing up again after cancelling or being rejected
+                    signup.user = user
+                    signup.notes = notes
+                    signup.status = status
+                    signup.waitlisted_at = waitlisted_at
+                    signup.approved_by = None
+                    signup.approved_at = None
+                    signup.save()
+        except IntegrityError:
+            # A concurrent signup for the same member won the unique constraint
+            raise ValueError('Already signed up for this opportunity')
+        return signup
+
+    @staticmethod
+    def withdraw(opportunity, member_id):
+        """
+        Cancel a member's signup or waitlist entry. A freed spot goes to
+        the next waitlisted volunteer. Returns the promoted signups.
+        """
+        with transaction.atomic():
+            signup = VolunteerSignup.objects.select_for_update().filter(
+                opportunity=opportunity,
+                member_id=member_id,
+                status__in=HOLDING_STATUSES + ['waitlisted']
+            ).first()
+            if signup is None:
+                raise ValueError('Not signed up for this opportunity')
+
+            held_spot = signup.status in HOLDING_STATUSES
+            signup.status = 'cancelled'
+            signup.waitlisted_at = None
+            signup.save(update_fields=['status', 'waitlisted_at'])
+
+            if not held_spot:
+                return []
+            VolunteerService.release_spot(opportunity.pk)
+            return VolunteerService.promote(opportunity.pk)
+
+    @staticmethod
+    def status_changed(signup, previous_status):
+        """
+        Keep spots_filled in step when a signup's status is edited directly.
+        Raises ValueError if the new status needs a spot and none is free.
+        """
+        if signup.status == 'waitlisted' and signup.waitlisted_at is None:
+            signup.waitlisted_at = timezone.now()
+            signup.save(update_fields=['waitlisted_at'])
+
+        was_holding = previous_status in HOLDING_STATUSES
+        is_holding = signup.status in HOLDING_STATUSES
+        if is_holding and not was_holding:
+            if not VolunteerService.claim_spot(signup.opportunity_id):
+                raise ValueError('Opportunity is full')
+            if signup.waitlisted_at is not None:
+                signup.waitlisted_at = None
+                signup.save(update_fields=['waitlisted_at'])
+        elif was_holding and not is_holding:
+            VolunteerService.release_spot(signup.opportunity_id)
+            transaction.on_commit(lambda: VolunteerService.promote(signup.opportunity_id))
+
+    @staticmethod
+    def promote(opportunity_id):
+        """Move waitlisted volunteers into free spots, oldest first. Returns the promoted signups."""
+        promoted = []
+        with transaction.atomic():
+            while True:
+                signup = VolunteerSignup.objects.select_for_update(skip_locked=True).filter(
+                    opportunity_id=opportunity_id,
+                    status='waitlisted'
+                ).order_by('waitlisted_at', 'id').first()
+                if signup is None or not VolunteerService.claim_spot(opportunity_id):
+                    break
+                signup.status = 'pending'
+                signup.waitlisted_at = None
+                signup.save(update_fields=['status', 'waitlisted_at'])
+                promoted.append(signup)
+
+        for signup in promoted:
+            transaction.on_commit(lambda signup=signup: VolunteerService.notify_promoted(signup))
+        return promoted
+
+    @staticmethod
+    def notify_promoted(signup):
+        from core.services.notification_service import NotificationService
+
+        try:
+            NotificationService.notify_user(
+                signup.user,
+                'You have a volunteer spot',
+                f'A spot opened up for "{signup.opportunity.title}" and you have been moved off the waitlist.',
+                notification_type='volunteer',
+                metadata={'signup_id': signup.id, 'opportunity_id': signup.opportunity_id}
+            )
+        except Exception as e:
+            logger.warning(f'⚠️ Could not notify promoted volunteer {signup.id}: {e}')
+
+    @staticmethod
+    def reconcile():
+        """
+        Reset spots_filled to the number of signups holding a spot wherever
+        they differ, then fill any freed spots from waitlists.
+        Returns the number of opportunities corrected.
+        """
+        held = dict(
+            VolunteerSignup.objects.filter(status__in=HOLDING_STATUSES)
+            .values('opportunity').annotate(count=Count('id')).order_by()
+            .values_list('opportunity', 'count')
+        )
+        drifted = [
+            opportunity_id
+            for opportunity_id, spots_filled in VolunteerOpportunity.objects.values_list('id', 'spots_filled')
+            if spots_filled != held.get(opportunity_id, 0)
+        ]
+
+        for opportunity_id in drifted:
+            with transaction.atomic():
+                # Count again under the row lock so in-flight signups are included
+                opportunity = VolunteerOpportunity.objects.select_for_update().get(pk=opportunity_id)
+                actual = VolunteerSignup.objects.filter(
+                    opportunity_id=opportunity_id,
+                    status__in=HOLDING_STATUSES
+                ).count()
+                if opportunity.spots_filled != actual:
+                    logger.warning(
+                        f'⚠️ Volunteer opportunity {opportunity_id} had {opportunity.spots_filled} '
+                        f'spots filled, expected {actual}'
+                    )
+                    VolunteerOpportunity.objects.filter(pk=opportunity_id).update(spots_filled=actual)
+
+        waiting = VolunteerSignup.objects.filter(status='waitlisted').values_list('opportunity_id', flat=True).distinct()
+        for opportunity_id in waiting:
+            VolunteerService.promote(opportunity_id)
+
+        return len(drifted)
@@ -2,239 +2,116 @@
 Django signals for auto-creating notifications and tracking events.
 """
 
-from django.db.models.signals import post_save, pre_delete
+from django.db.models.signals import post_save, pre_save, post_delete, pre_delete
 from django.dispatch import receiver
-from django.utils import timezone
 
 
 @receiver(post_save, sender='events.Event')
 def create_event_notifications(sender, instance, created, **kwargs):
     """
-    Auto-create notifications when an event is created.
-    Notify all church members.
+    Broadcast a notification when an event is created.
+    Stored once for all church members.
     """
     if created:
-        from apps.notifications.models import Notification
-        from apps.authentication.models import User
-        from django.db import connection
-        from apps.churches.models import Church
-        
-        # Get church from tenant context or creator's church
-        church = None
-        try:
-            # Try to get church from current tenant
-            tenant = connection.get_tenant()
-            if tenant and isinstance(tenant, Church):
-                church = tenant
-        except:
-            pass
-        
-        # Fallback: get church from creator
-        if not church and instance.created_by and instance.created_by.church:
-            church = instance.created_by.church
-        
-        if not church:
-            # Can't determine church, skip notification creation
-            return
-        
-        # Get all members of the church (in tenant schema, all users are members of this church)
-        users = User.objects.filter(
-            church=church,
-            role='member',
-            is_active=True
-        )
+        from core.services.notification_service import NotificationService
         
-        # Determine priority based on event date
-        hours_until = (instance.date - timezone.now()).total_seconds() / 3600
-        priority = 'urgent' if hours_until < 48 else 'normal'
-        
-        # Create notifications for all members
-        notifications = []
-        for user in users:
-            notifications.append(
-                Notification(
-                    user=user,
-                    type='event',
-                    title=f"New Event: {instance.title}",
-                    message=f"{instance.title} has been scheduled for {instance.date.strftime('%B %d, %Y at %I:%M %p')} at {instance.location}",
-                    priority=priority,
-                    metadata={
-                        'event_id': str(instance.id),
-                        'event_title': instance.title,
-                        'event_date': instance.date.isoformat(),
-                    }
-                )
-            )
-        
-        if notifications:
-            Notification.objects.bulk_create(notifications)
+        broadcast = NotificationService.notify_event_created(instance)
+        instance.notification_broadcast_id = broadcast.id
+
+
+@receiver(post_save, sender='events.Event')
+def schedule_event_reminders(sender, instance, **kwargs):
+    """
+    Rebuild the event's pending reminders whenever it is saved.
+    """
+    from core.services.reminder_service import ReminderService
+    
+    ReminderService.sync_event(instance)
+
+
+@receiver(post_delete, sender='events.Event')
+def clear_event_reminders(sender, instance, **kwargs):
+    """
+    Drop pending reminders for a deleted event.
+    """
+    from core.services.reminder_service import ReminderService
+    
+    ReminderService.clear_event(instance.id)
 
 
 @receiver(post_save, sender='announcements.Announcement')
 def create_announcement_notifications(sender, instance, created, **kwargs):
     """
-    Auto-create notifications when announcement is posted.
+    Broadcast a notification when announcement is posted.
+    Stored once for the announcement's target audience.
     """
     if created and instance.is_active:
-        from apps.notifications.models import Notification
-        from apps.authentication.models import User
-        from django.db import connection
-        from apps.churches.models import Church
-        
-        # Get church from tenant context or creator's church
-        church = None
-        try:
-            # Try to get church from current tenant
-            tenant = connection.get_tenant()
-            if tenant and isinstance(tenant, Church):
-                church = tenant
-        except Exception as e:
-            # Fallback: get church from creator
-            if instance.created_by and instance.created_by.church:
-                church = instance.created_by.church
-            else:
-                print(f"Warning: Could not determine church for announcement {instance.id}. Error: {e}")
-                return  # Cannot create notifications without a church context
+        from core.services.notification_service import NotificationService
         
-        # Fallback: get church from creator if tenant context failed
-        if not church and instance.created_by and instance.created_by.church:
-            church = instance.created_by.church
-        
-        if not church:
-            print(f"Warning: No church context found for announcement {instance.id}. Skipping notification creation.")
-            return
-        
-        # Determine recipients based on target_audience
-        if instance.target_audience == 'all':
-            users = User.objects.filter(church=church, is_active=True)
-        elif instance.target_audience == 'members':
-            users = User.objects.filter(church=church, role='member', is_active=True)
-        elif instance.target_audience == 'leaders':
-            users = User.objects.filter(church=church, role__in=['admin', 'leader'], is_active=True)
-        else:
-            # Default to members
-            users = User.objects.filter(church=church, role='member', is_active=True)
-        
-        # Create notifications
-        notifications = []
-        for user in users:
-            notifications.append(
-                Notification(
-                    user=user,
-                    type='announcement',
-                    title=f"New Announcement: {instance.title}",
-                    message=instance.content[:200] + '...' if len(instance.content) > 200 else instance.content,
-                    priority=instance.priority,
-                    metadata={
-                        'announcement_id': str(instance.id),
-                        'announcement_title': instance.title,
-                    }
-                )
-            )
-        
-        if notifications:
-            Notification.objects.bulk_create(notifications)
+        broadcast = NotificationService.notify_announcement_created(instance)
+        instance.notification_broadcast_id = broadcast.id
 
 
 @receiver(post_save, sender='requests.ServiceRequest')
 def create_request_notifications(sender, instance, created, **kwargs):
     """
     Auto-create notifications when member submits service request.
-    Notify admins.
+    Broadcast once to the church's admins.
     """
     if created:
-        from apps.notifications.models import Notification
-        from apps.authentication.models import User
+        from core.services.notification_service import NotificationService
         
-        # Notify admins
-        admins = User.objects.filter(
-            church=instance.member.church,
-            role='admin',
-            is_active=True
+        NotificationService.notify_admins(
+            instance.member.church,
+            title='New Service Request',
+            message=f"{instance.member.full_name} submitted a {instance.type} request",
+            notification_type='member_request',
+            metadata={
+                'request_id': str(instance.id),
+                'member_id': str(instance.member.id),
+                'request_type': instance.type,
+            }
         )
-        
-        notifications = []
-        for admin in admins:
-            notifications.append(
-                Notification(
-                    user=admin,
-                    type='member_request',
-                    title='New Service Request',
-                    message=f"{instance.member.full_name} submitted a {instance.type} request",
-                    priority='high',
-                    metadata={
-                        'request_id': str(instance.id),
-                        'member_id': str(instance.member.id),
-                        'request_type': instance.type,
-                    }
-                )
-            )
-        
-        if notifications:
-            Notification.objects.bulk_create(notifications)
 
 
 @receiver(post_save, sender='members.MemberRequest')
 def create_member_request_notifications(sender, instance, created, **kwargs):
     """
     Auto-create notifications when someone submits a membership request.
-    Notify admins when:
+    Broadcast once to the church's admins when:
     1. New request is submitted (pending)
     2. Request is approved and needs final confirmation
     """
-    from apps.notifications.models import Notification
-    from apps.authentication.models import User
+    from core.services.notification_service import NotificationService
     
     if not instance.church:
         return
     
-    # Get admins for this church
-    # Note: MemberRequest is in public schema, so we need to query public users
-    admins = User.objects.filter(
-        church=instance.church,
-        role='admin',
-        is_active=True
-    )
-    
-    notifications = []
+    metadata = {
+        'request_id': str(instance.id),
+        'request_type': 'membership_application',
+        'status': instance.status,
+    }
     
     if created:
         # New request submitted
-        for admin in admins:
-            notifications.append(
-                Notification(
-                    user=admin,
-                    type='member_request',
-                    title='New Membership Request',
-                    message=f"{instance.name} ({instance.email}) has requested to join your church",
-                    priority='high',
-                    metadata={
-                        'request_id': str(instance.id),
-                        'request_type': 'membership_application',
-                        'status': instance.status,
-                    }
-                )
-            )
+        NotificationService.notify_admins(
+            instance.church,
+            title='New Membership Request',
+            message=f"{instance.name} ({instance.email}) has requested to join your church",
+            notification_type='member_request',
+            metadata=metadata
+        )
     elif instance.status == 'approved' and kwargs.get('update_fields') and 'status' in kwargs['update_fields']:
         # Request approved - notify for final confirmation
-        for admin in admins:
-            notifications.append(
-                Notification(
-                    user=admin,
-                    type='member_request',
-                    title='Membership Request Approved - Awaiting Confirmation',
-                    message=f"{instance.name}'s membership request has been approved and is ready for final confirmation",
-                    priority='normal',
-                    metadata={
-                        'request_id': str(instance.id),
-                        'request_type': 'membership_application',
-                        'status': instance.status,
-                    }
-                )
-            )
-    
-    if notifications:
-        Notification.objects.bulk_create(notifications)
+        NotificationService.notify_admins(
+            instance.church,
+            title='Membership Request Approved - Awaiting Confirmation',
+            message=f"{instance.name}'s membership request has been approved and is ready for final confirmation",
+            notification_type='member_request',
+            priority='normal',
+            metadata=metadata
+        )
 
 
 @receiver(post_save, sender='payments.Payment')
@@ -244,7 +121,7 @@ def create_payment_notifications(sender, instance, created, **kwargs):
     """
     if created and instance.status == 'completed':
         from apps.notifications.models import Notification
-        from apps.authentication.models import User
+        from core.services.notification_service import NotificationService
         
         # Notify the member
         if instance.member and instance.member.user:
@@ -261,67 +138,366 @@ def create_payment_notifications(sender, instance, created, **kwargs):
                 }
             )
         
-        # Notify admins
-        admins = User.objects.filter(
-            church=instance.member.church,
-            role='admin',
-            is_active=True
+        # Broadcast once to admins
+        NotificationService.notify_admins(
+            instance.member.church,
+            title='Payment Received',
+            message=f"{instance.member.full_name} made a {instance.type} payment of {instance.currency} {instance.amount}",
+            notification_type='payment',
+            priority='low',
+            metadata={
+                'payment_id': str(instance.id),
+                'member_id': str(instance.member.id),
+            }
         )
-        
-        for admin in admins:
-            Notification.objects.create(
-                user=admin,
-                type='payment',
-                title='Payment Received',
-                message=f"{instance.member.full_name} made a {instance.type} payment of {instance.currency} {instance.amount}",
-                priority='low',
-                metadata={
-                    'payment_id': str(instance.id),
-                    'member_id': str(instance.member.id),
-                }
-            )
 
 
 @receiver(post_save, sender='prayers.PrayerRequest')
 def create_prayer_request_notifications(sender, instance, created, **kwargs):
     """
     Auto-create notifications for prayer requests.
+    Broadcast once to the church's admins.
     """
     if created:
-        from apps.notifications.models import Notification
-        from apps.authentication.models import User
+        from core.services.notification_service import NotificationService
+        
+        requester_name = instance.member.full_name if instance.member else instance.requester_name or 'Anonymous'
         
-        # Notify admins and prayer team
-        recipients = User.objects.filter(
-            church=instance.member.church if instance.member else None,
-            role__in=['admin'],
-            is_active=True
+        NotificationService.notify_admins(
+            instance.member.church if instance.member else None,
+            title='New Prayer Request',
+            message=f"{requester_name} submitted a prayer request: {instance.title}",
+            notification_type='prayer',
+            priority='normal' if instance.urgency == 'normal' else 'high',
+            metadata={
+                'prayer_id': str(instance.id),
+                'category': instance.category,
+                'urgency': instance.urgency,
+            }
         )
+
+
+@receiver(pre_save, sender='payments.Payment')
+def capture_previous_payment_state(sender, instance, **kwargs):
+    """
+    Remember the pledge-relevant fields of a payment before it is updated,
+    so the post_save handler can apply only the difference to the pledge.
+    """
+    instance._previous_pledge_state = None
+    if instance.pk:
+        instance._previous_pledge_state = sender.objects.filter(pk=instance.pk).values(
+            'pledge_id', 'amount', 'status'
+        ).first()
+
+
+@receiver(post_save, sender='payments.Payment')
+def apply_payment_to_pledge(sender, instance, created, **kwargs):
+    """
+    Incrementally update Pledge.amount_paid for payments linked via pledge_id.
+    """
+    from core.services.pledge_service import PledgeService
+
+    previous = None if created else getattr(instance, '_previous_pledge_state', None)
+    if not instance.pledge_id and not (previous and previous.get('pledge_id')):
+        return
+
+    PledgeService.apply_payment_change(previous, instance)
+
+
+@receiver(post_delete, sender='payments.Payment')
+def remove_payment_from_pledge(sender, instance, **kwargs):
+    """
+    Reverse a deleted payment's contribution to its pledge.
+    """
+    if not instance.pledge_id:
+        return
+
+    from core.services.pledge_service import PledgeService
+
+    PledgeService.apply_payment_change(
+        {'pledge_id': instance.pledge_id, 'amount': instance.amount, 'status': instance.status},
+        None
+    )
+
+
+@receiver(post_save, sender='notifications.Notification')
+def record_notification_created(sender, instance, created, **kwargs):
+    """
+    Update unread counters and push single notification creates.
+    Bulk creates call NotificationService.record_created directly.
+    """
+    if created:
+        from core.services.notification_service import NotificationService
         
-        requester_name = instance.member.full_name if instance.member else instance.requester_name or 'Anonymous'
+        NotificationService.record_created([instance])
+
+
+@receiver(post_save, sender='authentication.User')
+@receiver(post_delete, sender='authentication.User')
+def forget_unread_counters(sender, instance, **kwargs):
+    """
+    Drop a deactivated or deleted user's cached unread counters so the
+    stateless unread_count endpoint reloads, and rejects, the user.
+    """
+    if kwargs.get('signal') is post_save and instance.is_active:
+        return
+    
+    from apps.churches.models import Church
+    from core.services.unread_counter_service import UnreadCounterService
+    
+    schema_name = Church.objects.filter(pk=instance.church_id).values_list('schema_name', flat=True).first()
+    if schema_name:
+        UnreadCounterService.forget(instance.id, schema_name)
+
+
+@receiver(post_save, sender='members.Member')
+@receiver(post_delete, sender='members.Member')
+@receiver(post_save, sender='events.Event')
+@receiver(post_delete, sender='events.Event')
+@receiver(post_save, sender='payments.Payment')
+@receiver(post_delete, sender='payments.Payment')
+@receiver(post_save, sender='ministries.Ministry')
+@receiver(post_delete, sender='ministries.Ministry')
+def invalidate_dashboard_stats(sender, instance, **kwargs):
+    """
+    Drop the tenant's cached dashboard stats when a counted model changes.
+    """
+    from core.services.dashboard_service import DashboardService
+    
+    DashboardService.invalidate()
+
+
+@receiver(pre_save, sender='members.Member')
+@receiver(pre_save, sender='payments.Payment')
+@receiver(pre_save, sender='events.Event')
+@receiver(pre_save, sender='events.EventRegistration')
+@receiver(pre_save, sender='volunteers.VolunteerHours')
+def capture_previous_fact_date(sender, instance, **kwargs):
+    """
+    Remember the analytics fact date a source row had before it is
+    updated, so moving it (e.g. a backdated payment) marks both days.
+    """
+    from core.services.analytics_service import AnalyticsService
+    
+    instance._previous_fact_date = None
+    if instance.pk:
+        instance._previous_fact_date = AnalyticsService.previous_fact_date(sender, instance.pk)
+
+
+@receiver(post_save, sender='members.Member')
+@receiver(post_delete, sender='members.Member')
+@receiver(post_save, sender='payments.Payment')
+@receiver(post_delete, sender='payments.Payment')
+@receiver(post_save, sender='events.Event')
+@receiver(post_save, sender='events.EventRegistration')
+@receiver(post_delete, sender='events.EventRegistration')
+@receiver(post_save, sender='volunteers.VolunteerHours')
+@receiver(post_delete, sender='volunteers.VolunteerHours')
+def mark_analytics_facts_stale(sender, instance, created=False, **kwargs):
+    """
+    Mark the days a source write affects so their daily facts are rebuilt,
+    however far back they are. A new event has no attendance yet; a
+    deleted one marks its day through its registrations.
+    """
+    if sender._meta.label == 'events.Event' and created:
+        return
+    
+    from core.services.analytics_service import AnalyticsService
+    
+    AnalyticsService.mark_stale(
+        getattr(instance, '_previous_fact_date', None),
+        AnalyticsService.current_fact_date(instance)
+    )
+
+
+@receiver(post_save, sender='members.Member')
+@receiver(post_delete, sender='members.Member')
+def invalidate_member_retention(sender, instance, **kwargs):
+    """
+    Drop the tenant's cached cohort retention when a member changes.
+    """
+    from core.services.retention_service import RetentionService
+    
+    RetentionService.invalidate()
+
+
+@receiver(post_save, sender='events.EventRegistration')
+@receiver(post_delete, sender='events.EventRegistration')
+def mark_attendance_forecasts_dirty(sender, instance, **kwargs):
+    """
+    Flag the tenant's attendance forecasts for an incremental refresh.
+    """
+    from core.services.forecast_service import ForecastService
+    
+    ForecastService.mark_dirty()
+
+
+@receiver(post_delete, sender='documents.Document')
+def release_document_blob(sender, instance, **kwargs):
+    """
+    Delete the stored file once no other document shares its content.
+    """
+    from django.db import transaction
+    from core.services.document_service import DocumentService
+    from core.services.photo_variant_service import PhotoVariantService
+    
+    def release():
+        if DocumentService.release(instance):
+            PhotoVariantService.release(instance.content_hash)
+    
+    transaction.on_commit(release)
+
+
+@receiver(post_save, sender='documents.Document')
+def queue_photo_variants(sender, instance, created, **kwargs):
+    """
+    Queue thumbnail and web renditions for newly stored photos.
+    """
+    if created and instance.content_hash:
+        from core.services.photo_variant_service import PhotoVariantService
         
-        notifications = []
-        for user in recipients:
-            notifications.append(
-                Notification(
-                    user=user,
-                    type='prayer',
-                    title='New Prayer Request',
-                    message=f"{requester_name} submitted a prayer request: {instance.title}",
-                    priority='normal' if instance.urgency == 'normal' else 'high',
-                    metadata={
-                        'prayer_id': str(instance.id),
-                        'category': instance.category,
-                        'urgency': instance.urgency,
-                    }
-                )
-            )
+        PhotoVariantService.enqueue(instance)
+
+
+@receiver(post_save, sender='documents.Document')
+@receiver(post_delete, sender='documents.Document')
+def meter_document_storage(sender, instance, created=False, **kwargs):
+    """
+    Track the church's stored bytes.
+    """
+    if created or kwargs['signal'] is post_delete:
+        from core.services.usage_service import UsageService
+        
+        UsageService.record('storage_bytes', instance.file_size if created else -instance.file_size)
+
+
+@receiver(post_save, sender='members.Member')
+@receiver(post_delete, sender='members.Member')
+def meter_members(sender, instance, created=False, **kwargs):
+    """
+    Track the church's member count.
+    """
+    if created or kwargs['signal'] is post_delete:
+        from core.services.usage_service import UsageService
         
-        if notifications:
-            Notification.objects.bulk_create(notifications)
+        UsageService.record('members', 1 if created else -1)
+
+
+@receiver(pre_save, sender='volunteers.VolunteerHours')
+def capture_previous_volunteer_hours(sender, instance, **kwargs):
+    """
+    Remember the rollup-relevant fields of a VolunteerHours row before it
+    is updated, so only the difference is applied to the rollups.
+    """
+    instance._previous_rollup_state = None
+    if instance.pk:
+        instance._previous_rollup_state = sender.objects.filter(pk=instance.pk).values(
+            'member_id', 'opportunity_id', 'hours', 'verified_by_id'
+        ).first()
+
+
+@receiver(post_save, sender='volunteers.VolunteerHours')
+def apply_volunteer_hours_to_rollups(sender, instance, created, **kwargs):
+    """
+    Incrementally update the member's hour rollups.
+    """
+    from core.services.volunteer_hours_service import VolunteerHoursService
+
+    previous = None if created else getattr(instance, '_previous_rollup_state', None)
+    VolunteerHoursService.apply_change(previous, instance)
+
+
+@receiver(post_delete, sender='volunteers.VolunteerHours')
+def remove_volunteer_hours_from_rollups(sender, instance, **kwargs):
+    """
+    Reverse a deleted row's contribution to the member's hour rollups.
+    """
+    from core.services.volunteer_hours_service import VolunteerHoursService
+
+    VolunteerHoursService.apply_change(VolunteerHoursService.state(instance), None)
+
+
+@receiver(pre_save, sender='ministries.MinistryMembership')
+def capture_previous_membership_state(sender, instance, **kwargs):
+    """
+    Remember a membership's ministry and status before it is updated.
+    """
+    instance._previous_membership_state = None
+    if instance.pk:
+        instance._previous_membership_state = sender.objects.filter(pk=instance.pk).values(
+            'ministry_id', 'status'
+        ).first()
+
+
+@receiver(post_save, sender='ministries.MinistryMembership')
+def apply_membership_to_member_count(sender, instance, created, **kwargs):
+    """
+    Keep Ministry.member_count in step with active memberships.
+    """
+    from core.services.ministry_service import MinistryService
+
+    previous = None if created else getattr(instance, '_previous_membership_state', None)
+    MinistryService.apply_membership_change(previous, instance)
+
+
+@receiver(post_delete, sender='ministries.MinistryMembership')
+def remove_membership_from_member_count(sender, instance, **kwargs):
+    """
+    Reverse a deleted membership's contribution to the member count.
+    """
+    from core.services.ministry_service import MinistryService
+
+    MinistryService.apply_membership_change(
+        {'ministry_id': instance.ministry_id, 'status': instance.status},
+        None
+    )
+
+
+@receiver(pre_save, sender='churches.Church')
+def capture_previous_subdomain(sender, instance, **kwargs):
+    """
+    Remember a church's subdomain before it is updated, so the cached
+    lookup for the old subdomain is dropped too.
+    """
+    instance._previous_subdomain = None
+    if instance.pk:
+        instance._previous_subdomain = sender.objects.filter(pk=instance.pk).values_list(
+            'subdomain', flat=True
+        ).first()
 
 
+@receiver(post_save, sender='churches.Church')
+@receiver(post_delete, sender='churches.Church')
+def invalidate_public_church(sender, instance, **kwargs):
+    """
+    Drop the cached public lookup for the church's subdomain.
+    """
+    from core.services.church_service import ChurchService
+    
+    ChurchService.invalidate(instance.subdomain, getattr(instance, '_previous_subdomain', None))
 
 
+@receiver(post_delete, sender='churches.Church')
+def clear_church_reminders(sender, instance, **kwargs):
+    """
+    Drop a deleted church's event reminders so the scheduler never claims
+    rows for a tenant that no longer exists.
+    """
+    from core.services.reminder_service import ReminderService
+    
+    ReminderService.clear_schema(instance.schema_name)
 
 
+@receiver(post_save, sender='churches.Domain')
+@receiver(post_delete, sender='churches.Domain')
+def invalidate_public_church_domains(sender, instance, **kwargs):
+    """
+    The public lookup lists the church's domains.
+    """
+    from apps.churches.models import Church
+    from core.services.church_service import ChurchService
+    
+    # The church may already be gone when its domains are deleted with it
+    ChurchService.invalidate(
+        Church.objects.filter(pk=instance.tenant_id).values_list('subdomain', flat=True).first()
+    )
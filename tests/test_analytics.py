@@ -0,0 +1,300 @@
+"""
+Tests for Analytics API endpoints
+"""
+from datetime import date, datetime, time, timedelta
+import numpy as np
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+from django.utils import timezone
+from tests.base import APITestCase
+from apps.analytics.models import AttendanceChange, AttendanceForecast, ReportJob
+from apps.events.models import Event, EventRegistration
+from apps.members.models import Member
+from apps.notifications.models import Notification
+from apps.payments.models import Payment
+from core.services import AnalyticsService, ForecastService
+
+
+class AnalyticsSeriesTestCase(APITestCase):
+    """Test time-series analytics over daily facts"""
+    
+    def setUp(self):
+        """Set up test data"""
+        super().setUp()
+        cache.clear()
+        
+        self.member = Member.objects.create(
+            member_id='ANA001',
+            first_name='Ana',
+            last_name='Lytics',
+            email='ana@test.com',
+            membership_date=date(2024, 1, 15)
+        )
+        for day, amount, payment_type in [
+            (date(2024, 1, 10), 100, 'tithe'),
+            (date(2024, 2, 10), 50, 'offering'),
+            (date(2025, 1, 10), 150, 'tithe'),
+        ]:
+            Payment.objects.create(
+                member=self.member,
+                amount=amount,
+                type=payment_type,
+                method='cash',
+                status='completed',
+                date=timezone.make_aware(datetime.combine(day, time(12)))
+            )
+        AnalyticsService.rebuild_facts(date(2024, 1, 1), date(2025, 12, 31))
+    
+    def test_monthly_giving_with_yoy(self):
+        """Test monthly giving totals, breakdown and year-over-year change"""
+        response = self.admin_client.get(
+            '/api/v1/analytics/?start=2025-01-01&end=2025-03-31&granularity=month&metrics=giving,new_members'
+        )
+        
+        self.assertSuccess(response)
+        analytics = response.data['analytics']
+        self.assertEqual(analytics['periods'], ['2025-01-01', '2025-02-01', '2025-03-01'])
+        
+        giving = analytics['series']['giving']
+        self.assertEqual(giving['values'], [150.0, 0.0, 0.0])
+        self.assertEqual(giving['yoy_change'], [50.0, -50.0, 0.0])
+        self.assertEqual(giving['yoy_percent'][0], 50.0)
+        self.assertIsNone(giving['yoy_percent'][2])
+        self.assertEqual(giving['by']['tithe'], [150.0, 0.0, 0.0])
+        
+        self.assertEqual(analytics['series']['new_members']['total'], [1.0, 1.0, 1.0])
+    
+    def test_backdated_writes_refresh_their_days(self):
+        """Test a backdated payment marks its day and the refresh rebuilds it"""
+        from apps.analytics.models import DailyFact, StaleFactDate
+        
+        payment = Payment.objects.create(
+            member=self.member,
+            amount=25,
+            type='tithe',
+            method='cash',
+            status='completed',
+            date=timezone.make_aware(datetime.combine(date(2024, 1, 10), time(15)))
+        )
+        self.assertTrue(StaleFactDate.objects.filter(date=date(2024, 1, 10)).exists())
+        
+        AnalyticsService.refresh()
+        self.assertFalse(StaleFactDate.objects.exists())
+        fact = DailyFact.objects.get(metric='giving', dimension='tithe', date=date(2024, 1, 10))
+        self.assertEqual(fact.value, 125)
+        
+        # Moving it to another day rebuilds both
+        payment.date = timezone.make_aware(datetime.combine(date(2024, 3, 5), time(12)))
+        payment.save()
+        AnalyticsService.refresh()
+        self.assertEqual(DailyFact.objects.get(metric='giving', dimension='tithe', date=date(2024, 1, 10)).value, 100)
+        self.assertEqual(DailyFact.objects.get(metric='giving', dimension='tithe', date=date(2024, 3, 5)).value, 25)
+    
+    def test_invalid_granularity(self):
+        """Test unknown granularity is rejected"""
+        response = self.admin_client.get('/api/v1/analytics/?granularity=hour')
+        
+        self.assertEqual(response.status_code, 400)
+
+
+class ReportJobTestCase(APITestCase):
+    """Test background report jobs"""
+    
+    def setUp(self):
+        """Set up test data"""
+        super().setUp()
+        
+        for i in range(3):
+            Member.objects.create(
+                member_id=f'REP00{i}',
+                first_name=f'Report{i}',
+                last_name='Member',
+                email=f'report{i}@test.com',
+                status='active'
+            )
+    
+    def test_csv_report_generated_and_reused(self):
+        """Test a report is generated, downloadable and reused for identical params"""
+        response = self.admin_client.post('/api/v1/reports/', {
+            'report_type': 'members',
+            'format': 'csv',
+            'params': {'status': 'active'}
+        }, format='json')
+        
+        self.assertEqual(response.status_code, 202)
+        job = ReportJob.objects.get(pk=response.data['job']['id'])
+        self.assertEqual(job.status, 'completed')
+        self.assertEqual(job.row_count, 3)
+        
+        response = self.admin_client.get(f'/api/v1/reports/{job.id}/download/')
+        self.assertEqual(response.status_code, 200)
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(len(lines), 4)
+        
+        response = self.admin_client.post('/api/v1/reports/', {
+            'report_type': 'members',
+            'format': 'csv',
+            'params': {'status': 'active'}
+        }, format='json')
+        self.assertSuccess(response)
+        self.assertTrue(response.data['reused'])
+        self.assertEqual(response.data['job']['id'], job.id)
+        
+        self.assertTrue(Notification.objects.filter(
+            user=self.admin_user,
+            metadata__report_job_id=str(job.id)
+        ).exists())
+    
+    def test_pdf_and_xlsx_reports(self):
+        """Test the other formats produce artifacts"""
+        for report_format, magic in [('pdf', b'%PDF'), ('xlsx', b'PK')]:
+            response = self.admin_client.post('/api/v1/reports/', {
+                'report_type': 'members',
+                'format': report_format
+            }, format='json')
+            
+            job = ReportJob.objects.get(pk=response.data['job']['id'])
+            self.assertEqual(job.status, 'completed')
+            with default_storage.open(job.file_path, 'rb') as artifact:
+                self.assertEqual(artifact.read(len(magic)), magic)
+    
+    def test_invalid_params_rejected(self):
+        """Test unknown params are rejected"""
+        response = self.admin_client.post('/api/v1/reports/', {
+            'report_type': 'financial',
+            'params': {'start': 'yesterday'}
+        }, format='json')
+        
+        self.assertEqual(response.status_code, 400)
+    
+    def test_builder_errors_fail_the_job(self):
+        """Test a job whose query cannot be built is failed, not left running"""
+        from core.services import ReportService
+        
+        job = ReportJob.objects.create(
+            report_type='financial',
+            format='csv',
+            params={'start': 'yesterday'},
+            params_hash='bad-params',
+            requested_by=self.admin_user
+        )
+        
+        ReportService.generate(job)
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'failed')
+        self.assertTrue(job.error)
+    
+    def test_members_cannot_request_reports(self):
+        """Test reports are admin only"""
+        response = self.member_client.post('/api/v1/reports/', {'report_type': 'members'}, format='json')
+        
+        self.assertEqual(response.status_code, 403)
+
+
+class RetentionTestCase(APITestCase):
+    """Test membership cohort retention"""
+    
+    def setUp(self):
+        """Set up test data"""
+        super().setUp()
+        cache.clear()
+        
+        now = timezone.now()
+        this_month = timezone.localdate().replace(day=1)
+        two_months_ago = (this_month - timedelta(days=40)).replace(day=1)
+        
+        # Joined two months ago: one still active, one lapsed right away
+        Member.objects.create(
+            member_id='RET001', first_name='Stays', last_name='Active', email='stays@test.com',
+            membership_date=two_months_ago, last_activity_date=now
+        )
+        Member.objects.create(
+            member_id='RET002', first_name='Left', last_name='Early', email='left@test.com',
+            membership_date=two_months_ago, status='inactive',
+            last_activity_date=timezone.make_aware(datetime.combine(two_months_ago, time(12)))
+        )
+        # Marked inactive but seen recently
+        Member.objects.create(
+            member_id='RET003', first_name='Came', last_name='Back', email='back@test.com',
+            membership_date=this_month, status='inactive', last_activity_date=now
+        )
+    
+    def test_cohort_grid(self):
+        """Test cohort sizes, retention and reactivation"""
+        response = self.admin_client.get('/api/v1/analytics/retention/?months=3')
+        
+        self.assertSuccess(response)
+        retention = response.data['retention']
+        first, _, last = retention['cohorts']
+        self.assertEqual(first['size'], 2)
+        self.assertEqual(first['retention'], [100.0, 50.0, 50.0])
+        self.assertEqual(last['size'], 1)
+        self.assertEqual(retention['churn']['churned'], [0, 1, 0])
+        self.assertEqual(retention['reactivation']['total'], 1)
+    
+    def test_invalid_months(self):
+        """Test out-of-range months are rejected"""
+        response = self.admin_client.get('/api/v1/analytics/retention/?months=0')
+        
+        self.assertEqual(response.status_code, 400)
+
+
+class AttendanceForecastTestCase(APITestCase):
+    """Test weekly service attendance forecasts"""
+    
+    def setUp(self):
+        """Set up test data"""
+        super().setUp()
+        cache.clear()
+        
+        self.members = [
+            Member.objects.create(
+                member_id=f'FC{i:03d}', first_name='Fore', last_name=f'Cast{i}', email=f'fc{i}@test.com'
+            )
+            for i in range(5)
+        ]
+        week = ForecastService.current_week()
+        self.events = []
+        for weeks_ago in range(1, 11):
+            event = Event.objects.create(
+                title='Sunday Service',
+                description='Weekly service',
+                type='service',
+                date=timezone.make_aware(datetime.combine(week - timedelta(weeks=weeks_ago, days=1), time(10))),
+                location='Main Hall'
+            )
+            for member in self.members[:3 + weeks_ago % 3]:
+                EventRegistration.objects.create(event=event, member=member, status='attended')
+            self.events.append(event)
+    
+    def test_forecast_endpoint(self):
+        """Test forecasts are fitted and served with intervals"""
+        self.assertEqual(ForecastService.refresh(), {'refitted': 1, 'updated': 0})
+        
+        response = self.admin_client.get('/api/v1/analytics/attendance-forecast/?weeks=4')
+        
+        self.assertSuccess(response)
+        forecast = response.data['forecasts'][0]
+        self.assertEqual(forecast['service'], 'Sunday Service')
+        self.assertEqual(forecast['history_weeks'], 10)
+        self.assertEqual(len(forecast['predictions']), 4)
+        prediction = forecast['predictions'][0]
+        self.assertLessEqual(prediction['lower_95'], prediction['attendance'])
+        self.assertGreaterEqual(prediction['upper_95'], prediction['attendance'])
+    
+    def test_refresh_is_incremental(self):
+        """Test unchanged history is skipped and edited history is refitted"""
+        ForecastService.refresh()
+        self.assertFalse(ForecastService.needs_refresh())
+        self.assertEqual(ForecastService.refresh(), {'refitted': 0, 'updated': 0})
+        
+        state = AttendanceForecast.objects.get().state
+        updated = ForecastService.update(state, np.array([4.0]))
+        self.assertEqual(len(updated['history']), 11)
+        self.assertEqual(updated['alpha'], state['alpha'])
+        
+        EventRegistration.objects.create(event=self.events[-1], member=self.members[-1], status='attended')
+        # The mark is stored with the change, so a worker process sees it too
+        self.assertTrue(AttendanceChange.objects.exists())
+        self.assertTrue(ForecastService.needs_refresh())
+        self.assertEqual(ForecastService.refresh(), {'refitted': 1, 'updated': 0})
@@ -5,6 +5,7 @@ from django.utils import timezone
 from datetime import timedelta
 from tests.base import APITestCase
 from apps.announcements.models import Announcement
+from apps.notifications.models import Notification, BroadcastNotification
 
 
 class AnnouncementsAPITestCase(APITestCase):
@@ -109,7 +110,56 @@ class AnnouncementsAPITestCase(APITestCase):
         self.assertFalse(Announcement.objects.filter(id=self.announcement1.id).exists())
 
 
-
-
-
-
+class AnnouncementBroadcastTestCase(APITestCase):
+    """Test broadcast notifications for announcements"""
+    
+    def test_create_returns_broadcast_id(self):
+        """Test create response includes the broadcast notification ID"""
+        response = self.admin_client.post('/api/v1/announcements/', {
+            'title': 'Broadcast Announcement',
+            'content': 'Reaches every member',
+            'priority': 'normal',
+            'target_audience': 'members',
+            'is_active': True,
+        })
+        
+        self.assertCreated(response)
+        self.assertTrue(response.data['notification_broadcast_id'])
+    
+    def test_broadcast_stored_once(self):
+        """Test an announcement writes one broadcast and no per-user rows"""
+        Announcement.objects.create(
+            title='Members Only',
+            content='Hello members',
+            target_audience='members',
+            created_by=self.admin_user,
+            is_active=True
+        )
+        
+        self.assertEqual(BroadcastNotification.objects.count(), 1)
+        self.assertFalse(Notification.objects.filter(type='announcement').exists())
+    
+    def test_feed_respects_audience_and_receipts(self):
+        """Test members see member broadcasts and read receipts update counts"""
+        Announcement.objects.create(
+            title='Members Only',
+            content='Hello members',
+            target_audience='members',
+            created_by=self.admin_user,
+            is_active=True
+        )
+        
+        response = self.member_client.get('/api/v1/notifications/unread_count/')
+        self.assertEqual(response.data['count'], 1)
+        
+        response = self.admin_client.get('/api/v1/notifications/unread_count/')
+        self.assertEqual(response.data['count'], 0)
+        
+        response = self.member_client.get('/api/v1/notifications/')
+        self.assertSuccess(response)
+        item = response.data['results'][0]
+        self.assertEqual(item['source'], 'broadcast')
+        
+        self.member_client.put(f"/api/v1/notifications/broadcasts/{item['id']}/mark-read/")
+        response = self.member_client.get('/api/v1/notifications/unread_count/')
+        self.assertEqual(response.data['count'], 0)
@@ -1,9 +1,16 @@
 """
 Tests for Authentication API endpoints
 """
+from unittest import mock
+
+from django.core import mail
+from django.core.cache import cache
+from django.test import override_settings
 from django.urls import reverse
 from tests.base import APITestCase
 from apps.authentication.models import User
+from apps.emails.models import EmailDelivery
+from core.services import EmailService
 
 
 class AuthenticationAPITestCase(APITestCase):
@@ -118,3 +125,61 @@ class AuthenticationAPITestCase(APITestCase):
         self.assertSuccess(response)
         self.assertIn('access', response.data)
 
+
+class EmailQueueTestCase(APITestCase):
+    """Test queued outbound email"""
+    
+    def setUp(self):
+        """Set up test data"""
+        super().setUp()
+        cache.clear()
+    
+    def test_forgot_password_queues_email(self):
+        """Test password reset email is queued and delivered by the worker"""
+        response = self.client.post('/api/v1/auth/forgot-password/', {'email': self.member_user.email})
+        self.assertSuccess(response)
+        
+        delivery = EmailDelivery.objects.get(to_email=self.member_user.email)
+        self.assertEqual(delivery.template, 'password_reset')
+        
+        EmailService.process_queue()
+        delivery.refresh_from_db()
+        self.assertEqual(delivery.status, 'sent')
+        self.assertIn(response.data['token'], mail.outbox[-1].body)
+    
+    @override_settings(EMAIL_RATE_LIMIT_PER_MINUTE=2)
+    def test_rate_limit_defers(self):
+        """Test messages over the per-church limit are deferred, not failed"""
+        mail.outbox.clear()
+        for i in range(3):
+            EmailService.enqueue('test_message', f'member{i}@test.com', {'sequence': i}, church=self.church)
+        
+        EmailService.process_queue()
+        
+        self.assertEqual(EmailDelivery.objects.filter(status='sent').count(), 2)
+        self.assertEqual(len(mail.outbox), 2)
+        self.assertEqual(EmailDelivery.objects.filter(status='queued').count(), 1)
+    
+    def test_failures_retry_with_backoff(self):
+        """Test a failing message is rescheduled and eventually marked failed"""
+        delivery = EmailService.enqueue('missing_template', 'member@test.com')
+        
+        EmailService.process_queue()
+        delivery.refresh_from_db()
+        self.assertEqual(delivery.status, 'queued')
+        self.assertEqual(delivery.attempts, 1)
+        self.assertGreater(delivery.next_attempt_at, delivery.updated_at)
+        
+        with override_settings(EMAIL_MAX_ATTEMPTS=2):
+            EmailDelivery.objects.filter(pk=delivery.pk).update(next_attempt_at=delivery.created_at)
+            EmailService.process_queue()
+        delivery.refresh_from_db()
+        self.assertEqual(delivery.status, 'failed')
+    
+    def test_empty_queue_opens_no_connection(self):
+        """Test an idle tick claims nothing and never opens an SMTP session"""
+        with mock.patch('core.services.email_service.get_connection') as get_connection:
+            totals = EmailService.process_queue()
+        
+        get_connection.assert_not_called()
+        self.assertEqual(totals['sent'], 0)
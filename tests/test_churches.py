@@ -0,0 +1,54 @@
+"""
+Tests for public church resolution
+"""
+from django.core.cache import cache
+from tests.base import APITestCase
+
+
+class ChurchBySubdomainTestCase(APITestCase):
+    """Test the cached by_subdomain lookup"""
+    
+    def setUp(self):
+        """Start from an empty cache"""
+        super().setUp()
+        cache.clear()
+        self.url = f'/api/v1/churches/by_subdomain/?subdomain={self.church.subdomain}'
+    
+    def test_etag_and_not_modified(self):
+        """Test responses carry a strong ETag and revalidate with 304"""
+        client = self._create_tenant_client()
+        response = client.get(self.url)
+        
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['church']['subdomain'], self.church.subdomain)
+        self.assertTrue(response['ETag'].startswith('"'))
+        self.assertIn('max-age=', response['Cache-Control'])
+        
+        response = client.get(self.url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+    
+    def test_save_invalidates(self):
+        """Test saving the church serves the new details under a new ETag"""
+        client = self._create_tenant_client()
+        etag = client.get(self.url)['ETag']
+        
+        name = self.church.name
+        self.church.name = 'Renamed Church'
+        self.church.save()
+        try:
+            response = client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+            
+            self.assertEqual(response.status_code, 200)
+            self.assertNotEqual(response['ETag'], etag)
+            self.assertEqual(response.json()['church']['name'], 'Renamed Church')
+        finally:
+            self.church.name = name
+            self.church.save()
+    
+    def test_unknown_subdomain(self):
+        """Test unknown and malformed subdomains are not found"""
+        client = self._create_tenant_client()
+        
+        self.assertEqual(client.get('/api/v1/churches/by_subdomain/?subdomain=nowhere').status_code, 404)
+        self.assertEqual(client.get('/api/v1/churches/by_subdomain/?subdomain=no%20where').status_code, 404)
@@ -0,0 +1,79 @@
+"""
+Tests for Dashboard API endpoints
+"""
+from datetime import timedelta
+from django.core.cache import cache
+from django.utils import timezone
+from tests.base import APITestCase
+from apps.members.models import Member
+from apps.payments.models import Payment
+from core.services import DashboardService
+
+
+class DashboardStatsTestCase(APITestCase):
+    """Test cached dashboard statistics"""
+    
+    def setUp(self):
+        """Set up test data"""
+        super().setUp()
+        cache.clear()
+        
+        self.member = Member.objects.create(
+            member_id='DASH001',
+            first_name='Dash',
+            last_name='Board',
+            email='dash@test.com',
+            status='active'
+        )
+        Payment.objects.create(
+            member=self.member,
+            amount=50,
+            type='tithe',
+            method='cash',
+            status='completed',
+            date=timezone.now()
+        )
+        Payment.objects.create(
+            member=self.member,
+            amount=20,
+            type='offering',
+            method='cash',
+            status='completed',
+            date=DashboardService.month_bounds(timezone.now())[0] - timedelta(days=1)
+        )
+    
+    def get_stats(self):
+        response = self.admin_client.get('/api/v1/dashboard/stats/')
+        self.assertSuccess(response)
+        return response.data['stats']
+    
+    def test_stats(self):
+        """Test totals and this-month ranges"""
+        stats = self.get_stats()
+        
+        self.assertEqual(stats['members']['total'], 1)
+        self.assertEqual(stats['members']['active'], 1)
+        self.assertEqual(stats['payments']['total_count'], 2)
+        self.assertEqual(stats['payments']['total_amount'], 70)
+        self.assertEqual(stats['payments']['this_month_count'], 1)
+        self.assertEqual(stats['payments']['this_month_amount'], 50)
+    
+    def test_stats_cached_until_write(self):
+        """Test stats are served from cache and refreshed by writes"""
+        self.assertEqual(self.get_stats()['members']['total'], 1)
+        
+        # Bypass signals: cached stats are unchanged
+        Member.objects.bulk_create([
+            Member(member_id='DASH002', first_name='Bulk', last_name='Member', email='bulk@test.com')
+        ])
+        with self.assertNumQueries(0):
+            DashboardService.get_stats()
+        self.assertEqual(self.get_stats()['members']['total'], 1)
+        
+        Member.objects.create(
+            member_id='DASH003',
+            first_name='New',
+            last_name='Member',
+            email='new@test.com'
+        )
+        self.assertEqual(self.get_stats()['members']['total'], 3)
@@ -0,0 +1,263 @@
+"""
+Tests for Documents API endpoints
+"""
+import hashlib
+import io
+import shutil
+import tempfile
+from PIL import Image
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import override_settings
+from rest_framework.test import APIClient
+from tests.base import APITestCase
+from apps.documents.models import Document, DocumentUpload, DocumentVariant
+from core.services.document_service import DocumentService, document_storage
+from core.services.photo_variant_service import PhotoVariantService
+
+
+class DocumentStorageTestCase(APITestCase):
+    """Base for tests that store documents in a temporary directory"""
+
+    def setUp(self):
+        """Set up temporary spool and storage directories"""
+        super().setUp()
+        self.tmp = tempfile.mkdtemp()
+        self.settings_override = override_settings(
+            DOCUMENT_UPLOAD_CHUNK_SIZE=4,
+            DOCUMENT_UPLOAD_SPOOL_DIR=f'{self.tmp}/spool',
+            DOCUMENT_STORAGE_BACKEND='django.core.files.storage.FileSystemStorage',
+            DOCUMENT_STORAGE_OPTIONS={'location': f'{self.tmp}/documents'},
+        )
+        self.settings_override.enable()
+        document_storage.cache_clear()
+
+    def tearDown(self):
+        """Remove temporary files"""
+        self.settings_override.disable()
+        document_storage.cache_clear()
+        shutil.rmtree(self.tmp, ignore_errors=True)
+        super().tearDown()
+
+
+class DocumentUploadTestCase(DocumentStorageTestCase):
+    """Test chunked, resumable document uploads"""
+
+    def start_upload(self, content, file_name='notes.txt'):
+        response = self.member_client.post('/api/v1/documents/uploads/', {
+            'file_name': file_name,
+            'total_size': len(content),
+        }, format='json')
+        self.assertEqual(response.status_code, 201)
+        return response.data['upload']['id']
+
+    def send_chunk(self, upload_id, chunk, offset):
+        return self.member_client.generic(
+            'PATCH',
+            f'/api/v1/documents/uploads/{upload_id}/',
+            chunk,
+            content_type='application/octet-stream',
+            HTTP_UPLOAD_OFFSET=str(offset)
+        )
+
+    def test_chunked_upload_resumes_and_completes(self):
+        """Test chunks are appended at the current offset and stored by hash"""
+        content = b'%PDF-1.4 hello'
+        upload_id = self.start_upload(content, 'letter.pdf')
+
+        self.assertEqual(self.send_chunk(upload_id, content[:4], 0).status_code, 200)
+
+        # A stale offset is rejected with the offset to resume from
+        response = self.send_chunk(upload_id, content[:4], 0)
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.data['offset'], 4)
+
+        for offset in range(4, len(content), 4):
+            self.assertEqual(self.send_chunk(upload_id, content[offset:offset + 4], offset).status_code, 200)
+
+        digest = hashlib.sha256(content).hexdigest()
+        response = self.member_client.post(
+            f'/api/v1/documents/uploads/{upload_id}/complete/',
+            {'sha256': digest},
+            format='json'
+        )
+
+        self.assertEqual(response.status_code, 201)
+        document = Document.objects.get(pk=response.data['document']['id'])
+        self.assertEqual(document.content_hash, digest)
+        self.assertEqual(document.file_size, len(content))
+        self.assertEqual(document.mime_type, 'application/pdf')
+        with document_storage().open(document.file_path) as stored:
+            self.assertEqual(stored.read(), content)
+        self.assertEqual(DocumentUpload.objects.get(pk=upload_id).status, 'completed')
+
+    def test_oversized_chunk_rejected(self):
+        """Test chunks larger than DOCUMENT_UPLOAD_CHUNK_SIZE are refused"""
+        upload_id = self.start_upload(b'0123456789')
+
+        response = self.send_chunk(upload_id, b'0123456', 0)
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(DocumentUpload.objects.get(pk=upload_id).received_bytes, 0)
+
+    def test_identical_content_is_stored_once(self):
+        """Test uploads of the same content share one blob"""
+        content = b'same bytes'
+        first = self.member_client.post('/api/v1/documents/upload/', {
+            'file': SimpleUploadedFile('a.txt', content, content_type='text/plain'),
+        }, format='multipart')
+        second = self.member_client.post('/api/v1/documents/upload/', {
+            'file': SimpleUploadedFile('b.txt', content, content_type='text/plain'),
+        }, format='multipart')
+
+        self.assertEqual(first.status_code, 201)
+        self.assertEqual(second.status_code, 201)
+        self.assertEqual(first.data['document']['file_path'], second.data['document']['file_path'])
+
+        path = first.data['document']['file_path']
+        Document.objects.get(pk=first.data['document']['id']).delete()
+        self.assertTrue(document_storage().exists(path))
+
+
+class DocumentDownloadTestCase(DocumentStorageTestCase):
+    """Test signed document downloads"""
+
+    def setUp(self):
+        """Store a document through the service"""
+        super().setUp()
+        self.content = b'0123456789abcdef'
+        self.document = DocumentService.store(
+            ContentFile(self.content),
+            file_name='roster.txt',
+            uploaded_by=self.admin_user,
+        )
+
+    def download_url(self, client):
+        response = client.get(f'/api/v1/documents/{self.document.id}/')
+        self.assertEqual(response.status_code, 200)
+        return response.data['download_url']
+
+    def test_range_and_etag(self):
+        """Test ranges are served and a matching ETag answers 304"""
+        url = self.download_url(self.admin_client)
+        client = APIClient()
+
+        response = client.get(url, HTTP_RANGE='bytes=4-7')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(b''.join(response.streaming_content), b'4567')
+        self.assertEqual(response['Content-Range'], f'bytes 4-7/{len(self.content)}')
+
+        etag = response['ETag']
+        self.assertEqual(etag, f'"{self.document.content_hash}"')
+        self.assertEqual(client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        self.assertEqual(client.get(url, HTTP_RANGE='bytes=100-').status_code, 416)
+
+    def test_invalid_token_rejected(self):
+        """Test tampered links are refused"""
+        response = APIClient().get(f'/api/v1/documents/{self.document.id}/download/?token=bogus')
+
+        self.assertEqual(response.status_code, 403)
+
+    def test_visibility_rechecked(self):
+        """Test a link stops working once the user may no longer see the document"""
+        self.document.is_public = True
+        self.document.save()
+        url = self.download_url(self.member_client)
+
+        self.document.is_public = False
+        self.document.save()
+
+        self.assertEqual(APIClient().get(url).status_code, 404)
+
+    @override_settings(DOCUMENT_DELIVERY_MODE='x-accel-redirect')
+    def test_accel_redirect(self):
+        """Test offload mode only authorizes and names the file for the proxy"""
+        response = APIClient().get(self.download_url(self.admin_client))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['X-Accel-Redirect'], f'/protected-documents/{self.document.file_path}')
+
+
+@override_settings(DOCUMENT_IMAGE_VARIANTS=[('thumb', 32), ('web', 64)])
+class PhotoVariantTestCase(DocumentStorageTestCase):
+    """Test thumbnail and web variants for photos"""
+
+    def setUp(self):
+        """Store a photo through the service"""
+        super().setUp()
+        cache.clear()
+        image = io.BytesIO()
+        Image.new('RGB', (200, 100), 'red').save(image, 'JPEG')
+        self.document = DocumentService.store(
+            ContentFile(image.getvalue()),
+            file_name='choir.jpg',
+            uploaded_by=self.admin_user,
+            category='photo',
+        )
+
+    def test_variants_rendered_once(self):
+        """Test variants are generated, keyed by hash and not regenerated"""
+        PhotoVariantService.drain()
+
+        self.document.refresh_from_db()
+        self.assertEqual(self.document.variant_status, 'ready')
+        variants = {variant.name: variant for variant in DocumentVariant.objects.filter(content_hash=self.document.content_hash)}
+        self.assertEqual((variants['thumb'].width, variants['thumb'].height), (32, 16))
+        self.assertEqual(variants['web'].width, 64)
+        self.assertTrue(variants['web'].file_path.startswith(self.document.file_path))
+
+        # Same photo again: shares the existing variants
+        copy = DocumentService.store(
+            ContentFile(document_storage().open(self.document.file_path).read()),
+            file_name='choir-copy.jpg',
+            uploaded_by=self.admin_user,
+            category='photo',
+        )
+        copy.refresh_from_db()
+        self.assertEqual(copy.variant_status, 'ready')
+        self.assertEqual(DocumentVariant.objects.count(), 2)
+
+    def test_smallest_suitable_variant_served(self):
+        """Test ?width= picks the smallest variant that is wide enough"""
+        PhotoVariantService.drain()
+        url = self.client_url()
+
+        response = APIClient().get(f'{url}&width=20')
+        self.assertEqual(response['Content-Type'], 'image/webp')
+        self.assertEqual(response['ETag'], f'"{self.document.content_hash}-thumb"')
+
+        response = APIClient().get(f'{url}&width=500')
+        self.assertEqual(response['Content-Type'], 'image/jpeg')
+
+    def test_oversized_originals_skipped(self):
+        """Test photos over the pixel limit are failed from their header and served as-is"""
+        DocumentVariant.objects.all().delete()
+        Document.objects.update(variant_status='pending')
+        with override_settings(DOCUMENT_VARIANT_MAX_PIXELS=100):
+            PhotoVariantService.drain()
+
+        self.document.refresh_from_db()
+        self.assertEqual(self.document.variant_status, 'failed')
+        self.assertFalse(DocumentVariant.objects.exists())
+
+    def test_batches_capped_by_bytes(self):
+        """Test a batch stops at the byte budget but always takes one photo"""
+        image = io.BytesIO()
+        Image.new('RGB', (100, 200), 'blue').save(image, 'JPEG')
+        DocumentService.store(
+            ContentFile(image.getvalue()),
+            file_name='choir-2.jpg',
+            uploaded_by=self.admin_user,
+            category='photo',
+        )
+        Document.objects.update(variant_status='pending')
+
+        with override_settings(DOCUMENT_VARIANT_BATCH_BYTES=1):
+            self.assertEqual(len(PhotoVariantService.claim_batch()), 1)
+            self.assertEqual(PhotoVariantService.drain(), 2)
+        self.assertFalse(Document.objects.filter(variant_status='pending').exists())
+
+    def client_url(self):
+        response = self.admin_client.get(f'/api/v1/documents/{self.document.id}/')
+        return response.data['download_url']
@@ -130,3 +130,85 @@ class EventsAPITestCase(APITestCase):
 
 
 
+
+
+class EventReminderTestCase(APITestCase):
+    """Test the event reminder scheduler"""
+    
+    def setUp(self):
+        super().setUp()
+        from apps.members.models import Member
+        
+        self.member = Member.objects.create(
+            member_id='REM001',
+            first_name='Reminder',
+            last_name='Member',
+            email='reminder@test.com',
+            user=self.member_user
+        )
+        self.event = Event.objects.create(
+            title='Prayer Night',
+            description='Evening of prayer',
+            type='service',
+            date=timezone.now() + timedelta(days=2),
+            location='Main Hall'
+        )
+        EventRegistration.objects.create(event=self.event, member=self.member)
+    
+    def test_saving_event_schedules_reminders(self):
+        """Test that saving an event creates one reminder per lead time"""
+        from apps.reminders.models import EventReminder
+        
+        reminders = EventReminder.objects.filter(schema_name='test', event_id=self.event.id)
+        self.assertEqual(reminders.count(), 2)
+        
+        # Moving the event rewrites its pending reminders
+        self.event.date = timezone.now() + timedelta(days=3)
+        self.event.save()
+        self.assertTrue(all(r.occurrence == self.event.date for r in reminders))
+    
+    def test_send_due_notifies_registrants(self):
+        """Test that due reminders notify registered members once"""
+        from apps.notifications.models import Notification
+        from apps.reminders.models import EventReminder
+        from core.services.reminder_service import ReminderService
+        
+        EventReminder.objects.filter(event_id=self.event.id, lead_minutes=1440).update(
+            due_at=timezone.now() - timedelta(minutes=1)
+        )
+        
+        self.assertEqual(ReminderService.send_due(), 1)
+        self.assertEqual(ReminderService.send_due(), 0)
+        
+        reminder = EventReminder.objects.get(event_id=self.event.id, lead_minutes=1440)
+        self.assertEqual(reminder.status, 'sent')
+        self.assertEqual(reminder.recipients, 1)
+        self.assertEqual(
+            Notification.objects.filter(user=self.member_user, type='event_reminder').count(),
+            1
+        )
+    
+    def test_failed_reminders_back_off_then_fail(self):
+        """Test a reminder that cannot be sent is retried later and eventually failed"""
+        from django.test import override_settings
+        from apps.reminders.models import EventReminder
+        from core.services.reminder_service import ReminderService
+        
+        # Rows for a tenant whose schema is gone can never be sent
+        EventReminder.objects.filter(event_id=self.event.id, lead_minutes=1440).update(
+            schema_name='missing_schema',
+            due_at=timezone.now() - timedelta(minutes=1)
+        )
+        
+        self.assertEqual(ReminderService.send_due(), 1)
+        reminder = EventReminder.objects.get(schema_name='missing_schema')
+        self.assertEqual(reminder.status, 'pending')
+        self.assertEqual(reminder.attempts, 1)
+        self.assertGreater(reminder.due_at, timezone.now())
+        self.assertEqual(ReminderService.send_due(), 0)
+        
+        with override_settings(EVENT_REMINDER_MAX_ATTEMPTS=2):
+            EventReminder.objects.filter(pk=reminder.pk).update(due_at=timezone.now() - timedelta(minutes=1))
+            ReminderService.send_due()
+        reminder.refresh_from_db()
+        self.assertEqual(reminder.status, 'failed')
@@ -1,9 +1,14 @@
 """
 Tests for Ministries API endpoints
 """
+from datetime import timedelta
+from django.db import connection
+from django.utils import timezone
+from django.test.utils import CaptureQueriesContext
 from tests.base import APITestCase
-from apps.ministries.models import Ministry, MinistryMembership
+from apps.ministries.models import Ministry, MinistryMeeting, MinistryMembership
 from apps.members.models import Member
+from core.services.ministry_service import MinistryService
 
 
 class MinistriesAPITestCase(APITestCase):
@@ -101,7 +106,195 @@ class MinistriesAPITestCase(APITestCase):
         self.assertEqual(membership.ministry.name, 'Worship Team')
 
 
+class MinistryMemberCountTestCase(APITestCase):
+    """Test denormalized member counts and capacity"""
+    
+    def setUp(self):
+        """Create a one-place ministry and two members"""
+        super().setUp()
+        self.ministry = Ministry.objects.create(
+            name='Prayer Circle',
+            description='Weekly prayer meeting',
+            category='prayer',
+            max_capacity=1
+        )
+        self.members = [
+            Member.objects.create(
+                member_id=f'MIN01{number}',
+                first_name=f'Prayer{number}',
+                last_name='Member',
+                email=f'prayer{number}@test.com'
+            )
+            for number in range(2)
+        ]
+    
+    def join(self, member):
+        return self.admin_client.post(
+            f'/api/v1/ministries/{self.ministry.id}/join/',
+            {'member_id': member.id},
+            format='json'
+        )
+    
+    def test_capacity_and_count(self):
+        """Test joins stop at capacity and leaving frees the place"""
+        self.assertEqual(self.join(self.members[0]).status_code, 200)
+        self.assertEqual(self.join(self.members[1]).status_code, 400)
+        self.ministry.refresh_from_db()
+        self.assertEqual(self.ministry.member_count, 1)
+        
+        self.admin_client.post(
+            f'/api/v1/ministries/{self.ministry.id}/leave/',
+            {'member_id': self.members[0].id},
+            format='json'
+        )
+        self.ministry.refresh_from_db()
+        self.assertEqual(self.ministry.member_count, 0)
+        
+        self.assertEqual(self.join(self.members[1]).status_code, 200)
+        self.assertEqual(self.join(self.members[0]).status_code, 400)
+    
+    def test_saving_ministry_keeps_count(self):
+        """Test saving a stale ministry instance does not overwrite the count"""
+        stale = Ministry.objects.get(pk=self.ministry.pk)
+        self.join(self.members[0])
+        
+        stale.name = 'Prayer Warriors'
+        stale.save()
+        
+        self.ministry.refresh_from_db()
+        self.assertEqual(self.ministry.member_count, 1)
+        self.assertEqual(self.ministry.name, 'Prayer Warriors')
+    
+    def test_reconcile_corrects_drift(self):
+        """Test counts changed outside the membership paths are reset"""
+        self.join(self.members[0])
+        Ministry.objects.filter(pk=self.ministry.pk).update(member_count=5)
+        
+        self.assertEqual(MinistryService.reconcile(), 1)
+        self.ministry.refresh_from_db()
+        self.assertEqual(self.ministry.member_count, 1)
+        self.assertEqual(MinistryService.reconcile(), 0)
+    
+    def test_list_queries_constant(self):
+        """Test the list does not query per ministry"""
+        with CaptureQueriesContext(connection) as few:
+            self.admin_client.get('/api/v1/ministries/')
+        
+        for number in range(3):
+            ministry = Ministry.objects.create(
+                name=f'Group {number}',
+                description='Small group',
+                category='other',
+                leader=self.members[0]
+            )
+            MinistryMembership.objects.create(ministry=ministry, member=self.members[1])
+        
+        with CaptureQueriesContext(connection) as many:
+            response = self.admin_client.get('/api/v1/ministries/')
+        
+        self.assertEqual(len(many), len(few))
+        counts = {ministry['name']: ministry['member_count'] for ministry in response.data['results']}
+        self.assertEqual(counts['Group 0'], 1)
 
 
-
-
+class GroupAttendanceTestCase(APITestCase):
+    """Test small-group attendance recording and rates"""
+    
+    def setUp(self):
+        """Create a group with three members who joined a month ago"""
+        super().setUp()
+        self.ministry = Ministry.objects.create(
+            name='Home Group',
+            description='Tuesday home group',
+            category='education'
+        )
+        self.members = []
+        for number in range(3):
+            member = Member.objects.create(
+                member_id=f'MIN02{number}',
+                first_name=f'Home{number}',
+                last_name='Member',
+                email=f'home{number}@test.com'
+            )
+            MinistryMembership.objects.create(ministry=self.ministry, member=member)
+            self.members.append(member)
+        MinistryMembership.objects.filter(ministry=self.ministry).update(
+            joined_at=timezone.now() - timedelta(weeks=4)
+        )
+        self.today = timezone.localdate()
+    
+    def record(self, days_ago, present, client=None):
+        return (client or self.admin_client).post(f'/api/v1/ministries/{self.ministry.id}/attendance/', {
+            'date': (self.today - timedelta(days=days_ago)).isoformat(),
+            'present': [member.id for member in present],
+        }, format='json')
+    
+    def test_record_stores_one_row_per_meeting(self):
+        """Test a meeting is stored as one array and re-recording replaces it"""
+        self.assertEqual(self.record(7, self.members[:2]).status_code, 200)
+        self.assertEqual(self.record(7, self.members).status_code, 200)
+        
+        meeting = MinistryMeeting.objects.get(ministry=self.ministry)
+        self.assertEqual(meeting.attendee_ids, sorted(member.id for member in self.members))
+        self.assertEqual(meeting.roster_size, 3)
+    
+    def test_unknown_member_rejected(self):
+        """Test attendees must be on the active roster"""
+        outsider = Member.objects.create(
+            member_id='MIN029',
+            first_name='Out',
+            last_name='Sider',
+            email='outsider@test.com'
+        )
+        
+        response = self.record(7, [self.members[0], outsider])
+        
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(MinistryMeeting.objects.exists())
+    
+    def test_backdated_meeting_uses_roster_on_date(self):
+        """Test past meetings check attendees against memberships active that day"""
+        self.admin_client.post(
+            f'/api/v1/ministries/{self.ministry.id}/leave/',
+            {'member_id': self.members[2].id},
+            format='json'
+        )
+        left = MinistryMembership.objects.filter(ministry=self.ministry, member=self.members[2])
+        self.assertIsNotNone(left.get().left_at)
+        left.update(left_at=timezone.now() - timedelta(days=3))
+        newcomer = Member.objects.create(
+            member_id='MIN028',
+            first_name='New',
+            last_name='Comer',
+            email='newcomer@test.com'
+        )
+        MinistryMembership.objects.create(ministry=self.ministry, member=newcomer)
+        
+        self.assertEqual(self.record(7, [self.members[0], newcomer]).status_code, 400)
+        self.assertEqual(self.record(7, self.members).status_code, 200)
+        self.assertEqual(MinistryMeeting.objects.get(ministry=self.ministry).roster_size, 3)
+        
+        self.assertEqual(self.record(0, [self.members[2]]).status_code, 400)
+        self.assertEqual(self.record(0, [self.members[0], newcomer]).status_code, 200)
+        self.assertEqual(MinistryMeeting.objects.get(date=self.today).roster_size, 3)
+    
+    def test_rates(self):
+        """Test group, member and church-wide rates over the trailing weeks"""
+        self.record(14, self.members)
+        self.record(7, self.members[:1])
+        
+        report = self.admin_client.get(f'/api/v1/ministries/{self.ministry.id}/attendance/').data['attendance']
+        self.assertEqual(report['meetings'], 2)
+        self.assertEqual(report['rate'], 66.7)
+        rates = {row['member']: row['rate'] for row in report['members']}
+        self.assertEqual(rates[self.members[0].id], 100.0)
+        self.assertEqual(rates[self.members[1].id], 50.0)
+        
+        response = self.admin_client.get('/api/v1/ministries/attendance_rates/')
+        self.assertEqual(response.data['data'][0]['rate'], 66.7)
+    
+    def test_members_cannot_record(self):
+        """Test ordinary members cannot take attendance"""
+        response = self.record(7, self.members, client=self.member_client)
+        
+        self.assertEqual(response.status_code, 403)
@@ -0,0 +1,227 @@
+"""
+Tests for Notifications API endpoints
+"""
+from asgiref.sync import sync_to_async
+from channels.testing import WebsocketCommunicator
+from django.conf import settings
+from django.core import mail
+from django.core.cache import cache
+from django_tenants.utils import schema_context
+from rest_framework_simplejwt.tokens import RefreshToken
+from config.asgi import application
+from tests.base import APITestCase
+from apps.announcements.models import Announcement
+from apps.notifications.models import Notification, NotificationDigest, NotificationPreference
+from datetime import timedelta
+from django.utils import timezone
+from core.services import DigestService, NotificationRetentionService, NotificationService, UnreadCounterService
+
+
+class UnreadCounterTestCase(APITestCase):
+    """Test cached unread notification counters"""
+
+    def setUp(self):
+        """Set up test data"""
+        super().setUp()
+        cache.clear()
+
+    def get_count(self):
+        response = self.member_client.get('/api/v1/notifications/unread_count/')
+        self.assertSuccess(response)
+        return response.data['count']
+
+    def test_count_served_from_cache(self):
+        """Test a warm counter is returned without recounting"""
+        NotificationService.notify_user(self.member_user, 'First', 'Hello')
+        self.assertEqual(self.get_count(), 1)
+
+        # Bypass signals: the cached counter is not touched
+        Notification.objects.bulk_create([
+            Notification(user=self.member_user, type='system', title='Second', message='Hi')
+        ])
+        self.assertEqual(self.get_count(), 1)
+
+        UnreadCounterService.reconcile(self.church.id)
+        self.assertEqual(self.get_count(), 2)
+
+    def test_counter_follows_writes(self):
+        """Test creates, broadcasts and reads adjust the counter"""
+        self.assertEqual(self.get_count(), 0)
+
+        notification = NotificationService.notify_user(self.member_user, 'Personal', 'Hello')
+        self.assertEqual(self.get_count(), 1)
+
+        Announcement.objects.create(
+            title='Members Only',
+            content='Hello members',
+            target_audience='members',
+            created_by=self.admin_user,
+            is_active=True
+        )
+        self.assertEqual(self.get_count(), 2)
+
+        self.member_client.put(f'/api/v1/notifications/{notification.id}/mark_read/')
+        self.member_client.put(f'/api/v1/notifications/{notification.id}/mark_read/')
+        self.assertEqual(self.get_count(), 1)
+
+        self.member_client.put('/api/v1/notifications/mark_all_read/')
+        self.assertEqual(self.get_count(), 0)
+
+    def test_inactive_user_rejected(self):
+        """Test a deactivated user's token stops working once counters are warm"""
+        self.assertEqual(self.get_count(), 0)
+
+        self.member_user.is_active = False
+        self.member_user.save()
+
+        response = self.member_client.get('/api/v1/notifications/unread_count/')
+        self.assertEqual(response.status_code, 401)
+
+    def test_admin_notifications_stored_once(self):
+        """Test admin notifications are one broadcast only admins see"""
+        NotificationService.notify_admins(self.church, 'New Prayer Request', 'Please pray', notification_type='prayer')
+
+        self.assertFalse(Notification.objects.filter(type='prayer').exists())
+        self.assertEqual(self.get_count(), 0)
+        response = self.admin_client.get('/api/v1/notifications/unread_count/')
+        self.assertEqual(response.data['count'], 1)
+
+
+class NotificationPushTestCase(APITestCase):
+    """Test WebSocket notification push"""
+
+    def get_communicator(self, user=None):
+        headers = [(b'origin', b'http://localhost:5173')]
+        if user is not None:
+            token = RefreshToken.for_user(user).access_token
+            headers.append((b'cookie', f'{settings.ACCESS_TOKEN_COOKIE_NAME}={token}'.encode()))
+        return WebsocketCommunicator(
+            application,
+            f'/ws/notifications/?tenant={self.church.subdomain}',
+            headers=headers
+        )
+
+    def notify_member(self, title):
+        with schema_context(self.church.schema_name):
+            NotificationService.notify_user(self.member_user, title, 'Hello')
+
+    async def test_rejects_anonymous(self):
+        """Test connections without a token are closed"""
+        communicator = self.get_communicator()
+        connected, code = await communicator.connect()
+        self.assertFalse(connected)
+        self.assertEqual(code, 4401)
+
+    async def test_pushes_new_notifications(self):
+        """Test connected users receive their notifications"""
+        communicator = self.get_communicator(self.member_user)
+        connected, _ = await communicator.connect()
+        self.assertTrue(connected)
+
+        message = await communicator.receive_json_from()
+        self.assertEqual(message['event'], 'unread_count')
+
+        await sync_to_async(self.notify_member)('Pushed')
+
+        message = await communicator.receive_json_from()
+        self.assertEqual(message['event'], 'notification')
+        self.assertEqual(message['data']['title'], 'Pushed')
+        self.assertEqual(message['data']['source'], 'personal')
+
+        await communicator.disconnect()
+
+
+class NotificationRetentionTestCase(APITestCase):
+    """Test notification partition maintenance and purging"""
+
+    def test_partitions_exist_ahead(self):
+        """Test partitions are created up front and only once"""
+        NotificationRetentionService.ensure_partitions(months_ahead=2)
+        self.assertEqual(NotificationRetentionService.ensure_partitions(months_ahead=2), [])
+
+        current = timezone.now().date().replace(day=1)
+        self.assertIn(current, NotificationRetentionService.partitions())
+
+    def test_purges_expired_and_dismissed(self):
+        """Test expired and long-dismissed notifications are deleted in batches"""
+        now = timezone.now()
+        keep = NotificationService.notify_user(self.member_user, 'Keep', 'Still relevant')
+        for title in ['Expired 1', 'Expired 2', 'Expired 3']:
+            notification = NotificationService.notify_user(self.member_user, title, 'Old')
+            notification.expires_at = now - timedelta(days=1)
+            notification.save()
+        dismissed = NotificationService.notify_user(self.member_user, 'Dismissed', 'Old')
+        dismissed.dismissed_at = now - timedelta(days=60)
+        dismissed.save()
+
+        deleted = NotificationRetentionService.purge_expired_rows(batch_size=2, dismissed_days=30)
+
+        self.assertEqual(deleted, 4)
+        self.assertEqual(list(Notification.objects.values_list('id', flat=True)), [keep.id])
+
+
+class NotificationDigestTestCase(APITestCase):
+    """Test notification digest emails"""
+
+    def setUp(self):
+        """Set up test data"""
+        super().setUp()
+        cache.clear()
+
+    def test_one_digest_per_user(self):
+        """Test pending notifications are combined into one email per user"""
+        NotificationService.notify_user(self.member_user, 'First', 'Hello')
+        NotificationService.notify_user(self.member_user, 'Second', 'Hello again')
+
+        result = DigestService.send_digests(self.church)
+
+        member_emails = [m for m in mail.outbox if m.to == [self.member_user.email]]
+        self.assertEqual(len(member_emails), 1)
+        self.assertIn('2 new notifications', member_emails[0].subject)
+        self.assertEqual(result['failed'], 0)
+        self.assertTrue(NotificationDigest.objects.filter(user=self.member_user, frequency='daily').exists())
+
+        # Nothing new is due until the next period
+        mail.outbox.clear()
+        DigestService.send_digests(self.church)
+        self.assertEqual(len(mail.outbox), 0)
+
+    def test_preference_changes_apply_to_next_run(self):
+        """Test a preference changed between runs is honoured without any invalidation"""
+        NotificationPreference.objects.create(
+            user=self.member_user, channel='email', category='system', frequency='immediate'
+        )
+        NotificationService.notify_user(self.member_user, 'First', 'Hello')
+        DigestService.send_digests(self.church)
+        self.assertEqual(len([m for m in mail.outbox if m.to == [self.member_user.email]]), 1)
+        
+        # Bypass signals, as a change saved by another process would
+        NotificationPreference.objects.filter(user=self.member_user).update(enabled=False)
+        mail.outbox.clear()
+        NotificationService.notify_user(self.member_user, 'Second', 'Hello again')
+        DigestService.send_digests(self.church)
+        self.assertFalse([m for m in mail.outbox if m.to == [self.member_user.email]])
+
+    def test_honours_preferences(self):
+        """Test disabled categories and quiet hours hold back digests"""
+        NotificationPreference.objects.create(
+            user=self.member_user, channel='email', category='system', enabled=False
+        )
+        NotificationService.notify_user(self.member_user, 'Muted', 'Hello')
+
+        DigestService.send_digests(self.church)
+        self.assertFalse([m for m in mail.outbox if m.to == [self.member_user.email]])
+
+        now = timezone.now()
+        NotificationPreference.objects.create(
+            user=self.member_user, channel='email', category='payment', frequency='immediate',
+            quiet_hours_start=(now - timedelta(hours=1)).time(),
+            quiet_hours_end=(now + timedelta(hours=1)).time(),
+        )
+        NotificationService.notify_user(self.member_user, 'Quiet', 'Hello', notification_type='payment')
+
+        DigestService.send_digests(self.church, now=now)
+        self.assertFalse([m for m in mail.outbox if m.to == [self.member_user.email]])
+
+        DigestService.send_digests(self.church, now=now + timedelta(hours=2))
+        self.assertTrue([m for m in mail.outbox if m.to == [self.member_user.email]])
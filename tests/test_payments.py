@@ -1,11 +1,13 @@
 """
 Tests for Payments API endpoints
 """
+from datetime import date
 from decimal import Decimal
 from django.utils import timezone
 from tests.base import APITestCase
 from apps.payments.models import Payment, Pledge
 from apps.members.models import Member
+from core.services import PledgeService
 
 
 class PaymentsAPITestCase(APITestCase):
@@ -160,7 +162,94 @@ class PledgesAPITestCase(APITestCase):
         self.assertEqual(response.data['frequency'], 'weekly')
 
 
-
-
-
-
+class PledgeTrackingTestCase(APITestCase):
+    """Test pledge fulfilment tracking and projection"""
+    
+    def setUp(self):
+        """Set up test data"""
+        super().setUp()
+        
+        self.member = Member.objects.create(
+            member_id='PLG002',
+            first_name='Paul',
+            last_name='Pledger',
+            email='paul@test.com'
+        )
+        
+        self.pledge = Pledge.objects.create(
+            member=self.member,
+            amount=Decimal('1200.00'),
+            frequency='monthly',
+            start_date=date(2025, 1, 15),
+            end_date=date(2025, 12, 15),
+            status='active'
+        )
+    
+    def _pay(self, reference, amount, status='completed'):
+        return Payment.objects.create(
+            member=self.member,
+            amount=Decimal(amount),
+            type='pledge',
+            method='cash',
+            status=status,
+            date=timezone.now(),
+            reference=reference,
+            pledge_id=str(self.pledge.id)
+        )
+    
+    def test_completed_payment_applied_to_pledge(self):
+        """Test linked payments increment amount_paid"""
+        self._pay('PLGREF1', '100.00')
+        self._pay('PLGREF2', '50.00')
+        
+        self.pledge.refresh_from_db()
+        self.assertEqual(self.pledge.amount_paid, Decimal('150.00'))
+    
+    def test_status_change_and_delete_adjust_pledge(self):
+        """Test refunds and deletions reverse the contribution"""
+        payment = self._pay('PLGREF3', '100.00', status='pending')
+        self.pledge.refresh_from_db()
+        self.assertEqual(self.pledge.amount_paid, Decimal('0.00'))
+        
+        payment.status = 'completed'
+        payment.save()
+        self.pledge.refresh_from_db()
+        self.assertEqual(self.pledge.amount_paid, Decimal('100.00'))
+        
+        payment.delete()
+        self.pledge.refresh_from_db()
+        self.assertEqual(self.pledge.amount_paid, Decimal('0.00'))
+    
+    def test_pledge_completed_when_fully_paid(self):
+        """Test pledge status flips to completed"""
+        self._pay('PLGREF4', '1200.00')
+        
+        self.pledge.refresh_from_db()
+        self.assertEqual(self.pledge.status, 'completed')
+    
+    def test_project_expected_to_date(self):
+        """Test vectorized expected-to-date calculation"""
+        rows = [
+            {'amount': 1200, 'amount_paid': 300, 'frequency': 'monthly',
+             'start_date': date(2025, 1, 15), 'end_date': date(2025, 12, 15)},
+            {'amount': 520, 'amount_paid': 0, 'frequency': 'weekly',
+             'start_date': date(2025, 1, 1), 'end_date': date(2025, 12, 30)},
+            {'amount': 400, 'amount_paid': 0, 'frequency': 'quarterly',
+             'start_date': date(2026, 1, 1), 'end_date': date(2026, 12, 31)},
+        ]
+        
+        projection = PledgeService.project(rows, date(2025, 3, 14))
+        
+        self.assertEqual(list(projection['expected']), [200.0, 110.0, 0.0])
+        self.assertEqual(list(projection['installments']), [12, 52, 4])
+    
+    def test_projection_endpoint(self):
+        """Test projection endpoint"""
+        response = self.admin_client.get(
+            '/api/v1/payments/pledges/projection/?as_of=2025-03-14&months=3'
+        )
+        
+        self.assertSuccess(response)
+        summary = response.data['projection']['summary']
+        self.assertEqual(summary['expected_to_date'], 200.0)
+        self.assertEqual(len(response.data['projection']['curve']), 3)
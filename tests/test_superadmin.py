@@ -0,0 +1,85 @@
+"""
+Tests for platform metrics
+"""
+from django.utils import timezone
+from tests.base import APITestCase
+from apps.authentication.models import User
+from apps.members.models import Member
+from apps.payments.models import Payment
+from apps.superadmin.models import TenantMetricSnapshot
+from core.services import PlatformMetricsService
+
+
+class PlatformMetricsTestCase(APITestCase):
+    """Test cross-tenant metric snapshots"""
+    
+    def setUp(self):
+        """Set up test data"""
+        super().setUp()
+        
+        member = Member.objects.create(
+            member_id='PLAT001',
+            first_name='Platform',
+            last_name='Member',
+            email='platform@test.com',
+            status='active'
+        )
+        Member.objects.create(
+            member_id='PLAT002',
+            first_name='Inactive',
+            last_name='Member',
+            email='inactive@test.com',
+            status='inactive'
+        )
+        Payment.objects.create(
+            member=member,
+            amount=75,
+            type='tithe',
+            method='cash',
+            status='completed',
+            date=timezone.now()
+        )
+    
+    def test_snapshot_reads_tenant_schemas(self):
+        """Test a snapshot is stored per church from the UNION ALL query"""
+        self.assertGreaterEqual(PlatformMetricsService.snapshot(), 1)
+        
+        snapshot = TenantMetricSnapshot.objects.get(church=self.church)
+        self.assertEqual(snapshot.members_total, 2)
+        self.assertEqual(snapshot.members_active, 1)
+        self.assertEqual(snapshot.giving_30d, 75)
+        self.assertEqual(snapshot.payments_30d, 1)
+        self.assertEqual(snapshot.users_active, 3)
+    
+    def test_latest_snapshot_per_church(self):
+        """Test only the newest snapshot per church is read"""
+        PlatformMetricsService.snapshot()
+        PlatformMetricsService.snapshot()
+        
+        latest = [s for s in PlatformMetricsService.latest() if s.church_id == self.church.id]
+        self.assertEqual(len(latest), 1)
+        self.assertEqual(PlatformMetricsService.totals(latest)['members_total'], 2)
+    
+    def test_metrics_endpoints(self):
+        """Test superadmins can read platform metrics over the API and church admins cannot"""
+        PlatformMetricsService.snapshot()
+        superadmin = User.objects.create_user(
+            email='super@test.com',
+            password='testpass123',
+            name='Super Admin',
+            role='superadmin',
+            is_active=True
+        )
+        client = self._create_tenant_client()
+        self._authenticate_client(client, superadmin)
+        
+        response = client.get('/api/v1/superadmin/metrics/')
+        self.assertSuccess(response)
+        churches = {row['church']: row for row in response.data['churches']}
+        self.assertEqual(churches[self.church.id]['members_total'], 2)
+        
+        response = client.get(f'/api/v1/superadmin/metrics/{self.church.id}/history/?days=7')
+        self.assertSuccess(response)
+        self.assertEqual(len(response.data['history']), 1)
+        
+        self.assertForbidden(self.admin_client.get('/api/v1/superadmin/metrics/'))
@@ -0,0 +1,81 @@
+"""
+Tests for usage metering and plan quotas
+"""
+from datetime import date
+from django.core.cache import cache
+from django.test import override_settings
+from tests.base import APITestCase
+from apps.churches.models_usage import ChurchUsage
+from apps.members.models import Member
+from core.services import UsageService
+
+
+LIMITS = {'trial': {'storage_bytes': 1000, 'members': 2, 'api_calls': None, 'notifications_sent': None}}
+
+
+@override_settings(PLAN_LIMITS=LIMITS, USAGE_FLUSH_SECONDS=3600)
+class UsageTestCase(APITestCase):
+    """Test usage counters and quota checks"""
+    
+    def setUp(self):
+        """Start from flushed counters"""
+        super().setUp()
+        cache.clear()
+        UsageService.flush()
+        ChurchUsage.objects.filter(church=self.church).delete()
+    
+    def test_member_limit_enforced(self):
+        """Test creating members past the plan limit is refused"""
+        Member.objects.create(member_id='USE001', first_name='One', last_name='Member', email='one@test.com')
+        
+        response = self.admin_client.post('/api/v1/members/', {
+            'member_id': 'USE002',
+            'first_name': 'Two',
+            'last_name': 'Member',
+            'email': 'two@test.com',
+        }, format='json')
+        self.assertEqual(response.status_code, 201)
+        
+        response = self.admin_client.post('/api/v1/members/', {
+            'member_id': 'USE003',
+            'first_name': 'Three',
+            'last_name': 'Member',
+            'email': 'three@test.com',
+        }, format='json')
+        self.assertEqual(response.status_code, 403)
+        self.assertFalse(response.data['success'])
+    
+    def test_flush_accumulates_and_resets_monthly(self):
+        """Test counters are written as deltas and monthly counters restart"""
+        UsageService.reconcile()
+        ChurchUsage.objects.filter(church=self.church).update(period=date(2000, 1, 1), api_calls=500)
+        
+        UsageService.record('api_calls', 3)
+        UsageService.record('storage_bytes', 250)
+        # Running totals are written straight away; only monthly counters wait for a flush
+        self.assertEqual(ChurchUsage.objects.get(church=self.church).storage_bytes, 250)
+        self.assertEqual(UsageService.flush(), 1)
+        
+        usage = ChurchUsage.objects.get(church=self.church)
+        self.assertEqual(usage.api_calls, 3)
+        self.assertEqual(usage.period, UsageService.current_period())
+        self.assertEqual(usage.storage_bytes, 250)
+    
+    def test_reconcile_does_not_double_count(self):
+        """Test writes counted by a reconcile are not applied again afterwards"""
+        UsageService.reconcile()
+        Member.objects.create(member_id='USE004', first_name='Four', last_name='Member', email='four@test.com')
+        
+        self.assertEqual(UsageService.reconcile()['members'], 1)
+        UsageService.flush()
+        
+        self.assertEqual(ChurchUsage.objects.get(church=self.church).members, 1)
+        self.assertEqual(UsageService.usage()['members'], 1)
+    
+    def test_usage_endpoint(self):
+        """Test usage is reported with the plan's limits"""
+        response = self.admin_client.get(f'/api/v1/churches/{self.church.id}/usage/')
+        
+        self.assertSuccess(response)
+        self.assertEqual(response.data['limits']['members'], 2)
+        self.assertIn('storage_bytes', response.data['usage'])
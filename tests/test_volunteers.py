@@ -1,12 +1,17 @@
 """
 Tests for Volunteers API endpoints
 """
+import time
+from collections import Counter
 from django.utils import timezone
-from datetime import timedelta
+from datetime import datetime, timedelta
 from tests.base import APITestCase
-from apps.volunteers.models import VolunteerOpportunity, VolunteerSignup
+from decimal import Decimal
+from apps.volunteers.models import VolunteerHours, VolunteerHoursTotal, VolunteerOpportunity, VolunteerSignup
 from apps.ministries.models import Ministry
 from apps.members.models import Member
+from core.services.roster_service import Roster
+from core.services.volunteer_service import VolunteerService
 
 
 class VolunteersAPITestCase(APITestCase):
@@ -102,7 +107,247 @@ class VolunteersAPITestCase(APITestCase):
         self.assertGreater(len(response.data['results']), 0)
 
 
+class VolunteerWaitlistTestCase(APITestCase):
+    """Test signup capacity and waitlist promotion"""
+    
+    def setUp(self):
+        """Create a one-spot opportunity and two members"""
+        super().setUp()
+        self.opportunity = VolunteerOpportunity.objects.create(
+            title='Nursery Helper',
+            description='Care for toddlers during service',
+            category='ministry',
+            location='Nursery',
+            spots_available=1
+        )
+        self.first = Member.objects.create(
+            member_id='VOL010',
+            first_name='First',
+            last_name='Volunteer',
+            email='first@test.com'
+        )
+        self.second = Member.objects.create(
+            member_id='VOL011',
+            first_name='Second',
+            last_name='Volunteer',
+            email='second@test.com'
+        )
+    
+    def signup(self, member):
+        return self.admin_client.post(
+            f'/api/v1/volunteer-opportunities/{self.opportunity.id}/signup/',
+            {'member_id': member.id},
+            format='json'
+        )
+    
+    def test_full_opportunity_waitlists(self):
+        """Test signups past capacity are waitlisted instead of overfilling"""
+        self.assertEqual(self.signup(self.first).data['signup']['status'], 'pending')
+        
+        response = self.signup(self.second)
+        
+        self.assertEqual(response.data['signup']['status'], 'waitlisted')
+        self.assertEqual(response.data['waitlist_position'], 1)
+        self.opportunity.refresh_from_db()
+        self.assertEqual(self.opportunity.spots_filled, 1)
+        self.assertEqual(self.signup(self.second).status_code, 400)
+    
+    def test_withdraw_promotes_next(self):
+        """Test withdrawing hands the spot to the oldest waitlisted volunteer"""
+        self.signup(self.first)
+        waitlisted = self.signup(self.second).data['signup']['id']
+        
+        response = self.admin_client.delete(
+            f'/api/v1/volunteer-opportunities/{self.opportunity.id}/withdraw/',
+            {'member_id': self.first.id},
+            format='json'
+        )
+        
+        self.assertEqual(response.data['promoted'], [waitlisted])
+        self.assertEqual(VolunteerSignup.objects.get(pk=waitlisted).status, 'pending')
+        self.opportunity.refresh_from_db()
+        self.assertEqual(self.opportunity.spots_filled, 1)
+    
+    def test_reconcile_corrects_drift(self):
+        """Test spots_filled is reset from signups and freed spots are filled"""
+        self.signup(self.first)
+        self.signup(self.second)
+        VolunteerSignup.objects.filter(member=self.first).update(status='cancelled')
+        
+        self.assertEqual(VolunteerService.reconcile(), 1)
+        
+        self.opportunity.refresh_from_db()
+        self.assertEqual(self.opportunity.spots_filled, 1)
+        self.assertEqual(VolunteerSignup.objects.get(member=self.second).status, 'pending')
 
 
+class VolunteerRosterTestCase(APITestCase):
+    """Test draft rosters for recurring opportunities"""
+    
+    def setUp(self):
+        """Create a weekly opportunity with three approved volunteers"""
+        super().setUp()
+        self.first_sunday = timezone.make_aware(datetime(2026, 11, 1, 9, 0))
+        self.opportunity = VolunteerOpportunity.objects.create(
+            title='Sound Desk',
+            description='Run sound for Sunday service',
+            category='ministry',
+            location='Sanctuary',
+            schedule='recurring',
+            recurrence_pattern='weekly',
+            start_date=self.first_sunday
+        )
+        self.members = []
+        for number in range(3):
+            member = Member.objects.create(
+                member_id=f'VOL02{number}',
+                first_name=f'Tech{number}',
+                last_name='Volunteer',
+                email=f'tech{number}@test.com'
+            )
+            VolunteerSignup.objects.create(
+                opportunity=self.opportunity,
+                member=member,
+                user=self.admin_user,
+                status='approved'
+            )
+            self.members.append(member)
+    
+    def draft(self, **data):
+        response = self.admin_client.post('/api/v1/volunteer-opportunities/roster/', {
+            'start': '2026-11-01',
+            'end': '2026-12-31',
+            **data
+        }, format='json')
+        self.assertEqual(response.status_code, 200)
+        return response.data['roster']
+    
+    def test_roster_is_fair_and_spaced(self):
+        """Test every Sunday is filled and shifts are spread evenly"""
+        roster = self.draft(max_shifts_per_month=2, min_gap_days=13)
+        
+        self.assertEqual(len(roster['slots']), 9)
+        self.assertEqual(roster['unfilled'], 0)
+        shifts = [volunteer['shifts'] for volunteer in roster['volunteers']]
+        self.assertLessEqual(max(shifts) - min(shifts), 1)
+        
+        last_shift = {}
+        for slot in roster['slots']:
+            start = datetime.fromisoformat(slot['start'])
+            for assignee in slot['assigned']:
+                if assignee['member'] in last_shift:
+                    self.assertGreaterEqual((start - last_shift[assignee['member']]).days, 13)
+                last_shift[assignee['member']] = start
+    
+    def test_availability_respected(self):
+        """Test blackout dates keep a volunteer off that slot"""
+        signup = VolunteerSignup.objects.get(member=self.members[0])
+        signup.availability = {'blackout_dates': ['2026-11-01', '2026-11-08']}
+        signup.save()
+        
+        roster = self.draft(end='2026-11-08')
+        
+        for slot in roster['slots']:
+            self.assertNotIn(self.members[0].id, [assignee['member'] for assignee in slot['assigned']])
+    
+    def test_large_roster_solves_quickly(self):
+        """Test a half-year draft for 300 volunteers with more demand than capacity"""
+        slots = [
+            {
+                'start': self.first_sunday + timedelta(weeks=week, days=opportunity % 7, hours=opportunity),
+                'needed': 20,
+                'candidates': list(range(300)),
+            }
+            for opportunity in range(10)
+            for week in range(26)
+        ]
+        
+        started = time.monotonic()
+        slots = Roster(slots, max_per_month=2, min_gap_days=6).solve()
+        self.assertLess(time.monotonic() - started, 10)
+        
+        days = {}
+        for slot in slots:
+            for member in slot['assigned']:
+                days.setdefault(member, []).append(slot['day'])
+        self.assertTrue(days)
+        for worked in days.values():
+            worked.sort()
+            self.assertTrue(all((later - earlier).days >= 6 for earlier, later in zip(worked, worked[1:])))
+            per_month = Counter((day.year, day.month) for day in worked)
+            self.assertLessEqual(max(per_month.values()), 2)
+    
+    def test_members_cannot_draft(self):
+        """Test only admins can draft rosters"""
+        response = self.member_client.post('/api/v1/volunteer-opportunities/roster/', {}, format='json')
+        
+        self.assertEqual(response.status_code, 403)
 
 
+class VolunteerHoursRollupTestCase(APITestCase):
+    """Test incremental hour rollups and the leaderboard"""
+    
+    def setUp(self):
+        """Create an opportunity and three members"""
+        super().setUp()
+        self.opportunity = VolunteerOpportunity.objects.create(
+            title='Food Pantry',
+            description='Sort and hand out groceries',
+            category='community',
+            location='Fellowship Hall'
+        )
+        self.members = [
+            Member.objects.create(
+                member_id=f'VOL03{number}',
+                first_name=f'Pantry{number}',
+                last_name='Volunteer',
+                email=f'pantry{number}@test.com'
+            )
+            for number in range(3)
+        ]
+    
+    def log(self, member, hours, **fields):
+        return VolunteerHours.objects.create(
+            member=member,
+            opportunity=self.opportunity,
+            hours=Decimal(hours),
+            date=timezone.localdate(),
+            **fields
+        )
+    
+    def test_rollups_follow_writes(self):
+        """Test totals change with creates, edits, verification and deletes"""
+        first = self.log(self.members[0], '2.50')
+        self.log(self.members[0], '1.50')
+        
+        first.hours = Decimal('3.00')
+        first.verified_by = self.admin_user
+        first.save()
+        
+        total = VolunteerHoursTotal.objects.get(member=self.members[0])
+        self.assertEqual(total.hours, Decimal('4.50'))
+        self.assertEqual(total.verified_hours, Decimal('3.00'))
+        self.assertEqual(total.opportunities, 1)
+        
+        VolunteerHours.objects.filter(member=self.members[0]).delete()
+        total.refresh_from_db()
+        self.assertEqual(total.hours, Decimal('0.00'))
+        self.assertEqual(total.opportunities, 0)
+    
+    def test_leaderboard_ranks_and_percentile(self):
+        """Test the leaderboard orders by hours and places the member"""
+        self.log(self.members[0], '10')
+        self.log(self.members[1], '4')
+        self.log(self.members[2], '4')
+        
+        response = self.admin_client.get(
+            f'/api/v1/volunteer-hours/leaderboard/?limit=2&member={self.members[1].id}'
+        )
+        
+        self.assertEqual(response.status_code, 200)
+        leaderboard = response.data['leaderboard']
+        self.assertEqual(leaderboard['volunteers'], 3)
+        self.assertEqual([leader['rank'] for leader in leaderboard['leaders']], [1, 2])
+        self.assertEqual(leaderboard['leaders'][0]['member'], self.members[0].id)
+        self.assertEqual(leaderboard['position']['rank'], 2)
+        self.assertEqual(leaderboard['position']['percentile'], 66.7)